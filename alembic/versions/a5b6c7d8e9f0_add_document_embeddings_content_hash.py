@@ -0,0 +1,55 @@
+"""add chunk content hash for incremental re-ingestion
+
+Revision ID: a5b6c7d8e9f0
+Revises: z4a5b6c7d8e9
+Create Date: 2025-12-03 10:00:00.000000
+
+문서 재처리(재업로드, /retry) 시 변경된 청크만 다시 임베딩하도록
+document_embeddings에 청크 본문 해시 컬럼과 (document_id, content_hash) 인덱스를 추가합니다.
+
+- content_hash = sha256(chunk_text UTF-8) hex (app.core.vector_store.chunk_content_hash와 동일)
+- 기존 행은 id 구간 단위로 나눠 채웁니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5b6c7d8e9f0'
+down_revision = 'z4a5b6c7d8e9'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.add_column(
+        'document_embeddings',
+        sa.Column('content_hash', sa.String(length=64), nullable=True, comment='chunk_text의 sha256 (증분 재수집용)')
+    )
+
+    conn = op.get_bind()
+    bounds = conn.execute(sa.text("SELECT MIN(id), MAX(id) FROM document_embeddings")).one()
+    if bounds[0] is not None:
+        for start in range(bounds[0], bounds[1] + 1, BACKFILL_BATCH_SIZE):
+            conn.execute(
+                sa.text(
+                    "UPDATE document_embeddings "
+                    "SET content_hash = encode(sha256(convert_to(chunk_text, 'UTF8')), 'hex') "
+                    "WHERE id >= :start AND id < :end AND content_hash IS NULL"
+                ),
+                {"start": start, "end": start + BACKFILL_BATCH_SIZE}
+            )
+
+    op.create_index(
+        'document_embeddings_document_id_content_hash_idx',
+        'document_embeddings',
+        ['document_id', 'content_hash'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('document_embeddings_document_id_content_hash_idx', table_name='document_embeddings')
+    op.drop_column('document_embeddings', 'content_hash')
@@ -0,0 +1,69 @@
+"""add SimHash signatures and near-duplicate chunk links
+
+Revision ID: b6c7d8e9f0a1
+Revises: a5b6c7d8e9f0
+Create Date: 2025-12-04 10:00:00.000000
+
+수집 시 유사 중복 청크를 대표 청크에 연결하기 위한 스키마를 추가합니다.
+
+- document_embeddings.simhash (BIGINT) / simhash_bands (int4[], GIN 인덱스)
+- document_chunk_links: 중복 청크(문서, 청크 인덱스, 원문, 메타데이터) → 대표 임베딩 행
+
+기존 행의 서명은 SQL로 계산할 수 없어 비워 둡니다. 서명이 없는 행은 중복 후보에서
+제외되며, 해당 문서가 재처리되면 유지되는 행에도 서명이 채워집니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6c7d8e9f0a1'
+down_revision = 'a5b6c7d8e9f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'document_embeddings',
+        sa.Column('simhash', sa.BigInteger(), nullable=True, comment='청크 SimHash 64비트 서명')
+    )
+    op.add_column(
+        'document_embeddings',
+        sa.Column('simhash_bands', postgresql.ARRAY(sa.Integer()), nullable=True, comment='SimHash 밴드 키 (후보 검색용)')
+    )
+    op.create_index(
+        'document_embeddings_simhash_bands_idx',
+        'document_embeddings',
+        ['simhash_bands'],
+        unique=False,
+        postgresql_using='gin'
+    )
+
+    op.create_table(
+        'document_chunk_links',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.String(length=36), nullable=False, comment='중복 청크가 속한 documents.document_id'),
+        sa.Column('canonical_embedding_id', sa.Integer(), nullable=False, comment='대표 청크 (document_embeddings.id)'),
+        sa.Column('chunk_index', sa.Integer(), nullable=False, comment='문서 내 청크 인덱스'),
+        sa.Column('chunk_text', sa.Text(), nullable=False, comment='중복 청크 원문 (대표 청크 삭제 시 승격용)'),
+        sa.Column('doc_metadata', sa.JSON(), nullable=True, comment='중복 청크 메타데이터 (대표 청크 삭제 시 승격용)'),
+        sa.Column('hamming_distance', sa.Integer(), nullable=False, comment='대표 청크와의 SimHash 해밍 거리'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['canonical_embedding_id'], ['document_embeddings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_document_chunk_links_document_id', 'document_chunk_links', ['document_id'], unique=False)
+    op.create_index(
+        'ix_document_chunk_links_canonical_embedding_id', 'document_chunk_links', ['canonical_embedding_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_chunk_links_canonical_embedding_id', table_name='document_chunk_links')
+    op.drop_index('ix_document_chunk_links_document_id', table_name='document_chunk_links')
+    op.drop_table('document_chunk_links')
+    op.drop_index('document_embeddings_simhash_bands_idx', table_name='document_embeddings')
+    op.drop_column('document_embeddings', 'simhash_bands')
+    op.drop_column('document_embeddings', 'simhash')
@@ -0,0 +1,109 @@
+"""promote hot metadata keys to typed columns and index doc_metadata as JSONB
+
+Revision ID: c7d8e9f0a1b2
+Revises: b6c7d8e9f0a1
+Create Date: 2025-12-05 10:00:00.000000
+
+VectorStore 필터(filter_dict), get_document, delete_document가 인덱스를 쓸 수 있도록
+document_embeddings의 메타데이터 저장 방식을 바꿉니다.
+
+- doc_metadata: JSON → JSONB + GIN(jsonb_path_ops) 인덱스 (비승격 키는 @> 포함 조건)
+- 자주 쓰는 키를 B-tree 인덱스 컬럼으로 승격
+    chunk_id  ← doc_metadata->>'document_id' (청크 ID)
+    user_uuid ← doc_metadata->>'user_uuid'
+    file_type ← doc_metadata->>'file_type'
+    page      ← doc_metadata->>'page' (정수인 경우)
+  원본 문서 ID는 기존 document_id 컬럼을 사용하며 (document_id, page) 복합 인덱스를 추가합니다.
+- document_chunk_links.chunk_id (유사 중복 연결 청크의 청크 ID 조회)
+- 기존 행은 id 구간 단위로 나눠 채웁니다.
+
+JSONB 변환은 테이블을 다시 쓰므로 대용량 테넌트는 점검 시간에 실행하세요.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d8e9f0a1b2'
+down_revision = 'b6c7d8e9f0a1'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'document_embeddings',
+        'doc_metadata',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using='doc_metadata::jsonb'
+    )
+
+    op.add_column('document_embeddings', sa.Column('chunk_id', sa.String(length=100), nullable=True, comment='청크 ID (metadata.document_id)'))
+    op.add_column('document_embeddings', sa.Column('user_uuid', sa.String(length=36), nullable=True, comment='업로드 사용자 UUID (metadata.user_uuid)'))
+    op.add_column('document_embeddings', sa.Column('file_type', sa.String(length=20), nullable=True, comment='파일 형식 (metadata.file_type)'))
+    op.add_column('document_embeddings', sa.Column('page', sa.Integer(), nullable=True, comment='시작 페이지 번호 (metadata.page)'))
+
+    conn = op.get_bind()
+    bounds = conn.execute(sa.text("SELECT MIN(id), MAX(id) FROM document_embeddings")).one()
+    if bounds[0] is not None:
+        for start in range(bounds[0], bounds[1] + 1, BACKFILL_BATCH_SIZE):
+            conn.execute(
+                sa.text(
+                    "UPDATE document_embeddings SET "
+                    "chunk_id = LEFT(doc_metadata->>'document_id', 100), "
+                    "user_uuid = LEFT(doc_metadata->>'user_uuid', 36), "
+                    "file_type = LEFT(doc_metadata->>'file_type', 20), "
+                    "page = CASE WHEN doc_metadata->>'page' ~ '^[0-9]{1,9}$' "
+                    "THEN (doc_metadata->>'page')::integer END "
+                    "WHERE id >= :start AND id < :end AND doc_metadata IS NOT NULL"
+                ),
+                {"start": start, "end": start + BACKFILL_BATCH_SIZE}
+            )
+
+    # 유사 중복 연결 청크도 청크 ID로 조회 (get_document)
+    op.add_column('document_chunk_links', sa.Column('chunk_id', sa.String(length=100), nullable=True, comment='중복 청크 ID (metadata.document_id)'))
+    op.execute(
+        "UPDATE document_chunk_links SET chunk_id = LEFT(doc_metadata::jsonb->>'document_id', 100) "
+        "WHERE doc_metadata IS NOT NULL"
+    )
+    op.create_index('ix_document_chunk_links_chunk_id', 'document_chunk_links', ['chunk_id'], unique=False)
+
+    op.create_index('ix_document_embeddings_chunk_id', 'document_embeddings', ['chunk_id'], unique=False)
+    op.create_index('ix_document_embeddings_user_uuid', 'document_embeddings', ['user_uuid'], unique=False)
+    op.create_index('ix_document_embeddings_file_type', 'document_embeddings', ['file_type'], unique=False)
+    op.create_index('document_embeddings_document_id_page_idx', 'document_embeddings', ['document_id', 'page'], unique=False)
+    op.create_index(
+        'document_embeddings_doc_metadata_idx',
+        'document_embeddings',
+        ['doc_metadata'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'doc_metadata': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('document_embeddings_doc_metadata_idx', table_name='document_embeddings')
+    op.drop_index('document_embeddings_document_id_page_idx', table_name='document_embeddings')
+    op.drop_index('ix_document_embeddings_file_type', table_name='document_embeddings')
+    op.drop_index('ix_document_embeddings_user_uuid', table_name='document_embeddings')
+    op.drop_index('ix_document_embeddings_chunk_id', table_name='document_embeddings')
+    op.drop_index('ix_document_chunk_links_chunk_id', table_name='document_chunk_links')
+    op.drop_column('document_chunk_links', 'chunk_id')
+    op.drop_column('document_embeddings', 'page')
+    op.drop_column('document_embeddings', 'file_type')
+    op.drop_column('document_embeddings', 'user_uuid')
+    op.drop_column('document_embeddings', 'chunk_id')
+    op.alter_column(
+        'document_embeddings',
+        'doc_metadata',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='doc_metadata::json'
+    )
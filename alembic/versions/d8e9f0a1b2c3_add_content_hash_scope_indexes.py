@@ -0,0 +1,32 @@
+"""index content_hash per bot / user scope for cross-document embedding reuse
+
+Revision ID: d8e9f0a1b2c3
+Revises: c7d8e9f0a1b2
+Create Date: 2025-12-06 10:00:00.000000
+
+업로드마다 새 document_id가 발급되므로, 재업로드한 파일의 청크는
+같은 범위(bot_id, 봇이 없으면 user_uuid)에서 본문 해시가 같은 행을 찾아 임베딩을 복사합니다
+(VectorStore.plan_document_sync). 이 조회용 복합 인덱스를 추가합니다.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8e9f0a1b2c3'
+down_revision = 'c7d8e9f0a1b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'document_embeddings_bot_id_content_hash_idx', 'document_embeddings', ['bot_id', 'content_hash'], unique=False
+    )
+    op.create_index(
+        'document_embeddings_user_uuid_content_hash_idx', 'document_embeddings', ['user_uuid', 'content_hash'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('document_embeddings_user_uuid_content_hash_idx', table_name='document_embeddings')
+    op.drop_index('document_embeddings_bot_id_content_hash_idx', table_name='document_embeddings')
@@ -0,0 +1,77 @@
+"""add content-addressed workflow graph snapshots
+
+Revision ID: w1x2y3z4a5b6
+Revises: 00b8abd5938b
+Create Date: 2025-11-27 10:00:00.000000
+
+실행 기록마다 복사되던 graph_snapshot(JSONB)을 그래프 해시 기준 스냅샷 테이블로 분리합니다.
+기존 run의 graph_snapshot 컬럼은 그대로 두고(nullable), 신규 run은 해시 참조만 저장합니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'w1x2y3z4a5b6'
+down_revision = '00b8abd5938b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'workflow_graph_snapshots',
+        sa.Column('graph_hash', sa.String(length=64), nullable=False),
+        sa.Column('graph', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('graph_hash')
+    )
+
+    op.add_column(
+        'workflow_execution_runs',
+        sa.Column('graph_snapshot_hash', sa.String(length=64), nullable=True)
+    )
+    op.create_foreign_key(
+        'fk_workflow_execution_runs_graph_snapshot_hash',
+        'workflow_execution_runs', 'workflow_graph_snapshots',
+        ['graph_snapshot_hash'], ['graph_hash']
+    )
+    op.create_index(
+        op.f('ix_workflow_execution_runs_graph_snapshot_hash'),
+        'workflow_execution_runs', ['graph_snapshot_hash'], unique=False
+    )
+    op.alter_column(
+        'workflow_execution_runs', 'graph_snapshot',
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        nullable=True
+    )
+
+
+def downgrade() -> None:
+    # 해시 참조만 가진 run은 스냅샷 그래프를 다시 채워 넣은 뒤 컬럼을 제거
+    op.execute(
+        """
+        UPDATE workflow_execution_runs AS r
+        SET graph_snapshot = s.graph
+        FROM workflow_graph_snapshots AS s
+        WHERE r.graph_snapshot IS NULL
+          AND r.graph_snapshot_hash = s.graph_hash
+        """
+    )
+    op.alter_column(
+        'workflow_execution_runs', 'graph_snapshot',
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        nullable=False
+    )
+    op.drop_index(
+        op.f('ix_workflow_execution_runs_graph_snapshot_hash'),
+        table_name='workflow_execution_runs'
+    )
+    op.drop_constraint(
+        'fk_workflow_execution_runs_graph_snapshot_hash',
+        'workflow_execution_runs',
+        type_='foreignkey'
+    )
+    op.drop_column('workflow_execution_runs', 'graph_snapshot_hash')
+    op.drop_table('workflow_graph_snapshots')
@@ -0,0 +1,59 @@
+"""add full-text and trigram indexes for hybrid retrieval
+
+Revision ID: x2y3z4a5b6c7
+Revises: w1x2y3z4a5b6
+Create Date: 2025-11-28 10:00:00.000000
+
+하이브리드(어휘 + 벡터) 검색을 위해 document_embeddings.chunk_text에 대한
+tsvector 생성 컬럼(GIN)과 pg_trgm 트라이그램 인덱스(GIN)를 추가합니다.
+
+- 기본 PostgreSQL에는 한국어 형태소 분석 설정이 없으므로 'simple' 설정을 사용합니다
+  (제품 코드, 오류 번호, 영문 고유명사 등 공백 단위 토큰 매칭).
+- 조사가 붙은 한국어 어절("환불규정은")처럼 토큰이 일치하지 않는 경우는
+  트라이그램 word_similarity로 보완합니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'x2y3z4a5b6c7'
+down_revision = 'w1x2y3z4a5b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    op.add_column(
+        'document_embeddings',
+        sa.Column(
+            'chunk_tsv',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple'::regconfig, chunk_text)", persisted=True),
+            nullable=True
+        )
+    )
+    op.create_index(
+        'document_embeddings_chunk_tsv_idx',
+        'document_embeddings',
+        ['chunk_tsv'],
+        unique=False,
+        postgresql_using='gin'
+    )
+    op.create_index(
+        'document_embeddings_chunk_text_trgm_idx',
+        'document_embeddings',
+        ['chunk_text'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'chunk_text': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('document_embeddings_chunk_text_trgm_idx', table_name='document_embeddings')
+    op.drop_index('document_embeddings_chunk_tsv_idx', table_name='document_embeddings')
+    op.drop_column('document_embeddings', 'chunk_tsv')
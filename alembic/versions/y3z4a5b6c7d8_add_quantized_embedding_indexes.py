@@ -0,0 +1,45 @@
+"""add halfvec / binary quantized HNSW indexes on document embeddings
+
+Revision ID: y3z4a5b6c7d8
+Revises: x2y3z4a5b6c7
+Create Date: 2025-12-01 10:00:00.000000
+
+ANN 후보 단계용 양자화 HNSW 인덱스를 표현식 인덱스로 추가합니다.
+
+- halfvec: (embedding::halfvec(1024)) halfvec_cosine_ops  → 벡터당 2KB (float32 대비 1/2)
+- binary : (binary_quantize(embedding)::bit(1024)) bit_hamming_ops → 벡터당 128B (1/32)
+
+원본 float32 embedding 컬럼은 그대로 두고 후보 재점수(exact re-scoring)에만 사용하므로
+기존 행 변환(backfill)이 필요 없습니다 (인덱스 생성 시 기존 행이 함께 색인됨).
+
+settings.vector_search_quantization이 halfvec / binary일 때 해당 모드의 인덱스 하나만 만들고
+(기본값 none이면 아무것도 하지 않음), pgvector 0.7.0 미만이면 경고 후 건너뜁니다.
+운영 중 모드 전환과 원본 인덱스(document_embeddings_embedding_idx) 제거는
+scripts/apply_vector_search_index.py로 수행합니다.
+"""
+from alembic import op
+
+from app.config import settings
+from app.core.vector_indexes import create_ann_index, drop_ann_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'y3z4a5b6c7d8'
+down_revision = 'x2y3z4a5b6c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    mode = settings.vector_search_quantization
+    if mode not in ("halfvec", "binary"):
+        print(f"ℹ️  vector_search_quantization={mode} - 양자화 인덱스 생성을 건너뜁니다")
+        return
+    if not create_ann_index(op.get_bind(), mode):
+        print(f"⚠️  pgvector 0.7.0 미만 - {mode} 인덱스 생성을 건너뜁니다")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    drop_ann_index(conn, "binary")
+    drop_ann_index(conn, "halfvec")
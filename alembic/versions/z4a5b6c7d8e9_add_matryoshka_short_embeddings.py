@@ -0,0 +1,48 @@
+"""add matryoshka 256-d short embeddings for two-stage search
+
+Revision ID: z4a5b6c7d8e9
+Revises: y3z4a5b6c7d8
+Create Date: 2025-12-02 10:00:00.000000
+
+2단계(Matryoshka) 검색을 위해 document_embeddings에 256차원 축약 벡터 컬럼을 추가합니다.
+
+- embedding_short = l2_normalize(subvector(embedding, 1, 256))
+  (Titan Embeddings v2 1024차원 벡터의 앞 256차원을 재정규화)
+- 신규 행은 VectorStore.add_documents가 저장 시 함께 계산합니다.
+- settings.vector_search_quantization이 matryoshka일 때만 기존 행을 id 구간 단위로 채운 뒤
+  HNSW 인덱스를 생성합니다 (빈 인덱스에 행마다 삽입하는 것보다 빠름).
+  나중에 전환할 때는 scripts/apply_vector_search_index.py --mode matryoshka를 사용합니다.
+
+채움/인덱스에는 pgvector 0.7.0 이상이 필요하며 (subvector, l2_normalize), 미만이면 건너뜁니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+from app.config import settings
+from app.core.vector_indexes import create_ann_index, drop_ann_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'z4a5b6c7d8e9'
+down_revision = 'y3z4a5b6c7d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'document_embeddings',
+        sa.Column('embedding_short', Vector(256), nullable=True, comment='256차원 축약 임베딩 (후보 검색용)')
+    )
+
+    if settings.vector_search_quantization != "matryoshka":
+        print("ℹ️  vector_search_quantization != matryoshka - embedding_short 채움/인덱스 생성을 건너뜁니다")
+        return
+    if not create_ann_index(op.get_bind(), "matryoshka"):
+        print("⚠️  pgvector 0.7.0 미만 - embedding_short 채움/인덱스 생성을 건너뜁니다")
+
+
+def downgrade() -> None:
+    drop_ann_index(op.get_bind(), "matryoshka")
+    op.drop_column('document_embeddings', 'embedding_short')
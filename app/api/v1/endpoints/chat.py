@@ -16,6 +16,7 @@ from app.core.auth.dependencies import get_current_user_from_jwt_or_apikey
 from app.models.user import User
 from app.core.database import get_db
 from app.core.middleware.rate_limit import limiter
+from app.core.stream_events import event_payload
 
 logger = logging.getLogger(__name__)
 
@@ -163,11 +164,8 @@ async def chat_stream(
     async def event_generator() -> AsyncGenerator[str, None]:
         """SSE 이벤트 스트림 생성기"""
         def is_error_event(event_json: str) -> bool:
-            try:
-                payload = json.loads(event_json)
-            except json.JSONDecodeError:
-                return False
-            return payload.get("type") == "error"
+            payload = event_payload(event_json)
+            return bool(payload) and payload.get("type") == "error"
 
         error_sent = False
         client_disconnected = False
@@ -53,6 +53,20 @@ class DailyCostSummary(BaseModel):
     total_cost: float
 
 
+class PromptCacheStatsResponse(BaseModel):
+    """프롬프트 캐시(Anthropic/Bedrock cache_control) 적중률 통계"""
+    bot_id: str
+    total_requests: int
+    cached_requests: int
+    request_hit_rate: float
+    total_input_tokens: int
+    cache_read_tokens: int
+    cache_write_tokens: int
+    token_hit_rate: float
+    period_start: Optional[datetime] = None
+    period_end: Optional[datetime] = None
+
+
 class PricingInfo(BaseModel):
     """모델 가격 정보"""
     provider: str
@@ -249,6 +263,65 @@ async def get_bot_daily_costs(
     ]
 
 
+@router.get("/usage/{bot_id}/prompt-cache", response_model=PromptCacheStatsResponse)
+async def get_bot_prompt_cache_stats(
+    bot_id: str,
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    current_user: User = Depends(get_current_user_from_jwt_only),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    특정 봇의 프롬프트 캐시 적중률
+
+    - request_hit_rate: 캐시 읽기가 발생한 요청 비율
+    - token_hit_rate: 전체 입력 토큰 중 캐시에서 읽은 토큰 비율
+      (Anthropic 계열은 input_tokens에 캐시 토큰이 포함되지 않음)
+    """
+    if not end_date:
+        end_date = datetime.utcnow()
+    if not start_date:
+        start_date = end_date - timedelta(days=30)
+
+    conditions = [
+        LLMUsageLog.bot_id == bot_id,
+        LLMUsageLog.user_id == current_user.id,
+        LLMUsageLog.created_at >= start_date,
+        LLMUsageLog.created_at <= end_date
+    ]
+
+    query = select(
+        func.count(LLMUsageLog.id).label('total_requests'),
+        func.count(LLMUsageLog.id).filter(LLMUsageLog.cache_read_tokens > 0).label('cached_requests'),
+        func.sum(LLMUsageLog.input_tokens).label('total_input_tokens'),
+        func.sum(LLMUsageLog.cache_read_tokens).label('cache_read_tokens'),
+        func.sum(LLMUsageLog.cache_write_tokens).label('cache_write_tokens')
+    ).where(and_(*conditions))
+
+    result = await db.execute(query)
+    row = result.first()
+
+    total_requests = (row.total_requests or 0) if row else 0
+    cached_requests = (row.cached_requests or 0) if row else 0
+    input_tokens = (row.total_input_tokens or 0) if row else 0
+    cache_read = (row.cache_read_tokens or 0) if row else 0
+    cache_write = (row.cache_write_tokens or 0) if row else 0
+    prompt_tokens = input_tokens + cache_read + cache_write
+
+    return PromptCacheStatsResponse(
+        bot_id=bot_id,
+        total_requests=total_requests,
+        cached_requests=cached_requests,
+        request_hit_rate=round(cached_requests / total_requests, 4) if total_requests else 0.0,
+        total_input_tokens=input_tokens,
+        cache_read_tokens=cache_read,
+        cache_write_tokens=cache_write,
+        token_hit_rate=round(cache_read / prompt_tokens, 4) if prompt_tokens else 0.0,
+        period_start=start_date,
+        period_end=end_date
+    )
+
+
 @router.get("/pricing", response_model=List[PricingInfo])
 async def get_model_pricing(
     provider: Optional[str] = Query(None, description="Provider 필터"),
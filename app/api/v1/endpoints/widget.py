@@ -19,6 +19,7 @@ from app.schemas.widget import (
 from app.services.widget_service import WidgetService
 from app.core.exceptions import NotFoundException, ForbiddenException, UnauthorizedException
 from app.models.chat import ErrorEvent, ErrorCode
+from app.core.stream_events import event_payload
 
 router = APIRouter()
 
@@ -117,11 +118,8 @@ async def send_message_stream(
 
     async def event_generator():
         def is_error_event(event_json: str) -> bool:
-            try:
-                payload = json.loads(event_json)
-                return payload.get("type") == "error"
-            except json.JSONDecodeError:
-                return False
+            payload = event_payload(event_json)
+            return bool(payload) and payload.get("type") == "error"
 
         error_sent = False
 
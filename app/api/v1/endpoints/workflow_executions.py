@@ -21,6 +21,7 @@ from app.schemas.workflow import (
     WorkflowExecutionStatistics
 )
 from app.services.workflow_execution_service import WorkflowExecutionService
+from app.core.workflow.graph_snapshot import load_graph_snapshot
 from app.services.bot_service import BotService
 from app.core.pricing import calculate_token_cost
 from decimal import Decimal
@@ -239,7 +240,8 @@ async def get_execution_run(
             total_cost=total_cost,
             total_steps=run.total_steps,
             created_at=run.created_at,
-            graph_snapshot=run.graph_snapshot,
+            graph_snapshot=await load_graph_snapshot(db, run),
+            graph_snapshot_hash=run.graph_snapshot_hash,
             inputs=run.inputs,
             outputs=run.outputs
         )
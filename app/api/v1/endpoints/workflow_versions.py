@@ -23,7 +23,7 @@ from app.schemas.workflow import (
 )
 from app.services.workflow_version_service import WorkflowVersionService
 from app.services.bot_service import BotService
-from app.core.workflow.validator import WorkflowValidator
+from app.core.workflow.incremental_validator import get_draft_validator
 
 logger = logging.getLogger(__name__)
 
@@ -88,7 +88,8 @@ async def create_or_update_draft(
             if node.get("type") == "slack" or node.get("data", {}).get("type") == "slack":
                 logger.info(f"[DEBUG] Saving Slack node: id={node.get('id')}, data keys={list(node.get('data', {}).keys())}, data={node.get('data', {})}")
 
-        validator = WorkflowValidator()
+        # autosave가 반복되므로 봇 단위 증분 검증기로 직전 결과를 재사용
+        validator = get_draft_validator(bot_id)
         edges = graph_payload.get("edges", []) if graph_payload else []
         is_valid, errors, warnings = validator.validate(nodes, edges)
 
@@ -13,6 +13,7 @@ from app.core.auth.dependencies import get_current_user_from_jwt as get_current_
 from app.core.workflow.node_registry import node_registry
 from app.core.workflow.node_registry_v2 import node_registry_v2
 from app.core.workflow.validator import WorkflowValidator
+from app.core.workflow.incremental_validator import get_draft_validator
 from app.models.user import User
 from app.schemas.workflow import (
     Workflow,
@@ -351,9 +352,9 @@ async def update_bot_workflow(
         dict: 성공 메시지
     """
     try:
-        # 워크플로우 검증
+        # 워크플로우 검증 (봇 단위 증분 검증기)
         workflow_data = workflow.model_dump()
-        validator = WorkflowValidator()
+        validator = get_draft_validator(bot_id)
         nodes = workflow_data.get("nodes", [])
         edges = workflow_data.get("edges", [])
 
@@ -436,7 +437,7 @@ async def validate_bot_workflow(
             )
 
         workflow_data = workflow.model_dump()
-        validator = WorkflowValidator()
+        validator = get_draft_validator(bot_id)
         nodes = workflow_data.get("nodes", [])
         edges = workflow_data.get("edges", [])
 
@@ -69,6 +69,12 @@ class Settings(BaseSettings):
     redis_db: int = 0
     redis_url: str = ""
     redis_use_ssl: bool = False
+    redis_max_connections: int = 50  # 커넥션 풀 크기 (텍스트/바이너리 연결 각각)
+    redis_socket_timeout_sec: float = 5.0
+    redis_health_check_interval_sec: int = 30  # 유휴 커넥션 재사용 전 PING 주기
+    # 프로세스 로컬 near-cache (get(..., near_cache=True)로 조회하는 hot key만 대상)
+    redis_near_cache_max_entries: int = 1024  # 0이면 비활성
+    redis_near_cache_ttl_sec: float = 2.0  # 다른 레플리카의 변경이 반영되기까지의 최대 지연
     # LLM 캐시
     llm_cache_enabled: bool = True
     llm_cache_ttl_sec: int = 300  # 5분
@@ -80,6 +86,70 @@ class Settings(BaseSettings):
     semantic_cache_similarity_threshold: float = 0.92
     semantic_cache_max_entries: int = 500
     semantic_cache_min_chars: int = 32
+    # Provider 프롬프트 캐시 (Anthropic/Bedrock cache_control)
+    prompt_cache_enabled: bool = True
+    prompt_cache_min_tokens: int = 1024  # Claude 최소 캐시 단위 (Haiku는 2048)
+
+    # LLM 지연시간 기반 라우팅 (Bedrock Claude ↔ Anthropic 직접 호출 등 동일 티어 간)
+    # 동일 티어 간 라우팅/헤지는 중복 요청 비용이 발생하므로 명시적으로 켠다 (opt-in)
+    llm_routing_enabled: bool = False
+    llm_routing_window_size: int = 200  # provider/모델별 롤링 윈도우 크기 (요청 수)
+    llm_routing_min_samples: int = 20  # 라우팅/헤지 판단에 필요한 최소 표본 수
+    llm_routing_hysteresis: float = 0.2  # 대안이 p95 기준 20% 이상 빠를 때만 전환
+    llm_routing_error_penalty: float = 4.0  # 오류율 1.0당 p95 가중치
+    llm_routing_max_error_rate: float = 0.5  # 표본 부족 상태에서도 우회할 오류율
+    llm_hedging_enabled: bool = False  # 헤지 시 두 provider 모두 과금될 수 있음
+    llm_hedge_percentile: float = 0.95  # 이 백분위 지연시간이 지나면 헤지 요청 발사
+    llm_hedge_min_delay_ms: float = 300.0
+    llm_hedge_max_delay_ms: float = 10000.0
+
+    # SSE 토큰 병합 (토큰마다 이벤트를 직렬화하지 않고 짧은 시간 창 단위로 묶어 전송)
+    stream_coalesce_window_ms: float = 20.0  # 0이면 토큰 단위 전송
+    stream_coalesce_max_bytes: int = 256  # 이 크기 이상 쌓이면 시간 창과 무관하게 즉시 전송
+
+    # 대화 변수 상태 캐시 (Redis hash, DB는 실행 종료 시 일괄 upsert)
+    conversation_state_cache_enabled: bool = True
+    conversation_state_cache_prefix: str = "conv:vars"
+    conversation_state_cache_ttl_sec: int = 600  # DB 외부 변경이 캐시에 반영되기까지의 최대 지연
+
+    # 노드 출력 메모이제이션 (노드가 캐시 정책을 선언한 경우에만 적용)
+    node_output_cache_enabled: bool = True
+    node_output_cache_prefix: str = "node:out"
+    node_output_cache_local_max_entries: int = 2048  # 프로세스 로컬 티어 최대 항목 수
+    node_output_cache_knowledge_ttl_sec: int = 600  # 지식 검색 노드 TTL (코퍼스 버전이 바뀌면 즉시 무효)
+
+    # 검색 결과 캐시 (코퍼스 버전이 키에 포함되어 문서 추가/삭제 시 즉시 무효)
+    retrieval_cache_enabled: bool = True
+    retrieval_cache_prefix: str = "retrieval"
+    retrieval_cache_ttl_sec: int = 3600  # 버전 갱신 누락(Redis 장애 등)에 대비한 상한
+    retrieval_cache_local_max_entries: int = 1024
+
+    # 라이브러리 에이전트(ImportedWorkflowNode) 실행 계획 캐시
+    library_agent_plan_cache_size: int = 256
+    library_agent_plan_revalidate_sec: float = 10.0  # 다른 레플리카의 버전 변경을 updated_at으로 재확인하는 주기 (0이면 매번)
+    imported_workflow_trace_child_runs: bool = False  # True면 중첩 실행마다 별도 실행 기록(run)을 남김 (노드 설정 trace_child_run으로 개별 지정)
+
+    # 외부 HTTP 호출 공용 클라이언트 풀 (HTTP 노드 등)
+    http_client_max_connections: int = 100
+    http_client_max_keepalive_connections: int = 20
+    http_client_keepalive_expiry_sec: float = 30.0
+    http_client_max_connections_per_host: int = 10  # 한 호스트로의 동시 요청 수 제한
+    http_client_http2_enabled: bool = True  # h2 패키지가 설치된 경우에만 적용
+    http_node_max_response_bytes: int = 5 * 1024 * 1024  # 초과분은 잘라내고 error에 표시
+
+    # HTTP 응답 캐시 (GET/HEAD, Cache-Control/ETag 기반)
+    http_response_cache_enabled: bool = True
+    http_response_cache_prefix: str = "http:resp"
+    http_response_cache_local_max_entries: int = 512
+    http_response_cache_max_body_bytes: int = 512 * 1024  # 이보다 큰 응답은 캐시하지 않음
+    http_response_cache_stale_retention_sec: int = 3600  # 만료 후 조건부 재검증용으로 보관하는 시간
+
+    # Tavily 검색 결과 캐시 (정규화된 쿼리+검색 옵션 키, stale-while-revalidate)
+    tavily_search_cache_enabled: bool = True
+    tavily_search_cache_prefix: str = "tavily:search"
+    tavily_search_cache_ttl_sec: int = 300  # 기본 TTL (노드 설정 cache_ttl_sec로 변경, 0이면 비활성)
+    tavily_search_cache_stale_sec: int = 600  # TTL 경과 후 이 시간 동안은 이전 결과를 반환하며 백그라운드 갱신
+    tavily_search_cache_local_max_entries: int = 1024
 
     # 연결 문자열 생성 규칙을 한 곳에 모아 일관성 있게 관리하려는 목적
     # 비밀번호 포함/미포함, 기본값 처리 등을 캡슐화
@@ -202,10 +272,36 @@ class Settings(BaseSettings):
     allowed_extensions: List[str] = ["pdf", "txt", "docx"]
     chunk_size: int = 512
     chunk_overlap: int = 128
+    # char | token (chunk_size/chunk_overlap 단위). 기존 청크 크기를 유지하기 위해 기본은 문자 수이며,
+    # token으로 바꿀 때는 chunk_size/chunk_overlap도 토큰 기준(예: 192/48)으로 함께 낮춰야 함
+    chunk_length_unit: str = "char"
+    chunk_token_encoding: str = "cl100k_base"  # 토큰 길이 측정용 tiktoken 인코딩 (로드 실패 시 문자 수)
     
     # 검색
     default_top_k: int = 5
     max_top_k: int = 50
+    retrieval_default_search_mode: str = "semantic"  # semantic | hybrid (지식 검색 노드 기본값)
+    retrieval_hybrid_candidate_multiplier: int = 4  # 하이브리드 검색 시 각 검색 경로의 후보 수 = top_k * 배수
+    retrieval_rrf_k: int = 60  # Reciprocal Rank Fusion 상수 (클수록 하위 순위 가중치 완만)
+    vector_search_quantization: str = "none"  # none | halfvec | binary | matryoshka (ANN 후보 단계 인덱스, 원본 벡터로 재점수; 인덱스는 scripts/apply_vector_search_index.py로 전환)
+    vector_search_rescore_multiplier: int = 4  # 양자화 검색 후보 수 = top_k * 배수 (binary는 10 이상 권장)
+    retrieval_mmr_enabled: bool = False  # 지식 검색 노드 MMR 다양성 재순위 기본값 (노드 설정 mmr_enabled로 재정의)
+    retrieval_mmr_lambda: float = 0.7  # MMR 관련도 가중치 (1.0이면 관련도 순, 낮을수록 다양성 우선)
+    retrieval_mmr_fetch_multiplier: int = 3  # MMR 후보 수 = top_k * 배수
+    retrieval_dedup_similarity_threshold: float = 0.95  # 선택된 청크와 코사인 유사도가 이 값 이상이면 중복으로 제외
+    local_vector_index_enabled: bool = False  # hot 문서 집합을 로컬 mmap 세그먼트로 검색 (Postgres는 원본/폴백)
+    local_vector_index_dir: str = "./data/vector_index"  # 세그먼트 파일 경로 (같은 호스트의 워커끼리 공유)
+    local_vector_index_dtype: str = "float32"  # float32 | int8 (행별 스케일, 용량 1/4)
+    local_vector_index_exact_max_rows: int = 20000  # 이하면 정확 내적 검색, 초과하면 hnswlib 사용 (미설치 시 Postgres)
+    local_vector_index_min_hits: int = 3  # 프로세스에서 같은 문서 집합이 이 횟수 이상 검색되면 세그먼트 생성
+    local_vector_index_max_open_segments: int = 256  # 프로세스당 열어 둘 문서 세그먼트 수 (LRU)
+
+    # 수집 시 중복 청크 억제 (같은 봇/사용자 범위의 대표 청크에 연결, 검색 시 연결 청크의 본문/메타데이터 반환)
+    ingest_dedup_enabled: bool = True
+    # 0(기본): 본문 해시가 같은 청크만 연결
+    # 1~3: SimHash 유사 중복까지 연결 (숫자 하나만 다른 청크도 한 임베딩을 공유하므로 opt-in, 3 초과는 후보 누락 가능)
+    ingest_dedup_max_hamming: int = 0
+    ingest_dedup_max_candidates: int = 5000  # 범위 내 후보 조회 상한 (밴드 일치 행)
 
     # 업로드
     upload_temp_dir: str = "./data/uploads"
@@ -276,6 +372,12 @@ class Settings(BaseSettings):
 
     # Widget 설정 (명세 WIDGET_EMBEDDING_API_SPECIFICATION.md:144 준수)
     widget_session_expire_hours: int = 1  # Widget 세션 유효 시간 (1시간)
+    # Widget 세션 principal 캐시 (메시지마다 세션/배포/봇 조회 생략)
+    widget_session_cache_enabled: bool = True
+    widget_session_cache_prefix: str = "widget:principal"
+    widget_session_cache_ttl_sec: int = 3600  # Redis 보관 상한 (세션 만료 시각을 넘지 않음)
+    widget_session_cache_local_max_entries: int = 4096
+    widget_session_cache_local_ttl_sec: float = 5.0  # 다른 레플리카의 무효화가 반영되기까지의 최대 지연
     widget_refresh_token_expire_days: int = 7  # Refresh Token 유효 시간
 
     def get_frontend_urls(self) -> List[str]:
@@ -1,61 +1,305 @@
 """
 텍스트 청킹 모듈
+
+LangChain RecursiveCharacterTextSplitter와 같은 방식으로 문서를 재귀적으로 나눕니다.
+먼저 큰 단위(예: 문단 단위 → \\n\\n)로 나누려고 시도하고
+그래도 너무 길면 문장 단위(. ), 단어 단위( ), 마지막으로 문자 단위로 자릅니다.
+
+- 길이는 토큰 수(tiktoken 인코더, 프로세스 단위 캐시) 또는 문자 수로 측정 (settings.chunk_length_unit)
+- iter_chunks는 페이지 스트림을 받아 청크를 순차적으로 생성 (문서 전체를 메모리에 올리지 않음)
+- 각 청크에 원문 기준 문자 오프셋과 시작/끝 페이지 번호를 함께 제공
 """
 import logging
-from typing import List
-
-# LangChain의 RecursiveCharacterTextSplitter 사용
-#이 splitter는  문서를 재귀적으로 나눔
-#먼저 큰 단위(예: 문단 단위 → \n\n)로 나누려고 시도
-#그래도 너무 길면 문장 단위(. )로 나눔
-#그래도 길면 단어 단위( )로 나눔
-#마지막으로 그래도 길면 문자 단위로 자름 
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SEPARATORS = ["\n\n", "\n", ". ", " ", ""]
+PAGE_SEPARATOR = "\n\n"  # DocumentProcessor가 페이지를 이어 붙일 때 쓰는 구분자
+
+LENGTH_UNIT_TOKEN = "token"
+LENGTH_UNIT_CHAR = "char"
+
+
+@lru_cache(maxsize=8)
+def get_token_encoder(encoding_name: str) -> Optional[Any]:
+    """tiktoken 인코더 (프로세스 단위 캐시, 로드 실패 시 None)"""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        logger.warning(f"토큰 인코더 로드 실패({encoding_name}), 문자 수 기준으로 청킹합니다: {e}")
+        return None
+
+
+def get_length_function(unit: str, encoding_name: Optional[str] = None) -> Callable[[str], int]:
+    """청크 길이 측정 함수 (token | char)"""
+    if unit == LENGTH_UNIT_TOKEN:
+        encoder = get_token_encoder(encoding_name or settings.chunk_token_encoding)
+        if encoder is not None:
+            encode = encoder.encode_ordinary
+            return lambda text: len(encode(text))
+    elif unit != LENGTH_UNIT_CHAR:
+        raise ValueError(f"지원하지 않는 청크 길이 단위입니다: {unit}")
+    return len
+
+
+@dataclass
+class TextChunk:
+    """청크와 원문 내 위치 정보"""
+
+    text: str
+    index: int
+    start: int  # 페이지를 PAGE_SEPARATOR로 이어 붙인 원문 기준 문자 오프셋
+    end: int
+    page_start: int  # 1부터 시작
+    page_end: int
+    length: int  # length_function 기준 길이 (조각 길이 합, 토큰 경계 때문에 근사값)
+
+    def to_metadata(self) -> Dict[str, int]:
+        return {
+            "start_offset": self.start,
+            "end_offset": self.end,
+            "page": self.page_start,
+            "page_end": self.page_end,
+            "chunk_length": self.length,
+        }
+
+
+# (원문 기준 시작 오프셋, 텍스트, 길이)
+_Piece = Tuple[int, str, int]
+
 
 class TextChunker:
     """텍스트 청킹 클래스"""
-    
+
     def __init__(
         self,
         chunk_size: int = None,
-        chunk_overlap: int = None
+        chunk_overlap: int = None,
+        length_unit: str = None,
+        length_function: Callable[[str], int] = None,
+        separators: Sequence[str] = None
     ):
         self.chunk_size = chunk_size or settings.chunk_size
-        self.chunk_overlap = chunk_overlap or settings.chunk_overlap
-        
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""]
-        )
-    
+        self.chunk_overlap = settings.chunk_overlap if chunk_overlap is None else chunk_overlap
+        if self.chunk_overlap > self.chunk_size:
+            raise ValueError(
+                f"chunk_overlap({self.chunk_overlap})은 chunk_size({self.chunk_size})보다 클 수 없습니다"
+            )
+        self.length_unit = length_unit or settings.chunk_length_unit
+        self.length_function = length_function or get_length_function(self.length_unit)
+        self.separators = list(separators or DEFAULT_SEPARATORS)
+
     def split_text(self, text: str) -> List[str]:
         """텍스트를 청크로 분할"""
         if not text or not text.strip():
             logger.warning("빈 텍스트가 입력되었습니다")
             return []
-        
-        chunks = self.splitter.split_text(text)
-        
+
+        chunks = [chunk.text for chunk in self.iter_chunks([text])]
+
         logger.info(f"텍스트 분할 완료: {len(chunks)}개 청크 생성")
         return chunks
-    
+
     def split_documents(self, texts: List[str]) -> List[str]:
         """여러 문서를 청크로 분할"""
         all_chunks = []
-        
+
         for text in texts:
             chunks = self.split_text(text)
             all_chunks.extend(chunks)
-        
+
         logger.info(f"총 {len(all_chunks)}개 청크 생성")
         return all_chunks
 
+    def iter_chunks(self, pages: Iterable[Union[str, Tuple[int, str]]]) -> Iterator[TextChunk]:
+        """
+        페이지 스트림을 청크로 분할 (제너레이터)
+
+        페이지는 PAGE_SEPARATOR로 이어 붙인 것과 같은 결과를 내며, 최상위 구분자 단위 조각만
+        버퍼에 유지하므로 메모리 사용량은 chunk_size 수준입니다 (구분자 없는 초대형 문단 제외).
+
+        Args:
+            pages: 페이지 텍스트 또는 (페이지 번호, 텍스트) 스트림
+
+        Yields:
+            TextChunk
+        """
+        top_separator = self.separators[0]
+        page_offsets: List[Tuple[int, int]] = []  # (시작 오프셋, 페이지 번호)
+        merger = _SplitMerger(self.chunk_size, self.chunk_overlap)
+        counter = {"index": 0}
+
+        def emit(start: int, text: str, length: int) -> Optional[TextChunk]:
+            stripped = text.strip()
+            if not stripped:
+                return None
+            chunk_start = start + (len(text) - len(text.lstrip()))
+            chunk_end = chunk_start + len(stripped)
+            chunk = TextChunk(
+                text=stripped,
+                index=counter["index"],
+                start=chunk_start,
+                end=chunk_end,
+                page_start=_page_at(page_offsets, chunk_start),
+                page_end=_page_at(page_offsets, chunk_end - 1),
+                length=length,
+            )
+            counter["index"] += 1
+            return chunk
+
+        # 최상위 구분자 기준 마지막 조각(다음 페이지와 이어질 수 있음)만 버퍼에 남긴다
+        buffer = ""
+        buffer_start = 0
+        for page_index, page in enumerate(pages, start=1):
+            page_number, page_text = page if isinstance(page, tuple) else (page_index, page)
+            if page_offsets:
+                buffer += PAGE_SEPARATOR
+            page_offsets.append((buffer_start + len(buffer), page_number))
+            buffer += page_text or ""
+            if not top_separator:
+                continue
+
+            pieces = self._split_keep_separator(buffer, top_separator)
+            if len(pieces) <= 1:
+                continue
+            for piece_offset, piece in pieces[:-1]:
+                for merged in self._feed(merger, buffer_start + piece_offset, piece):
+                    chunk = emit(*merged)
+                    if chunk:
+                        yield chunk
+            tail_offset = pieces[-1][0]
+            buffer = buffer[tail_offset:]
+            buffer_start += tail_offset
+
+        if not top_separator:
+            pieces = self._split_recursive(0, buffer, self.separators)
+        else:
+            pieces = []
+            for piece_offset, piece in self._split_keep_separator(buffer, top_separator):
+                pieces.extend(self._feed(merger, buffer_start + piece_offset, piece))
+            merger.flush(pieces)
+        for start, text, length in pieces:
+            chunk = emit(start, text, length)
+            if chunk:
+                yield chunk
+
+    def _feed(self, merger: "_SplitMerger", start: int, text: str) -> List[_Piece]:
+        """최상위 조각 1개 처리 (짧으면 병합 버퍼로, 길면 하위 구분자로 재귀 분할)"""
+        results: List[_Piece] = []
+        length = self.length_function(text)
+        if length < self.chunk_size:
+            merger.add((start, text, length), results)
+            return results
+
+        merger.flush(results)
+        remaining = self.separators[1:]
+        if remaining:
+            results.extend(self._split_recursive(start, text, remaining))
+        else:
+            results.append((start, text, length))
+        return results
+
+    def _split_recursive(self, start: int, text: str, separators: Sequence[str]) -> List[_Piece]:
+        """RecursiveCharacterTextSplitter._split_text와 같은 재귀 분할 (원문 오프셋 유지)"""
+        separator = separators[-1]
+        next_separators: Sequence[str] = []
+        for i, candidate in enumerate(separators):
+            if candidate == "":
+                separator = candidate
+                break
+            if candidate in text:
+                separator = candidate
+                next_separators = separators[i + 1 :]
+                break
+
+        results: List[_Piece] = []
+        merger = _SplitMerger(self.chunk_size, self.chunk_overlap)
+        pieces = self._split_keep_separator(text, separator) if separator else [
+            (i, char) for i, char in enumerate(text)
+        ]
+        length_function = self.length_function
+        chunk_size = self.chunk_size
+        for piece_offset, piece in pieces:
+            length = length_function(piece)
+            if length < chunk_size:
+                merger.add((start + piece_offset, piece, length), results)
+                continue
+            merger.flush(results)
+            if next_separators:
+                results.extend(self._split_recursive(start + piece_offset, piece, next_separators))
+            else:
+                results.append((start + piece_offset, piece, length))
+        merger.flush(results)
+        return results
+
+    @staticmethod
+    def _split_keep_separator(text: str, separator: str) -> List[Tuple[int, str]]:
+        """구분자로 분할하되 구분자를 다음 조각 앞에 붙임 (빈 조각 제외)"""
+        parts = text.split(separator)
+        pieces: List[Tuple[int, str]] = [(0, parts[0])] if parts[0] else []
+        position = len(parts[0])
+        for part in parts[1:]:
+            piece = separator + part
+            pieces.append((position, piece))
+            position += len(piece)
+        return pieces
+
+
+class _SplitMerger:
+    """조각을 chunk_size 이하 청크로 병합 (overlap 유지, RecursiveCharacterTextSplitter._merge_splits와 동일)"""
+
+    __slots__ = ("chunk_size", "chunk_overlap", "current", "total")
+
+    def __init__(self, chunk_size: int, chunk_overlap: int):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.current: Deque[_Piece] = deque()
+        self.total = 0
+
+    def add(self, piece: _Piece, out: List[_Piece]) -> None:
+        """조각 추가, 완성된 청크는 out에 추가"""
+        length = piece[2]
+        current = self.current
+        if current and self.total + length > self.chunk_size:
+            if self.total > self.chunk_size:
+                logger.warning(
+                    f"청크 길이 {self.total}이(가) 지정된 chunk_size {self.chunk_size}보다 깁니다"
+                )
+            out.append(self._join())
+            while self.total > self.chunk_overlap or (
+                self.total + length > self.chunk_size and self.total > 0
+            ):
+                self.total -= current.popleft()[2]
+        current.append(piece)
+        self.total += length
+
+    def flush(self, out: List[_Piece]) -> None:
+        if self.current:
+            out.append(self._join())
+            self.current.clear()
+            self.total = 0
+
+    def _join(self) -> _Piece:
+        current = self.current
+        return current[0][0], "".join([piece[1] for piece in current]), self.total
+
+
+def _page_at(page_offsets: List[Tuple[int, int]], position: int) -> int:
+    """오프셋이 속한 페이지 번호"""
+    page = page_offsets[0][1] if page_offsets else 1
+    for start, number in reversed(page_offsets):
+        if position >= start:
+            return number
+    return page
+
 
 def get_text_chunker(chunk_size: int = None, chunk_overlap: int = None) -> TextChunker:
     """텍스트 청커 인스턴스 반환"""
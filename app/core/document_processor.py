@@ -3,13 +3,14 @@
 """
 import logging
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
 
 from pypdf import PdfReader
 from pypdf.errors import PdfReadError
 from docx import Document
 from docx.opc.exceptions import PackageNotFoundError
 
+from app.core.chunking import PAGE_SEPARATOR
 from app.core.exceptions import (
     DocumentParsingError,
     UnsupportedDocumentTypeError
@@ -30,7 +31,26 @@ class DocumentProcessor:
             file_path: 처리할 파일 경로
 
         Returns:
-            추출된 텍스트
+            추출된 텍스트 (페이지는 빈 줄로 구분)
+
+        Raises:
+            UnsupportedDocumentTypeError: 지원하지 않는 파일 형식
+            DocumentParsingError: 문서 파싱 중 오류 발생
+        """
+        text = PAGE_SEPARATOR.join(DocumentProcessor.iter_pages(file_path))
+        logger.info(f"문서 처리 완료: {len(text)} characters")
+        return text
+
+    @staticmethod
+    def iter_pages(file_path: str) -> Iterator[str]:
+        """
+        파일을 페이지 단위로 파싱 (제너레이터, PDF는 페이지별, 그 외는 1페이지)
+
+        Args:
+            file_path: 처리할 파일 경로
+
+        Yields:
+            페이지 텍스트
 
         Raises:
             UnsupportedDocumentTypeError: 지원하지 않는 파일 형식
@@ -54,10 +74,11 @@ class DocumentProcessor:
 
         try:
             if file_extension == ".pdf":
-                # PDF 처리
+                # PDF 처리 (페이지 단위로 추출)
                 try:
                     reader = PdfReader(file_path)
-                    text = "\n\n".join([page.extract_text() for page in reader.pages])
+                    for page in reader.pages:
+                        yield page.extract_text()
                 except PdfReadError as e:
                     raise DocumentParsingError(
                         message="PDF 파일 파싱에 실패했습니다",
@@ -85,12 +106,13 @@ class DocumentProcessor:
                                 "error": str(e)
                             }
                         )
+                yield text
 
             elif file_extension == ".docx":
                 # DOCX 처리
                 try:
                     doc = Document(file_path)
-                    text = "\n\n".join([paragraph.text for paragraph in doc.paragraphs])
+                    text = PAGE_SEPARATOR.join([paragraph.text for paragraph in doc.paragraphs])
                 except PackageNotFoundError as e:
                     raise DocumentParsingError(
                         message="DOCX 파일을 찾을 수 없거나 손상되었습니다",
@@ -99,9 +121,7 @@ class DocumentProcessor:
                             "error": str(e)
                         }
                     )
-
-            logger.info(f"문서 처리 완료: {len(text)} characters")
-            return text
+                yield text
 
         except DocumentParsingError:
             # 이미 처리된 커스텀 예외는 그대로 전달
@@ -0,0 +1,549 @@
+"""
+공용 HTTP 클라이언트 풀 + 응답 캐시
+
+워크플로우 HTTP 노드가 요청마다 httpx.AsyncClient를 새로 만들면서 커넥션 풀,
+TLS 세션, DNS 결과를 매번 버리던 문제를 해결하기 위한 모듈입니다.
+
+- 보안 프로필(HttpClientProfile)별로 프로세스 공용 AsyncClient를 유지합니다
+  (keep-alive, 호스트별 동시 연결 제한, h2 패키지가 있으면 HTTP/2).
+- 안전한 메서드(GET/HEAD) 응답은 RFC 9111 규칙(Cache-Control/Expires/ETag/
+  Last-Modified/Vary)에 따라 로컬 LRU + Redis 2단 캐시에 보관합니다.
+  서버 측 공유 캐시이므로 private/no-store 응답은 저장하지 않고, 자격 증명 헤더
+  (Authorization, Cookie, X-API-Key 등)가 붙은 요청은 public/s-maxage 응답만 저장합니다.
+  캐시 키는 요청 헤더 전체의 해시와 호출자 범위(봇 등)별로 분리합니다.
+- 응답 본문은 스트리밍으로 읽고 max_body_bytes를 넘으면 잘라냅니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:  # HTTP/2는 선택 의존성 (h2 패키지)
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - 설치 환경에 따라 다름
+    HTTP2_AVAILABLE = False
+
+CACHEABLE_METHODS = frozenset({"GET", "HEAD"})
+# 명시적 freshness 또는 검증자가 있을 때 저장 가능한 상태 코드 (RFC 9110 15.1)
+CACHEABLE_STATUS_CODES = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+# 자격 증명으로 취급하는 요청 헤더 (이름 패턴은 워크플로우 HTTP 노드의 사용자 정의 헤더용)
+CREDENTIAL_HEADERS = frozenset({"authorization", "proxy-authorization", "cookie"})
+_CREDENTIAL_HEADER_PATTERN = re.compile(r"auth|token|key|secret|session|cookie|signature|credential")
+# 호스트별 동시성 제한을 유지하는 최대 호스트 수 (초과 시 오래 쓰지 않은 유휴 호스트부터 제거)
+MAX_TRACKED_HOSTS = 1024
+
+
+def has_credential_headers(request_headers: Dict[str, str]) -> bool:
+    """요청에 자격 증명으로 볼 수 있는 헤더가 있는지 (헤더 이름은 소문자)"""
+    return any(
+        name in CREDENTIAL_HEADERS or _CREDENTIAL_HEADER_PATTERN.search(name)
+        for name in request_headers
+    )
+
+
+@dataclass(frozen=True)
+class HttpClientProfile:
+    """공용 클라이언트를 구분하는 보안/연결 프로필 (같은 프로필끼리만 커넥션을 공유)"""
+
+    name: str = "default"
+    follow_redirects: bool = True
+    verify: bool = True
+    http2: bool = True
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    max_connections_per_host: int = 10
+
+    @classmethod
+    def from_settings(cls, name: str = "default", **overrides: Any) -> "HttpClientProfile":
+        values: Dict[str, Any] = {
+            "name": name,
+            "http2": settings.http_client_http2_enabled,
+            "max_connections": settings.http_client_max_connections,
+            "max_keepalive_connections": settings.http_client_max_keepalive_connections,
+            "keepalive_expiry": settings.http_client_keepalive_expiry_sec,
+            "max_connections_per_host": settings.http_client_max_connections_per_host,
+        }
+        values.update(overrides)
+        return cls(**values)
+
+
+@dataclass
+class HttpResult:
+    """HTTP 요청 결과 (본문은 디코딩된 문자열, 헤더 이름은 캐시 여부와 관계없이 소문자)"""
+
+    status_code: int
+    headers: Dict[str, str]
+    body: str
+    truncated: bool = False
+    from_cache: bool = False
+
+
+@dataclass
+class CachedResponse:
+    """캐시에 저장되는 응답"""
+
+    status_code: int
+    headers: Dict[str, str]
+    body: str
+    stored_at: float
+    initial_age: float
+    freshness_lifetime: float
+    vary: Dict[str, Optional[str]] = field(default_factory=dict)
+    must_revalidate: bool = False
+
+    def current_age(self, now: Optional[float] = None) -> float:
+        return self.initial_age + max(0.0, (now or time.time()) - self.stored_at)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return not self.must_revalidate and self.current_age(now) < self.freshness_lifetime
+
+    @property
+    def has_validators(self) -> bool:
+        return "etag" in self.headers or "last-modified" in self.headers
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Cache-Control 헤더를 {directive: 값 또는 None}으로 파싱 (directive는 소문자)"""
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        directives[name.strip().lower()] = arg.strip().strip('"') if arg else None
+    return directives
+
+
+def _int_directive(directives: Dict[str, Optional[str]], name: str) -> Optional[int]:
+    raw = directives.get(name)
+    if raw is None:
+        return None
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return None
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def freshness_lifetime(headers: Dict[str, str]) -> Optional[float]:
+    """공유 캐시 기준 freshness lifetime (명시 정보가 없으면 None)"""
+    directives = parse_cache_control(headers.get("cache-control"))
+    for name in ("s-maxage", "max-age"):
+        seconds = _int_directive(directives, name)
+        if seconds is not None:
+            return float(seconds)
+
+    expires = headers.get("expires")
+    if expires is not None:
+        expires_at = _http_date(expires)
+        if expires_at is None:
+            return 0.0  # 잘못된 Expires는 이미 만료된 것으로 간주
+        date = _http_date(headers.get("date")) or time.time()
+        return max(0.0, expires_at - date)
+    return None
+
+
+def build_cached_response(
+    method: str,
+    request_headers: Dict[str, str],
+    status_code: int,
+    response_headers: Dict[str, str],
+    body: str,
+    request_time: float,
+    response_time: float,
+) -> Optional[CachedResponse]:
+    """저장 가능한 응답이면 CachedResponse, 아니면 None"""
+    if method not in CACHEABLE_METHODS or status_code not in CACHEABLE_STATUS_CODES:
+        return None
+
+    request_cc = parse_cache_control(request_headers.get("cache-control"))
+    response_cc = parse_cache_control(response_headers.get("cache-control"))
+    if "no-store" in request_cc or "no-store" in response_cc or "private" in response_cc:
+        return None
+
+    vary = response_headers.get("vary")
+    if vary and vary.strip() == "*":
+        return None
+
+    # 자격 증명 헤더가 붙은 요청은 공유 캐시 저장이 명시적으로 허용된 경우에만 저장
+    if has_credential_headers(request_headers) and not (
+        "public" in response_cc or "s-maxage" in response_cc
+    ):
+        return None
+
+    lifetime = freshness_lifetime(response_headers)
+    has_validators = "etag" in response_headers or "last-modified" in response_headers
+    if lifetime is None and not has_validators:
+        return None
+
+    # 초기 age 계산 (RFC 9111 4.2.3)
+    date = _http_date(response_headers.get("date")) or response_time
+    apparent_age = max(0.0, response_time - date)
+    try:
+        age_value = float(response_headers.get("age") or 0)
+    except ValueError:
+        age_value = 0.0
+    corrected_age = age_value + (response_time - request_time)
+
+    vary_values = {
+        name.strip().lower(): request_headers.get(name.strip().lower())
+        for name in (vary or "").split(",")
+        if name.strip()
+    }
+
+    return CachedResponse(
+        status_code=status_code,
+        headers=dict(response_headers),
+        body=body,
+        stored_at=response_time,
+        initial_age=max(apparent_age, corrected_age),
+        freshness_lifetime=lifetime or 0.0,
+        vary=vary_values,
+        must_revalidate="no-cache" in response_cc,
+    )
+
+
+class HttpResponseCache:
+    """로컬 LRU + Redis 2단 HTTP 응답 캐시"""
+
+    def __init__(
+        self,
+        redis: Any = None,
+        enabled: Optional[bool] = None,
+        prefix: Optional[str] = None,
+        local_max_entries: Optional[int] = None,
+        max_body_bytes: Optional[int] = None,
+        stale_retention_sec: Optional[int] = None,
+    ):
+        if redis is None:
+            from app.core.redis_client import redis_client
+
+            redis = redis_client
+        self.redis = redis
+        self.enabled = settings.http_response_cache_enabled if enabled is None else enabled
+        self.prefix = prefix or settings.http_response_cache_prefix
+        self.local_max_entries = local_max_entries or settings.http_response_cache_local_max_entries
+        self.max_body_bytes = max_body_bytes or settings.http_response_cache_max_body_bytes
+        self.stale_retention_sec = (
+            settings.http_response_cache_stale_retention_sec
+            if stale_retention_sec is None else stale_retention_sec
+        )
+        self._local: "OrderedDict[str, CachedResponse]" = OrderedDict()
+
+    @property
+    def _redis_available(self) -> bool:
+        return getattr(self.redis, "redis", None) is not None
+
+    def cache_key(
+        self,
+        method: str,
+        url: str,
+        request_headers: Dict[str, str],
+        scope: Optional[str] = None,
+    ) -> str:
+        """
+        (메서드, URL, 요청 헤더 전체, 호출자 범위) 단위 캐시 키
+
+        자격 증명이 어떤 헤더에 실려 오는지 알 수 없으므로 헤더 전체를 키에 포함하고,
+        봇/테넌트 간 응답 공유를 막기 위해 호출자 범위를 함께 넣습니다.
+        """
+        headers_digest = hashlib.sha256(
+            json.dumps(sorted(request_headers.items()), ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        raw = "\n".join([method, url, scope or "", headers_digest])
+        return f"{self.prefix}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+    async def get(self, key: str, request_headers: Dict[str, str]) -> Optional[CachedResponse]:
+        entry = self._local.get(key)
+        if entry is not None and self._expired(entry):
+            self._local.pop(key, None)
+            entry = None
+        if entry is not None:
+            self._local.move_to_end(key)
+        elif self._redis_available:
+            payload = await self.redis.get(key)
+            if isinstance(payload, dict):
+                try:
+                    entry = CachedResponse(**payload)
+                except TypeError:
+                    entry = None
+                if entry is not None:
+                    self._store_local(key, entry)
+
+        if entry is None:
+            return None
+        # Vary 헤더로 지정된 요청 헤더 값이 다르면 다른 표현으로 간주
+        for name, value in entry.vary.items():
+            if request_headers.get(name) != value:
+                return None
+        return entry
+
+    async def set(self, key: str, entry: CachedResponse) -> bool:
+        if len(entry.body.encode("utf-8")) > self.max_body_bytes:
+            return False
+        self._store_local(key, entry)
+        if self._redis_available:
+            # 검증자가 있으면 만료 후에도 조건부 요청을 위해 잠시 보관
+            ttl = entry.freshness_lifetime - entry.initial_age
+            if entry.has_validators:
+                ttl += self.stale_retention_sec
+            if ttl >= 1:
+                await self.redis.set(key, json.dumps(asdict(entry), ensure_ascii=False), expire=int(ttl))
+        return True
+
+    def _expired(self, entry: CachedResponse) -> bool:
+        """로컬 항목이 Redis TTL과 같은 보관 기한을 넘겼는지"""
+        retention = self.stale_retention_sec if entry.has_validators else 0
+        return entry.current_age() >= entry.freshness_lifetime + retention
+
+    def _store_local(self, key: str, entry: CachedResponse) -> None:
+        self._local[key] = entry
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_max_entries:
+            self._local.popitem(last=False)
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+
+@dataclass
+class _HostLimit:
+    semaphore: asyncio.Semaphore
+    active: int = 0
+
+
+class HttpClientPool:
+    """보안 프로필별 프로세스 공용 httpx.AsyncClient 풀"""
+
+    def __init__(
+        self,
+        response_cache: Optional[HttpResponseCache] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self._clients: Dict[HttpClientProfile, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+        self._host_limits: "OrderedDict[Tuple[HttpClientProfile, str], _HostLimit]" = OrderedDict()
+        self._response_cache = response_cache
+        self._transport = transport
+
+    @property
+    def response_cache(self) -> HttpResponseCache:
+        if self._response_cache is None:
+            self._response_cache = HttpResponseCache()
+        return self._response_cache
+
+    def get_client(self, profile: Optional[HttpClientProfile] = None) -> httpx.AsyncClient:
+        profile = profile or HttpClientProfile.from_settings()
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(profile)
+        # AsyncClient는 생성된 이벤트 루프에 묶이므로 루프가 바뀌면 새로 생성
+        if entry is not None and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+
+        client = httpx.AsyncClient(
+            follow_redirects=profile.follow_redirects,
+            verify=profile.verify,
+            http2=profile.http2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=profile.max_connections,
+                max_keepalive_connections=profile.max_keepalive_connections,
+                keepalive_expiry=profile.keepalive_expiry,
+            ),
+            transport=self._transport,
+        )
+        self._clients[profile] = (loop, client)
+        logger.info(
+            "[HttpClientPool] 클라이언트 생성: profile=%s, http2=%s",
+            profile.name,
+            profile.http2 and HTTP2_AVAILABLE,
+        )
+        return client
+
+    @asynccontextmanager
+    async def _host_slot(self, profile: HttpClientProfile, url: str) -> AsyncIterator[None]:
+        """호스트별 동시 요청 수 제한 (LRU로 추적 호스트 수를 MAX_TRACKED_HOSTS로 제한)"""
+        host = urlsplit(url).netloc.lower()
+        key = (profile, host)
+        limit = self._host_limits.get(key)
+        if limit is None:
+            limit = _HostLimit(asyncio.Semaphore(profile.max_connections_per_host))
+            self._host_limits[key] = limit
+            self._evict_idle_hosts()
+        else:
+            self._host_limits.move_to_end(key)
+
+        limit.active += 1
+        try:
+            async with limit.semaphore:
+                yield
+        finally:
+            limit.active -= 1
+
+    def _evict_idle_hosts(self) -> None:
+        # 사용 중인 세마포어를 버리면 같은 호스트에 제한이 두 개 생기므로 유휴 항목만 제거
+        excess = len(self._host_limits) - MAX_TRACKED_HOSTS
+        if excess <= 0:
+            return
+        for key in [k for k, limit in self._host_limits.items() if limit.active == 0][:excess]:
+            del self._host_limits[key]
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Any = None,
+        content: Optional[str] = None,
+        timeout: float = 30.0,
+        max_body_bytes: Optional[int] = None,
+        profile: Optional[HttpClientProfile] = None,
+        use_cache: bool = True,
+        cache_scope: Optional[str] = None,
+    ) -> HttpResult:
+        """
+        공용 클라이언트로 요청 전송 (안전한 메서드는 응답 캐시 사용)
+
+        cache_scope: 응답 캐시를 공유할 범위 (예: 봇 ID). 다른 범위와는 캐시를 공유하지 않습니다.
+
+        Raises:
+            httpx.TimeoutException, httpx.RequestError: 호출자가 기존과 동일하게 처리
+        """
+        method = method.upper()
+        profile = profile or HttpClientProfile.from_settings()
+        max_body_bytes = max_body_bytes or settings.http_node_max_response_bytes
+        client = self.get_client(profile)
+        request = client.build_request(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            json=json_body,
+            content=content,
+            timeout=timeout,
+        )
+        request_headers = {name.lower(): value for name, value in request.headers.items()}
+
+        cache = self.response_cache if use_cache and method in CACHEABLE_METHODS else None
+        if cache is not None and not cache.enabled:
+            cache = None
+        if cache is not None and "no-store" in parse_cache_control(request_headers.get("cache-control")):
+            cache = None
+
+        cache_key = cache.cache_key(method, str(request.url), request_headers, cache_scope) if cache else None
+        cached = await cache.get(cache_key, request_headers) if cache else None
+        if cached is not None:
+            request_cc = parse_cache_control(request_headers.get("cache-control"))
+            if cached.is_fresh() and "no-cache" not in request_cc and request_cc.get("max-age") != "0":
+                return self._from_cache(cached)
+            if not cached.has_validators:
+                cached = None
+            else:
+                # 조건부 요청으로 재검증
+                if "etag" in cached.headers:
+                    request.headers["If-None-Match"] = cached.headers["etag"]
+                if "last-modified" in cached.headers:
+                    request.headers["If-Modified-Since"] = cached.headers["last-modified"]
+
+        request_time = time.time()
+        async with self._host_slot(profile, url):
+            response = await client.send(request, stream=True)
+            try:
+                body, truncated = await self._read_body(response, max_body_bytes)
+            finally:
+                await response.aclose()
+        response_time = time.time()
+        response_headers = {name.lower(): value for name, value in response.headers.items()}
+
+        if cached is not None and response.status_code == 304:
+            # 304의 헤더로 저장된 응답 메타데이터 갱신 후 재사용
+            merged_headers = {**cached.headers, **response_headers}
+            refreshed = build_cached_response(
+                method, request_headers, cached.status_code, merged_headers,
+                cached.body, request_time, response_time,
+            )
+            if refreshed is not None:
+                await cache.set(cache_key, refreshed)
+            return self._from_cache(refreshed or cached)
+
+        if cache is not None and not truncated:
+            entry = build_cached_response(
+                method, request_headers, response.status_code, response_headers,
+                body, request_time, response_time,
+            )
+            if entry is not None:
+                await cache.set(cache_key, entry)
+
+        return HttpResult(
+            status_code=response.status_code,
+            headers=dict(response_headers),
+            body=body,
+            truncated=truncated,
+        )
+
+    @staticmethod
+    async def _read_body(response: httpx.Response, max_body_bytes: int) -> Tuple[str, bool]:
+        chunks = []
+        size = 0
+        truncated = False
+        async for chunk in response.aiter_bytes():
+            remaining = max_body_bytes - size
+            if len(chunk) > remaining:
+                chunks.append(chunk[:remaining])
+                truncated = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        raw = b"".join(chunks)
+        return raw.decode(response.encoding or "utf-8", errors="replace"), truncated
+
+    @staticmethod
+    def _from_cache(entry: CachedResponse) -> HttpResult:
+        return HttpResult(
+            status_code=entry.status_code,
+            headers=dict(entry.headers),
+            body=entry.body,
+            from_cache=True,
+        )
+
+    async def aclose(self) -> None:
+        """모든 공용 클라이언트 종료 (애플리케이션 종료 시)"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._host_limits.clear()
+        for _, client in clients:
+            if not client.is_closed:
+                await client.aclose()
+
+
+http_client_pool = HttpClientPool()
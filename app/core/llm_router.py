@@ -0,0 +1,458 @@
+"""
+LLM 지연시간 기반 라우터
+------------------------
+provider/모델별 최근 지연시간·오류율을 롤링 윈도우로 유지하고,
+동일 티어 모델(예: Bedrock Claude ↔ Anthropic 직접 호출) 중 p95가 낮은 쪽으로 라우팅한다.
+
+헤지 요청(hedged request): 1순위 요청이 최근 백분위 지연시간 안에 끝나지 않으면
+동일 티어의 2순위 provider로 두 번째 요청을 보내고, 먼저 성공한 쪽을 채택한 뒤
+진행 중인 나머지 요청은 취소한다(이미 응답까지 끝난 요청은 비용을 별도로 기록).
+한 provider가 느려져도 채팅 꼬리 지연(p99)이 함께 늘지 않도록 한다.
+
+통계는 프로세스(워커) 단위 메모리에만 유지한다.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 동일 티어로 취급하는 Anthropic 직접 호출 모델 ↔ Bedrock 기본 모델 ID
+_CLAUDE_BEDROCK_MODELS: Dict[str, str] = {
+    "claude-3-haiku-20240307": "anthropic.claude-3-haiku-20240307-v1:0",
+    "claude-3-5-haiku-20241022": "anthropic.claude-3-5-haiku-20241022-v1:0",
+    "claude-3-5-sonnet-20240620": "anthropic.claude-3-5-sonnet-20240620-v1:0",
+    "claude-3-5-sonnet-20241022": "anthropic.claude-3-5-sonnet-20241022-v2:0",
+    "claude-3-7-sonnet-20250219": "anthropic.claude-3-7-sonnet-20250219-v1:0",
+    "claude-sonnet-4-20250514": "anthropic.claude-sonnet-4-20250514-v1:0",
+    "claude-sonnet-4-5-20250929": "anthropic.claude-sonnet-4-5-20250929-v1:0",
+}
+_BEDROCK_TO_ANTHROPIC: Dict[str, str] = {
+    bedrock_id: anthropic_id for anthropic_id, bedrock_id in _CLAUDE_BEDROCK_MODELS.items()
+}
+
+# Bedrock 교차 리전 추론 프로필 접두사 (apac., us., eu. 등)
+_BEDROCK_REGION_PREFIX = re.compile(r"^[a-z]{2,4}\.(?=anthropic\.)")
+
+# 리전 접두사 → 추론 프로필 지역 (최신 Claude 모델은 온디맨드 호출 시 추론 프로필 ID만 허용)
+_INFERENCE_PROFILE_GEOS: Tuple[Tuple[str, str], ...] = (
+    ("us-", "us"),
+    ("ca-", "us"),
+    ("eu-", "eu"),
+    ("ap-", "apac"),
+)
+
+
+def bedrock_inference_profile_id(model_id: str, region: str) -> str:
+    """Bedrock 기본 모델 ID를 리전에 맞는 교차 리전 추론 프로필 ID로 변환"""
+    if _BEDROCK_REGION_PREFIX.match(model_id):
+        return model_id
+    for region_prefix, geo in _INFERENCE_PROFILE_GEOS:
+        if region.startswith(region_prefix):
+            return f"{geo}.{model_id}"
+    return model_id
+
+
+# 동일 티어로 취급하는 Anthropic 직접 호출 모델 ↔ Bedrock 추론 프로필 ID
+CLAUDE_TIER_EQUIVALENTS: Dict[str, str] = {
+    anthropic_id: bedrock_inference_profile_id(bedrock_id, settings.bedrock_region)
+    for anthropic_id, bedrock_id in _CLAUDE_BEDROCK_MODELS.items()
+}
+
+# 스트리밍은 전체 응답이 아닌 첫 청크까지의 지연시간(TTFT)을 별도로 집계
+KIND_GENERATE = "generate"
+KIND_STREAM = "stream"
+
+
+@dataclass(frozen=True)
+class RouteTarget:
+    """라우팅 대상 (provider + 해당 provider에서의 모델 ID)"""
+
+    provider: str
+    model: Optional[str]
+
+
+class LatencyWindow:
+    """최근 N건의 지연시간(ms)과 성공 여부를 보관하는 롤링 윈도우"""
+
+    def __init__(self, size: int):
+        self._samples: Deque[Tuple[float, bool]] = deque(maxlen=max(1, size))
+
+    def record(self, latency_ms: float, success: bool) -> None:
+        self._samples.append((float(latency_ms), bool(success)))
+
+    @property
+    def sample_count(self) -> int:
+        return len(self._samples)
+
+    @property
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        failures = sum(1 for _, ok in self._samples if not ok)
+        return failures / len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """성공한 요청 기준 백분위 지연시간 (nearest-rank)"""
+        latencies = sorted(latency for latency, ok in self._samples if ok)
+        if not latencies:
+            return None
+        q = min(max(q, 0.0), 1.0)
+        index = min(len(latencies) - 1, max(0, int(round(q * len(latencies))) - 1))
+        return latencies[index]
+
+
+class LLMLatencyRouter:
+    """provider/모델별 지연시간 통계 기반 라우팅 및 헤지 요청 실행기"""
+
+    def __init__(
+        self,
+        window_size: Optional[int] = None,
+        min_samples: Optional[int] = None,
+    ):
+        self.window_size = window_size or settings.llm_routing_window_size
+        self.min_samples = min_samples or settings.llm_routing_min_samples
+        self._windows: Dict[Tuple[str, str, str], LatencyWindow] = {}
+
+    # ------------------------------------------------------------------ #
+    # 통계
+    # ------------------------------------------------------------------ #
+    def record(
+        self,
+        provider: str,
+        model: Optional[str],
+        latency_ms: float,
+        success: bool,
+        kind: str = KIND_GENERATE,
+    ) -> None:
+        """호출 결과 기록"""
+        key = (provider, model or "default", kind)
+        window = self._windows.get(key)
+        if window is None:
+            window = LatencyWindow(self.window_size)
+            self._windows[key] = window
+        window.record(latency_ms, success)
+
+    def get_window(
+        self,
+        target: RouteTarget,
+        kind: str = KIND_GENERATE,
+    ) -> Optional[LatencyWindow]:
+        return self._windows.get((target.provider, target.model or "default", kind))
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """모니터링용 통계 스냅샷"""
+        result: List[Dict[str, Any]] = []
+        for (provider, model, kind), window in self._windows.items():
+            result.append({
+                "provider": provider,
+                "model": model,
+                "kind": kind,
+                "samples": window.sample_count,
+                "p50_ms": window.percentile(0.5),
+                "p95_ms": window.percentile(0.95),
+                "error_rate": round(window.error_rate, 4),
+            })
+        return result
+
+    def reset(self) -> None:
+        self._windows.clear()
+
+    # ------------------------------------------------------------------ #
+    # 라우팅
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def equivalent_targets(provider: str, model: Optional[str]) -> List[RouteTarget]:
+        """동일 티어의 다른 provider 대상 목록 (요청 대상 제외)"""
+        if not model:
+            return []
+
+        if provider == "anthropic":
+            bedrock_model = CLAUDE_TIER_EQUIVALENTS.get(model)
+            return [RouteTarget("bedrock", bedrock_model)] if bedrock_model else []
+
+        if provider == "bedrock":
+            anthropic_model = _BEDROCK_TO_ANTHROPIC.get(_BEDROCK_REGION_PREFIX.sub("", model))
+            return [RouteTarget("anthropic", anthropic_model)] if anthropic_model else []
+
+        return []
+
+    def _score(self, target: RouteTarget, kind: str) -> Optional[float]:
+        """p95에 오류율 패널티를 곱한 점수 (표본 부족 시 None)"""
+        window = self.get_window(target, kind)
+        if window is None or window.sample_count < self.min_samples:
+            return None
+        p95 = window.percentile(0.95)
+        if p95 is None:
+            # 성공 표본이 없으면 사실상 사용 불가
+            return float("inf")
+        return p95 * (1.0 + window.error_rate * settings.llm_routing_error_penalty)
+
+    def rank(
+        self,
+        primary: RouteTarget,
+        alternatives: List[RouteTarget],
+        kind: str = KIND_GENERATE,
+    ) -> List[RouteTarget]:
+        """
+        요청 대상과 동일 티어 대상을 우선순위 순으로 정렬
+
+        - 통계가 충분하지 않은 대상은 요청 대상(primary)의 순서를 유지한다.
+        - 대안이 primary보다 충분히(hysteresis) 빠를 때만 순서를 바꿔 플래핑을 막는다.
+        """
+        if not alternatives:
+            return [primary]
+
+        primary_score = self._score(primary, kind)
+        scored = [(alt, self._score(alt, kind)) for alt in alternatives]
+
+        best_alt: Optional[RouteTarget] = None
+        best_alt_score: Optional[float] = None
+        for alt, score in scored:
+            if score is None:
+                continue
+            if best_alt_score is None or score < best_alt_score:
+                best_alt, best_alt_score = alt, score
+
+        promote = False
+        if best_alt is not None and best_alt_score is not None:
+            if primary_score is None:
+                window = self.get_window(primary, kind)
+                # primary 표본이 적어도 오류가 누적되면 검증된 대안으로 우회
+                promote = bool(
+                    window
+                    and window.sample_count
+                    and window.error_rate >= settings.llm_routing_max_error_rate
+                )
+            else:
+                margin = 1.0 - settings.llm_routing_hysteresis
+                promote = best_alt_score < primary_score * margin
+
+        if promote and best_alt is not None:
+            rest = [alt for alt in alternatives if alt != best_alt]
+            return [best_alt, primary, *rest]
+        return [primary, *alternatives]
+
+    def plan(
+        self,
+        provider: str,
+        model: Optional[str],
+        is_available: Callable[[str], bool],
+        kind: str = KIND_GENERATE,
+    ) -> List[RouteTarget]:
+        """요청 provider/모델에 대한 실행 계획 (사용 가능한 provider만 포함)"""
+        primary = RouteTarget(provider, model)
+        if not settings.llm_routing_enabled:
+            return [primary]
+
+        alternatives = [
+            target for target in self.equivalent_targets(provider, model)
+            if is_available(target.provider)
+        ]
+        return self.rank(primary, alternatives, kind)
+
+    def hedge_delay(self, target: RouteTarget, kind: str = KIND_GENERATE) -> Optional[float]:
+        """
+        헤지 요청 발사 지연(초)
+
+        1순위 대상의 최근 백분위 지연시간을 사용하며, 표본이 부족하면 None(헤지 안 함).
+        """
+        if not settings.llm_hedging_enabled:
+            return None
+        window = self.get_window(target, kind)
+        if window is None or window.sample_count < self.min_samples:
+            return None
+        delay_ms = window.percentile(settings.llm_hedge_percentile)
+        if delay_ms is None:
+            return None
+        delay_ms = min(
+            max(delay_ms, settings.llm_hedge_min_delay_ms),
+            settings.llm_hedge_max_delay_ms,
+        )
+        return delay_ms / 1000.0
+
+    # ------------------------------------------------------------------ #
+    # 실행
+    # ------------------------------------------------------------------ #
+    async def execute(
+        self,
+        targets: List[RouteTarget],
+        call: Callable[[RouteTarget], Awaitable[T]],
+        kind: str = KIND_GENERATE,
+        discard: Optional[Callable[[T], Awaitable[None]]] = None,
+        on_spent: Optional[Callable[[RouteTarget], None]] = None,
+    ) -> Tuple[T, RouteTarget]:
+        """
+        계획된 대상에 요청 실행 (필요 시 헤지)
+
+        Args:
+            targets: 우선순위 순 대상 목록 (plan 결과)
+            call: 대상별 요청 코루틴 팩토리
+            kind: 통계 구분 (generate / stream)
+            discard: 먼저 끝난 요청에 밀려 버려지는 결과 정리 콜백 (스트림 close 등)
+            on_spent: 헤지 경쟁에서 졌지만 응답까지 완료된(비용이 발생한) 대상 통지 콜백
+
+        Returns:
+            (결과, 실제로 응답한 대상)
+        """
+        if not targets:
+            raise ValueError("라우팅 대상이 비어 있습니다")
+
+        primary = targets[0]
+        secondary = targets[1] if len(targets) > 1 else None
+        delay = self.hedge_delay(primary, kind) if secondary else None
+
+        if secondary is None:
+            result = await self._timed_call(primary, call, kind)
+            return result, primary
+
+        if delay is None:
+            # 통계 워밍업 중에는 헤지 없이 실패 시에만 동일 티어로 폴백
+            try:
+                result = await self._timed_call(primary, call, kind)
+                return result, primary
+            except Exception as exc:
+                logger.warning(
+                    "[LLMRouter] %s/%s 실패, %s/%s로 폴백: %s",
+                    primary.provider, primary.model, secondary.provider, secondary.model, exc,
+                )
+                result = await self._timed_call(secondary, call, kind)
+                return result, secondary
+
+        return await self._hedged(primary, secondary, delay, call, kind, discard, on_spent)
+
+    async def _timed_call(
+        self,
+        target: RouteTarget,
+        call: Callable[[RouteTarget], Awaitable[T]],
+        kind: str,
+    ) -> T:
+        started = time.perf_counter()
+        try:
+            result = await call(target)
+        except asyncio.CancelledError:
+            # 헤지 경쟁에서 진 요청은 통계에 반영하지 않는다
+            raise
+        except Exception:
+            self.record(target.provider, target.model, (time.perf_counter() - started) * 1000, False, kind)
+            raise
+        self.record(target.provider, target.model, (time.perf_counter() - started) * 1000, True, kind)
+        return result
+
+    async def _hedged(
+        self,
+        primary: RouteTarget,
+        secondary: RouteTarget,
+        delay: float,
+        call: Callable[[RouteTarget], Awaitable[T]],
+        kind: str,
+        discard: Optional[Callable[[T], Awaitable[None]]],
+        on_spent: Optional[Callable[[RouteTarget], None]],
+    ) -> Tuple[T, RouteTarget]:
+        tasks: Dict[asyncio.Task, RouteTarget] = {
+            asyncio.ensure_future(self._timed_call(primary, call, kind)): primary
+        }
+        done, _ = await asyncio.wait(tasks.keys(), timeout=delay)
+
+        if not done:
+            logger.info(
+                "[LLMRouter] 헤지 요청 발사: %s/%s → %s/%s (delay=%.0fms)",
+                primary.provider, primary.model, secondary.provider, secondary.model, delay * 1000,
+            )
+            tasks[asyncio.ensure_future(self._timed_call(secondary, call, kind))] = secondary
+
+        pending = set(tasks.keys())
+        winner: Optional[asyncio.Task] = None
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = winner or task
+                        continue
+                    last_error = task.exception()
+                    logger.warning(
+                        "[LLMRouter] %s/%s 요청 실패: %s",
+                        tasks[task].provider, tasks[task].model, last_error,
+                    )
+
+                if winner is not None:
+                    if len(tasks) > 1 and tasks[winner] != primary:
+                        logger.info(
+                            "[LLMRouter] 헤지 요청 채택: %s/%s",
+                            tasks[winner].provider, tasks[winner].model,
+                        )
+                    return winner.result(), tasks[winner]
+
+                if not pending and len(tasks) == 1 and secondary is not None:
+                    # 헤지 발사 전에 primary가 실패하면 즉시 secondary로 폴백
+                    tasks[asyncio.ensure_future(self._timed_call(secondary, call, kind))] = secondary
+                    pending = {task for task, target in tasks.items() if target == secondary}
+        finally:
+            await self._settle_losers(
+                [task for task in tasks if task is not winner], tasks, discard, on_spent
+            )
+
+        assert last_error is not None
+        raise last_error
+
+    @staticmethod
+    async def _settle_losers(
+        losers: List[asyncio.Task],
+        tasks: Dict[asyncio.Task, RouteTarget],
+        discard: Optional[Callable[[T], Awaitable[None]]],
+        on_spent: Optional[Callable[[RouteTarget], None]],
+    ) -> None:
+        """
+        헤지 경쟁에서 진 요청 정리
+
+        진행 중인 요청만 취소하고, 이미 끝난 요청은 결과/예외를 회수한다
+        (never retrieved 경고 방지). 응답까지 완료된 요청은 비용이 이미 발생했으므로
+        on_spent로 통지한 뒤 discard로 결과를 정리한다.
+        """
+        in_flight = [task for task in losers if not task.done()]
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            # 취소 처리 완료 대기 (취소 직전에 끝난 요청도 아래에서 함께 정리)
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+        for task in losers:
+            if task.cancelled() or task.exception() is not None:
+                continue
+            target = tasks[task]
+            if on_spent is not None:
+                try:
+                    on_spent(target)
+                except Exception as exc:
+                    logger.warning("[LLMRouter] 헤지 패자 비용 기록 실패 (%s): %s", target.provider, exc)
+            if discard is not None:
+                try:
+                    await discard(task.result())
+                except Exception as exc:
+                    logger.warning("[LLMRouter] 헤지 패자 결과 정리 실패 (%s): %s", target.provider, exc)
+
+
+# 전역 라우터 (워커 프로세스 단위 통계)
+llm_latency_router = LLMLatencyRouter()
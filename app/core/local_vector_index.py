@@ -0,0 +1,438 @@
+"""
+프로세스 로컬 벡터 인덱스 (hot 문서 집합용 mmap 검색 티어)
+
+자주 검색되는 문서 집합(지식 검색 노드의 document_ids 등)의 임베딩을 문서 단위
+세그먼트 파일(.npy)로 내려받아 np.load(mmap_mode="r")로 검색합니다.
+같은 호스트의 uvicorn 워커들은 페이지 캐시를 통해 같은 세그먼트를 공유합니다.
+
+- 세그먼트 파일명에 문서별 코퍼스 버전(retrieval_cache)을 포함하므로, 문서가 바뀌면
+  해당 문서 세그먼트만 다시 내려받습니다 (증분 갱신).
+- 행 수가 local_vector_index_exact_max_rows 이하이면 정확 내적 검색,
+  초과하면 hnswlib(선택 의존성)가 있을 때만 로컬 HNSW를 만들고 없으면 Postgres로 검색합니다.
+- 메타데이터 필터가 있는 검색, Redis 미연결(버전 확인 불가) 등은 항상 Postgres로 처리합니다.
+  Postgres가 원본이며 로컬 티어는 캐시입니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import and_, cast, func, or_, select
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.config import settings
+from app.core.retrieval_cache import corpus_scopes, retrieval_cache
+from app.models.document_embeddings import DocumentChunkLink, DocumentEmbedding
+
+try:  # 선택 의존성: 대용량 문서 집합의 로컬 HNSW
+    import hnswlib
+
+    HNSWLIB_AVAILABLE = True
+except ImportError:  # pragma: no cover - 설치 환경에 따라 다름
+    hnswlib = None
+    HNSWLIB_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DTYPE_FLOAT32 = "float32"
+DTYPE_INT8 = "int8"
+INT8_SCALE = 127.0
+MAX_TRACKED_DOCSETS = 10000
+MAX_HNSW_INDEXES = 8
+
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """정규화된 행을 행별 최대 절댓값 기준 대칭 int8로 양자화 (값, 행별 스케일)"""
+    max_abs = np.abs(matrix).max(axis=1, keepdims=True)
+    max_abs[max_abs == 0] = 1.0
+    quantized = np.round(matrix / max_abs * INT8_SCALE).astype(np.int8)
+    scales = (max_abs[:, 0] / INT8_SCALE).astype(np.float32)
+    return quantized, scales
+
+
+def exact_top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """점수 상위 top_k 인덱스 (내림차순, argpartition으로 전체 정렬 회피)"""
+    if scores.size == 0 or top_k <= 0:
+        return np.empty(0, dtype=np.int64)
+    k = min(top_k, scores.size)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+@dataclass
+class IndexSegment:
+    """문서 하나의 임베딩 세그먼트 (vectors는 mmap)"""
+
+    document_id: str
+    version: int
+    vectors: np.ndarray
+    scales: Optional[np.ndarray]
+    ids: List[str]
+    texts: List[str]
+    metadatas: List[Dict[str, Any]]
+    # document_embeddings.id (유사 중복 대표 청크는 여러 문서 세그먼트에 함께 들어감)
+    row_ids: List[Any]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        if self.vectors.shape[0] == 0:
+            return np.empty(0, dtype=np.float32)
+        scores = self.vectors @ query
+        if self.scales is not None:
+            scores = scores.astype(np.float32) * self.scales
+        return scores
+
+    def dense(self) -> np.ndarray:
+        """float32 행렬 (HNSW 구축/임베딩 반환용)"""
+        if self.scales is None:
+            return np.asarray(self.vectors, dtype=np.float32)
+        return self.vectors.astype(np.float32) * self.scales[:, None]
+
+
+class LocalVectorIndex:
+    """문서 세그먼트 기반 로컬 벡터 검색 티어"""
+
+    def __init__(
+        self,
+        root_dir: Optional[str] = None,
+        enabled: Optional[bool] = None,
+        dtype: Optional[str] = None,
+        exact_max_rows: Optional[int] = None,
+        min_hits: Optional[int] = None,
+        max_open_segments: Optional[int] = None,
+        versions: Any = None,
+    ):
+        self.versions = versions or retrieval_cache
+        self.root_dir = root_dir or settings.local_vector_index_dir
+        self.enabled = settings.local_vector_index_enabled if enabled is None else enabled
+        self.dtype = dtype or settings.local_vector_index_dtype
+        self.exact_max_rows = exact_max_rows or settings.local_vector_index_exact_max_rows
+        self.min_hits = settings.local_vector_index_min_hits if min_hits is None else min_hits
+        self.max_open_segments = max_open_segments or settings.local_vector_index_max_open_segments
+
+        # (document_id, version) -> IndexSegment
+        self._segments: "OrderedDict[Tuple[str, int], IndexSegment]" = OrderedDict()
+        # 문서 집합 키 -> 검색 횟수 (hot 판단)
+        self._hits: Dict[str, int] = {}
+        # (문서 집합 키, 버전 서명) -> hnswlib.Index
+        self._hnsw: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def _docset_key(document_ids: Sequence[str]) -> str:
+        return hashlib.sha256("\n".join(sorted(set(document_ids))).encode("utf-8")).hexdigest()[:24]
+
+    def _segment_paths(self, document_id: str, version: int) -> Tuple[str, str, str]:
+        directory = os.path.join(self.root_dir, _UNSAFE_FILENAME.sub("_", document_id))
+        base = os.path.join(directory, f"{version}.{self.dtype}")
+        return f"{base}.vectors.npy", f"{base}.scales.npy", f"{base}.rows.json"
+
+    async def search(
+        self,
+        db: Any,
+        document_ids: Sequence[str],
+        query_embedding: Sequence[float],
+        top_k: int,
+        include_embeddings: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        로컬 티어 검색
+
+        Returns:
+            VectorStore.search와 같은 ChromaDB 호환 형식, 처리할 수 없으면 None (Postgres 사용)
+        """
+        if not self.enabled or not document_ids:
+            return None
+
+        docset = self._docset_key(document_ids)
+        if docset not in self._hits and len(self._hits) >= MAX_TRACKED_DOCSETS:
+            self._hits.clear()
+        self._hits[docset] = self._hits.get(docset, 0) + 1
+        if self._hits[docset] < self.min_hits:
+            return None
+
+        scopes = corpus_scopes(document_ids)
+        versions = await self.versions.get_corpus_versions(scopes)
+        if versions is None:
+            return None
+
+        segments: List[IndexSegment] = []
+        for document_id in sorted(set(document_ids)):
+            segment = await self._get_segment(db, document_id, versions[f"doc:{document_id}"])
+            if segment is None:
+                return None
+            segments.append(segment)
+
+        total_rows = sum(len(segment) for segment in segments)
+        query = normalize_rows(np.asarray(query_embedding, dtype=np.float32)[None, :])[0]
+
+        if total_rows <= self.exact_max_rows:
+            candidates = self._exact_search(segments, query, top_k)
+        elif HNSWLIB_AVAILABLE:
+            signature = ",".join(f"{segment.document_id}:{segment.version}" for segment in segments)
+            candidates = await self._hnsw_search(docset, signature, segments, query, top_k)
+        else:
+            return None
+
+        return self._to_results(candidates, include_embeddings)
+
+    @staticmethod
+    def _exact_search(
+        segments: List[IndexSegment], query: np.ndarray, top_k: int
+    ) -> List[Tuple[IndexSegment, int, float]]:
+        """
+        세그먼트별 상위 top_k 후보를 모아 전체 상위 top_k 선택
+
+        여러 문서가 같은 대표 청크를 공유하면 같은 임베딩 행이 여러 세그먼트에 있으므로
+        임베딩 행 ID로 중복을 제거합니다 (pgvector 경로와 같은 결과).
+        """
+        pooled: List[Tuple[float, int, int]] = []
+        for segment_index, segment in enumerate(segments):
+            scores = segment.scores(query)
+            for row in exact_top_k(scores, top_k):
+                pooled.append((float(scores[row]), segment_index, int(row)))
+        pooled.sort(key=lambda item: -item[0])
+
+        candidates: List[Tuple[IndexSegment, int, float]] = []
+        seen = set()
+        for score, segment_index, row in pooled:
+            row_id = segments[segment_index].row_ids[row]
+            if row_id in seen:
+                continue
+            seen.add(row_id)
+            candidates.append((segments[segment_index], row, score))
+            if len(candidates) == top_k:
+                break
+        return candidates
+
+    @staticmethod
+    def _unique_rows(segments: List[IndexSegment]) -> List[Tuple[IndexSegment, int]]:
+        """세그먼트 전체에서 임베딩 행 ID 기준으로 중복을 제거한 (세그먼트, 행) 목록"""
+        entries: List[Tuple[IndexSegment, int]] = []
+        seen = set()
+        for segment in segments:
+            for row, row_id in enumerate(segment.row_ids):
+                if row_id not in seen:
+                    seen.add(row_id)
+                    entries.append((segment, row))
+        return entries
+
+    async def _hnsw_search(
+        self,
+        docset: str,
+        signature: str,
+        segments: List[IndexSegment],
+        query: np.ndarray,
+        top_k: int,
+    ) -> List[Tuple[IndexSegment, int, float]]:
+        key = (docset, signature)
+        entries = self._unique_rows(segments)
+        index = self._hnsw.get(key)
+        if index is None:
+            index = await asyncio.to_thread(self._build_hnsw, segments, entries)
+            # 같은 문서 집합의 이전 버전 인덱스는 폐기
+            for stale in [existing for existing in self._hnsw if existing[0] == docset]:
+                self._hnsw.pop(stale, None)
+            self._hnsw[key] = index
+            while len(self._hnsw) > MAX_HNSW_INDEXES:
+                self._hnsw.popitem(last=False)
+        else:
+            self._hnsw.move_to_end(key)
+
+        labels, distances = index.knn_query(query, k=min(top_k, len(entries)))
+        return [
+            (*entries[int(label)], 1.0 - float(distance))
+            for label, distance in zip(labels[0], distances[0])
+        ]
+
+    @staticmethod
+    def _build_hnsw(segments: List[IndexSegment], entries: List[Tuple[IndexSegment, int]]) -> Any:
+        """중복 제거된 행으로 HNSW 구축 (label = entries 인덱스)"""
+        dense = {id(segment): segment.dense() for segment in segments}
+        matrix = np.stack([dense[id(segment)][row] for segment, row in entries])
+        index = hnswlib.Index(space="cosine", dim=matrix.shape[1])
+        index.init_index(max_elements=matrix.shape[0], ef_construction=64, M=16)
+        index.add_items(matrix, np.arange(matrix.shape[0]))
+        index.set_ef(max(64, min(matrix.shape[0], 200)))
+        return index
+
+    @staticmethod
+    def _to_results(
+        candidates: List[Tuple[IndexSegment, int, float]], include_embeddings: bool
+    ) -> Dict[str, Any]:
+        ids, documents, metadatas, distances, embeddings = [], [], [], [], []
+        for segment, row, score in candidates:
+            ids.append(segment.ids[row])
+            documents.append(segment.texts[row])
+            metadatas.append(segment.metadatas[row])
+            # 정규화된 벡터의 내적 → pgvector 코사인 거리(<=>)와 같은 척도
+            distances.append(float(1.0 - score))
+            if include_embeddings:
+                embeddings.append(segment.dense()[row].tolist())
+
+        results = {
+            "ids": [ids],
+            "documents": [documents],
+            "metadatas": [metadatas],
+            "distances": [distances],
+        }
+        if include_embeddings:
+            results["embeddings"] = [embeddings]
+        return results
+
+    async def _get_segment(self, db: Any, document_id: str, version: int) -> Optional[IndexSegment]:
+        key = (document_id, version)
+        segment = self._segments.get(key)
+        if segment is not None:
+            self._segments.move_to_end(key)
+            return segment
+
+        lock = self._locks.setdefault(document_id, asyncio.Lock())
+        async with lock:
+            segment = self._segments.get(key)
+            if segment is None:
+                segment = await asyncio.to_thread(self._open_segment, document_id, version)
+            if segment is None:
+                segment = await self._materialize(db, document_id, version)
+            if segment is None:
+                return None
+
+            # 이전 버전 세그먼트는 닫고 새 버전 보관
+            for stale in [existing for existing in self._segments if existing[0] == document_id]:
+                self._segments.pop(stale, None)
+            self._segments[key] = segment
+            while len(self._segments) > self.max_open_segments:
+                self._segments.popitem(last=False)
+            return segment
+
+    def _open_segment(self, document_id: str, version: int) -> Optional[IndexSegment]:
+        """다른 워커가 이미 내려받은 세그먼트 파일을 mmap으로 열기"""
+        vectors_path, scales_path, rows_path = self._segment_paths(document_id, version)
+        if not os.path.exists(vectors_path):
+            return None
+        try:
+            with open(rows_path, "r", encoding="utf-8") as file:
+                rows = json.load(file)
+            vectors = np.load(vectors_path, mmap_mode="r")
+            scales = np.load(scales_path) if self.dtype == DTYPE_INT8 else None
+        except (OSError, ValueError) as e:
+            logger.warning(f"[LocalVectorIndex] 세그먼트 열기 실패 ({document_id}@{version}): {e}")
+            return None
+        return IndexSegment(
+            document_id=document_id,
+            version=version,
+            vectors=vectors,
+            scales=scales,
+            ids=rows["ids"],
+            texts=rows["texts"],
+            metadatas=rows["metadatas"],
+            # row_ids가 없는 이전 형식 세그먼트는 청크 ID로 대신함
+            row_ids=rows.get("row_ids") or rows["ids"],
+        )
+
+    async def _materialize(self, db: Any, document_id: str, version: int) -> Optional[IndexSegment]:
+        """Postgres에서 문서 임베딩을 읽어 세그먼트 파일로 저장 후 mmap으로 열기"""
+        # 다른 문서의 대표 청크에 중복 링크로 연결된 청크는 대표 행의 임베딩 + 연결 청크의 본문/메타데이터
+        link = DocumentChunkLink
+        try:
+            rows = (await db.execute(
+                select(
+                    DocumentEmbedding.id,
+                    func.coalesce(link.chunk_text, DocumentEmbedding.chunk_text).label("chunk_text"),
+                    func.coalesce(cast(link.doc_metadata, JSONB), DocumentEmbedding.doc_metadata).label("doc_metadata"),
+                    DocumentEmbedding.embedding,
+                )
+                .outerjoin(link, and_(
+                    link.canonical_embedding_id == DocumentEmbedding.id,
+                    link.document_id == document_id,
+                    DocumentEmbedding.document_id.is_distinct_from(document_id),
+                ))
+                .where(or_(DocumentEmbedding.document_id == document_id, link.id.is_not(None)))
+                .order_by(DocumentEmbedding.id, link.id)
+            )).all()
+        except Exception as e:
+            logger.warning(f"[LocalVectorIndex] 세그먼트 조회 실패 ({document_id}): {e}")
+            return None
+        # 같은 대표 행에 이 문서의 링크가 여러 개면 첫 링크만 사용 (Postgres 검색과 같은 기준)
+        unique_rows: Dict[int, Any] = {}
+        for row in rows:
+            unique_rows.setdefault(row.id, row)
+        rows = list(unique_rows.values())
+
+        await asyncio.to_thread(self._write_segment, document_id, version, rows)
+        logger.info(f"[LocalVectorIndex] 세그먼트 생성: document_id={document_id}, version={version}, rows={len(rows)}")
+        return await asyncio.to_thread(self._open_segment, document_id, version)
+
+    def _write_segment(self, document_id: str, version: int, rows: Sequence[Any]) -> None:
+        vectors_path, scales_path, rows_path = self._segment_paths(document_id, version)
+        directory = os.path.dirname(vectors_path)
+        os.makedirs(directory, exist_ok=True)
+
+        dimensions = DocumentEmbedding.embedding.type.dim
+        matrix = (
+            normalize_rows(np.asarray([row.embedding for row in rows], dtype=np.float32))
+            if rows else np.empty((0, dimensions), dtype=np.float32)
+        )
+        sidecar = {
+            "ids": [(row.doc_metadata or {}).get("document_id", str(row.id)) for row in rows],
+            "texts": [row.chunk_text for row in rows],
+            "metadatas": [row.doc_metadata or {} for row in rows],
+            "row_ids": [row.id for row in rows],
+        }
+
+        # 임시 파일에 쓴 뒤 교체 (rows.json → vectors.npy 순, 읽는 쪽은 vectors.npy 존재로 완료 판단)
+        suffix = f".tmp{os.getpid()}"
+        with open(rows_path + suffix, "w", encoding="utf-8") as file:
+            json.dump(sidecar, file, ensure_ascii=False)
+        if self.dtype == DTYPE_INT8:
+            quantized, scales = quantize_int8(matrix)
+            with open(scales_path + suffix, "wb") as file:
+                np.save(file, scales)
+            os.replace(scales_path + suffix, scales_path)
+            matrix = quantized
+        with open(vectors_path + suffix, "wb") as file:
+            np.save(file, matrix)
+        os.replace(rows_path + suffix, rows_path)
+        os.replace(vectors_path + suffix, vectors_path)
+
+        # 더 낮은 버전 파일만 정리 (늦게 끝난 이전 버전 작성자가 동시에 재구축된 최신 세그먼트를
+        # 지우지 않도록 함, 열려 있는 mmap은 unlink 후에도 유효)
+        for name in os.listdir(directory):
+            if ".tmp" in name:
+                continue
+            try:
+                file_version = int(name.split(".", 1)[0])
+            except ValueError:
+                continue
+            if file_version < version:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def clear_local(self) -> None:
+        self._segments.clear()
+        self._hits.clear()
+        self._hnsw.clear()
+
+
+local_vector_index = LocalVectorIndex()
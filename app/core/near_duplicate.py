@@ -0,0 +1,117 @@
+"""
+유사 중복 청크 탐지 (SimHash + 밴드 LSH)
+
+수집 시 청크마다 64비트 SimHash 서명을 계산하고, settings.ingest_dedup_max_hamming이 1 이상이면
+같은 범위(봇 또는 사용자)의 기존 청크와 해밍 거리가 그 이하일 때 새로 저장하지 않고
+기존(대표) 청크에 연결합니다 (기본값 0은 본문 해시가 같은 청크만 연결).
+
+- 특징(shingle): 정규화한 텍스트의 문자 n-gram (한국어/영어 공통, 형태소 분석 불필요)
+- n-gram 해시는 NumPy uint64 다항식 해시 + splitmix64 혼합으로 벡터화 (프로세스 간 동일한 값)
+- 서명을 16비트 밴드 4개로 나눠 DB(simhash_bands, GIN) 및 메모리 인덱스 후보를 찾습니다.
+  비둘기집 원리로 해밍 거리 3 이하인 쌍은 반드시 한 밴드 이상이 같습니다.
+"""
+import re
+import unicodedata
+from typing import Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+SIMHASH_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+SHINGLE_SIZE = 4
+
+_WHITESPACE = re.compile(r"\s+")
+_POLY_PRIME = np.uint64(1099511628211)
+_BIT_POSITIONS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+
+
+def normalize_for_signature(text: str) -> str:
+    """서명 계산용 정규화 (NFKC, 소문자, 공백 축약)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).lower()).strip()
+
+
+def _splitmix64(values: np.ndarray) -> np.ndarray:
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> int:
+    """64비트 SimHash (부호 없는 정수)"""
+    normalized = normalize_for_signature(text)
+    if not normalized:
+        return 0
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    size = min(shingle_size, len(codes))
+    count = len(codes) - size + 1
+
+    with np.errstate(over="ignore"):
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset in range(size):
+            hashes = hashes * _POLY_PRIME + codes[offset:offset + count]
+        hashes = _splitmix64(hashes)
+
+    bits = (hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - count
+    signature = 0
+    for position in np.flatnonzero(votes > 0):
+        signature |= 1 << int(position)
+    return signature
+
+
+def hamming_distance(left: int, right: int) -> int:
+    return (left ^ right).bit_count()
+
+
+def simhash_bands(signature: int) -> List[int]:
+    """밴드 키 목록 ((밴드 번호 << 16) | 밴드 값, int4 배열 컬럼에 저장)"""
+    mask = (1 << SIMHASH_BAND_BITS) - 1
+    return [
+        (band << SIMHASH_BAND_BITS) | ((signature >> (band * SIMHASH_BAND_BITS)) & mask)
+        for band in range(SIMHASH_BANDS)
+    ]
+
+
+def to_signed64(signature: int) -> int:
+    """BIGINT 컬럼 저장용 부호 있는 64비트 값"""
+    return signature - (1 << SIMHASH_BITS) if signature >= 1 << (SIMHASH_BITS - 1) else signature
+
+
+def from_signed64(value: int) -> int:
+    return value + (1 << SIMHASH_BITS) if value < 0 else value
+
+
+class SimHashIndex(Generic[KeyT]):
+    """밴드 LSH 메모리 인덱스 (수집 1회 동안 범위 내 후보 + 같은 문서의 새 청크를 담음)"""
+
+    def __init__(self):
+        self._buckets: Dict[int, List[KeyT]] = {}
+        self._signatures: Dict[KeyT, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, key: KeyT, signature: int) -> None:
+        if key in self._signatures:
+            return
+        self._signatures[key] = signature
+        for band in simhash_bands(signature):
+            self._buckets.setdefault(band, []).append(key)
+
+    def nearest(self, signature: int, max_distance: int) -> Optional[Tuple[KeyT, int]]:
+        """해밍 거리 max_distance 이하 중 가장 가까운 키 (같으면 먼저 추가된 키)"""
+        best: Optional[Tuple[KeyT, int]] = None
+        seen = set()
+        for band in simhash_bands(signature):
+            for key in self._buckets.get(band, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                distance = hamming_distance(signature, self._signatures[key])
+                if distance <= max_distance and (best is None or distance < best[1]):
+                    best = (key, distance)
+        return best
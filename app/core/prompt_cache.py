@@ -0,0 +1,158 @@
+"""
+Provider 프롬프트 캐시 (Anthropic / Bedrock cache_control) 유틸리티
+------------------------------------------------------------------
+시스템 프롬프트, 정적 템플릿 구간처럼 턴마다 바이트 단위로 동일한 프리픽스에
+cache_control 마커를 붙여 provider 측 프리필 캐시를 재사용한다.
+
+OpenAI 형식 메시지에 `cache_prefix` 키로 "캐시 가능한 앞부분"을 표시하고,
+Anthropic 계열 클라이언트가 요청 본문을 만들 때 content block으로 분리한다.
+"""
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.config import settings
+
+# 메시지 dict에 캐시 프리픽스를 표시하는 키 (provider 요청 전 제거됨)
+CACHE_PREFIX_KEY = "cache_prefix"
+
+# cache_control 마커를 이해하는 provider
+PROMPT_CACHE_PROVIDERS = frozenset({"anthropic", "bedrock"})
+
+_EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+
+# LLM 노드 템플릿의 변수 표기 ({{ node.port }} 및 단순 {query} 계열)
+_TEMPLATE_VARIABLE_PATTERN = re.compile(
+    r"\{\{.*?\}\}|\{(?:query|question|context|system_prompt)\}",
+    re.DOTALL,
+)
+
+
+@dataclass(frozen=True)
+class PromptCacheHints:
+    """
+    요청별 캐시 프리픽스 힌트
+
+    Attributes:
+        system_prefix: 시스템 프롬프트 중 턴마다 동일한 앞부분 (None이면 시스템 프롬프트 전체)
+        prompt_prefix: 사용자 프롬프트 중 턴마다 동일한 앞부분 (정적 템플릿 구간)
+    """
+
+    system_prefix: Optional[str] = None
+    prompt_prefix: Optional[str] = None
+
+
+def supports_prompt_cache(provider_key: Optional[str]) -> bool:
+    """cache_control 마커를 붙일 수 있는 provider인지 여부"""
+    return settings.prompt_cache_enabled and (provider_key or "").lower() in PROMPT_CACHE_PROVIDERS
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """UTF-8 바이트 기준 대략적인 토큰 수 (한글 1자 ≈ 0.75 토큰, 영문 4자 ≈ 1 토큰)"""
+    if not text:
+        return 0
+    return len(text.encode("utf-8")) // 4
+
+
+def is_cacheable(text: Optional[str]) -> bool:
+    """provider 최소 캐시 단위를 넘는 길이인지 여부"""
+    return estimate_tokens(text) >= max(1, settings.prompt_cache_min_tokens)
+
+
+def extract_static_prefix(template: Optional[str]) -> str:
+    """템플릿에서 첫 변수 이전까지의 정적 구간 반환"""
+    if not template:
+        return ""
+    match = _TEMPLATE_VARIABLE_PATTERN.search(template)
+    return template[:match.start()] if match else template
+
+
+def resolve_static_prefix(template: Optional[str], rendered: Optional[str]) -> Optional[str]:
+    """
+    렌더링된 프롬프트에서 템플릿 정적 구간에 해당하는 캐시 프리픽스 계산
+
+    렌더링 과정의 공백/빈 줄 정리로 정적 구간이 조금 달라질 수 있으므로
+    렌더링 결과와의 공통 프리픽스까지만 사용한다.
+    """
+    if not template or not rendered:
+        return None
+    prefix = extract_static_prefix(template).lstrip()
+    common = os.path.commonprefix([prefix, rendered])
+    return common if is_cacheable(common) else None
+
+
+def mark_cache_prefix(message: Dict[str, Any], prefix: Optional[str]) -> Dict[str, Any]:
+    """
+    메시지에 캐시 프리픽스 표시 (content가 prefix로 시작하고 충분히 길 때만)
+
+    Returns:
+        표시가 추가된 메시지 사본 또는 원본 메시지
+    """
+    content = message.get("content")
+    if not prefix or not isinstance(content, str) or not content.startswith(prefix):
+        return message
+    if not is_cacheable(prefix):
+        return message
+    return {**message, CACHE_PREFIX_KEY: prefix}
+
+
+def build_content_blocks(
+    content: Any,
+    cache_prefix: Optional[str]
+) -> Union[Any, List[Dict[str, Any]]]:
+    """
+    캐시 프리픽스를 cache_control이 붙은 text block으로 분리
+
+    프리픽스가 없거나 content와 맞지 않으면 content를 그대로 반환한다.
+    """
+    if not cache_prefix or not isinstance(content, str) or not content.startswith(cache_prefix):
+        return content
+
+    remainder = content[len(cache_prefix):]
+    if not remainder.strip():
+        # 공백뿐인 block은 API가 거부하므로 전체를 하나의 캐시 block으로 보낸다
+        return [{"type": "text", "text": content, "cache_control": dict(_EPHEMERAL_CACHE_CONTROL)}]
+
+    return [
+        {"type": "text", "text": cache_prefix, "cache_control": dict(_EPHEMERAL_CACHE_CONTROL)},
+        {"type": "text", "text": remainder},
+    ]
+
+
+def convert_to_anthropic_messages(
+    messages: List[Dict[str, Any]],
+    default_system: Optional[str],
+    enable_cache: bool = True
+) -> Tuple[Any, List[Dict[str, Any]]]:
+    """
+    OpenAI 형식 메시지를 Anthropic Messages API 형식으로 변환
+
+    OpenAI: [{"role": "system", ...}, {"role": "user", ...}]
+    Anthropic: system 파라미터 분리 + messages는 user/assistant만
+
+    `cache_prefix` 표시가 있는 메시지는 content block 배열로 변환하고,
+    표시가 없으면 기존과 동일하게 문자열 content를 유지한다.
+    """
+    system_message: Any = None
+    converted_messages: List[Dict[str, Any]] = []
+
+    for msg in messages:
+        cache_prefix = msg.get(CACHE_PREFIX_KEY) if enable_cache else None
+        if msg.get("role") == "system":
+            # system 메시지는 별도 파라미터로 분리
+            system_message = build_content_blocks(msg.get("content"), cache_prefix)
+        else:
+            # user, assistant 메시지는 캐시 표시 키만 제거하고 유지
+            converted = {key: value for key, value in msg.items() if key != CACHE_PREFIX_KEY}
+            if cache_prefix:
+                converted["content"] = build_content_blocks(converted.get("content"), cache_prefix)
+            converted_messages.append(converted)
+
+    # system 메시지가 없으면 기본 프롬프트 사용
+    if system_message is None:
+        system_message = default_system
+
+    return system_message, converted_messages
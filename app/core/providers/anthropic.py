@@ -10,6 +10,7 @@ from anthropic import APIError, RateLimitError, APITimeoutError
 from app.core.llm_base import BaseLLMClient
 from app.core.llm_registry import register_provider
 from app.core.providers.config import AnthropicConfig
+from app.core.prompt_cache import convert_to_anthropic_messages
 from app.core.exceptions import (
     LLMAPIError,
     LLMRateLimitError,
@@ -39,29 +40,16 @@ class AnthropicClient(BaseLLMClient):
 
     def _convert_messages(
         self, messages: List[Dict[str, str]]
-    ) -> tuple[Optional[str], List[Dict[str, str]]]:
+    ) -> tuple[Optional[Any], List[Dict[str, Any]]]:
         """
         OpenAI 형식 메시지를 Anthropic 형식으로 변환
 
         OpenAI: [{"role": "system", ...}, {"role": "user", ...}]
         Anthropic: system 파라미터 분리 + messages는 user/assistant만
+
+        cache_prefix가 표시된 메시지는 cache_control block으로 분리됩니다.
         """
-        system_message = None
-        converted_messages = []
-
-        for msg in messages:
-            if msg.get("role") == "system":
-                # system 메시지는 별도 파라미터로 분리
-                system_message = msg.get("content")
-            else:
-                # user, assistant 메시지는 그대로 유지
-                converted_messages.append(msg)
-
-        # system 메시지가 없으면 기본 프롬프트 사용
-        if system_message is None:
-            system_message = self.system_prompt
-
-        return system_message, converted_messages
+        return convert_to_anthropic_messages(messages, self.system_prompt)
 
     async def generate(
         self,
@@ -1,7 +1,7 @@
 """
 AWS Bedrock (Anthropic Claude) API 클라이언트 구현
 """
-from typing import List, Dict, AsyncGenerator, Optional
+from typing import Any, List, Dict, AsyncGenerator, Optional, Set
 import logging
 import json
 import asyncio
@@ -17,6 +17,7 @@ from app.core.exceptions import (
     LLMRateLimitError,
 )
 from app.core.llm_rate_limiter import LLMRateLimiter
+from app.core.prompt_cache import convert_to_anthropic_messages
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,9 @@ class BedrockClient(BaseLLMClient):
     _max_concurrent_requests: Optional[int] = None  # 동적으로 계산됨
     _provisioned_model_units: int = 0  # 프로비저닝된 용량 (Model Units)
 
+    # 프롬프트 캐시(cache_control)를 거부한 모델 ID (재시도 시 마커 없이 호출)
+    _prompt_cache_unsupported_models: Set[str] = set()
+
     def __init__(self, config: BedrockConfig):
         self.config = config
         self.client = boto3.client(
@@ -103,24 +107,23 @@ class BedrockClient(BaseLLMClient):
         logger.info(f"Bedrock Client 초기화: 모델={self.model}, 리전={config.region_name}")
 
     def _convert_messages(
-        self, messages: List[Dict[str, str]]
-    ) -> tuple[Optional[str], List[Dict[str, str]]]:
+        self, messages: List[Dict[str, str]], enable_cache: bool = True
+    ) -> tuple[Optional[Any], List[Dict[str, Any]]]:
         """
         OpenAI 형식 메시지를 Bedrock (Anthropic) 형식으로 변환
-        """
-        system_message = None
-        converted_messages = []
 
-        for msg in messages:
-            if msg.get("role") == "system":
-                system_message = msg.get("content")
-            else:
-                converted_messages.append(msg)
+        cache_prefix가 표시된 메시지는 cache_control block으로 분리됩니다.
+        """
+        return convert_to_anthropic_messages(messages, self.system_prompt, enable_cache=enable_cache)
 
-        if system_message is None:
-            system_message = self.system_prompt
+    def _prompt_cache_allowed(self, model_id: str) -> bool:
+        """해당 모델에 cache_control 마커를 보내도 되는지 여부"""
+        return model_id not in BedrockClient._prompt_cache_unsupported_models
 
-        return system_message, converted_messages
+    @staticmethod
+    def _is_prompt_cache_rejection(error_code: str, error_message: str) -> bool:
+        """cache_control 미지원 모델이 요청을 거부한 경우인지 판별"""
+        return error_code == "ValidationException" and "cache_control" in (error_message or "")
 
     async def generate(
         self,
@@ -131,12 +134,15 @@ class BedrockClient(BaseLLMClient):
     ) -> str:
         """비동기 완료 생성"""
         try:
-            # 메시지 형식 변환
-            system_message, converted_messages = self._convert_messages(messages)
-
             # 런타임 모델 오버라이드 지원
             model_id = kwargs.pop("model", None) or self.model
 
+            # 메시지 형식 변환
+            system_message, converted_messages = self._convert_messages(
+                messages,
+                enable_cache=self._prompt_cache_allowed(model_id)
+            )
+
             # Bedrock API 요청 본문
             body = {
                 "anthropic_version": "bedrock-2023-05-31",
@@ -176,8 +182,8 @@ class BedrockClient(BaseLLMClient):
                 'input_tokens': input_tokens,
                 'output_tokens': output_tokens,
                 'total_tokens': input_tokens + output_tokens,
-                'cache_read_tokens': usage.get('cache_read_input_token_count', 0),
-                'cache_write_tokens': usage.get('cache_creation_input_token_count', 0),
+                'cache_read_tokens': usage.get('cache_read_input_tokens', usage.get('cache_read_input_token_count', 0)) or 0,
+                'cache_write_tokens': usage.get('cache_creation_input_tokens', usage.get('cache_creation_input_token_count', 0)) or 0,
                 'model': model_id
             }
 
@@ -197,6 +203,19 @@ class BedrockClient(BaseLLMClient):
                     message="Bedrock API 사용량 제한에 도달했습니다",
                     details={"model": model_id, "error": error_message}
                 )
+            elif self._is_prompt_cache_rejection(error_code, error_message) and self._prompt_cache_allowed(model_id):
+                logger.warning(
+                    "Bedrock 모델 %s가 프롬프트 캐시(cache_control)를 지원하지 않습니다. 마커 없이 재시도합니다.",
+                    model_id
+                )
+                BedrockClient._prompt_cache_unsupported_models.add(model_id)
+                return await self.generate(
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    model=model_id,
+                    **kwargs
+                )
             elif "on-demand throughput isn't supported" in error_message.lower():
                 # ON_DEMAND를 지원하지 않는 모델 (INFERENCE_PROFILE만 지원)
                 logger.error(
@@ -273,12 +292,15 @@ class BedrockClient(BaseLLMClient):
     ) -> AsyncGenerator[str, None]:
         """스트리밍 응답 생성"""
         try:
-            # 메시지 형식 변환
-            system_message, converted_messages = self._convert_messages(messages)
-
             # 런타임 모델 오버라이드 지원
             model_id = kwargs.pop("model", None) or self.model
 
+            # 메시지 형식 변환
+            system_message, converted_messages = self._convert_messages(
+                messages,
+                enable_cache=self._prompt_cache_allowed(model_id)
+            )
+
             # Bedrock API 요청 본문
             body = {
                 "anthropic_version": "bedrock-2023-05-31",
@@ -395,6 +417,21 @@ class BedrockClient(BaseLLMClient):
                     message="Bedrock API 사용량 제한에 도달했습니다",
                     details={"model": model_id, "error": error_message}
                 )
+            elif self._is_prompt_cache_rejection(error_code, error_message) and self._prompt_cache_allowed(model_id):
+                logger.warning(
+                    "Bedrock 모델 %s가 프롬프트 캐시(cache_control)를 지원하지 않습니다. 마커 없이 스트리밍 재시도합니다.",
+                    model_id
+                )
+                BedrockClient._prompt_cache_unsupported_models.add(model_id)
+                async for chunk in self.generate_stream(
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    model=model_id,
+                    **kwargs
+                ):
+                    yield chunk
+                return
             elif "on-demand throughput isn't supported" in error_message.lower():
                 # ON_DEMAND를 지원하지 않는 모델 (INFERENCE_PROFILE만 지원)
                 logger.error(
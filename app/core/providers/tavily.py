@@ -6,13 +6,25 @@ Tavily API를 사용하여 실시간 웹 검색을 수행합니다.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import httpx
 import logging
-from typing import Any, Dict, List, Optional
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field
 
+from app.config import settings
+from app.core.http_client import HttpClientProfile, http_client_pool
+
 logger = logging.getLogger(__name__)
 
+# Tavily 전용 커넥션 프로필 (프로세스 공용 클라이언트를 재사용)
+TAVILY_PROFILE = HttpClientProfile.from_settings("tavily", follow_redirects=False)
+
 
 class TavilySearchRequest(BaseModel):
     """Tavily 검색 요청 모델"""
@@ -68,20 +80,13 @@ class TavilyClient:
         self.client: Optional[httpx.AsyncClient] = None
 
     async def __aenter__(self):
-        """비동기 컨텍스트 매니저 진입"""
-        self.client = httpx.AsyncClient(
-            base_url=self.BASE_URL,
-            timeout=30.0,
-            headers={
-                "Content-Type": "application/json",
-            }
-        )
+        """비동기 컨텍스트 매니저 진입 (공용 클라이언트 사용, 커넥션 재사용)"""
+        self.client = http_client_pool.get_client(TAVILY_PROFILE)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """비동기 컨텍스트 매니저 종료"""
-        if self.client:
-            await self.client.aclose()
+        """비동기 컨텍스트 매니저 종료 (공용 클라이언트는 닫지 않음)"""
+        self.client = None
 
     async def search(self, request: TavilySearchRequest) -> TavilySearchResponse:
         """
@@ -124,8 +129,9 @@ class TavilyClient:
 
         try:
             response = await self.client.post(
-                "/search",
-                json=payload
+                f"{self.BASE_URL}/search",
+                json=payload,
+                timeout=30.0,
             )
             response.raise_for_status()
 
@@ -193,7 +199,201 @@ class TavilyClient:
             return (False, f"Validation failed: {str(e)}")
 
     async def close(self):
-        """클라이언트 종료"""
-        if self.client:
-            await self.client.aclose()
-            self.client = None
+        """클라이언트 참조 해제 (공용 클라이언트는 http_client_pool이 종료)"""
+        self.client = None
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 쿼리 정규화 (유니코드 NFKC, 공백 정리, 소문자)"""
+    return " ".join(unicodedata.normalize("NFKC", str(query)).split()).casefold()
+
+
+class TavilySearchCache:
+    """
+    Tavily 검색 결과 캐시 (로컬 LRU + Redis, stale-while-revalidate)
+
+    - 신선(age < ttl): 캐시 결과 반환
+    - 만료 후 stale 구간(age < ttl + stale_sec): 캐시 결과를 즉시 반환하고 백그라운드에서 갱신
+    - 그 외: 동일 키의 동시 요청은 한 번만 API를 호출 (single-flight)
+
+    API 키 검증(validate_key) 등 캐시하면 안 되는 호출은 TavilyClient.search를 직접 사용합니다.
+    """
+
+    def __init__(
+        self,
+        redis: Any = None,
+        enabled: Optional[bool] = None,
+        prefix: Optional[str] = None,
+        local_max_entries: Optional[int] = None,
+        stale_sec: Optional[int] = None,
+    ):
+        if redis is None:
+            from app.core.redis_client import redis_client
+
+            redis = redis_client
+        self.redis = redis
+        self.enabled = settings.tavily_search_cache_enabled if enabled is None else enabled
+        self.prefix = prefix or settings.tavily_search_cache_prefix
+        self.local_max_entries = local_max_entries or settings.tavily_search_cache_local_max_entries
+        self.stale_sec = settings.tavily_search_cache_stale_sec if stale_sec is None else stale_sec
+        # key -> (fetched_at, 응답 딕셔너리)
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[TavilySearchResponse]"] = {}
+        self._refreshing: set = set()
+        # 백그라운드 갱신 태스크가 GC로 사라지지 않도록 참조 유지
+        self._refresh_tasks: "set[asyncio.Task[None]]" = set()
+
+        # 통계 (로그/테스트용)
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @property
+    def _redis_available(self) -> bool:
+        return getattr(self.redis, "redis", None) is not None
+
+    def cache_key(self, request: TavilySearchRequest) -> str:
+        params = request.model_dump()
+        params["query"] = normalize_query(request.query)
+        for field in ("include_domains", "exclude_domains"):
+            if params.get(field):
+                params[field] = sorted({domain.strip().lower() for domain in params[field]})
+        raw = json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return f"{self.prefix}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+    async def search(
+        self,
+        api_key: str,
+        request: TavilySearchRequest,
+        ttl_sec: Optional[int] = None,
+        force_refresh: bool = False,
+    ) -> Tuple[TavilySearchResponse, str]:
+        """
+        캐시를 거쳐 검색
+
+        Args:
+            force_refresh: True면 캐시 조회 없이 API를 호출하고 결과로 캐시를 갱신 (재검색 등)
+
+        Returns:
+            (검색 응답, 캐시 상태: "hit" | "stale" | "miss" | "refresh" | "bypass")
+
+        Raises:
+            ValueError: TavilyClient.search와 동일
+        """
+        ttl_sec = settings.tavily_search_cache_ttl_sec if ttl_sec is None else ttl_sec
+        if not self.enabled or ttl_sec <= 0:
+            return await self._fetch(api_key, request), "bypass"
+
+        key = self.cache_key(request)
+        if force_refresh:
+            self.misses += 1
+            return await self._load(key, api_key, request, ttl_sec), "refresh"
+
+        entry = await self._lookup(key)
+        if entry is not None:
+            fetched_at, payload = entry
+            age = time.time() - fetched_at
+            if age < ttl_sec:
+                self.hits += 1
+                return TavilySearchResponse(**payload), "hit"
+            if age < ttl_sec + self.stale_sec:
+                self.stale_hits += 1
+                self._schedule_refresh(key, api_key, request, ttl_sec)
+                return TavilySearchResponse(**payload), "stale"
+
+        self.misses += 1
+        return await self._load(key, api_key, request, ttl_sec), "miss"
+
+    async def _lookup(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        entry = self._local.get(key)
+        if entry is not None:
+            self._local.move_to_end(key)
+            return entry
+        if self._redis_available:
+            payload = await self.redis.get(key)
+            if isinstance(payload, dict) and isinstance(payload.get("response"), dict):
+                entry = (float(payload.get("fetched_at") or 0), payload["response"])
+                self._store_local(key, entry)
+                return entry
+        return None
+
+    async def _load(
+        self,
+        key: str,
+        api_key: str,
+        request: TavilySearchRequest,
+        ttl_sec: int,
+    ) -> TavilySearchResponse:
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future: "asyncio.Future[TavilySearchResponse]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self._fetch(api_key, request)
+            await self._store(key, response, ttl_sec)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # 대기자가 없을 때 미조회 예외 경고 방지
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _schedule_refresh(self, key: str, api_key: str, request: TavilySearchRequest, ttl_sec: int) -> None:
+        if key in self._refreshing or key in self._inflight:
+            return
+        self._refreshing.add(key)
+
+        async def refresh() -> None:
+            try:
+                # 여러 레플리카가 동시에 갱신하지 않도록 Redis 락 (획득 실패 시 다른 곳에서 갱신 중)
+                if self._redis_available:
+                    acquired = await self.redis.set(f"{key}:refresh", "1", expire=30, nx=True)
+                    if not acquired:
+                        # 다른 레플리카가 갱신 중 → Redis에 더 최신 결과가 있으면 로컬에 반영
+                        payload = await self.redis.get(key)
+                        if isinstance(payload, dict) and isinstance(payload.get("response"), dict):
+                            self._store_local(key, (float(payload.get("fetched_at") or 0), payload["response"]))
+                        return
+                await self._load(key, api_key, request, ttl_sec)
+            except Exception as e:
+                logger.warning(f"[TavilySearchCache] 백그라운드 갱신 실패 (stale 결과 유지): {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    @staticmethod
+    async def _fetch(api_key: str, request: TavilySearchRequest) -> TavilySearchResponse:
+        async with TavilyClient(api_key=api_key) as tavily_client:
+            return await tavily_client.search(request)
+
+    async def _store(self, key: str, response: TavilySearchResponse, ttl_sec: int) -> None:
+        entry = (time.time(), response.model_dump())
+        self._store_local(key, entry)
+        if self._redis_available:
+            await self.redis.set(
+                key,
+                {"fetched_at": entry[0], "response": entry[1]},
+                expire=ttl_sec + self.stale_sec,
+            )
+
+    def _store_local(self, key: str, entry: Tuple[float, Dict[str, Any]]) -> None:
+        self._local[key] = entry
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_max_entries:
+            self._local.popitem(last=False)
+
+    def clear_local(self) -> None:
+        self._local.clear()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+
+tavily_search_cache = TavilySearchCache()
@@ -43,11 +43,8 @@ class APIKeyRateLimiter:
         # 1. 분 단위 체크
         # ==========================================
         minute_key = f"rate_limit:{api_key_id}:minute:{now.strftime('%Y%m%d%H%M')}"
-        minute_count = await redis_client.incr(minute_key)
-        
-        if minute_count == 1:
-            # 첫 요청일 때 TTL 설정 (60초)
-            await redis_client.expire(minute_key, 60)
+        # 증가와 첫 요청 TTL(60초) 설정을 한 번의 왕복으로 처리
+        minute_count = await redis_client.incr_with_expire(minute_key, 60)
         
         if minute_count > rate_limit_per_minute:
             # 분당 제한 초과
@@ -63,11 +60,8 @@ class APIKeyRateLimiter:
         # 2. 시간 단위 체크
         # ==========================================
         hour_key = f"rate_limit:{api_key_id}:hour:{now.strftime('%Y%m%d%H')}"
-        hour_count = await redis_client.incr(hour_key)
-        
-        if hour_count == 1:
-            # 첫 요청일 때 TTL 설정 (3600초)
-            await redis_client.expire(hour_key, 3600)
+        # 증가와 첫 요청 TTL(3600초) 설정을 한 번의 왕복으로 처리
+        hour_count = await redis_client.incr_with_expire(hour_key, 3600)
         
         if hour_count > rate_limit_per_hour:
             # 시간당 제한 초과
@@ -83,11 +77,8 @@ class APIKeyRateLimiter:
         # 3. 일 단위 체크
         # ==========================================
         day_key = f"rate_limit:{api_key_id}:day:{now.strftime('%Y%m%d')}"
-        day_count = await redis_client.incr(day_key)
-        
-        if day_count == 1:
-            # 첫 요청일 때 TTL 설정 (86400초)
-            await redis_client.expire(day_key, 86400)
+        # 증가와 첫 요청 TTL(86400초) 설정을 한 번의 왕복으로 처리
+        day_count = await redis_client.incr_with_expire(day_key, 86400)
         
         if day_count > rate_limit_per_day:
             # 일당 제한 초과
@@ -137,7 +128,8 @@ async def rate_limit_middleware(request: Request, call_next):
         
         # Redis에서 API 키 정보 캐싱 조회 (5분 TTL)
         cache_key = f"api_key:cache:{key_hash}"
-        cached_api_key = await redis_client.get(cache_key)
+        # 매 요청 조회되는 hot key이므로 near-cache 사용
+        cached_api_key = await redis_client.get(cache_key, near_cache=True)
         
         if not cached_api_key:
             # 캐시 미스: DB 조회 (다음 핸들러에서 처리)
@@ -2,15 +2,121 @@
 Redis 클라이언트 모듈
 
 Widget 세션, 캐싱, Rate Limiting을 위한 Redis 연결 관리
+
+- 텍스트 연결(decode_responses=True): JSON 값 저장/조회
+- 바이너리 연결(decode_responses=False): 임베딩 벡터 등 바이너리 값 (packed float32, msgpack)
+- near-cache: 호출자가 near_cache=True로 조회한 hot key를 짧은 TTL로 프로세스 로컬에 보관
 """
 from redis import asyncio as aioredis
-from typing import Optional, Any, List
+from collections import OrderedDict
+from typing import Optional, Any, Dict, List, Sequence, Tuple
 import json
 import logging
+import struct
+import time
 from app.config import settings
 
+try:  # msgpack은 선택 의존성 (없으면 JSON 바이트로 저장)
+    import msgpack
+except ImportError:  # pragma: no cover - 설치 환경에 따라 다름
+    msgpack = None
+
 logger = logging.getLogger(__name__)
 
+# 바이너리 값 포맷 표식 (레플리카마다 msgpack 설치 여부가 달라도 디코딩 가능하도록)
+_CODEC_JSON = b"\x00"
+_CODEC_MSGPACK = b"\x01"
+_VECTOR_HEADER = struct.Struct("<II")  # (벡터 개수, 차원)
+
+
+def encode_packed(value: Any) -> bytes:
+    """값을 바이너리로 인코딩 (msgpack 우선, 없으면 JSON)"""
+    if msgpack is not None:
+        return _CODEC_MSGPACK + msgpack.packb(value, use_bin_type=True)
+    return _CODEC_JSON + json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_packed(data: Optional[bytes]) -> Any:
+    """encode_packed로 저장한 값 디코딩"""
+    if not data:
+        return None
+    marker, body = data[:1], data[1:]
+    if marker == _CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack으로 저장된 값이지만 msgpack이 설치되어 있지 않습니다")
+        return msgpack.unpackb(body, raw=False)
+    if marker == _CODEC_JSON:
+        return json.loads(body.decode("utf-8"))
+    raise ValueError("알 수 없는 바이너리 값 포맷")
+
+
+def pack_vectors(vectors: Sequence[Sequence[float]]) -> bytes:
+    """동일 차원 벡터 목록을 little-endian float32 행렬로 직렬화"""
+    count = len(vectors)
+    dim = len(vectors[0]) if count else 0
+    if any(len(vector) != dim for vector in vectors):
+        raise ValueError("벡터 차원이 일치하지 않습니다")
+    flat = [float(value) for vector in vectors for value in vector]
+    return _VECTOR_HEADER.pack(count, dim) + struct.pack(f"<{len(flat)}f", *flat)
+
+
+def unpack_vectors(data: Optional[bytes]) -> List[List[float]]:
+    """pack_vectors 역변환"""
+    if not data or len(data) < _VECTOR_HEADER.size:
+        return []
+    count, dim = _VECTOR_HEADER.unpack_from(data)
+    flat = struct.unpack_from(f"<{count * dim}f", data, _VECTOR_HEADER.size)
+    return [list(flat[i * dim:(i + 1) * dim]) for i in range(count)]
+
+
+class NearCache:
+    """프로세스 로컬 near-cache (원문 문자열 보관, TTL + LRU)"""
+
+    def __init__(self, max_entries: int, ttl_sec: float):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        # key -> (만료 시각, 원문)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, raw = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, raw
+
+    def set(self, key: str, raw: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_sec, raw)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _decode_json(value: Any) -> Any:
+    # JSON 문자열이면 파싱, 아니면 원문
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return value
+
+
+def _encode_json(value: Any) -> Any:
+    # dict/list는 JSON으로 변환
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
 
 class RedisClient:
     """비동기 Redis 클라이언트"""
@@ -18,6 +124,12 @@ class RedisClient:
     def __init__(self):
         # Redis 연결 객체 초기화
         self.redis: Optional[aioredis.Redis] = None
+        # 바이너리 값 전용 연결 (응답을 디코딩하지 않음)
+        self.binary: Optional[aioredis.Redis] = None
+        self.near_cache: Optional[NearCache] = (
+            NearCache(settings.redis_near_cache_max_entries, settings.redis_near_cache_ttl_sec)
+            if settings.redis_near_cache_max_entries > 0 else None
+        )
         # 연결 문자열 생성 규칙을 한 곳에 모아 일관성 있게 관리하려는 목적
         # 비밀번호 포함/미포함, 기본값 처리 등을 캡슐화
         self._url = settings.get_redis_url()
@@ -27,10 +139,12 @@ class RedisClient:
         try:
             # 기본 클라이언트 옵션
             client_kwargs = {
-                "encoding": "utf-8",
-                "decode_responses": True,
                 "socket_connect_timeout": 5,
                 "socket_keepalive": True,
+                "socket_timeout": settings.redis_socket_timeout_sec,
+                "max_connections": settings.redis_max_connections,
+                "health_check_interval": settings.redis_health_check_interval_sec,
+                "retry_on_timeout": True,
             }
 
             # 프로덕션 환경: SSL/TLS 설정 추가
@@ -44,6 +158,14 @@ class RedisClient:
             # Redis 클라이언트 생성
             self.redis = await aioredis.from_url(
                 self._url,
+                encoding="utf-8",
+                decode_responses=True,
+                **client_kwargs
+            )
+            # 바이너리 연결은 별도 풀 (첫 사용 시 연결)
+            self.binary = await aioredis.from_url(
+                self._url,
+                decode_responses=False,
                 **client_kwargs
             )
 
@@ -56,22 +178,36 @@ class RedisClient:
 
     async def close(self):
         """Redis 연결 종료"""
+        if self.binary:
+            await self.binary.aclose()
         if self.redis:
             await self.redis.aclose()
             logger.info("Redis 연결 종료")
 
+    def set_near_cache(self, near_cache: Optional[NearCache]) -> None:
+        """near-cache 구현 교체 (None이면 비활성)"""
+        self.near_cache = near_cache
+
     # 값 조회 후 JSON이면 자동 파싱, 아니면 원문 반환
-    async def get(self, key: str) -> Optional[Any]:
-        """키로 값 조회 (JSON 자동 디코딩)"""
+    async def get(self, key: str, near_cache: bool = False) -> Optional[Any]:
+        """
+        키로 값 조회 (JSON 자동 디코딩)
+
+        Args:
+            near_cache: True면 로컬 near-cache를 먼저 조회 (자주 읽고 드물게 바뀌는 키에만 사용)
+        """
+        use_near = near_cache and self.near_cache is not None
+        if use_near:
+            hit, raw = self.near_cache.get(key)
+            if hit:
+                return _decode_json(raw) if raw is not None else None
         try:
             value = await self.redis.get(key)
+            if use_near:
+                self.near_cache.set(key, value)
             if value is None:
                 return None
-            # JSON 문자열이면 파싱
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                return value
+            return _decode_json(value)
         except Exception as e:
             logger.error(f"Redis GET 실패 [{key}]: {e}")
             return None
@@ -94,14 +230,12 @@ class RedisClient:
             nx: True면 키가 없을 때만 설정 (SET NX)
             xx: True면 키가 있을 때만 설정 (SET XX)
         """
+        if self.near_cache is not None:
+            self.near_cache.invalidate(key)
         try:
-            # dict는 JSON으로 변환
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value, ensure_ascii=False)
-
             result = await self.redis.set(
                 key,
-                value,
+                _encode_json(value),
                 ex=expire,
                 nx=nx,
                 xx=xx
@@ -113,6 +247,8 @@ class RedisClient:
 
     async def delete(self, *keys: str) -> int:
         """키 삭제 (여러 키 동시 삭제 가능)"""
+        if self.near_cache is not None:
+            self.near_cache.invalidate(*keys)
         try:
             return await self.redis.delete(*keys)
         except Exception as e:
@@ -159,6 +295,126 @@ class RedisClient:
             logger.error(f"Redis DECR 실패 [{key}]: {e}")
             return 0
 
+    async def incr_with_expire(self, key: str, seconds: int) -> int:
+        """
+        카운터 증가 + 최초 생성 시 만료 설정을 한 번의 왕복(MULTI)으로 수행
+
+        INCR 후 별도 EXPIRE를 보내던 방식과 달리 TTL 없는 카운터가 남지 않습니다.
+        """
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.set(key, 0, ex=seconds, nx=True)
+                pipe.incr(key)
+                _, count = await pipe.execute()
+            return count
+        except Exception as e:
+            logger.error(f"Redis INCR 실패 [{key}]: {e}")
+            return 0
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """여러 키 한 번에 조회 (JSON 자동 디코딩, 없는 키는 None)"""
+        if not keys:
+            return []
+        try:
+            values = await self.redis.mget(list(keys))
+            return [_decode_json(value) if value is not None else None for value in values]
+        except Exception as e:
+            logger.error(f"Redis MGET 실패 [{len(keys)} keys]: {e}")
+            return [None] * len(keys)
+
+    async def mset(self, mapping: Dict[str, Any], expire: Optional[int] = None) -> bool:
+        """여러 키 한 번에 저장 (JSON 자동 인코딩, 파이프라인 한 번의 왕복)"""
+        if not mapping:
+            return True
+        if self.near_cache is not None:
+            self.near_cache.invalidate(*mapping.keys())
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, _encode_json(value), ex=expire)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis MSET 실패 [{len(mapping)} keys]: {e}")
+            return False
+
+    def pipeline(self, transaction: bool = True):
+        """
+        파이프라인 (async with로 사용, transaction=True면 MULTI/EXEC)
+
+        명령을 모아 한 번의 왕복으로 실행합니다. 값 인코딩과 near-cache 무효화는 호출자가 처리합니다.
+        """
+        return self.redis.pipeline(transaction=transaction)
+
+    async def get_packed(self, key: str) -> Optional[Any]:
+        """바이너리 연결로 encode_packed 값 조회"""
+        try:
+            return decode_packed(await self.binary.get(key))
+        except Exception as e:
+            logger.error(f"Redis GET(binary) 실패 [{key}]: {e}")
+            return None
+
+    async def set_packed(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        """바이너리 연결로 값 저장 (msgpack, 없으면 JSON 바이트)"""
+        try:
+            return bool(await self.binary.set(key, encode_packed(value), ex=expire))
+        except Exception as e:
+            logger.error(f"Redis SET(binary) 실패 [{key}]: {e}")
+            return False
+
+    async def get_vectors(self, key: str) -> List[List[float]]:
+        """packed float32 행렬 조회"""
+        try:
+            return unpack_vectors(await self.binary.get(key))
+        except Exception as e:
+            logger.error(f"Redis GET(vectors) 실패 [{key}]: {e}")
+            return []
+
+    async def set_vectors(
+        self,
+        key: str,
+        vectors: Sequence[Sequence[float]],
+        expire: Optional[int] = None
+    ) -> bool:
+        """벡터 목록을 packed float32 행렬로 저장 (JSON 대비 약 1/4 크기)"""
+        try:
+            return bool(await self.binary.set(key, pack_vectors(vectors), ex=expire))
+        except Exception as e:
+            logger.error(f"Redis SET(vectors) 실패 [{key}]: {e}")
+            return False
+
+    async def hgetall(self, key: str) -> dict:
+        """해시 전체 필드 조회 (값은 원문 문자열)"""
+        try:
+            return await self.redis.hgetall(key)
+        except Exception as e:
+            logger.error(f"Redis HGETALL 실패 [{key}]: {e}")
+            return {}
+
+    async def hset_many(
+        self,
+        key: str,
+        mapping: dict,
+        expire: Optional[int] = None
+    ) -> bool:
+        """해시 필드 여러 개를 한 번에 저장 (dict/list 값은 JSON 인코딩, 만료 시간 함께 설정)"""
+        if not mapping:
+            return True
+        try:
+            encoded = {
+                field: json.dumps(value, ensure_ascii=False) if not isinstance(value, str) else value
+                for field, value in mapping.items()
+            }
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping=encoded)
+                if expire:
+                    pipe.expire(key, expire)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis HSET 실패 [{key}]: {e}")
+            return False
+
     async def keys(self, pattern: str, batch_size: int = 500) -> List[str]:
         """패턴으로 키 검색 (SCAN 기반, 대량 키에서도 안전)"""
         cursor = 0 # 시작점은 0
@@ -0,0 +1,248 @@
+"""
+검색(retrieval) 결과 캐시와 코퍼스 버전
+
+같은 질문이 반복될 때 쿼리 임베딩 + pgvector 검색을 다시 수행하지 않도록
+(검색 범위, document_ids, 정규화된 쿼리, top_k 등 검색 파라미터, 코퍼스 버전) 키로
+검색 결과를 보관합니다.
+
+- 코퍼스 버전은 범위(scope)별 Redis 카운터이며, VectorStore.add_documents /
+  delete_document(임베딩 워커 포함)가 증가시킵니다. 버전이 키에 포함되므로
+  TTL 추정 없이 문서 변경 즉시 이전 결과가 조회되지 않습니다.
+- 범위: "all"(전체 코퍼스), "doc:{document_id}"(특정 문서).
+  현재 VectorStore.search는 bot/user로 필터링하지 않으므로 document_ids가 없는 검색은
+  "all" 버전에 의존합니다. 키에는 bot_id/user_uuid를 함께 넣어 결과 공유 범위를 분리합니다.
+- 버전을 확인할 수 없으면(Redis 미연결 등) 캐시하지 않습니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.core.workflow.base_node_v2 import BaseNodeV2, NodeExecutionContext
+
+logger = logging.getLogger(__name__)
+
+CORPUS_SCOPE_ALL = "all"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 쿼리 정규화 (NFKC, 공백 정리, 대소문자 무시)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", query or "")).strip().casefold()
+
+
+def corpus_scopes(document_ids: Optional[Iterable[str]] = None) -> List[str]:
+    """검색 결과가 의존하는 코퍼스 버전 범위 목록"""
+    if document_ids:
+        return sorted({f"doc:{document_id}" for document_id in document_ids})
+    return [CORPUS_SCOPE_ALL]
+
+
+class RetrievalCache:
+    """로컬 LRU + Redis 2단 검색 결과 캐시 (코퍼스 버전 기반 무효화)"""
+
+    def __init__(
+        self,
+        redis: Any = None,
+        enabled: Optional[bool] = None,
+        prefix: Optional[str] = None,
+        local_max_entries: Optional[int] = None,
+        ttl_sec: Optional[int] = None,
+    ):
+        if redis is None:
+            from app.core.redis_client import redis_client
+
+            redis = redis_client
+        self.redis = redis
+        self.enabled = settings.retrieval_cache_enabled if enabled is None else enabled
+        self.prefix = prefix or settings.retrieval_cache_prefix
+        self.local_max_entries = local_max_entries or settings.retrieval_cache_local_max_entries
+        self.ttl_sec = settings.retrieval_cache_ttl_sec if ttl_sec is None else ttl_sec
+        # key -> (만료 시각, JSON 문자열)
+        self._local: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+
+        # 통계 (로그/테스트용)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _redis_available(self) -> bool:
+        return getattr(self.redis, "redis", None) is not None
+
+    def _version_key(self, scope: str) -> str:
+        return f"{self.prefix}:ver:{scope}"
+
+    async def get_corpus_versions(self, scopes: Sequence[str]) -> Optional[Dict[str, int]]:
+        """
+        범위별 코퍼스 버전 조회
+
+        처음 조회되는 범위는 현재 시각(ms) 기반 값으로 초기화합니다. 버전 키가 축출/삭제된 뒤
+        다시 1부터 시작하면 이전 결과와 키가 겹칠 수 있으므로 항상 이전보다 큰 값에서 시작합니다.
+
+        Returns:
+            {scope: version} 또는 None (Redis 미연결)
+        """
+        if not self._redis_available:
+            return None
+        try:
+            keys = [self._version_key(scope) for scope in scopes]
+            values = await self.redis.mget(keys)
+            versions: Dict[str, int] = {}
+            for scope, key, value in zip(scopes, keys, values):
+                if value is None:
+                    await self.redis.redis.set(key, int(time.time() * 1000), nx=True)
+                    value = await self.redis.redis.get(key)
+                versions[scope] = int(value)
+            return versions
+        except Exception as e:
+            logger.warning(f"[RetrievalCache] 코퍼스 버전 조회 실패: {e}")
+            return None
+
+    async def bump_corpus_version(self, document_ids: Optional[Iterable[str]] = None) -> None:
+        """
+        코퍼스 변경 알림 (전체 범위 + 변경된 문서 범위의 버전 증가)
+
+        존재하지 않는 범위는 INCR로 새로 만들지 않습니다 (첫 조회 시 시각 기반 값으로 초기화).
+        """
+        if not self._redis_available:
+            return
+        scopes = [CORPUS_SCOPE_ALL]
+        scopes.extend(scope for scope in corpus_scopes(document_ids) if scope != CORPUS_SCOPE_ALL)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for scope in scopes:
+                    key = self._version_key(scope)
+                    pipe.set(key, int(time.time() * 1000), nx=True)
+                    pipe.incr(key)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"[RetrievalCache] 코퍼스 버전 갱신 실패: {e}")
+
+    def build_key(
+        self,
+        scope: Dict[str, Any],
+        query: str,
+        params: Dict[str, Any],
+        versions: Dict[str, int],
+    ) -> Optional[str]:
+        """캐시 키 계산 (직렬화할 수 없는 파라미터면 None)"""
+        try:
+            raw = json.dumps(
+                {
+                    "scope": scope,
+                    "query": normalize_query(query),
+                    "params": params,
+                    "versions": versions,
+                },
+                sort_keys=True,
+                separators=(",", ":"),
+                ensure_ascii=False,
+            )
+        except (TypeError, ValueError):
+            return None
+        return f"{self.prefix}:res:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (로컬 → Redis 순, hit마다 새 객체 반환)"""
+        local = self._local.get(key)
+        if local is not None:
+            expires_at, raw = local
+            if expires_at > time.monotonic():
+                self._local.move_to_end(key)
+                self.hits += 1
+                return json.loads(raw)
+            self._local.pop(key, None)
+
+        if self._redis_available:
+            payload = await self.redis.get(key)
+            if isinstance(payload, dict) and "results" in payload:
+                self._store_local(key, json.dumps(payload["results"], ensure_ascii=False))
+                self.hits += 1
+                return payload["results"]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, results: Any) -> bool:
+        try:
+            raw = json.dumps(results, ensure_ascii=False)
+        except (TypeError, ValueError):
+            logger.debug("[RetrievalCache] 직렬화할 수 없는 결과로 캐시 생략")
+            return False
+        self._store_local(key, raw)
+        if self._redis_available:
+            await self.redis.set(key, {"results": json.loads(raw)}, expire=self.ttl_sec)
+        return True
+
+    async def fetch(
+        self,
+        scope: Dict[str, Any],
+        query: str,
+        params: Dict[str, Any],
+        document_ids: Optional[Iterable[str]],
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        캐시 조회 후 miss면 loader()로 검색해 저장
+
+        Args:
+            scope: 결과 공유 범위 (bot_id, user_uuid 등)
+            query: 검색 쿼리 원문
+            params: 결과에 영향을 주는 검색 파라미터 (top_k, search_mode, 필터 등)
+            document_ids: 검색 대상 문서 (코퍼스 버전 범위 결정)
+            loader: 실제 검색 코루틴 함수
+        """
+        if not self.enabled or self.ttl_sec <= 0:
+            return await loader()
+
+        versions = await self.get_corpus_versions(corpus_scopes(document_ids))
+        key = self.build_key(scope, query, params, versions) if versions is not None else None
+        if key is None:
+            return await loader()
+
+        cached = await self.get(key)
+        if cached is not None:
+            logger.info("[RetrievalCache] 검색 결과 캐시 hit: query='%s...'", query[:30])
+            return cached
+
+        results = await loader()
+        await self.set(key, results)
+        return results
+
+    def _store_local(self, key: str, raw: str) -> None:
+        self._local[key] = (time.monotonic() + self.ttl_sec, raw)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_max_entries:
+            self._local.popitem(last=False)
+
+    def clear_local(self) -> None:
+        self._local.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+retrieval_cache = RetrievalCache()
+
+
+async def knowledge_corpus_version(node: "BaseNodeV2", context: "NodeExecutionContext") -> Optional[str]:
+    """
+    노드 출력 캐시용 코퍼스 버전 (NodeOutputCache corpus_version_provider)
+
+    지식 검색 노드는 document_ids 검색 결과가 없으면 전체 문서로 재검색하므로
+    항상 전체 코퍼스 버전에 의존합니다.
+    """
+    versions = await retrieval_cache.get_corpus_versions([CORPUS_SCOPE_ALL])
+    if versions is None:
+        return None
+    return str(versions[CORPUS_SCOPE_ALL])
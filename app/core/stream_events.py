@@ -0,0 +1,121 @@
+"""
+SSE 스트리밍 이벤트 인코딩 / 토큰 병합(coalescing)
+--------------------------------------------------
+- 이벤트는 생성 시점에 한 번만 직렬화하고(orjson), 직렬화 결과와 원본 payload를
+  함께 들고 다니는 `StreamEvent`로 전달해 하위 소비자가 다시 파싱하지 않도록 한다.
+- LLM 토큰은 짧은 시간 창(window_ms) 또는 바이트 한도(max_bytes) 단위로 묶어
+  하나의 content 프레임으로 내보낸다.
+"""
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 미설치 환경은 표준 json 사용
+    orjson = None
+
+
+def dumps_event(payload: Dict[str, Any]) -> str:
+    """이벤트 payload를 JSON 문자열로 직렬화 (한글 등 비ASCII 문자 유지)"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class StreamEvent(str):
+    """
+    직렬화된 SSE 이벤트
+
+    문자열로는 기존과 동일한 JSON 본문이며, `payload`/`event_type`으로
+    원본 dict에 바로 접근할 수 있다.
+    """
+
+    payload: Dict[str, Any]
+    event_type: Optional[str]
+
+    def __new__(cls, payload: Dict[str, Any]) -> "StreamEvent":
+        event = super().__new__(cls, dumps_event(payload))
+        event.payload = payload
+        event.event_type = payload.get("type")
+        return event
+
+    @classmethod
+    def from_model(cls, model: BaseModel) -> "StreamEvent":
+        return cls(model.model_dump())
+
+
+def event_payload(event: str) -> Optional[Dict[str, Any]]:
+    """스트림 이벤트의 payload 반환 (StreamEvent가 아니면 JSON 파싱, 실패 시 None)"""
+    if isinstance(event, StreamEvent):
+        return event.payload
+    try:
+        payload = json.loads(event)
+    except (TypeError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+class ContentCoalescer:
+    """
+    LLM 토큰을 시간 창/바이트 한도 단위로 묶는 버퍼
+
+    - 첫 토큰이 버퍼에 들어온 뒤 window_ms가 지났거나 누적 바이트가 max_bytes 이상이면 프레임 방출
+    - window_ms <= 0 이면 병합하지 않고 토큰을 그대로 방출
+    """
+
+    def __init__(
+        self,
+        window_ms: float,
+        max_bytes: int,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.window = max(0.0, window_ms) / 1000.0
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._parts: List[str] = []
+        self._bytes = 0
+        self._started_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._parts)
+
+    def add(self, text: str) -> Optional[str]:
+        """토큰 추가. 프레임을 내보낼 시점이면 병합된 텍스트 반환"""
+        if not text:
+            return None
+        if not self.enabled:
+            return text
+
+        if not self._parts:
+            self._started_at = self._clock()
+        self._parts.append(text)
+        self._bytes += len(text.encode("utf-8"))
+
+        if (self.max_bytes > 0 and self._bytes >= self.max_bytes) or self.remaining() <= 0:
+            return self.drain()
+        return None
+
+    def remaining(self) -> float:
+        """현재 프레임의 시간 창이 끝날 때까지 남은 시간(초)"""
+        if not self._parts:
+            return self.window
+        return self.window - (self._clock() - self._started_at)
+
+    def drain(self) -> Optional[str]:
+        """버퍼에 남은 텍스트를 모두 꺼냄"""
+        if not self._parts:
+            return None
+        frame = "".join(self._parts)
+        self._parts.clear()
+        self._bytes = 0
+        return frame
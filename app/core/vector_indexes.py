@@ -0,0 +1,102 @@
+"""
+document_embeddings ANN(HNSW) 인덱스 관리 (Alembic 마이그레이션 / 운영 스크립트 공용)
+
+settings.vector_search_quantization 모드(app.core.vector_store.QUANTIZATION_*)마다
+후보 검색에 쓰는 HNSW 인덱스가 하나씩 있고, 설정된 모드의 인덱스만 유지합니다.
+
+- none      : embedding vector_cosine_ops (float32 원본)
+- halfvec   : (embedding::halfvec(1024)) halfvec_cosine_ops
+- binary    : (binary_quantize(embedding)::bit(1024)) bit_hamming_ops
+- matryoshka: embedding_short vector_cosine_ops (기존 행 embedding_short 채움 필요)
+
+halfvec / binary / matryoshka는 pgvector 0.7.0 이상이 필요하며, 버전이 낮으면
+예외 없이 건너뛰어 이후 마이그레이션이 막히지 않도록 합니다.
+모든 함수는 동기 Connection을 받습니다 (op.get_bind() 또는 engine.begin()).
+"""
+import logging
+from typing import Optional, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+PGVECTOR_QUANTIZATION_MIN_VERSION = (0, 7)
+SHORT_EMBEDDING_BACKFILL_BATCH_SIZE = 5000
+FLOAT32_INDEX_NAME = "document_embeddings_embedding_idx"
+
+_HNSW_WITH = "WITH (m = 16, ef_construction = 64)"
+# 모드 → (인덱스 이름, 인덱스 대상)
+ANN_INDEXES = {
+    "none": (FLOAT32_INDEX_NAME, "embedding vector_cosine_ops"),
+    "halfvec": ("document_embeddings_embedding_halfvec_idx", "(embedding::halfvec(1024)) halfvec_cosine_ops"),
+    "binary": ("document_embeddings_embedding_binary_idx", "(binary_quantize(embedding)::bit(1024)) bit_hamming_ops"),
+    "matryoshka": ("document_embeddings_embedding_short_idx", "embedding_short vector_cosine_ops"),
+}
+
+
+def pgvector_version(conn: Connection) -> Optional[Tuple[int, ...]]:
+    """설치된 vector 확장 버전 (미설치 시 None)"""
+    version = conn.execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not version:
+        return None
+    return tuple(int(part) for part in version.split(".")[:2] if part.isdigit())
+
+
+def supports_quantization(conn: Connection) -> bool:
+    """halfvec / binary_quantize / subvector / l2_normalize 사용 가능 여부 (pgvector 0.7.0+)"""
+    version = pgvector_version(conn)
+    return version is not None and version >= PGVECTOR_QUANTIZATION_MIN_VERSION
+
+
+def backfill_short_embeddings(conn: Connection, batch_size: int = SHORT_EMBEDDING_BACKFILL_BATCH_SIZE) -> None:
+    """embedding_short가 비어 있는 기존 행을 id 구간 단위로 채움 (앞 256차원 + L2 재정규화)"""
+    bounds = conn.execute(sa.text("SELECT MIN(id), MAX(id) FROM document_embeddings")).one()
+    if bounds[0] is None:
+        return
+    for start in range(bounds[0], bounds[1] + 1, batch_size):
+        conn.execute(
+            sa.text(
+                "UPDATE document_embeddings "
+                "SET embedding_short = l2_normalize(subvector(embedding, 1, 256))::vector(256) "
+                "WHERE id >= :start AND id < :end AND embedding_short IS NULL"
+            ),
+            {"start": start, "end": start + batch_size}
+        )
+
+
+def create_ann_index(conn: Connection, mode: str) -> bool:
+    """
+    모드의 ANN 인덱스 생성 (matryoshka는 embedding_short를 먼저 채움)
+
+    Returns:
+        인덱스가 존재하게 되었는지 (pgvector 버전이 낮아 건너뛰면 False)
+
+    Raises:
+        ValueError: 지원하지 않는 모드
+    """
+    if mode not in ANN_INDEXES:
+        raise ValueError(f"지원하지 않는 양자화 모드입니다: {mode}")
+    name, target = ANN_INDEXES[mode]
+    if mode != "none" and not supports_quantization(conn):
+        logger.warning(
+            "[VectorIndexes] pgvector %s 미만이라 %s 인덱스 생성을 건너뜁니다 (ALTER EXTENSION vector UPDATE 후 재실행)",
+            ".".join(map(str, PGVECTOR_QUANTIZATION_MIN_VERSION)),
+            name,
+        )
+        return False
+
+    if mode == "matryoshka":
+        backfill_short_embeddings(conn)
+    conn.execute(sa.text(
+        f"CREATE INDEX IF NOT EXISTS {name} ON document_embeddings USING hnsw ({target}) {_HNSW_WITH}"
+    ))
+    return True
+
+
+def drop_ann_index(conn: Connection, mode: str) -> None:
+    """모드의 ANN 인덱스 제거 (없으면 무시)"""
+    name, _ = ANN_INDEXES[mode]
+    conn.execute(sa.text(f"DROP INDEX IF EXISTS {name}"))
@@ -1,12 +1,22 @@
 """
 PostgreSQL + pgvector 벡터 스토어 관리
 """
+import hashlib
 import logging
-from typing import List, Dict, Optional
-from sqlalchemy import select, delete as sql_delete, func, cast, String
+import math
+from dataclasses import dataclass, field
+from typing import Any, List, Dict, Optional, Sequence, Tuple
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import select, delete as sql_delete, update as sql_update, func, cast, String, Float, literal, union_all, or_, text
+from sqlalchemy.dialects.postgresql import BIT, REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.document_embeddings import DocumentEmbedding
+from sqlalchemy.types import UserDefinedType
+from app.config import settings
+from app.models.document_embeddings import DocumentEmbedding, DocumentChunkLink
 from app.models.bot import Bot, BotStatus
+from app.core.retrieval_cache import retrieval_cache
+from app.core.local_vector_index import local_vector_index
+from app.core.near_duplicate import SimHashIndex, from_signed64, simhash, simhash_bands, to_signed64
 from app.core.exceptions import (
     VectorStoreConnectionError,
     VectorStoreQueryError,
@@ -15,6 +25,309 @@ from app.core.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# 어휘 검색용 텍스트 검색 설정 (기본 PostgreSQL에 한국어 설정이 없어 'simple' + 트라이그램 보완)
+FULLTEXT_CONFIG = "simple"
+
+SEARCH_MODE_SEMANTIC = "semantic"
+SEARCH_MODE_HYBRID = "hybrid"
+SEARCH_MODES = (SEARCH_MODE_SEMANTIC, SEARCH_MODE_HYBRID)
+
+# ANN 후보 단계 양자화 모드 (app.core.vector_indexes.ANN_INDEXES의 모드별 HNSW 인덱스와 대응)
+QUANTIZATION_NONE = "none"
+QUANTIZATION_HALFVEC = "halfvec"
+QUANTIZATION_BINARY = "binary"
+# 2단계 Matryoshka: 앞 256차원(재정규화) 인덱스로 후보 검색 → 1024차원 원본으로 재순위
+QUANTIZATION_MATRYOSHKA = "matryoshka"
+QUANTIZATION_MODES = (QUANTIZATION_NONE, QUANTIZATION_HALFVEC, QUANTIZATION_BINARY, QUANTIZATION_MATRYOSHKA)
+
+EMBEDDING_DIMENSIONS = DocumentEmbedding.embedding.type.dim
+SHORT_EMBEDDING_DIMENSIONS = DocumentEmbedding.embedding_short.type.dim
+HNSW_DEFAULT_EF_SEARCH = 40
+
+
+def matryoshka_prefix(embedding: Sequence[float], dimensions: int = SHORT_EMBEDDING_DIMENSIONS) -> List[float]:
+    """
+    Matryoshka 임베딩의 앞 dimensions 차원을 잘라 L2 재정규화
+
+    Titan Embeddings v2는 앞쪽 차원에 정보가 집중되도록 학습되어 있어
+    잘라낸 벡터로도 1단계 후보 검색이 가능합니다.
+    """
+    prefix = [float(value) for value in list(embedding)[:dimensions]]
+    norm = math.sqrt(sum(value * value for value in prefix))
+    if norm == 0:
+        return prefix
+    return [value / norm for value in prefix]
+
+
+# filter_dict 키 중 타입 컬럼으로 승격된 키 (그 외 키는 doc_metadata JSONB 포함 조건)
+# doc_metadata["document_id"]는 청크 ID이고, 원본 문서 ID는 source_document_id / document_id 컬럼입니다.
+METADATA_FILTER_COLUMNS = {
+    "document_id": DocumentEmbedding.chunk_id,
+    "chunk_id": DocumentEmbedding.chunk_id,
+    "user_uuid": DocumentEmbedding.user_uuid,
+    "file_type": DocumentEmbedding.file_type,
+    "page": DocumentEmbedding.page,
+    "bot_id": DocumentEmbedding.bot_id,
+}
+
+
+def _coerce_filter_value(column, value: Any) -> Any:
+    """승격 컬럼 타입에 맞게 필터 값 변환 (기존 문자열 비교 의미 유지)"""
+    if column is DocumentEmbedding.page:
+        return int(value)
+    return str(value)
+
+
+def source_document_condition(document_ids: Sequence[str]) -> Any:
+    """
+    원본 문서 조건 (document_id 컬럼 또는 유사 중복 링크)
+
+    유사 중복으로 다른 문서의 대표 청크에 연결된 청크도 해당 문서의 청크로 취급합니다.
+    """
+    document_ids = [str(document_id) for document_id in document_ids]
+    linked_ids = select(DocumentChunkLink.canonical_embedding_id).where(
+        DocumentChunkLink.document_id.in_(document_ids)
+    )
+    return or_(
+        DocumentEmbedding.document_id.in_(document_ids),
+        DocumentEmbedding.id.in_(linked_ids)
+    )
+
+
+def compile_metadata_filters(filter_dict: Optional[Dict[str, Any]]) -> List[Any]:
+    """
+    filter_dict를 인덱스를 쓰는 조건식 목록으로 변환
+
+    - source_document_id: document_id 컬럼 + 유사 중복 링크 (source_document_condition)
+    - 승격 키: B-tree 컬럼 비교 (리스트 값은 IN)
+    - 그 외 키: doc_metadata @> {"key": value} (GIN jsonb_path_ops, 리스트 값은 OR)
+      JSONB 포함 비교이므로 값의 타입(문자열/숫자)이 저장된 메타데이터와 같아야 합니다.
+    """
+    conditions: List[Any] = []
+    for key, value in (filter_dict or {}).items():
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        if key == "source_document_id":
+            conditions.append(source_document_condition(values))
+            continue
+        column = METADATA_FILTER_COLUMNS.get(key)
+        if column is not None:
+            coerced = [_coerce_filter_value(column, item) for item in values]
+            conditions.append(column.in_(coerced) if len(coerced) != 1 else column == coerced[0])
+            continue
+        containments = [DocumentEmbedding.doc_metadata.contains({key: item}) for item in values]
+        conditions.append(containments[0] if len(containments) == 1 else or_(*containments))
+    return conditions
+
+
+def hot_metadata_columns(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """저장할 메타데이터에서 승격 컬럼 값 추출"""
+    metadata = metadata or {}
+    page = metadata.get("page")
+    file_type = metadata.get("file_type")
+    return {
+        "chunk_id": metadata.get("document_id"),
+        "user_uuid": metadata.get("user_uuid"),
+        "file_type": str(file_type)[:20] if file_type is not None else None,
+        "page": int(page) if isinstance(page, int) or (isinstance(page, str) and page.isdigit()) else None,
+    }
+
+
+def chunk_content_hash(chunk_text: str) -> str:
+    """청크 본문 해시 (alembic a5b6c7d8e9f0 백필 식과 동일: sha256(UTF-8) hex)"""
+    return hashlib.sha256(chunk_text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class DocumentSyncPlan:
+    """
+    문서 재수집 계획 (새 청크 목록 vs 저장된 청크 해시 비교 결과)
+
+    - keep: 새 청크 인덱스 → 재사용할 기존 행 id (본문 동일, 임베딩 재사용)
+    - embed_indices: 임베딩이 필요한 새 청크 인덱스
+    - delete_ids: 새 청크 목록에 없는 기존 행 id
+    - links: 유사 중복 청크 인덱스 → (대표 행 id, 해밍 거리)
+    - new_links: 유사 중복 청크 인덱스 → (같은 문서의 대표 신규 청크 인덱스, 해밍 거리)
+    - copies: 새 청크 인덱스 → 본문이 같은 범위 내 다른 행의 임베딩 (재업로드 등, 새 행으로 복사)
+    """
+
+    source_document_id: str
+    keep: Dict[int, int] = field(default_factory=dict)
+    embed_indices: List[int] = field(default_factory=list)
+    delete_ids: List[int] = field(default_factory=list)
+    links: Dict[int, Tuple[int, int]] = field(default_factory=dict)
+    new_links: Dict[int, Tuple[int, int]] = field(default_factory=dict)
+    copies: Dict[int, List[float]] = field(default_factory=dict)
+    signatures: Dict[int, int] = field(default_factory=dict)
+
+    def signature(self, index: int, documents: Sequence[str]) -> int:
+        """청크 SimHash 서명 (계산 결과 캐시)"""
+        if index not in self.signatures:
+            self.signatures[index] = simhash(documents[index])
+        return self.signatures[index]
+
+
+def diff_chunk_hashes(
+    source_document_id: str,
+    existing: Sequence[Tuple[int, Optional[str]]],
+    documents: Sequence[str]
+) -> DocumentSyncPlan:
+    """
+    저장된 (행 id, content_hash) 목록과 새 청크 본문을 비교해 재수집 계획 생성
+
+    같은 본문이 여러 번 나오면 기존 행을 순서대로 하나씩 재사용합니다.
+    content_hash가 없는 행(해시 도입 전 행)은 재사용하지 않고 삭제 대상으로 둡니다.
+    """
+    available: Dict[str, List[int]] = {}
+    for row_id, content_hash in sorted(existing):
+        if content_hash:
+            available.setdefault(content_hash, []).append(row_id)
+
+    plan = DocumentSyncPlan(source_document_id=source_document_id)
+    for index, document in enumerate(documents):
+        row_ids = available.get(chunk_content_hash(document))
+        if row_ids:
+            plan.keep[index] = row_ids.pop(0)
+        else:
+            plan.embed_indices.append(index)
+
+    kept_ids = set(plan.keep.values())
+    plan.delete_ids = [row_id for row_id, _ in sorted(existing) if row_id not in kept_ids]
+    return plan
+
+
+def copy_scope_embeddings(
+    plan: DocumentSyncPlan,
+    documents: Sequence[str],
+    embeddings_by_hash: Dict[str, List[float]]
+) -> None:
+    """
+    임베딩 예정 청크 중 범위 내 다른 문서에 본문이 같은 행이 있으면 그 임베딩을 복사 (plan을 직접 갱신)
+
+    업로드마다 새 document_id가 발급되므로 같은 파일을 다시 올려도 문서 단위 비교(diff_chunk_hashes)로는
+    재사용할 행이 없습니다. 본문이 같으면 임베딩도 같으므로 임베딩 API 호출 없이 새 행을 만듭니다.
+    """
+    remaining: List[int] = []
+    for index in plan.embed_indices:
+        embedding = embeddings_by_hash.get(chunk_content_hash(documents[index]))
+        if embedding is None:
+            remaining.append(index)
+        else:
+            plan.copies[index] = embedding
+    plan.embed_indices = remaining
+
+
+def link_identical_chunks(
+    plan: DocumentSyncPlan,
+    documents: Sequence[str],
+    candidates: Sequence[Tuple[int, Optional[str]]]
+) -> None:
+    """
+    임베딩 예정 청크 중 본문 해시가 같은 청크만 대표 청크에 연결 (plan을 직접 갱신, 해밍 거리 0으로 기록)
+
+    SimHash 거리가 0이어도 본문은 다를 수 있으므로 (예: 숫자 하나 변경) 기본 모드는 해시로 비교합니다.
+    대표 후보는 link_near_duplicates와 같습니다 (candidates: (행 id, content_hash)).
+    """
+    canonical: Dict[str, Tuple[str, int]] = {}
+    for row_id, content_hash in sorted(candidates):
+        if content_hash:
+            canonical.setdefault(content_hash, ("row", row_id))
+    for chunk_index, row_id in sorted(plan.keep.items()):
+        canonical.setdefault(chunk_content_hash(documents[chunk_index]), ("row", row_id))
+
+    remaining: List[int] = []
+    for chunk_index in plan.embed_indices:
+        content_hash = chunk_content_hash(documents[chunk_index])
+        match = canonical.get(content_hash)
+        if match is None:
+            remaining.append(chunk_index)
+            canonical[content_hash] = ("new", chunk_index)
+        elif match[0] == "row":
+            plan.links[chunk_index] = (match[1], 0)
+        else:
+            plan.new_links[chunk_index] = (match[1], 0)
+    plan.embed_indices = remaining
+
+
+def link_near_duplicates(
+    plan: DocumentSyncPlan,
+    documents: Sequence[str],
+    candidates: Sequence[Tuple[int, Optional[int]]],
+    max_distance: int
+) -> None:
+    """
+    임베딩 예정 청크 중 유사 중복을 대표 청크에 연결 (plan을 직접 갱신)
+
+    대표 후보는 범위 내 기존 행(candidates: (행 id, 부호 있는 simhash)), 이 문서에서 유지되는 행,
+    그리고 같은 문서에서 먼저 나온 신규 청크입니다 (반복되는 머리말/꼬리말 등).
+    """
+    index: SimHashIndex = SimHashIndex()
+    for row_id, value in sorted(candidates):
+        if value is not None:
+            index.add(("row", row_id), from_signed64(value))
+    for chunk_index, row_id in sorted(plan.keep.items()):
+        index.add(("row", row_id), plan.signature(chunk_index, documents))
+
+    remaining: List[int] = []
+    for chunk_index in plan.embed_indices:
+        signature = plan.signature(chunk_index, documents)
+        match = index.nearest(signature, max_distance)
+        if match is None:
+            remaining.append(chunk_index)
+            index.add(("new", chunk_index), signature)
+            continue
+        (kind, reference), distance = match
+        if kind == "row":
+            plan.links[chunk_index] = (reference, distance)
+        else:
+            plan.new_links[chunk_index] = (reference, distance)
+    plan.embed_indices = remaining
+
+
+class HalfVector(UserDefinedType):
+    """pgvector halfvec 타입 (pgvector 0.2.x 파이썬 패키지에 없어 CAST 대상으로만 정의)"""
+
+    cache_ok = True
+
+    def __init__(self, dim: int):
+        super().__init__()
+        self.dim = dim
+
+    def get_col_spec(self, **kw):
+        return f"HALFVEC({self.dim})"
+
+
+def reciprocal_rank_fusion(
+    rankings: Dict[str, Sequence[Any]],
+    k: int = 60
+) -> List[Dict[str, Any]]:
+    """
+    Reciprocal Rank Fusion (RRF)
+
+    검색 경로별 순위 목록을 score = Σ 1 / (k + rank) 로 병합합니다 (rank는 1부터).
+    점수 척도가 다른 코사인 거리와 ts_rank를 정규화 없이 합칠 수 있습니다.
+
+    Args:
+        rankings: 경로 이름 → 순위순 항목 ID 목록
+        k: RRF 상수
+
+    Returns:
+        [{"id", "score", "ranks": {경로: 순위}}] (점수 내림차순, 동점이면 최고 순위 우선)
+    """
+    fused: Dict[Any, Dict[str, Any]] = {}
+    for leg, ids in rankings.items():
+        for rank, item_id in enumerate(ids, start=1):
+            entry = fused.setdefault(item_id, {"id": item_id, "score": 0.0, "ranks": {}})
+            # 같은 경로에 중복 ID가 있으면 상위 순위만 반영
+            if leg in entry["ranks"]:
+                continue
+            entry["ranks"][leg] = rank
+            entry["score"] += 1.0 / (k + rank)
+
+    return sorted(
+        fused.values(),
+        key=lambda entry: (-entry["score"], min(entry["ranks"].values()))
+    )
+
 
 class VectorStore:
     """PostgreSQL + pgvector 벡터 스토어 클래스"""
@@ -67,6 +380,56 @@ class VectorStore:
         # user_uuid 필터링 제거 (작동하지 않음)
         return query
 
+    @staticmethod
+    def _apply_search_filters(query, document_ids: Optional[List[str]], filter_dict: Optional[Dict]):
+        """document_ids / 메타데이터 필터 적용 (search, hybrid_search 공용)"""
+        if document_ids:
+            query = query.where(source_document_condition(document_ids))
+
+        for condition in compile_metadata_filters(filter_dict):
+            query = query.where(condition)
+        return query
+
+    @staticmethod
+    def _requested_source_documents(document_ids: Optional[List[str]], filter_dict: Optional[Dict]) -> List[str]:
+        """검색 범위로 지정된 원본 문서 ID (document_ids + filter_dict의 source_document_id)"""
+        requested = [str(document_id) for document_id in document_ids or []]
+        value = (filter_dict or {}).get("source_document_id")
+        if value is not None:
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            requested.extend(str(item) for item in values)
+        return requested
+
+    async def _linked_chunks(
+        self,
+        db: AsyncSession,
+        row_ids: Sequence[int],
+        source_document_ids: Sequence[str]
+    ) -> Dict[int, DocumentChunkLink]:
+        """
+        검색 문서 범위에 중복 링크로만 포함된 대표 행 → 그 범위 문서의 연결 청크
+
+        대표 행은 다른 문서의 청크이므로 결과에는 연결 청크의 본문/청크 ID/메타데이터를 돌려줍니다.
+        """
+        if not row_ids or not source_document_ids:
+            return {}
+        links = (await db.execute(
+            select(DocumentChunkLink)
+            .join(DocumentEmbedding, DocumentEmbedding.id == DocumentChunkLink.canonical_embedding_id)
+            .where(DocumentChunkLink.canonical_embedding_id.in_(list(row_ids)))
+            .where(DocumentChunkLink.document_id.in_(list(source_document_ids)))
+            .where(or_(
+                DocumentEmbedding.document_id.is_(None),
+                DocumentEmbedding.document_id.not_in(list(source_document_ids))
+            ))
+            .order_by(DocumentChunkLink.id)
+        )).scalars().all()
+
+        linked: Dict[int, DocumentChunkLink] = {}
+        for link in links:
+            linked.setdefault(link.canonical_embedding_id, link)
+        return linked
+
     async def add_documents(
         self,
         ids: List[str],
@@ -114,31 +477,23 @@ class VectorStore:
                     f"user_uuid={first_metadata.get('user_uuid', 'NOT FOUND')}"
                 )
             
+            changed_document_ids = set()
             for doc_id, embedding, document, metadata in zip(ids, embeddings, documents, metadatas):
                 # source_document_id가 전달되지 않은 경우 metadata에서 document_id를 사용
                 source_doc_id = source_document_id or metadata.get("document_id")
+                if source_doc_id:
+                    changed_document_ids.add(source_doc_id)
                 if not source_doc_id:
                     logger.warning(
                         "[VectorStore] source_document_id가 비어 있습니다. "
                         "document_ids 필터링 시 검색이 실패할 수 있습니다."
                     )
 
-                metadata_copy = metadata.copy()
-                if source_doc_id:
-                    metadata_copy["source_document_id"] = source_doc_id
-                metadata_copy["document_id"] = doc_id
-
-                doc_embedding = DocumentEmbedding(
-                    bot_id=self.bot_id,
-                    document_id=source_doc_id,  # ← 중요: documents 테이블 연결
-                    chunk_text=document,
-                    chunk_index=metadata.get("chunk_index", 0),  # metadata에서 chunk_index 가져오기
-                    embedding=embedding,
-                    doc_metadata=metadata_copy
-                )
-                db.add(doc_embedding)
+                db.add(self._new_embedding_row(doc_id, embedding, document, metadata, source_doc_id))
 
             await db.commit()
+            # 커밋 이후 코퍼스 버전 증가 (이전 검색 결과 캐시 무효화)
+            await retrieval_cache.bump_corpus_version(changed_document_ids)
             logger.info(
                 f"벡터 스토어에 {len(ids)}개 문서 추가 완료 "
                 f"(bot_id={self.bot_id}, source_document_id={source_document_id})"
@@ -156,12 +511,319 @@ class VectorStore:
                 }
             )
 
+    def _new_embedding_row(
+        self,
+        doc_id: str,
+        embedding: List[float],
+        document: str,
+        metadata: Dict,
+        source_doc_id: Optional[str],
+        signature: Optional[int] = None
+    ) -> DocumentEmbedding:
+        """저장할 임베딩 행 생성 (add_documents, apply_document_sync 공용)"""
+        row_metadata = self._row_metadata(doc_id, metadata, source_doc_id)
+        return DocumentEmbedding(
+            bot_id=self.bot_id,
+            document_id=source_doc_id,  # ← 중요: documents 테이블 연결
+            chunk_text=document,
+            chunk_index=metadata.get("chunk_index", 0),  # metadata에서 chunk_index 가져오기
+            content_hash=chunk_content_hash(document),
+            **self._signature_columns(simhash(document) if signature is None else signature),
+            embedding=embedding,
+            embedding_short=matryoshka_prefix(embedding),
+            doc_metadata=row_metadata,
+            **hot_metadata_columns(row_metadata)
+        )
+
+    @staticmethod
+    def _signature_columns(signature: int) -> Dict[str, Any]:
+        return {"simhash": to_signed64(signature), "simhash_bands": simhash_bands(signature)}
+
+    @staticmethod
+    def _row_metadata(doc_id: str, metadata: Dict, source_doc_id: Optional[str]) -> Dict:
+        metadata_copy = metadata.copy()
+        if source_doc_id:
+            metadata_copy["source_document_id"] = source_doc_id
+        metadata_copy["document_id"] = doc_id
+        return metadata_copy
+
+    async def plan_document_sync(self, source_document_id: str, documents: List[str]) -> DocumentSyncPlan:
+        """
+        문서 재수집 계획 생성 (저장된 청크 해시와 새 청크 비교)
+
+        Args:
+            source_document_id: 원본 문서 ID (documents 테이블의 document_id)
+            documents: 새로 분할한 청크 텍스트 리스트
+
+        Returns:
+            DocumentSyncPlan (embed_indices의 청크만 임베딩하면 됨)
+        """
+        db = self._get_session()
+
+        try:
+            rows = (await db.execute(
+                select(DocumentEmbedding.id, DocumentEmbedding.content_hash)
+                .where(DocumentEmbedding.document_id == source_document_id)
+            )).all()
+        except Exception as e:
+            logger.error(f"청크 해시 조회 실패: {e}")
+            raise VectorStoreQueryError(
+                message="기존 청크 조회 중 오류가 발생했습니다",
+                details={"document_id": source_document_id, "error": str(e)}
+            )
+
+        plan = diff_chunk_hashes(source_document_id, [(row.id, row.content_hash) for row in rows], documents)
+        await self._copy_scope_embeddings(db, plan, documents)
+        logger.info(
+            f"[VectorStore] 재수집 계획: document_id={source_document_id}, "
+            f"유지={len(plan.keep)}, 복사={len(plan.copies)}, 임베딩={len(plan.embed_indices)}, "
+            f"삭제={len(plan.delete_ids)}"
+        )
+        return plan
+
+    def _scope_conditions(self) -> List[Any]:
+        """중복 비교 범위 (bot_id, 없으면 봇 없는 user_uuid 문서)"""
+        if self.bot_id:
+            return [DocumentEmbedding.bot_id == self.bot_id]
+        return [DocumentEmbedding.bot_id.is_(None), DocumentEmbedding.user_uuid == self.user_uuid]
+
+    async def _copy_scope_embeddings(self, db: AsyncSession, plan: DocumentSyncPlan, documents: List[str]) -> None:
+        """임베딩 예정 청크와 본문 해시가 같은 범위 내 행의 임베딩 조회 후 복사 (content_hash 인덱스 사용)"""
+        hashes = sorted({chunk_content_hash(documents[index]) for index in plan.embed_indices})
+        if not hashes:
+            return
+        query = (
+            select(DocumentEmbedding.content_hash, DocumentEmbedding.embedding)
+            .where(DocumentEmbedding.content_hash.in_(hashes))
+            .where(*self._scope_conditions())
+            .distinct(DocumentEmbedding.content_hash)
+            .order_by(DocumentEmbedding.content_hash, DocumentEmbedding.id)
+        )
+        try:
+            rows = (await db.execute(query)).all()
+        except Exception as e:
+            logger.error(f"범위 내 동일 청크 조회 실패: {e}")
+            raise VectorStoreQueryError(
+                message="기존 청크 조회 중 오류가 발생했습니다",
+                details={"document_id": plan.source_document_id, "error": str(e)}
+            )
+        copy_scope_embeddings(
+            plan, documents, {row.content_hash: [float(value) for value in row.embedding] for row in rows}
+        )
+
+    async def find_near_duplicates(
+        self,
+        plan: DocumentSyncPlan,
+        documents: List[str],
+        max_distance: Optional[int] = None
+    ) -> DocumentSyncPlan:
+        """
+        임베딩 예정 청크의 중복을 같은 범위(bot_id, 없으면 user_uuid)의 기존 청크에서 찾아 연결
+
+        - max_distance 0 (기본): 본문 해시가 같은 청크만 연결 (link_identical_chunks)
+        - 1 이상: SimHash 밴드가 하나 이상 같은 행을 GIN 인덱스로 조회해 해밍 거리 이내면 연결
+        """
+        max_distance = settings.ingest_dedup_max_hamming if max_distance is None else max_distance
+        exact = max_distance <= 0
+        if exact:
+            keys = sorted({chunk_content_hash(documents[index]) for index in plan.embed_indices})
+            column, key_condition = DocumentEmbedding.content_hash, DocumentEmbedding.content_hash.in_(keys)
+        else:
+            keys = sorted({
+                band
+                for index in plan.embed_indices
+                for band in simhash_bands(plan.signature(index, documents))
+            })
+            column, key_condition = DocumentEmbedding.simhash, DocumentEmbedding.simhash_bands.overlap(keys)
+        candidates: List[Tuple[int, Any]] = []
+
+        if keys:
+            db = self._get_session()
+            query = select(DocumentEmbedding.id, column).where(key_condition).where(*self._scope_conditions())
+            if plan.delete_ids:
+                query = query.where(DocumentEmbedding.id.not_in(plan.delete_ids))
+            query = query.order_by(DocumentEmbedding.id).limit(settings.ingest_dedup_max_candidates)
+
+            try:
+                candidates = [tuple(row) for row in (await db.execute(query)).all()]
+            except Exception as e:
+                logger.error(f"유사 중복 후보 조회 실패: {e}")
+                raise VectorStoreQueryError(
+                    message="유사 중복 후보 조회 중 오류가 발생했습니다",
+                    details={"document_id": plan.source_document_id, "error": str(e)}
+                )
+
+        if exact:
+            link_identical_chunks(plan, documents, candidates)
+        else:
+            link_near_duplicates(plan, documents, candidates, max_distance)
+        logger.info(
+            f"[VectorStore] 중복 연결: document_id={plan.source_document_id}, max_hamming={max_distance}, "
+            f"기존 청크 연결={len(plan.links)}, 문서 내 연결={len(plan.new_links)}, 후보={len(candidates)}"
+        )
+        return plan
+
+    async def _promote_linked_rows(self, db: AsyncSession, row_ids: List[int], exclude_document_id: str):
+        """
+        삭제할 대표 청크에 다른 문서의 중복 청크가 연결되어 있으면 행을 삭제하지 않고 그 문서로 승격
+
+        대표 청크의 임베딩을 그대로 쓰고(유사 중복이므로) 본문/메타데이터만 연결된 청크로 바꿉니다.
+
+        Returns:
+            (승격된 행 id 집합, 승격받은 문서 id 집합)
+        """
+        if not row_ids:
+            return set(), set()
+        links = (await db.execute(
+            select(DocumentChunkLink)
+            .where(DocumentChunkLink.canonical_embedding_id.in_(row_ids))
+            .where(DocumentChunkLink.document_id != exclude_document_id)
+            .order_by(DocumentChunkLink.id)
+        )).scalars().all()
+
+        promoted: Dict[int, DocumentChunkLink] = {}
+        for link in links:
+            promoted.setdefault(link.canonical_embedding_id, link)
+
+        for row_id, link in promoted.items():
+            await db.execute(
+                sql_update(DocumentEmbedding)
+                .where(DocumentEmbedding.id == row_id)
+                .values(
+                    document_id=link.document_id,
+                    chunk_index=link.chunk_index,
+                    chunk_text=link.chunk_text,
+                    content_hash=chunk_content_hash(link.chunk_text),
+                    doc_metadata=link.doc_metadata,
+                    **hot_metadata_columns(link.doc_metadata),
+                    **self._signature_columns(simhash(link.chunk_text))
+                )
+            )
+            await db.execute(sql_delete(DocumentChunkLink).where(DocumentChunkLink.id == link.id))
+
+        if promoted:
+            logger.info(f"[VectorStore] 대표 청크 승격: {len(promoted)}개 (삭제 대신 연결된 문서로 이동)")
+        return set(promoted), {link.document_id for link in promoted.values()}
+
+    async def apply_document_sync(
+        self,
+        plan: DocumentSyncPlan,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict],
+        embeddings: List[List[float]]
+    ) -> Dict[str, int]:
+        """
+        재수집 계획 적용 (삭제 / 기존 행 순서·메타데이터 갱신 / 신규 행·중복 연결 추가를 한 트랜잭션으로)
+
+        커밋 전까지 다른 세션은 이전 버전 문서를 그대로 보고, 커밋 후 문서 코퍼스 버전을
+        올려 검색 캐시·로컬 인덱스가 새 버전으로 교체되도록 합니다.
+
+        Args:
+            plan: plan_document_sync 결과
+            ids / documents / metadatas: 새 청크 전체 (add_documents와 같은 형식)
+            embeddings: plan.embed_indices 순서의 신규 청크 임베딩 (plan.copies는 복사한 임베딩 사용)
+
+        Returns:
+            {"kept": .., "embedded": .., "copied": .., "linked": .., "deleted": .., "promoted": ..}
+        """
+        if len(embeddings) != len(plan.embed_indices):
+            raise VectorStoreDocumentError(
+                message="신규 청크 수와 임베딩 수가 일치하지 않습니다",
+                details={"expected": len(plan.embed_indices), "actual": len(embeddings)}
+            )
+
+        db = self._get_session()
+        source_doc_id = plan.source_document_id
+
+        try:
+            # 이 문서의 이전 중복 연결은 매번 새로 계산
+            await db.execute(sql_delete(DocumentChunkLink).where(DocumentChunkLink.document_id == source_doc_id))
+
+            promoted_ids, promoted_documents = await self._promote_linked_rows(db, plan.delete_ids, source_doc_id)
+            delete_ids = [row_id for row_id in plan.delete_ids if row_id not in promoted_ids]
+            if delete_ids:
+                await db.execute(
+                    sql_delete(DocumentEmbedding).where(DocumentEmbedding.id.in_(delete_ids))
+                )
+
+            # 유지되는 행은 임베딩은 그대로 두고 순서/메타데이터만 새 청크 기준으로 갱신
+            if plan.keep:
+                await db.execute(
+                    sql_update(DocumentEmbedding),
+                    [
+                        {
+                            "id": row_id,
+                            "chunk_index": metadatas[index].get("chunk_index", index),
+                            "doc_metadata": row_metadata,
+                            **hot_metadata_columns(row_metadata),
+                            **self._signature_columns(plan.signature(index, documents))
+                        }
+                        for index, row_id in plan.keep.items()
+                        for row_metadata in [self._row_metadata(ids[index], metadatas[index], source_doc_id)]
+                    ]
+                )
+
+            new_rows: Dict[int, DocumentEmbedding] = {}
+            for index, embedding in [*zip(plan.embed_indices, embeddings), *plan.copies.items()]:
+                new_rows[index] = self._new_embedding_row(
+                    ids[index], embedding, documents[index], metadatas[index], source_doc_id,
+                    signature=plan.signature(index, documents)
+                )
+                db.add(new_rows[index])
+
+            if plan.links or plan.new_links:
+                await db.flush()  # 신규 대표 청크 id 확보
+                canonical_ids = {index: row_id for index, (row_id, _) in plan.links.items()}
+                canonical_ids.update({
+                    index: new_rows[canonical_index].id for index, (canonical_index, _) in plan.new_links.items()
+                })
+                distances = {index: distance for index, (_, distance) in {**plan.links, **plan.new_links}.items()}
+                for index in sorted(canonical_ids):
+                    db.add(DocumentChunkLink(
+                        document_id=source_doc_id,
+                        chunk_id=ids[index],
+                        canonical_embedding_id=canonical_ids[index],
+                        chunk_index=metadatas[index].get("chunk_index", index),
+                        chunk_text=documents[index],
+                        doc_metadata=self._row_metadata(ids[index], metadatas[index], source_doc_id),
+                        hamming_distance=distances[index]
+                    ))
+
+            await db.commit()
+            await retrieval_cache.bump_corpus_version([source_doc_id, *promoted_documents])
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"문서 재수집 적용 실패: {e}")
+            raise VectorStoreDocumentError(
+                message="문서 재수집 중 오류가 발생했습니다",
+                details={
+                    "bot_id": self.bot_id,
+                    "document_id": source_doc_id,
+                    "error": str(e)
+                }
+            )
+
+        stats = {
+            "kept": len(plan.keep),
+            "embedded": len(plan.embed_indices),
+            "copied": len(plan.copies),
+            "linked": len(plan.links) + len(plan.new_links),
+            "deleted": len(delete_ids),
+            "promoted": len(promoted_ids)
+        }
+        logger.info(f"벡터 스토어 재수집 완료: document_id={source_doc_id}, {stats}")
+        return stats
+
     async def search(
         self,
         query_embedding: List[float],
         top_k: int = 5,
         filter_dict: Optional[Dict] = None,
-        document_ids: Optional[List[str]] = None
+        document_ids: Optional[List[str]] = None,
+        include_embeddings: bool = False,
+        quantization: Optional[str] = None
     ) -> Dict:
         """
         pgvector 코사인 유사도 검색
@@ -171,43 +833,46 @@ class VectorStore:
             top_k: 반환할 결과 개수
             filter_dict: 메타데이터 필터
             document_ids: 특정 문서만 검색 (document_id 리스트)
+            include_embeddings: 저장된 임베딩도 반환할지 (재순위용)
+            quantization: ANN 후보 단계 모드 (none | halfvec | binary, 기본: 설정값)
 
         Returns:
-            ChromaDB 호환 형식의 결과
+            ChromaDB 호환 형식의 결과 (include_embeddings면 embeddings 포함)
         """
         db = self._get_session()
 
-        try:
-            # 코사인 거리를 직접 계산하는 쿼리 구성
-            # <=> 연산자: 코사인 거리 (0에 가까울수록 유사)
-            distance_expr = DocumentEmbedding.embedding.cosine_distance(query_embedding)
+        # 메타데이터 필터가 없는 문서 범위 검색은 로컬 인덱스 티어 우선 (처리 불가 시 None → Postgres)
+        if document_ids and not filter_dict and local_vector_index.enabled:
+            try:
+                local_results = await local_vector_index.search(
+                    db=db,
+                    document_ids=document_ids,
+                    query_embedding=query_embedding,
+                    top_k=top_k,
+                    include_embeddings=include_embeddings
+                )
+                if local_results is not None:
+                    logger.info(
+                        f"벡터 검색 완료(로컬 인덱스): user_uuid={self.user_uuid}, "
+                        f"{len(local_results['ids'][0])}개 결과"
+                    )
+                    return local_results
+            except Exception as e:
+                logger.warning(f"[VectorStore] 로컬 인덱스 검색 실패, Postgres로 검색: {e}")
 
-            query = select(
-                DocumentEmbedding,
-                distance_expr.label('distance')
+        try:
+            quantization = quantization or settings.vector_search_quantization
+            candidate_k = top_k * max(1, settings.vector_search_rescore_multiplier)
+            query = self._build_ann_query(
+                query_embedding=query_embedding,
+                top_k=top_k,
+                filter_dict=filter_dict,
+                document_ids=document_ids,
+                quantization=quantization,
+                candidate_k=candidate_k
             )
-
-            # document_id 필터링 처리
-            # TODO: user_uuid 필터링이 작동하지 않아 임시로 제거
-            # 추후 bot_id 기반 필터링으로 대체 필요
-            if document_ids:
-                # document_ids 필터링만 적용
-                query = query.where(DocumentEmbedding.document_id.in_(document_ids))
-            # user_uuid 필터링 제거 (작동하지 않음)
-
-            # 메타데이터 필터 적용
-            if filter_dict:
-                for key, value in filter_dict.items():
-                    # SQLAlchemy 2.0+ 호환: .astext 대신 cast 사용
-                    field = cast(DocumentEmbedding.doc_metadata[key], String)
-
-                    if isinstance(value, list):
-                        query = query.where(field.in_([str(v) for v in value]))
-                    else:
-                        query = query.where(field == str(value))
-
-            # 거리순 정렬 및 top_k 제한
-            query = query.order_by(distance_expr).limit(top_k)
+            if quantization != QUANTIZATION_NONE:
+                await self._ensure_ef_search(db, candidate_k)
 
             # 디버깅: 쿼리 조건 로깅
             logger.info(
@@ -234,7 +899,7 @@ class VectorStore:
                     count_with_filter = select(func.count(DocumentEmbedding.id)).where(
                         DocumentEmbedding.document_id.in_(document_ids)
                     ).where(
-                        cast(DocumentEmbedding.doc_metadata["user_uuid"], String) == self.user_uuid
+                        DocumentEmbedding.user_uuid == self.user_uuid
                     )
                     filtered_count = (await db.execute(count_with_filter)).scalar()
                     logger.warning(
@@ -260,13 +925,20 @@ class VectorStore:
             documents = []
             metadatas = []
             distances = []
+            embeddings = []
 
+            linked = await self._linked_chunks(
+                db, [result.id for result, _ in results], self._requested_source_documents(document_ids, filter_dict)
+            )
             for result, distance in results:
-                doc_id = result.doc_metadata.get("document_id", str(result.id))
-                ids.append(doc_id)
-                documents.append(result.chunk_text)
-                metadatas.append(result.doc_metadata)
+                link = linked.get(result.id)
+                metadata = (link.doc_metadata if link else result.doc_metadata) or {}
+                ids.append(metadata.get("document_id", str(result.id)))
+                documents.append(link.chunk_text if link else result.chunk_text)
+                metadatas.append(metadata)
                 distances.append(float(distance))
+                if include_embeddings:
+                    embeddings.append(result.embedding)
 
             # 유사도 점수 로깅 (거리 값을 유사도로 변환하여 출력)
             if len(results) > 0:
@@ -280,12 +952,15 @@ class VectorStore:
             else:
                 logger.info(f"벡터 검색 완료: user_uuid={self.user_uuid}, {len(results)}개 결과")
 
-            return {
+            search_results = {
                 "ids": [ids],
                 "documents": [documents],
                 "metadatas": [metadatas],
                 "distances": [distances]
             }
+            if include_embeddings:
+                search_results["embeddings"] = [embeddings]
+            return search_results
 
         except Exception as e:
             logger.error(f"벡터 검색 실패: {e}")
@@ -298,12 +973,274 @@ class VectorStore:
                 }
             )
 
+    @staticmethod
+    def _ann_distance_expr(query_embedding: List[float], quantization: str):
+        """
+        ANN 정렬용 거리 표현식 (양자화 모드는 표현식 인덱스와 같은 형태로 작성)
+
+        - none: embedding <=> q (float32 HNSW)
+        - halfvec: embedding::halfvec(d) <=> q::halfvec(d)
+        - binary: binary_quantize(embedding)::bit(d) <~> binary_quantize(q) (해밍 거리)
+        - matryoshka: embedding_short <=> normalize(q[:256])
+        """
+        if quantization == QUANTIZATION_HALFVEC:
+            query_vector = cast(literal(query_embedding, Vector(EMBEDDING_DIMENSIONS)), HalfVector(EMBEDDING_DIMENSIONS))
+            return cast(DocumentEmbedding.embedding, HalfVector(EMBEDDING_DIMENSIONS)).op("<=>", return_type=Float)(
+                query_vector
+            )
+        if quantization == QUANTIZATION_MATRYOSHKA:
+            return DocumentEmbedding.embedding_short.cosine_distance(matryoshka_prefix(query_embedding))
+        if quantization == QUANTIZATION_BINARY:
+            query_vector = cast(literal(query_embedding, Vector(EMBEDDING_DIMENSIONS)), Vector(EMBEDDING_DIMENSIONS))
+            return cast(
+                func.binary_quantize(DocumentEmbedding.embedding), BIT(EMBEDDING_DIMENSIONS)
+            ).op("<~>", return_type=Float)(func.binary_quantize(query_vector))
+        return DocumentEmbedding.embedding.cosine_distance(query_embedding)
+
+    def _build_ann_query(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filter_dict: Optional[Dict] = None,
+        document_ids: Optional[List[str]] = None,
+        quantization: str = "none",
+        candidate_k: Optional[int] = None
+    ):
+        """
+        벡터 검색 쿼리 구성
+
+        양자화 모드에서는 양자화 인덱스로 candidate_k개 후보를 고른 뒤
+        원본 float32 벡터의 코사인 거리로 재점수해 top_k를 반환합니다.
+        """
+        # 코사인 거리를 직접 계산하는 쿼리 구성
+        # <=> 연산자: 코사인 거리 (0에 가까울수록 유사)
+        distance_expr = DocumentEmbedding.embedding.cosine_distance(query_embedding)
+
+        if quantization == QUANTIZATION_NONE:
+            query = select(
+                DocumentEmbedding,
+                distance_expr.label('distance')
+            )
+            # document_id / 메타데이터 필터링 처리
+            # TODO: user_uuid 필터링이 작동하지 않아 임시로 제거
+            # 추후 bot_id 기반 필터링으로 대체 필요
+            query = self._apply_search_filters(query, document_ids, filter_dict)
+            # 거리순 정렬 및 top_k 제한
+            return query.order_by(distance_expr).limit(top_k)
+
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"지원하지 않는 양자화 모드입니다: {quantization}")
+
+        ann_expr = self._ann_distance_expr(query_embedding, quantization)
+        candidates = self._apply_search_filters(select(DocumentEmbedding.id), document_ids, filter_dict)
+        candidates = candidates.order_by(ann_expr).limit(max(candidate_k or top_k, top_k)).subquery("ann_candidates")
+
+        return (
+            select(DocumentEmbedding, distance_expr.label('distance'))
+            .join(candidates, DocumentEmbedding.id == candidates.c.id)
+            .order_by(distance_expr)
+            .limit(top_k)
+        )
+
+    @staticmethod
+    async def _ensure_ef_search(db: AsyncSession, candidate_k: int) -> None:
+        """HNSW 탐색 폭(기본 40)이 후보 수보다 작으면 현재 트랜잭션에서만 확장"""
+        if candidate_k > HNSW_DEFAULT_EF_SEARCH:
+            await db.execute(text(f"SET LOCAL hnsw.ef_search = {int(candidate_k)}"))
+
+    def _build_hybrid_query(
+        self,
+        query_embedding: List[float],
+        query_text: str,
+        candidate_k: int,
+        filter_dict: Optional[Dict] = None,
+        document_ids: Optional[List[str]] = None,
+        include_embeddings: bool = False,
+        quantization: str = "none"
+    ):
+        """
+        벡터(ANN) 경로와 어휘 경로를 UNION ALL 한 단일 쿼리 구성
+
+        - semantic: 코사인 거리순 상위 candidate_k (HNSW 인덱스)
+        - lexical: chunk_tsv @@ websearch_to_tsquery 또는 트라이그램 word_similarity(%>) 매칭,
+          ts_rank_cd + word_similarity 순 상위 candidate_k (GIN 인덱스)
+        두 경로 모두 코사인 거리를 함께 조회해 similarity 계산에 사용합니다.
+        """
+        distance_expr = DocumentEmbedding.embedding.cosine_distance(query_embedding)
+        query_param = literal(query_text, String)
+        ts_query = func.websearch_to_tsquery(literal(FULLTEXT_CONFIG, REGCONFIG), query_param)
+        lexical_score = (
+            func.ts_rank_cd(DocumentEmbedding.chunk_tsv, ts_query)
+            + func.word_similarity(query_param, DocumentEmbedding.chunk_text)
+        )
+
+        extra_columns = [DocumentEmbedding.embedding.label("embedding")] if include_embeddings else []
+
+        semantic_leg = select(
+            DocumentEmbedding.id.label("id"),
+            DocumentEmbedding.chunk_text.label("chunk_text"),
+            DocumentEmbedding.doc_metadata.label("doc_metadata"),
+            distance_expr.label("distance"),
+            literal(0.0).label("lexical_score"),
+            literal(SEARCH_MODE_SEMANTIC, String).label("leg"),
+            *extra_columns
+        )
+        semantic_leg = self._apply_search_filters(semantic_leg, document_ids, filter_dict)
+        # 양자화 모드면 양자화 인덱스로 후보를 고르고, 경로 내 순위는 함께 조회한 원본 거리로 다시 정렬
+        ann_expr = self._ann_distance_expr(query_embedding, quantization)
+        semantic_leg = semantic_leg.order_by(ann_expr).limit(candidate_k).subquery("semantic_leg")
+
+        lexical_leg = select(
+            DocumentEmbedding.id.label("id"),
+            DocumentEmbedding.chunk_text.label("chunk_text"),
+            DocumentEmbedding.doc_metadata.label("doc_metadata"),
+            distance_expr.label("distance"),
+            lexical_score.label("lexical_score"),
+            literal("lexical", String).label("leg"),
+            *extra_columns
+        ).where(
+            or_(
+                DocumentEmbedding.chunk_tsv.bool_op("@@")(ts_query),
+                DocumentEmbedding.chunk_text.bool_op("%>")(query_param)
+            )
+        )
+        lexical_leg = self._apply_search_filters(lexical_leg, document_ids, filter_dict)
+        lexical_leg = lexical_leg.order_by(lexical_score.desc()).limit(candidate_k).subquery("lexical_leg")
+
+        return union_all(select(semantic_leg), select(lexical_leg))
+
+    async def hybrid_search(
+        self,
+        query_embedding: List[float],
+        query_text: str,
+        top_k: int = 5,
+        filter_dict: Optional[Dict] = None,
+        document_ids: Optional[List[str]] = None,
+        candidate_k: Optional[int] = None,
+        rrf_k: int = 60,
+        include_embeddings: bool = False
+    ) -> Dict:
+        """
+        하이브리드 검색 (어휘 + 벡터, Reciprocal Rank Fusion)
+
+        두 검색 경로를 하나의 UNION ALL 쿼리로 보내 DB 안에서 함께 실행하고
+        (AsyncSession은 동시 쿼리를 지원하지 않으므로 왕복 1회로 처리),
+        경로별 순위를 RRF로 병합합니다.
+
+        Args:
+            query_embedding: 쿼리 임베딩 벡터
+            query_text: 어휘 검색용 원문 쿼리
+            top_k: 반환할 결과 개수
+            filter_dict: 메타데이터 필터
+            document_ids: 특정 문서만 검색 (document_id 리스트)
+            candidate_k: 경로별 후보 개수 (기본: top_k * 4)
+            rrf_k: RRF 상수
+            include_embeddings: 저장된 임베딩도 반환할지 (재순위용)
+
+        Returns:
+            ChromaDB 호환 형식의 결과 + rrf_scores, match_sources
+        """
+        if not query_text or not query_text.strip():
+            return await self.search(
+                query_embedding=query_embedding,
+                top_k=top_k,
+                filter_dict=filter_dict,
+                document_ids=document_ids,
+                include_embeddings=include_embeddings
+            )
+
+        db = self._get_session()
+        candidate_k = max(candidate_k or top_k * 4, top_k)
+
+        try:
+            query = self._build_hybrid_query(
+                query_embedding=query_embedding,
+                query_text=query_text.strip(),
+                candidate_k=candidate_k,
+                filter_dict=filter_dict,
+                document_ids=document_ids,
+                include_embeddings=include_embeddings,
+                quantization=settings.vector_search_quantization
+            )
+            if settings.vector_search_quantization != QUANTIZATION_NONE:
+                await self._ensure_ef_search(db, candidate_k)
+            rows = (await db.execute(query)).mappings().all()
+
+            rows_by_id: Dict[int, Any] = {}
+            legs: Dict[str, List[Any]] = {SEARCH_MODE_SEMANTIC: [], "lexical": []}
+            for row in rows:
+                rows_by_id.setdefault(row["id"], row)
+                legs[row["leg"]].append(row)
+
+            # UNION ALL 결과는 순서가 보장되지 않으므로 경로별로 다시 정렬
+            rankings = {
+                SEARCH_MODE_SEMANTIC: [
+                    row["id"] for row in sorted(legs[SEARCH_MODE_SEMANTIC], key=lambda r: float(r["distance"]))
+                ],
+                "lexical": [
+                    row["id"] for row in sorted(legs["lexical"], key=lambda r: -float(r["lexical_score"]))
+                ],
+            }
+            fused = reciprocal_rank_fusion(rankings, k=rrf_k)[:top_k]
+
+            ids = []
+            documents = []
+            metadatas = []
+            distances = []
+            rrf_scores = []
+            match_sources = []
+            embeddings = []
+
+            linked = await self._linked_chunks(
+                db, [entry["id"] for entry in fused], self._requested_source_documents(document_ids, filter_dict)
+            )
+            for entry in fused:
+                row = rows_by_id[entry["id"]]
+                link = linked.get(row["id"])
+                metadata = (link.doc_metadata if link else row["doc_metadata"]) or {}
+                ids.append(metadata.get("document_id", str(row["id"])))
+                documents.append(link.chunk_text if link else row["chunk_text"])
+                metadatas.append(metadata)
+                distances.append(float(row["distance"]))
+                rrf_scores.append(entry["score"])
+                match_sources.append(sorted(entry["ranks"].keys()))
+                if include_embeddings:
+                    embeddings.append(row["embedding"])
+
+            logger.info(
+                f"하이브리드 검색 완료: user_uuid={self.user_uuid}, {len(fused)}개 결과 "
+                f"(semantic 후보 {len(rankings[SEARCH_MODE_SEMANTIC])}개, lexical 후보 {len(rankings['lexical'])}개)"
+            )
+
+            search_results = {
+                "ids": [ids],
+                "documents": [documents],
+                "metadatas": [metadatas],
+                "distances": [distances],
+                "rrf_scores": [rrf_scores],
+                "match_sources": [match_sources]
+            }
+            if include_embeddings:
+                search_results["embeddings"] = [embeddings]
+            return search_results
+
+        except Exception as e:
+            logger.error(f"하이브리드 검색 실패: {e}")
+            raise VectorStoreQueryError(
+                message="하이브리드 검색 중 오류가 발생했습니다",
+                details={
+                    "user_uuid": self.user_uuid,
+                    "top_k": top_k,
+                    "error": str(e)
+                }
+            )
+
     async def get_document(self, document_id: str) -> Optional[Dict]:
         """
         문서 ID로 문서 조회
 
         Args:
-            document_id: 조회할 문서 ID (metadata.document_id)
+            document_id: 조회할 청크 ID (metadata.document_id, 예: {문서ID}_chunk_0)
 
         Returns:
             문서 정보 딕셔너리 또는 None
@@ -311,10 +1248,8 @@ class VectorStore:
         db = self._get_session()
 
         try:
-            # SQLAlchemy 2.0+ 호환: .astext 대신 cast 사용
-            query = select(DocumentEmbedding).where(
-                cast(DocumentEmbedding.doc_metadata["document_id"], String) == document_id
-            )
+            # 청크 ID 승격 컬럼 조회 (B-tree 인덱스)
+            query = select(DocumentEmbedding).where(DocumentEmbedding.chunk_id == document_id)
 
             if self.bot_id:
                 query = query.where(DocumentEmbedding.bot_id == self.bot_id)
@@ -329,6 +1264,17 @@ class VectorStore:
                     "document": result.chunk_text,
                     "metadata": result.doc_metadata
                 }
+
+            # 유사 중복으로 대표 청크에 연결된 청크
+            link = (await db.execute(
+                select(DocumentChunkLink).where(DocumentChunkLink.chunk_id == document_id).limit(1)
+            )).scalars().first()
+            if link:
+                return {
+                    "id": document_id,
+                    "document": link.chunk_text,
+                    "metadata": link.doc_metadata
+                }
             return None
 
         except Exception as e:
@@ -347,25 +1293,30 @@ class VectorStore:
         문서 삭제 (해당 document_id의 모든 청크 삭제)
 
         Args:
-            document_id: 삭제할 문서 ID (metadata.document_id)
+            document_id: 삭제할 원본 문서 ID (documents 테이블의 document_id)
         """
         db = self._get_session()
 
         try:
-            # SQLAlchemy 2.0+ 호환: .astext 대신 cast 사용
-            delete_stmt = sql_delete(DocumentEmbedding).where(
-                cast(DocumentEmbedding.doc_metadata["document_id"], String) == document_id
-            )
+            # 원본 문서 ID 컬럼 조회 (B-tree 인덱스, 메타데이터 JSON 스캔 없음)
+            ids_query = select(DocumentEmbedding.id).where(DocumentEmbedding.document_id == document_id)
 
             if self.bot_id:
-                delete_stmt = delete_stmt.where(DocumentEmbedding.bot_id == self.bot_id)
+                ids_query = ids_query.where(DocumentEmbedding.bot_id == self.bot_id)
 
-            delete_stmt = self._apply_user_filter(delete_stmt)
+            ids_query = self._apply_user_filter(ids_query)
+            row_ids = list((await db.execute(ids_query)).scalars().all())
 
-            result = await db.execute(delete_stmt)
+            # 이 문서의 중복 연결 삭제, 다른 문서가 연결된 대표 청크는 삭제 대신 승격
+            await db.execute(sql_delete(DocumentChunkLink).where(DocumentChunkLink.document_id == document_id))
+            promoted_ids, promoted_documents = await self._promote_linked_rows(db, row_ids, document_id)
+            delete_ids = [row_id for row_id in row_ids if row_id not in promoted_ids]
+            if delete_ids:
+                await db.execute(sql_delete(DocumentEmbedding).where(DocumentEmbedding.id.in_(delete_ids)))
 
-            deleted_count = result.rowcount
+            deleted_count = len(delete_ids)
             await db.commit()
+            await retrieval_cache.bump_corpus_version([document_id, *promoted_documents])
 
             logger.info(f"문서 삭제 완료: {document_id} ({deleted_count}개 청크)")
 
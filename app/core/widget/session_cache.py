@@ -0,0 +1,180 @@
+"""
+Widget 세션 principal 캐시
+
+위젯 메시지마다 WidgetSession(+deployment) → Bot(+User)를 조회하던 검증 경로를
+session_token_hash 키의 principal 캐시로 대체합니다.
+
+- 로컬 LRU(짧은 TTL) + Redis(세션 만료 시각까지) 2단 캐시
+- 봇 단위 인덱스(Redis set)로 배포 변경/봇 수정/세션 폐기 시 일괄 무효화
+  (다른 레플리카의 로컬 티어는 widget_session_cache_local_ttl_sec 이내에 반영)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WidgetSessionPrincipal:
+    """세션 검증 결과 (DB 재조회 없이 메시지 처리에 필요한 정보)"""
+
+    session_id: str
+    deployment_id: str
+    bot_pk: int
+    bot_id: str
+    owner_uuid: Optional[str]
+    expires_at: datetime
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        return (now or datetime.now(timezone.utc)) > self.expires_at
+
+    def to_payload(self) -> Dict[str, Any]:
+        payload = asdict(self)
+        payload["expires_at"] = self.expires_at.isoformat()
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "WidgetSessionPrincipal":
+        return cls(
+            session_id=str(payload["session_id"]),
+            deployment_id=str(payload["deployment_id"]),
+            bot_pk=int(payload["bot_pk"]),
+            bot_id=str(payload["bot_id"]),
+            owner_uuid=payload.get("owner_uuid"),
+            expires_at=datetime.fromisoformat(payload["expires_at"]),
+        )
+
+
+class WidgetSessionCache:
+    """session_token_hash → WidgetSessionPrincipal 캐시"""
+
+    def __init__(
+        self,
+        redis: Any = None,
+        enabled: Optional[bool] = None,
+        prefix: Optional[str] = None,
+        local_max_entries: Optional[int] = None,
+        local_ttl_sec: Optional[float] = None,
+    ):
+        if redis is None:
+            from app.core.redis_client import redis_client
+
+            redis = redis_client
+        self.redis = redis
+        self.enabled = settings.widget_session_cache_enabled if enabled is None else enabled
+        self.prefix = prefix or settings.widget_session_cache_prefix
+        self.local_max_entries = local_max_entries or settings.widget_session_cache_local_max_entries
+        self.local_ttl_sec = (
+            settings.widget_session_cache_local_ttl_sec if local_ttl_sec is None else local_ttl_sec
+        )
+        # token_hash -> (로컬 만료 시각, principal)
+        self._local: "OrderedDict[str, tuple[float, WidgetSessionPrincipal]]" = OrderedDict()
+
+    @property
+    def _redis_available(self) -> bool:
+        return getattr(self.redis, "redis", None) is not None
+
+    def _key(self, token_hash: str) -> str:
+        return f"{self.prefix}:{token_hash}"
+
+    def _bot_index_key(self, bot_id: str) -> str:
+        return f"{self.prefix}:bot:{bot_id}"
+
+    async def get(self, token_hash: str, session_id: Any) -> Optional[WidgetSessionPrincipal]:
+        """
+        principal 조회 (요청의 session_id와 일치하고 만료되지 않은 경우에만 반환)
+        """
+        if not self.enabled:
+            return None
+
+        principal = None
+        local = self._local.get(token_hash)
+        if local is not None:
+            expires_at, cached = local
+            if expires_at > time.monotonic():
+                self._local.move_to_end(token_hash)
+                principal = cached
+            else:
+                self._local.pop(token_hash, None)
+
+        if principal is None and self._redis_available:
+            payload = await self.redis.get(self._key(token_hash))
+            if isinstance(payload, dict):
+                try:
+                    principal = WidgetSessionPrincipal.from_payload(payload)
+                except (KeyError, TypeError, ValueError):
+                    principal = None
+                if principal is not None:
+                    self._store_local(token_hash, principal)
+
+        if principal is None:
+            return None
+        if principal.session_id != str(session_id) or principal.is_expired():
+            return None
+        return principal
+
+    async def set(self, token_hash: str, principal: WidgetSessionPrincipal) -> None:
+        if not self.enabled:
+            return
+        remaining = int((principal.expires_at - datetime.now(timezone.utc)).total_seconds())
+        if remaining <= 0:
+            return
+        self._store_local(token_hash, principal)
+        if self._redis_available:
+            ttl = min(remaining, settings.widget_session_cache_ttl_sec)
+            index_key = self._bot_index_key(principal.bot_id)
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.set(self._key(token_hash), json.dumps(principal.to_payload(), ensure_ascii=False), ex=ttl)
+                    pipe.sadd(index_key, token_hash)
+                    pipe.expire(index_key, settings.widget_session_cache_ttl_sec)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"[WidgetSessionCache] Redis 저장 실패: {e}")
+
+    async def invalidate_token(self, token_hash: str) -> None:
+        """세션 하나 무효화 (세션 폐기/종료 시)"""
+        self._local.pop(token_hash, None)
+        if self._redis_available:
+            await self.redis.delete(self._key(token_hash))
+
+    async def invalidate_bot(self, bot_id: Optional[str]) -> None:
+        """봇의 모든 세션 principal 무효화 (배포 변경/봇 수정/삭제 시)"""
+        if not bot_id:
+            return
+        for token_hash, (_, principal) in list(self._local.items()):
+            if principal.bot_id == bot_id:
+                self._local.pop(token_hash, None)
+
+        if not self._redis_available:
+            return
+        index_key = self._bot_index_key(bot_id)
+        try:
+            token_hashes = await self.redis.redis.smembers(index_key)
+            keys = [self._key(token_hash) for token_hash in token_hashes]
+            await self.redis.delete(*keys, index_key)
+            logger.info(f"[WidgetSessionCache] 봇 세션 캐시 무효화: bot_id={bot_id}, sessions={len(keys)}")
+        except Exception as e:
+            logger.warning(f"[WidgetSessionCache] 봇 세션 캐시 무효화 실패: {e}")
+
+    def _store_local(self, token_hash: str, principal: WidgetSessionPrincipal) -> None:
+        self._local[token_hash] = (time.monotonic() + self.local_ttl_sec, principal)
+        self._local.move_to_end(token_hash)
+        while len(self._local) > self.local_max_entries:
+            self._local.popitem(last=False)
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+
+widget_session_cache = WidgetSessionCache()
@@ -14,6 +14,7 @@ from app.schemas.workflow import NodePortSchema, PortDefinition, PortType
 from app.core.workflow.variable_pool import VariablePool
 from app.core.workflow.service_container import ServiceContainer
 from app.core.workflow.base_node import NodeStatus, NodeExecutionResult
+from app.core.workflow.node_cache import NodeCachePolicy
 import logging
 
 logger = logging.getLogger(__name__)
@@ -246,6 +247,31 @@ class BaseNodeV2(ABC):
         """
         return []
 
+    def get_cache_policy(self) -> Optional[NodeCachePolicy]:
+        """
+        노드 출력 캐시 정책 (opt-in)
+
+        입력이 같으면 출력이 같은 노드만 정책을 반환해야 합니다.
+
+        Returns:
+            NodeCachePolicy 또는 None (캐시하지 않음, 기본값)
+        """
+        return None
+
+    def get_cache_key_inputs(self, context: NodeExecutionContext) -> Optional[Dict[str, Any]]:
+        """
+        캐시 키에 포함할 입력 값
+
+        기본값은 executor가 준비한 입력 포트 값입니다.
+        variable_pool에서 직접 값을 읽는 노드는 읽는 값을 모두 포함하도록 재정의해야 하며,
+        None을 반환하면 이번 실행은 캐시하지 않습니다.
+        """
+        return dict(context.metadata.get("prepared_inputs") or {})
+
+    def should_cache_output(self, outputs: Dict[str, Any]) -> bool:
+        """실행 결과를 캐시에 저장할지 여부 (실패 결과 제외 등)"""
+        return True
+
     # ========== 래퍼 메서드 (기존 시스템과 호환) ==========
 
     async def execute(
@@ -266,10 +292,25 @@ class BaseNodeV2(ABC):
         try:
             self.set_status(NodeStatus.RUNNING)
 
+            # 출력 캐시 조회 (정책을 선언한 노드만)
+            policy = self.get_cache_policy()
+            output_cache = context.get_service("node_output_cache") if policy else None
+            cache_key = None
+            if output_cache is not None:
+                cache_key = await output_cache.build_key(self, policy, context)
+                cached = await output_cache.get(cache_key, policy) if cache_key else None
+                if cached is not None:
+                    return self._complete_from_cache(context, cached)
+
             # V2 실행
             outputs = await self.execute_v2(context)
             edge_handles = context.consume_edge_handles()
 
+            if cache_key and self.should_cache_output(outputs):
+                await output_cache.set(cache_key, policy, outputs, edge_handles)
+            if cache_key:
+                context.metadata.setdefault("node_cache", {})[self.node_id] = {"hit": False}
+
             # 출력을 variable_pool에 저장
             for port_name, value in outputs.items():
                 context.set_output(port_name, value)
@@ -297,6 +338,28 @@ class BaseNodeV2(ABC):
                 metadata={"node_id": self.node_id}
             )
 
+    def _complete_from_cache(self, context: NodeExecutionContext, cached: Any) -> NodeExecutionResult:
+        """캐시된 출력/엣지 핸들을 재생하고 실행 기록에 hit 여부를 남김"""
+        for port_name, value in cached.outputs.items():
+            context.set_output(port_name, value)
+
+        context.metadata.setdefault("node_cache", {})[self.node_id] = {
+            "hit": True,
+            "tier": cached.tier,
+        }
+        self.set_status(NodeStatus.COMPLETED)
+        logger.debug(f"Node {self.node_id} output served from cache ({cached.tier})")
+
+        metadata = {"node_id": self.node_id, "cache_hit": True}
+        if cached.edge_handles:
+            metadata["edge_handles"] = list(cached.edge_handles)
+
+        return NodeExecutionResult(
+            status=NodeStatus.COMPLETED,
+            output=cached.outputs,
+            metadata=metadata
+        )
+
     # ========== 유틸리티 ==========
 
     def get_input_port_names(self) -> List[str]:
@@ -0,0 +1,207 @@
+"""
+대화 변수 상태 저장소
+
+(bot_id, session_id) 단위 대화 변수를 Redis hash에 보관해 매 실행 시작 시
+Postgres 조회를 생략하고, 실행 중 변경된 키는 실행 종료 시
+`INSERT ... ON CONFLICT` 한 번으로 DB에 반영합니다.
+
+일관성:
+- DB가 원본이며 Redis는 커밋이 끝난 값만 기록합니다. persist는 upsert/flush까지만 하고,
+  세션의 after_commit 시점에 hash를 갱신하며 커밋 없이 트랜잭션이 끝나면
+  (롤백, 실행 기록 없이 세션 종료 등) 해당 키를 삭제합니다.
+- hash에 로드 완료 마커가 없으면 부분 캐시로 보고 DB에서 다시 채웁니다.
+- 캐시는 TTL(conversation_state_cache_ttl_sec) 이후 만료되므로
+  DB를 직접 수정한 변경도 최대 TTL 안에 반영됩니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Dict, Optional, Set
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.conversation_variable import ConversationVariable
+
+logger = logging.getLogger(__name__)
+
+# 전체 변수가 로드된 hash임을 나타내는 필드 (변수 키와 충돌하지 않도록 예약)
+LOADED_MARKER_FIELD = "__loaded__"
+
+
+# 커밋 대기 중인 캐시 갱신 목록을 보관하는 Session.info 키
+PENDING_INFO_KEY = "conversation_state_pending"
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _mark_committed(session: Session) -> None:
+    pending = session.info.get(PENDING_INFO_KEY)
+    if pending is not None:
+        pending["committed"] = True
+
+
+def _settle_pending(session: Session, transaction: Any) -> None:
+    """최상위 트랜잭션 종료 시 커밋 여부에 따라 캐시 갱신 또는 무효화"""
+    pending = session.info.get(PENDING_INFO_KEY)
+    if pending is None or transaction.parent is not None:
+        return
+    writes, pending["writes"] = pending["writes"], []
+    committed, pending["committed"] = pending["committed"], False
+    for store, key, mapping in writes:
+        if committed:
+            # 마커가 없는 hash에 쓰면 다음 로드에서 부분 캐시로 판단해 DB에서 다시 채움
+            store._schedule(store.redis.hset_many(key, mapping, expire=store.ttl_sec))
+        else:
+            store._schedule(store.redis.delete(key))
+
+
+class ConversationStateStore:
+    """Redis hash 캐시 + DB 일괄 upsert 기반 대화 변수 저장소"""
+
+    def __init__(
+        self,
+        redis: Any = None,
+        enabled: Optional[bool] = None,
+        ttl_sec: Optional[int] = None,
+        prefix: Optional[str] = None,
+    ):
+        if redis is None:
+            from app.core.redis_client import redis_client
+
+            redis = redis_client
+        self.redis = redis
+        self.enabled = settings.conversation_state_cache_enabled if enabled is None else enabled
+        self.ttl_sec = ttl_sec or settings.conversation_state_cache_ttl_sec
+        self.prefix = prefix or settings.conversation_state_cache_prefix
+        # 커밋/롤백 훅에서 예약한 캐시 작업 (GC 방지용 참조 보관)
+        self._pending: Set[asyncio.Task] = set()
+
+    def cache_key(self, bot_id: str, session_id: str) -> str:
+        return f"{self.prefix}:{bot_id}:{session_id}"
+
+    @property
+    def _cache_available(self) -> bool:
+        # RedisClient가 아직 연결되지 않은 경우(워커/스크립트 등)에는 DB만 사용
+        return self.enabled and getattr(self.redis, "redis", None) is not None
+
+    async def load(self, db: Any, bot_id: str, session_id: str) -> Dict[str, Any]:
+        """대화 변수 전체 로드 (Redis hit 시 DB 조회 없음)"""
+        if not session_id:
+            return {}
+
+        key = self.cache_key(bot_id, session_id)
+        if self._cache_available:
+            cached = await self.redis.hgetall(key)
+            if cached and LOADED_MARKER_FIELD in cached:
+                return {
+                    field: json.loads(raw)
+                    for field, raw in cached.items()
+                    if field != LOADED_MARKER_FIELD
+                }
+
+        if not db:
+            return {}
+
+        stmt = (
+            select(ConversationVariable.key, ConversationVariable.value)
+            .where(ConversationVariable.conversation_id == session_id)
+            .where(ConversationVariable.bot_id == bot_id)
+        )
+        result = await db.execute(stmt)
+        variables = {row.key: row.value for row in result.all()}
+
+        if self._cache_available:
+            mapping = {field: _encode(value) for field, value in variables.items()}
+            mapping[LOADED_MARKER_FIELD] = "1"
+            await self.redis.hset_many(key, mapping, expire=self.ttl_sec)
+
+        return variables
+
+    async def persist(
+        self,
+        db: Any,
+        bot_id: str,
+        session_id: str,
+        dirty: Dict[str, Any],
+    ) -> None:
+        """
+        변경된 대화 변수를 한 번의 upsert로 저장
+
+        커밋은 호출자(실행 기록 완료 처리 또는 세션 의존성)가 수행하며,
+        Redis hash는 커밋이 성공한 뒤에만 갱신합니다.
+        """
+        if not db or not session_id or not dirty:
+            return
+
+        now = datetime.utcnow()
+        stmt = insert(ConversationVariable).values(
+            [
+                {
+                    "conversation_id": session_id,
+                    "bot_id": bot_id,
+                    "key": key,
+                    "value": value,
+                }
+                for key, value in dirty.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_conversation_variable_key",
+            set_={"value": stmt.excluded.value, "updated_at": now},
+        )
+        await db.execute(stmt)
+        await db.flush()
+
+        if self._cache_available:
+            self._sync_cache_on_commit(
+                db,
+                self.cache_key(bot_id, session_id),
+                {key: _encode(value) for key, value in dirty.items()},
+            )
+
+    def _sync_cache_on_commit(self, db: Any, key: str, mapping: Dict[str, str]) -> None:
+        """커밋 성공 시 hash 갱신, 커밋 없이 트랜잭션이 끝나면 키 삭제"""
+        session = getattr(db, "sync_session", db)
+        if not isinstance(session, Session):
+            # SQLAlchemy 세션이 아니면 커밋 시점을 알 수 없으므로 캐시만 비움
+            self._schedule(self.redis.delete(key))
+            return
+
+        pending = session.info.get(PENDING_INFO_KEY)
+        if pending is None:
+            pending = session.info[PENDING_INFO_KEY] = {"committed": False, "writes": []}
+            event.listen(session, "after_commit", _mark_committed)
+            event.listen(session, "after_transaction_end", _settle_pending)
+        pending["writes"].append((self, key, mapping))
+
+    def _schedule(self, operation: Awaitable[Any]) -> None:
+        """동기 세션 이벤트에서 Redis 작업 예약"""
+
+        async def _run() -> None:
+            try:
+                await operation
+            except Exception as exc:
+                logger.warning("[ConversationState] 캐시 반영 실패: %s", exc)
+
+        task = asyncio.get_running_loop().create_task(_run())
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def drain(self) -> None:
+        """예약된 캐시 작업 완료 대기 (테스트/종료 처리용)"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    async def invalidate(self, bot_id: str, session_id: str) -> None:
+        """캐시 무효화 (DB 반영 실패 등으로 캐시가 앞서갈 수 있을 때)"""
+        if self._cache_available:
+            await self.redis.delete(self.cache_key(bot_id, session_id))
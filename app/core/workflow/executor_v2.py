@@ -7,17 +7,23 @@
 import asyncio
 import json
 from typing import Dict, List, Any, Optional, Callable
-from collections import deque, defaultdict
+from collections import deque
 from app.core.workflow.base_node_v2 import BaseNodeV2, NodeExecutionContext
 from app.core.workflow.variable_pool import VariablePool
 from app.core.workflow.service_container import ServiceContainer
 from app.core.workflow.node_registry_v2 import node_registry_v2
 from app.core.workflow.validator import WorkflowValidator
+from app.core.workflow.graph_index import GraphIndex
 from app.core.workflow.base_node import NodeStatus
 from app.services.vector_service import VectorService
 from app.services.llm_service import LLMService
 from app.models.workflow_version import WorkflowExecutionRun, WorkflowNodeExecution
-from app.models.conversation_variable import ConversationVariable
+from app.core.workflow.graph_snapshot import (
+    mark_graph_snapshot_persisted,
+    store_graph_snapshot,
+)
+from app.core.workflow.conversation_state import ConversationStateStore
+from app.core.workflow.node_cache import get_node_output_cache
 from app.config import settings
 from app.services.event_publisher import WorkflowEventPublisher
 import logging
@@ -40,6 +46,7 @@ class WorkflowExecutorV2:
         self.validator = WorkflowValidator()
         self.nodes: Dict[str, BaseNodeV2] = {}
         self.edges: List[Dict[str, Any]] = []
+        self.graph_index: Optional[GraphIndex] = None
         self.execution_order: List[str] = []
         self.variable_pool: Optional[VariablePool] = None
         self.service_container: Optional[ServiceContainer] = None
@@ -52,6 +59,7 @@ class WorkflowExecutorV2:
         self.cancel_event: Optional[asyncio.Event] = None
         self._event_publisher = WorkflowEventPublisher()
         self._use_async_logs = bool(settings.log_queue_url)
+        self.conversation_state = ConversationStateStore()
 
     def _is_virtual_node(self, node_id: Optional[str]) -> bool:
         if not node_id:
@@ -75,7 +83,11 @@ class WorkflowExecutorV2:
         user_id: Optional[str] = None,
         api_request_id: Optional[str] = None,
         cancel_event: Optional[asyncio.Event] = None,
-        jwt_token: Optional[str] = None
+        jwt_token: Optional[str] = None,
+        execution_order: Optional[List[str]] = None,
+        conversation_variables: Optional[Dict[str, Any]] = None,
+        record_run: bool = True,
+        persist_conversation: bool = True
     ) -> str:
         """
         V2 워크플로우 실행
@@ -95,6 +107,10 @@ class WorkflowExecutorV2:
             user_id: 최종 사용자 ID (RESTful API 호출 시)
             api_request_id: API 요청 ID (추적용)
             cancel_event: 실행 중단 신호
+            execution_order: 미리 검증/계산된 실행 순서 (nested execution용, 지정 시 검증 생략)
+            conversation_variables: 이미 로드된 대화 변수 (지정 시 저장소 조회 생략)
+            record_run: False면 실행 기록(run/노드 실행)을 남기지 않음
+            persist_conversation: False면 대화 변수를 저장하지 않음 (호출자가 반영)
 
         Returns:
             str: 최종 응답
@@ -108,14 +124,16 @@ class WorkflowExecutorV2:
             nodes_data = workflow_data.get("nodes", [])
             edges_data = workflow_data.get("edges", [])
 
-            is_valid, errors, warnings = self.validator.validate(nodes_data, edges_data)
-            if not is_valid:
-                error_msg = "\n".join(errors)
-                raise ValueError(f"V2 워크플로우 검증 실패: {error_msg}")
+            # 컴파일된 실행 계획(실행 순서)이 주어지면 검증은 계획 생성 시 완료된 것으로 간주
+            if execution_order is None:
+                is_valid, errors, warnings = self.validator.validate(nodes_data, edges_data)
+                if not is_valid:
+                    error_msg = "\n".join(errors)
+                    raise ValueError(f"V2 워크플로우 검증 실패: {error_msg}")
 
-            if warnings:
-                for warning in warnings:
-                    logger.warning(f"V2 워크플로우 경고: {warning}")
+                if warnings:
+                    for warning in warnings:
+                        logger.warning(f"V2 워크플로우 경고: {warning}")
 
             self.workflow_version_id = workflow_data.get("workflow_version_id")
             self.cancel_event = cancel_event
@@ -123,11 +141,14 @@ class WorkflowExecutorV2:
             # 변수 풀 초기화
             environment_vars = workflow_data.get("environment_variables", {})
             conversation_vars = workflow_data.get("conversation_variables", {}) or {}
-            persisted_conversation_vars = await self._load_conversation_variables(
-                db=db,
-                session_id=session_id,
-                bot_id=bot_id
-            )
+            if conversation_variables is not None:
+                persisted_conversation_vars = dict(conversation_variables)
+            else:
+                persisted_conversation_vars = await self._load_conversation_variables(
+                    db=db,
+                    session_id=session_id,
+                    bot_id=bot_id
+                )
             merged_conversation_vars = {**conversation_vars, **persisted_conversation_vars}
 
             self.variable_pool = VariablePool(
@@ -164,6 +185,7 @@ class WorkflowExecutorV2:
             self.service_container.register("db_session", db)
             self.service_container.register("stream_handler", stream_handler)
             self.service_container.register("text_normalizer", text_normalizer)
+            self.service_container.register("node_output_cache", get_node_output_cache())
 
             # API 메타데이터 등록 (중첩 워크플로우에서 접근 가능)
             if api_key_id:
@@ -180,9 +202,13 @@ class WorkflowExecutorV2:
             # V2 노드 인스턴스 생성
             self._create_v2_nodes(nodes_data, edges_data)
             self.edges = edges_data
+            self.graph_index = GraphIndex(self.nodes.keys(), edges_data, is_virtual=self._is_virtual_node)
 
             # 실행 순서 결정
-            self.execution_order = self.validator.get_execution_order(nodes_data, edges_data)
+            if execution_order is not None:
+                self.execution_order = list(execution_order)
+            else:
+                self.execution_order = self.validator.get_execution_order(nodes_data, edges_data)
             if not self.execution_order:
                 raise ValueError("V2 워크플로우 실행 순서를 결정할 수 없습니다")
 
@@ -190,33 +216,35 @@ class WorkflowExecutorV2:
 
             # 실행 기록 시작
             self.run_start_time = datetime.utcnow()
-            await self._create_execution_run(
-                workflow_data=workflow_data,
-                session_id=session_id,
-                bot_id=bot_id,
-                user_message=user_message,
-                db=db,
-                workflow_version_id=self.workflow_version_id,
-                api_key_id=api_key_id,
-                user_id=user_id,
-                api_request_id=api_request_id
-            )
+            if record_run:
+                await self._create_execution_run(
+                    workflow_data=workflow_data,
+                    session_id=session_id,
+                    bot_id=bot_id,
+                    user_message=user_message,
+                    db=db,
+                    workflow_version_id=self.workflow_version_id,
+                    api_key_id=api_key_id,
+                    user_id=user_id,
+                    api_request_id=api_request_id
+                )
 
             # 노드 실행
             final_response = await self._execute_v2_nodes(stream_handler, text_normalizer, db)
 
             # 대화 변수 저장
-            try:
-                await self._persist_conversation_variables(
-                    db=db,
-                    bot_id=bot_id,
-                    session_id=session_id
-                )
-            except Exception as persist_error:
-                logger.error(
-                    "Failed to persist conversation variables: %s",
-                    persist_error
-                )
+            if persist_conversation:
+                try:
+                    await self._persist_conversation_variables(
+                        db=db,
+                        bot_id=bot_id,
+                        session_id=session_id
+                    )
+                except Exception as persist_error:
+                    logger.error(
+                        "Failed to persist conversation variables: %s",
+                        persist_error
+                    )
 
             # 실행 기록 완료
             await self._finalize_execution_run(
@@ -611,18 +639,8 @@ class WorkflowExecutorV2:
         session_id: str,
         bot_id: str,
     ) -> Dict[str, Any]:
-        """DB에서 대화 변수 로드"""
-        if not db or not session_id:
-            return {}
-
-        stmt = (
-            select(ConversationVariable)
-            .where(ConversationVariable.conversation_id == session_id)
-            .where(ConversationVariable.bot_id == bot_id)
-        )
-        result = await db.execute(stmt)
-        records = result.scalars().all()
-        return {record.key: record.value for record in records}
+        """대화 변수 로드 (Redis hash 우선, 없으면 DB)"""
+        return await self.conversation_state.load(db, bot_id, session_id)
 
     async def _persist_conversation_variables(
         self,
@@ -630,7 +648,7 @@ class WorkflowExecutorV2:
         bot_id: str,
         session_id: str,
     ) -> None:
-        """변경된 대화 변수를 DB에 저장"""
+        """변경된 대화 변수를 DB에 일괄 upsert (캐시는 커밋 성공 후 반영)"""
         if not db or not self.variable_pool or not session_id:
             return
 
@@ -638,30 +656,11 @@ class WorkflowExecutorV2:
         if not dirty_vars:
             return
 
-        for key, value in dirty_vars.items():
-            stmt = (
-                select(ConversationVariable)
-                .where(ConversationVariable.conversation_id == session_id)
-                .where(ConversationVariable.bot_id == bot_id)
-                .where(ConversationVariable.key == key)
-            )
-            result = await db.execute(stmt)
-            record = result.scalar_one_or_none()
-
-            if record:
-                record.value = value
-                record.updated_at = datetime.utcnow()
-            else:
-                db.add(
-                    ConversationVariable(
-                        conversation_id=session_id,
-                        bot_id=bot_id,
-                        key=key,
-                        value=value,
-                    )
-                )
-
-        await db.flush()
+        await self.conversation_state.persist(db, bot_id, session_id, dirty_vars)
+        if not self.execution_run:
+            # 실행 기록이 없으면 _finalize_execution_run이 커밋하지 않으므로 여기서 커밋
+            # (Core upsert는 세션 dirty 상태에 잡히지 않아 get_db도 커밋하지 않음)
+            await db.commit()
         self.variable_pool.clear_conversation_variable_dirty()
 
     def _build_incoming_counts(self) -> Dict[str, int]:
@@ -696,10 +695,10 @@ class WorkflowExecutorV2:
                 
                 # Start가 조건 분기 노드가 아닌 노드에 직접 연결된 경우
                 if target_type not in ['IfElseNodeV2', 'QuestionClassifierNodeV2']:
-                    # 해당 노드가 다른 노드로부터도 incoming 엣지를 받는지 확인
-                    other_incoming = sum(
-                        1 for e in self.edges 
-                        if e.get("target") == target and e.get("source") != source and e.get("source") in self.nodes
+                    # 해당 노드가 다른 노드로부터도 incoming 엣지를 받는지 확인 (인덱스 O(1) 조회)
+                    graph_index = self._get_graph_index()
+                    other_incoming = (
+                        graph_index.in_degree(target) - graph_index.edge_count(source, target)
                     )
                     
                     if other_incoming > 0:
@@ -736,16 +735,14 @@ class WorkflowExecutorV2:
         
         return counts
 
+    def _get_graph_index(self) -> GraphIndex:
+        if self.graph_index is None:
+            self.graph_index = GraphIndex(self.nodes.keys(), self.edges, is_virtual=self._is_virtual_node)
+        return self.graph_index
+
     def _group_edges_by_source(self) -> Dict[str, List[Dict[str, Any]]]:
-        mapping: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-        for edge in self.edges:
-            source = edge.get("source")
-            target = edge.get("target")
-            if self._is_virtual_node(source) or self._is_virtual_node(target):
-                continue
-            if source in self.nodes and target in self.nodes:
-                mapping[source].append(edge)
-        return mapping
+        """source별 outgoing 엣지 (그래프 인덱스 재사용, 가상/미존재 노드 엣지 제외)"""
+        return self._get_graph_index().out_edges
 
     def _select_outgoing_edges(
         self,
@@ -1032,12 +1029,15 @@ class WorkflowExecutorV2:
                 except (ValueError, TypeError):
                     logger.warning("Invalid workflow_version_id provided: %s", workflow_version_id)
 
+            # 그래프는 해시 기준으로 한 번만 저장하고 run에는 참조만 남긴다
+            graph_hash = await store_graph_snapshot(db, workflow_data)
+
             self.execution_run = WorkflowExecutionRun(
                 id=generated_id,
                 bot_id=bot_id,
                 workflow_version_id=version_uuid,
                 session_id=session_id,
-                graph_snapshot=workflow_data,
+                graph_snapshot_hash=graph_hash,
                 inputs={"user_message": user_message},
                 outputs={},
                 status="running",
@@ -1057,6 +1057,7 @@ class WorkflowExecutorV2:
 
             db.add(self.execution_run)
             await db.commit()
+            mark_graph_snapshot_persisted(graph_hash)
             logger.info(
                 f"V2 워크플로우 실행 기록 생성: run_id={self.execution_run.id}, "
                 f"api_key_id={api_key_id}, user_id={user_id}"
@@ -1140,7 +1141,8 @@ class WorkflowExecutorV2:
             "bot_id": run.bot_id,
             "workflow_version_id": str(run.workflow_version_id) if run.workflow_version_id else None,
             "session_id": run.session_id,
-            "graph_snapshot": run.graph_snapshot,
+            # 그래프 전체 대신 스냅샷 해시 참조만 전송 (스냅샷은 실행 시작 시 저장됨)
+            "graph_snapshot_hash": run.graph_snapshot_hash,
             "inputs": run.inputs,
             "outputs": run.outputs,
             "status": run.status,
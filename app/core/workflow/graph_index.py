@@ -0,0 +1,188 @@
+"""
+워크플로우 그래프 인덱스
+
+엣지 리스트를 한 번만 스캔해 노드/포트별 정방향·역방향 인접 리스트를 만들고,
+Executor와 Validator가 같은 인덱스를 공유하도록 합니다.
+
+- 인접/역인접 조회, 엣지 존재 여부: O(1)
+- 토폴로지 정렬, 순환 검사: O(V+E)
+- 도달 가능 노드(descendants): 역 토폴로지 순서로 비트마스크를 한 번 계산해 재사용
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict, deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+Edge = Dict[str, Any]
+
+
+class GraphIndex:
+    """엣지 리스트 기반 그래프 인덱스"""
+
+    def __init__(
+        self,
+        node_ids: Iterable[str],
+        edges: Iterable[Edge],
+        is_virtual: Optional[Callable[[Optional[str]], Any]] = None,
+    ):
+        """
+        Args:
+            node_ids: 실제 노드 ID 목록 (순서가 토폴로지 정렬의 tie-break 기준)
+            edges: 엣지 리스트 (source/target/source_port/target_port)
+            is_virtual: conv/env/sys 같은 가상 노드 판별 함수
+        """
+        self.node_ids: List[str] = list(dict.fromkeys(node_id for node_id in node_ids if node_id))
+        self._node_set: Set[str] = set(self.node_ids)
+        self._position: Dict[str, int] = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.edges: List[Edge] = list(edges)
+
+        # 양 끝이 모두 실제 노드인 엣지만 그래프 구조에 포함
+        self.out_edges: Dict[str, List[Edge]] = defaultdict(list)
+        self.in_edges: Dict[str, List[Edge]] = defaultdict(list)
+        self.out_edges_by_port: Dict[str, Dict[str, List[Edge]]] = defaultdict(lambda: defaultdict(list))
+        # 원본 엣지 기준 (source, target) 개수 (가상/미존재 노드 포함)
+        self._raw_pairs: Counter = Counter()
+        self._raw_sources: Dict[Any, List[Any]] = defaultdict(list)
+        # 실제 노드 사이 엣지 기준 (source, target) 개수
+        self._pairs: Counter = Counter()
+
+        for edge in self.edges:
+            source = edge.get("source")
+            target = edge.get("target")
+            self._raw_pairs[(source, target)] += 1
+            self._raw_sources[target].append(source)
+            if is_virtual and (is_virtual(source) or is_virtual(target)):
+                continue
+            if source not in self._node_set or target not in self._node_set:
+                continue
+            self.out_edges[source].append(edge)
+            self.in_edges[target].append(edge)
+            self.out_edges_by_port[source][edge.get("source_port") or ""].append(edge)
+            self._pairs[(source, target)] += 1
+
+        self._topological_order: Optional[List[str]] = None
+        self._topological_computed = False
+        self._descendant_masks: Optional[Dict[str, int]] = None
+
+    def __contains__(self, node_id: Any) -> bool:
+        return node_id in self._node_set
+
+    # ------------------------------------------------------------------
+    # 인접 조회
+    # ------------------------------------------------------------------
+
+    def successors(self, node_id: str) -> List[str]:
+        return [edge.get("target") for edge in self.out_edges.get(node_id, ())]
+
+    def predecessors(self, node_id: str) -> List[str]:
+        return [edge.get("source") for edge in self.in_edges.get(node_id, ())]
+
+    def in_degree(self, node_id: str) -> int:
+        return len(self.in_edges.get(node_id, ()))
+
+    def out_degree(self, node_id: str) -> int:
+        return len(self.out_edges.get(node_id, ()))
+
+    def edge_count(self, source: str, target: str) -> int:
+        """실제 노드 사이 source → target 엣지 개수"""
+        return self._pairs.get((source, target), 0)
+
+    def has_edge(self, source: Optional[str], target: Optional[str]) -> bool:
+        """원본 엣지 리스트에 source → target 엣지가 있는지 (가상 노드 포함)"""
+        return self._raw_pairs.get((source, target), 0) > 0
+
+    def raw_sources(self, target: Optional[str]) -> List[Any]:
+        """원본 엣지 리스트 기준 target으로 들어오는 source 목록 (가상 노드 포함)"""
+        return list(self._raw_sources.get(target, ()))
+
+    # ------------------------------------------------------------------
+    # 순서/순환
+    # ------------------------------------------------------------------
+
+    def topological_order(self) -> Optional[List[str]]:
+        """Kahn 알고리즘 토폴로지 정렬 (순환이 있으면 None)"""
+        if self._topological_computed:
+            return self._topological_order
+
+        in_degree = {node_id: self.in_degree(node_id) for node_id in self.node_ids}
+        queue = deque(node_id for node_id in self.node_ids if in_degree[node_id] == 0)
+        order: List[str] = []
+
+        while queue:
+            node_id = queue.popleft()
+            order.append(node_id)
+            for target in self.successors(node_id):
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    queue.append(target)
+
+        self._topological_order = order if len(order) == len(self.node_ids) else None
+        self._topological_computed = True
+        return self._topological_order
+
+    def has_cycle(self) -> bool:
+        return self.topological_order() is None
+
+    # ------------------------------------------------------------------
+    # 도달 가능성
+    # ------------------------------------------------------------------
+
+    def _compute_descendant_masks(self) -> Optional[Dict[str, int]]:
+        order = self.topological_order()
+        if order is None:
+            return None
+        if self._descendant_masks is None:
+            masks: Dict[str, int] = {}
+            for node_id in reversed(order):
+                mask = 0
+                for target in self.successors(node_id):
+                    mask |= (1 << self._position[target]) | masks[target]
+                masks[node_id] = mask
+            self._descendant_masks = masks
+        return self._descendant_masks
+
+    def _mask_to_nodes(self, mask: int) -> Set[str]:
+        nodes: Set[str] = set()
+        while mask:
+            low = mask & -mask
+            nodes.add(self.node_ids[low.bit_length() - 1])
+            mask ^= low
+        return nodes
+
+    def _bfs(self, start_nodes: Iterable[str]) -> Set[str]:
+        visited: Set[str] = set()
+        queue = deque(node_id for node_id in start_nodes if node_id in self._node_set)
+        while queue:
+            current = queue.popleft()
+            for target in self.successors(current):
+                if target not in visited:
+                    visited.add(target)
+                    queue.append(target)
+        return visited
+
+    def descendants(self, node_id: str) -> Set[str]:
+        """node_id에서 도달 가능한 모든 노드 (자기 자신 제외, 순환 시 BFS로 대체)"""
+        if node_id not in self._node_set:
+            return set()
+        masks = self._compute_descendant_masks()
+        if masks is None:
+            return self._bfs([node_id]) - {node_id}
+        return self._mask_to_nodes(masks[node_id])
+
+    def reachable_from(self, start_nodes: Iterable[str]) -> Set[str]:
+        """
+        시작 노드 집합에서 도달 가능한 다운스트림 노드 (시작 노드 제외)
+
+        시작 노드 중 실제 노드가 아닌 항목은 무시합니다.
+        """
+        starts = set(start_nodes)
+        masks = self._compute_descendant_masks()
+        if masks is None:
+            return self._bfs(starts) - starts
+
+        mask = 0
+        for node_id in starts:
+            if node_id in self._node_set:
+                mask |= masks[node_id]
+        return self._mask_to_nodes(mask) - starts
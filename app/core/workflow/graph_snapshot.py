@@ -0,0 +1,105 @@
+"""
+워크플로우 그래프 스냅샷 저장소 (content-addressed)
+
+실행 기록마다 그래프 전체를 JSONB로 복사하지 않고, 정규화된 그래프 JSON의
+sha256 해시를 키로 workflow_graph_snapshots 테이블에 한 번만 저장합니다.
+run은 해시만 참조하고, 상세 조회 시에만 그래프를 다시 읽습니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.workflow_version import WorkflowExecutionRun, WorkflowGraphSnapshot
+
+logger = logging.getLogger(__name__)
+
+# 이미 저장된 것으로 확인된 해시 (프로세스 로컬, INSERT 왕복 생략용)
+MAX_KNOWN_HASHES = 1024
+_known_hashes: "OrderedDict[str, None]" = OrderedDict()
+
+
+def canonical_graph_json(graph: Dict[str, Any]) -> str:
+    """키 정렬/공백 제거로 정규화한 그래프 JSON (같은 그래프는 항상 같은 문자열)"""
+    return json.dumps(
+        graph,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+def compute_graph_hash(graph: Dict[str, Any]) -> str:
+    """정규화된 그래프 JSON의 sha256 hex digest"""
+    return hashlib.sha256(canonical_graph_json(graph).encode("utf-8")).hexdigest()
+
+
+def mark_graph_snapshot_persisted(graph_hash: str) -> None:
+    """커밋이 끝난 스냅샷 해시를 기록 (이후 같은 그래프는 INSERT 생략)"""
+    _known_hashes[graph_hash] = None
+    _known_hashes.move_to_end(graph_hash)
+    while len(_known_hashes) > MAX_KNOWN_HASHES:
+        _known_hashes.popitem(last=False)
+
+
+async def store_graph_snapshot(db: Any, graph: Dict[str, Any]) -> str:
+    """
+    그래프 스냅샷을 저장하고 해시를 반환 (이미 있으면 저장하지 않음)
+
+    호출자의 트랜잭션 안에서 실행되며 커밋은 호출자가 수행합니다.
+    커밋 후 mark_graph_snapshot_persisted()를 호출해야 다음 실행에서 INSERT를 생략합니다.
+    """
+    graph_hash = compute_graph_hash(graph)
+    if graph_hash in _known_hashes:
+        _known_hashes.move_to_end(graph_hash)
+        return graph_hash
+
+    stmt = (
+        insert(WorkflowGraphSnapshot)
+        .values(graph_hash=graph_hash, graph=graph)
+        .on_conflict_do_nothing(index_elements=["graph_hash"])
+    )
+    await db.execute(stmt)
+    return graph_hash
+
+
+async def load_graph_snapshot(db: Any, run: WorkflowExecutionRun) -> Optional[Dict[str, Any]]:
+    """
+    run의 그래프 스냅샷 조회
+
+    해시 참조가 있으면 스냅샷 테이블에서, 없으면(레거시 run) 지연 로딩된
+    graph_snapshot 컬럼에서 읽습니다.
+    """
+    if run.graph_snapshot_hash:
+        result = await db.execute(
+            select(WorkflowGraphSnapshot.graph).where(
+                WorkflowGraphSnapshot.graph_hash == run.graph_snapshot_hash
+            )
+        )
+        graph = result.scalar_one_or_none()
+        if graph is not None:
+            return graph
+        logger.warning(
+            "그래프 스냅샷을 찾을 수 없습니다: run_id=%s hash=%s",
+            run.id,
+            run.graph_snapshot_hash,
+        )
+
+    result = await db.execute(
+        select(WorkflowExecutionRun.graph_snapshot).where(
+            WorkflowExecutionRun.id == run.id
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+def clear_known_hashes() -> None:
+    _known_hashes.clear()
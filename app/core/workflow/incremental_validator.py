@@ -0,0 +1,257 @@
+"""
+증분 워크플로우 검증기
+
+에디터 autosave처럼 같은 봇의 그래프가 조금씩 바뀌며 반복 검증되는 경우를 위한
+WorkflowValidator 확장입니다. 결과(오류/경고 목록과 순서)는 전체 검증과 동일합니다.
+
+- 그래프 단위: UI 전용 필드(position 등)를 제외한 구조 지문이 직전 검증과 같으면
+  저장해 둔 결과를 그대로 반환하고, 정규화 결과(포트/variable_mappings)만 다시 적용합니다.
+- 노드 단위: 직전 검증 대비 바뀐 노드만 다시 계산합니다.
+  * 포트 맵: 노드 타입 + ports 지문
+  * 노드 설정 검증: 노드 지문 (+ Answer 노드는 전체 노드 ID 집합)
+  * 템플릿 변수 연결 검증: 노드 지문 + 들어오는 엣지의 source 목록
+- 연결성/순환/분기 합류 같은 전역 검증은 GraphIndex 기반 O(V+E)로 매번 수행합니다.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.workflow.graph_index import GraphIndex
+from app.core.workflow.validator import WorkflowValidator
+
+logger = logging.getLogger(__name__)
+
+# 검증 결과에 영향을 주지 않는 에디터 전용 필드
+UI_ONLY_NODE_FIELDS = frozenset({
+    "position",
+    "positionAbsolute",
+    "selected",
+    "dragging",
+    "width",
+    "height",
+    "measured",
+    "zIndex",
+})
+UI_ONLY_EDGE_FIELDS = frozenset({"selected", "animated", "style", "markerEnd", "zIndex"})
+
+# 노드 단위 결과 캐시 최대 항목 수 (검증기 인스턴스당)
+MAX_NODE_RESULTS = 4096
+# 봇별 증분 검증기 최대 보관 수
+MAX_DRAFT_VALIDATORS = 256
+
+
+def _fingerprint(value: Any) -> str:
+    raw = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _strip(item: Dict[str, Any], ignored: frozenset) -> Dict[str, Any]:
+    return {key: value for key, value in item.items() if key not in ignored}
+
+
+class _LRU(OrderedDict):
+    """크기 제한 LRU 딕셔너리"""
+
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.max_size = max_size
+
+    def lookup(self, key: Any) -> Any:
+        value = self.get(key)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+
+    def store(self, key: Any, value: Any) -> None:
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+
+
+class IncrementalWorkflowValidator(WorkflowValidator):
+    """직전 검증 결과와 노드 단위 결과를 재사용하는 검증기"""
+
+    def __init__(self, max_node_results: int = MAX_NODE_RESULTS):
+        super().__init__()
+        self._port_maps = _LRU(max_node_results)
+        self._node_configs = _LRU(max_node_results)
+        self._template_checks = _LRU(max_node_results)
+
+        # 직전 검증 상태
+        self._last_graph_fingerprint: Optional[str] = None
+        self._last_result: Optional[Tuple[bool, List[str], List[str]]] = None
+        self._last_normalized: Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]] = None
+        self._last_node_fingerprints: Dict[str, str] = {}
+
+        # 현재 validate() 호출 동안 유효한 전체 노드 ID 집합 지문
+        self._node_ids_fingerprint: Optional[str] = None
+
+        # 통계 (로그/테스트용)
+        self.last_mode: Optional[str] = None
+        self.last_changed_nodes: Set[str] = set()
+
+    def validate(
+        self,
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]]
+    ) -> Tuple[bool, List[str], List[str]]:
+        graph_fingerprint = _fingerprint({
+            "nodes": [_strip(node, UI_ONLY_NODE_FIELDS) for node in nodes],
+            "edges": [_strip(edge, UI_ONLY_EDGE_FIELDS) for edge in edges],
+        })
+
+        if graph_fingerprint == self._last_graph_fingerprint and self._last_result is not None:
+            self._replay_normalization(nodes, edges)
+            self.last_mode = "reused"
+            self.last_changed_nodes = set()
+            is_valid, errors, warnings = self._last_result
+            self.errors = list(errors)
+            self.warnings = list(warnings)
+            return is_valid, list(errors), list(warnings)
+
+        node_fingerprints = {
+            node.get("id"): _fingerprint(_strip(node, UI_ONLY_NODE_FIELDS))
+            for node in nodes if node.get("id")
+        }
+        self.last_changed_nodes = {
+            node_id for node_id, fingerprint in node_fingerprints.items()
+            if self._last_node_fingerprints.get(node_id) != fingerprint
+        }
+        self.last_mode = "incremental"
+
+        try:
+            is_valid, errors, warnings = super().validate(nodes, edges)
+        finally:
+            self._node_ids_fingerprint = None
+
+        self._last_graph_fingerprint = graph_fingerprint
+        self._last_result = (is_valid, list(errors), list(warnings))
+        self._last_normalized = self._capture_normalization(nodes, edges)
+        self._last_node_fingerprints = node_fingerprints
+
+        logger.debug(
+            "[IncrementalWorkflowValidator] 변경 노드 %d/%d 재검증",
+            len(self.last_changed_nodes),
+            len(node_fingerprints),
+        )
+        return is_valid, errors, warnings
+
+    # ------------------------------------------------------------------
+    # 노드 단위 캐시
+    # ------------------------------------------------------------------
+
+    def _node_fingerprint(self, node: Dict[str, Any]) -> str:
+        # 정규화로 variable_mappings가 바뀔 수 있으므로 호출 시점의 노드 상태로 계산
+        return _fingerprint(_strip(node, UI_ONLY_NODE_FIELDS))
+
+    def _resolve_port_map(self, node: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        key = (node.get("type"), _fingerprint(node.get("ports") or {}))
+        cached = self._port_maps.lookup(key)
+        if cached is None:
+            cached = super()._resolve_port_map(node)
+            self._port_maps.store(key, cached)
+        return cached
+
+    def _check_node_configuration(
+        self,
+        node: Dict[str, Any],
+        node_ids: Set[Any]
+    ) -> Tuple[List[str], List[str]]:
+        key: Tuple[Any, ...] = (self._node_fingerprint(node),)
+        if node.get("data", {}).get("type") == "answer":
+            # Answer 노드는 변수 참조 대상 노드의 존재 여부에 의존
+            if self._node_ids_fingerprint is None:
+                self._node_ids_fingerprint = _fingerprint(sorted(str(node_id) for node_id in node_ids))
+            key += (self._node_ids_fingerprint,)
+
+        cached = self._node_configs.lookup(key)
+        if cached is None:
+            cached = super()._check_node_configuration(node, node_ids)
+            self._node_configs.store(key, cached)
+        errors, warnings = cached
+        return list(errors), list(warnings)
+
+    def _check_node_template_connectivity(
+        self,
+        node: Dict[str, Any],
+        graph_index: GraphIndex
+    ) -> List[str]:
+        key = (
+            self._node_fingerprint(node),
+            tuple(sorted(str(source) for source in graph_index.raw_sources(node.get("id")))),
+        )
+        cached = self._template_checks.lookup(key)
+        if cached is None:
+            cached = super()._check_node_template_connectivity(node, graph_index)
+            self._template_checks.store(key, cached)
+        return list(cached)
+
+    # ------------------------------------------------------------------
+    # 정규화 결과 재적용
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _capture_normalization(
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        node_mappings = {
+            node.get("id"): copy.deepcopy(node["variable_mappings"])
+            for node in nodes
+            if node.get("id") and "variable_mappings" in node
+        }
+        edge_ports = [
+            {
+                key: edge[key]
+                for key in ("source_port", "target_port", "data_type")
+                if key in edge
+            }
+            for edge in edges
+        ]
+        return node_mappings, edge_ports
+
+    def _replay_normalization(
+        self,
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]]
+    ) -> None:
+        if not self._last_normalized:
+            return
+        node_mappings, edge_ports = self._last_normalized
+        for node in nodes:
+            node_id = node.get("id")
+            if node_id in node_mappings:
+                node["variable_mappings"] = copy.deepcopy(node_mappings[node_id])
+        for edge, ports in zip(edges, edge_ports):
+            edge.update(ports)
+
+
+_draft_validators: "OrderedDict[str, IncrementalWorkflowValidator]" = OrderedDict()
+
+
+def get_draft_validator(scope: str) -> IncrementalWorkflowValidator:
+    """
+    봇(또는 draft) 단위 증분 검증기 조회
+
+    같은 봇의 autosave 요청은 같은 검증기를 재사용해 직전 검증 결과를 활용합니다.
+    """
+    validator = _draft_validators.get(scope)
+    if validator is None:
+        validator = IncrementalWorkflowValidator()
+        _draft_validators[scope] = validator
+        while len(_draft_validators) > MAX_DRAFT_VALIDATORS:
+            _draft_validators.popitem(last=False)
+    else:
+        _draft_validators.move_to_end(scope)
+    return validator
+
+
+def clear_draft_validators() -> None:
+    _draft_validators.clear()
@@ -0,0 +1,240 @@
+"""
+라이브러리 에이전트 실행 계획 캐시
+
+ImportedWorkflowNode는 실행마다 BotWorkflowVersion을 조회하고, 그래프에서 Start 노드와
+출력 매핑을 다시 찾고, 자식 Executor가 그래프를 다시 검증했습니다.
+이 모듈은 source_version_id 단위로 한 번만 컴파일한 실행 계획(LibraryAgentPlan)을
+프로세스 로컬 LRU에 보관합니다.
+
+무효화:
+- 같은 프로세스의 버전 변경(draft 저장/발행/아카이브)은 invalidate()로 즉시 제거합니다.
+- 다른 레플리카의 변경은 library_agent_plan_revalidate_sec마다 updated_at만 조회해 확인합니다.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.workflow_version import BotWorkflowVersion
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LibraryAgentPlan:
+    """컴파일된 라이브러리 에이전트 실행 계획 (검증/정규화 완료)"""
+
+    version_id: str
+    name: str
+    graph: Dict[str, Any]
+    input_schema: List[Dict[str, Any]]
+    output_schema: List[Dict[str, Any]]
+    start_node_id: Optional[str]
+    output_mappings: Dict[str, str]
+    execution_order: List[str]
+    updated_at: Optional[datetime] = None
+    warnings: List[str] = field(default_factory=list)
+
+    def to_agent_data(self) -> Dict[str, Any]:
+        """
+        ImportedWorkflowNode가 사용하던 agent_data 딕셔너리 형식
+
+        계획은 여러 실행이 공유하고 자식 Executor가 노드 config를 제자리에서 수정하므로
+        실행마다 깊은 복사본을 돌려줍니다.
+        """
+        return copy.deepcopy({
+            "id": self.version_id,
+            "name": self.name,
+            "graph": self.graph,
+            "input_schema": self.input_schema,
+            "output_schema": self.output_schema,
+            "start_node_id": self.start_node_id,
+            "output_mappings": self.output_mappings,
+        })
+
+
+def extract_selector(mapping: Any) -> Optional[str]:
+    """매핑(문자열 / {"variable"} / {"source": {"variable"}})에서 selector 추출"""
+    if isinstance(mapping, str):
+        return mapping
+    if isinstance(mapping, dict):
+        if "variable" in mapping:
+            return mapping["variable"]
+        if "source" in mapping and isinstance(mapping["source"], dict):
+            return mapping["source"].get("variable")
+    return None
+
+
+def _find_start_and_outputs(nodes: List[Dict[str, Any]]) -> Tuple[Optional[str], Dict[str, str]]:
+    start_node_id = None
+    output_mappings: Dict[str, str] = {}
+
+    for node in nodes:
+        node_id = node.get("id")
+        data = node.get("data", {}) or {}
+        node_type = data.get("type") or node.get("type")
+
+        if node_type == "start" and not start_node_id:
+            start_node_id = node_id
+        elif node_type in ["answer", "end"]:
+            inputs = data.get("inputs")
+            var_mappings = node.get("variable_mappings", {}) or {}
+
+            if isinstance(inputs, dict):
+                iter_ports = inputs.keys()
+            elif isinstance(inputs, list):
+                iter_ports = [inp.get("name") for inp in inputs if inp.get("name")]
+            else:
+                iter_ports = []
+
+            for port_name in iter_ports:
+                selector = extract_selector(var_mappings.get(port_name))
+                if selector:
+                    output_mappings[port_name] = selector
+
+            # 입력 정보가 없더라도 variable_mappings에 정의되어 있으면 활용
+            if not iter_ports and var_mappings:
+                for port_name, mapping in var_mappings.items():
+                    selector = extract_selector(mapping)
+                    if selector:
+                        output_mappings.setdefault(port_name, selector)
+
+    return start_node_id, output_mappings
+
+
+def compile_library_agent(source_version: BotWorkflowVersion) -> LibraryAgentPlan:
+    """
+    라이브러리 버전을 실행 계획으로 컴파일
+
+    그래프 사본을 한 번 검증(정규화 포함)하고 실행 순서를 계산합니다.
+
+    Raises:
+        ValueError: 그래프 검증 실패 또는 실행 순서를 결정할 수 없는 경우
+    """
+    # validator → 노드 레지스트리 → ImportedWorkflowNode → 이 모듈 순환을 피하기 위해 지연 import
+    from app.core.workflow.validator import WorkflowValidator
+
+    # Start 노드/출력 매핑은 정규화 전 원본 그래프 기준 (기존 동작 유지)
+    start_node_id, output_mappings = _find_start_and_outputs((source_version.graph or {}).get("nodes", []))
+
+    graph = copy.deepcopy(source_version.graph or {})
+    nodes = graph.get("nodes", [])
+    edges = graph.get("edges", [])
+
+    validator = WorkflowValidator()
+    is_valid, errors, warnings = validator.validate(nodes, edges)
+    if not is_valid:
+        raise ValueError(f"V2 워크플로우 검증 실패: {chr(10).join(errors)}")
+
+    for warning in warnings:
+        logger.warning(f"V2 워크플로우 경고 (라이브러리 에이전트 {source_version.id}): {warning}")
+
+    execution_order = validator.get_execution_order(nodes, edges)
+    if not execution_order:
+        raise ValueError("V2 워크플로우 실행 순서를 결정할 수 없습니다")
+
+    return LibraryAgentPlan(
+        version_id=str(source_version.id),
+        name=source_version.library_name or f"Version {source_version.version}",
+        graph=graph,
+        input_schema=source_version.input_schema or [],
+        output_schema=source_version.output_schema or [],
+        start_node_id=start_node_id,
+        output_mappings=output_mappings,
+        execution_order=execution_order,
+        updated_at=source_version.updated_at,
+        warnings=list(warnings),
+    )
+
+
+class LibraryAgentPlanCache:
+    """source_version_id → LibraryAgentPlan LRU 캐시"""
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        revalidate_sec: Optional[float] = None,
+    ):
+        self.max_size = max_size or settings.library_agent_plan_cache_size
+        self.revalidate_sec = (
+            settings.library_agent_plan_revalidate_sec if revalidate_sec is None else revalidate_sec
+        )
+        # version_id -> (plan, 마지막 확인 시각)
+        self._plans: "OrderedDict[str, Tuple[LibraryAgentPlan, float]]" = OrderedDict()
+
+    async def get_plan(self, db: Any, version_id: str, user: Any = None) -> LibraryAgentPlan:
+        """
+        실행 계획 조회 (없거나 버전이 바뀌었으면 로드 후 컴파일)
+
+        Raises:
+            ValueError: 라이브러리 에이전트를 찾을 수 없거나 그래프가 유효하지 않은 경우
+        """
+        version_id = str(version_id)
+
+        if user is not None and hasattr(user, "id"):
+            # 권한 검증이 필요한 조회는 매번 수행하되, 컴파일 결과는 재사용
+            from app.services.library_service import LibraryService
+
+            found = await LibraryService(db).get_library_agent_by_id(version_id=version_id, user_id=user.id)
+            source_version = found.get("agent") if found else None
+            if not source_version:
+                raise ValueError(f"라이브러리 에이전트를 찾을 수 없습니다: {version_id}")
+            cached = self._lookup(version_id)
+            if cached and cached.updated_at == source_version.updated_at:
+                return cached
+            return self._store(compile_library_agent(source_version))
+
+        entry = self._plans.get(version_id)
+        if entry is not None:
+            plan, checked_at = entry
+            self._plans.move_to_end(version_id)
+            if time.monotonic() - checked_at < self.revalidate_sec:
+                return plan
+
+            result = await db.execute(
+                select(BotWorkflowVersion.updated_at).where(BotWorkflowVersion.id == version_id)
+            )
+            current_updated_at = result.scalar_one_or_none()
+            if current_updated_at is not None and current_updated_at == plan.updated_at:
+                self._plans[version_id] = (plan, time.monotonic())
+                return plan
+            logger.info("라이브러리 에이전트 변경 감지, 실행 계획 재컴파일: %s", version_id)
+            self.invalidate(version_id)
+
+        result = await db.execute(
+            select(BotWorkflowVersion).where(BotWorkflowVersion.id == version_id)
+        )
+        source_version = result.scalar_one_or_none()
+        if not source_version:
+            raise ValueError(f"라이브러리 에이전트를 찾을 수 없습니다: {version_id}")
+
+        return self._store(compile_library_agent(source_version))
+
+    def _lookup(self, version_id: str) -> Optional[LibraryAgentPlan]:
+        entry = self._plans.get(version_id)
+        return entry[0] if entry else None
+
+    def _store(self, plan: LibraryAgentPlan) -> LibraryAgentPlan:
+        self._plans[plan.version_id] = (plan, time.monotonic())
+        self._plans.move_to_end(plan.version_id)
+        while len(self._plans) > self.max_size:
+            self._plans.popitem(last=False)
+        return plan
+
+    def invalidate(self, version_id: Any) -> None:
+        self._plans.pop(str(version_id), None)
+
+    def clear(self) -> None:
+        self._plans.clear()
+
+
+library_agent_plans = LibraryAgentPlanCache()
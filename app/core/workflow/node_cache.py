@@ -0,0 +1,224 @@
+"""
+워크플로우 V2 노드 출력 메모이제이션
+
+입력이 같으면 출력이 같고 I/O나 LLM 호출 비용이 큰 노드(검색, 웹 검색, HTTP 등)의 실행 결과를
+(노드 타입, 설정 해시, 해석된 입력 해시) 키로 보관해 재실행을 생략합니다.
+
+- 노드는 get_cache_policy()로 TTL/키 설정 필드/코퍼스 의존 여부를 선언합니다 (opt-in).
+  조건 분기·템플릿 변환처럼 순수 인메모리 연산은 키 계산(변수 스냅샷, 직렬화, 해시)이
+  실행보다 비싸므로 캐시하지 않습니다.
+- 노드가 variable_pool에서 직접 읽는 값은 get_cache_key_inputs()로 키에 포함합니다.
+- 로컬(프로세스) LRU + Redis 2단 캐시이며, Redis 티어는 정책의 shared=True일 때만 사용합니다.
+- 캐시 값은 JSON 문자열로 보관해 hit마다 새 객체를 돌려줍니다 (다운스트림 변경 격리).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.core.workflow.base_node_v2 import BaseNodeV2, NodeExecutionContext
+
+logger = logging.getLogger(__name__)
+
+CorpusVersionProvider = Callable[["BaseNodeV2", "NodeExecutionContext"], Awaitable[Optional[str]]]
+
+
+@dataclass(frozen=True)
+class NodeCachePolicy:
+    """
+    노드 출력 캐시 정책
+
+    Attributes:
+        ttl_sec: 캐시 유지 시간 (0 이하이면 캐시하지 않음)
+        key_fields: 캐시 키에 포함할 config 필드 (None이면 config 전체)
+        corpus_dependent: 지식베이스 코퍼스 버전에 의존하는지 (버전을 알 수 없으면 캐시 생략)
+        shared: Redis 티어 사용 여부 (계산 비용이 낮은 노드는 로컬만 사용)
+        scope: "bot"이면 봇 단위로 키를 분리, "global"이면 봇 간 공유
+    """
+
+    ttl_sec: int = 300
+    key_fields: Optional[Tuple[str, ...]] = None
+    corpus_dependent: bool = False
+    shared: bool = True
+    scope: str = "bot"
+
+
+@dataclass
+class CachedNodeOutput:
+    """캐시된 노드 실행 결과"""
+
+    outputs: Dict[str, Any]
+    edge_handles: List[str]
+    tier: str
+
+
+def _canonical(value: Any) -> str:
+    # JSON으로 표현할 수 없는 값은 TypeError를 그대로 올려 캐시 대상에서 제외
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class NodeOutputCache:
+    """로컬 LRU + Redis 2단 노드 출력 캐시"""
+
+    def __init__(
+        self,
+        redis: Any = None,
+        enabled: Optional[bool] = None,
+        prefix: Optional[str] = None,
+        local_max_entries: Optional[int] = None,
+        corpus_version_provider: Optional[CorpusVersionProvider] = None,
+    ):
+        if redis is None:
+            from app.core.redis_client import redis_client
+
+            redis = redis_client
+        self.redis = redis
+        self.enabled = settings.node_output_cache_enabled if enabled is None else enabled
+        self.prefix = prefix or settings.node_output_cache_prefix
+        self.local_max_entries = local_max_entries or settings.node_output_cache_local_max_entries
+        self.corpus_version_provider = corpus_version_provider
+        # key -> (만료 시각, JSON 문자열)
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+        # 통계 (로그/테스트용)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _redis_available(self) -> bool:
+        return getattr(self.redis, "redis", None) is not None
+
+    async def build_key(
+        self,
+        node: "BaseNodeV2",
+        policy: NodeCachePolicy,
+        context: "NodeExecutionContext",
+    ) -> Optional[str]:
+        """
+        캐시 키 계산
+
+        Returns:
+            캐시 키 또는 None (캐시 비활성/키 계산 불가/코퍼스 버전 미확인)
+        """
+        if not self.enabled or policy.ttl_sec <= 0:
+            return None
+
+        key_inputs = node.get_cache_key_inputs(context)
+        if key_inputs is None:
+            return None
+
+        config = node.config or {}
+        if policy.key_fields is not None:
+            config = {field: config.get(field) for field in policy.key_fields}
+
+        dependencies: Dict[str, Any] = {"inputs": key_inputs}
+        if policy.scope == "bot":
+            dependencies["bot_id"] = context.get_service("bot_id")
+        if policy.corpus_dependent:
+            corpus_version = None
+            if self.corpus_version_provider is not None:
+                corpus_version = await self.corpus_version_provider(node, context)
+            if corpus_version is None:
+                return None
+            dependencies["corpus_version"] = corpus_version
+
+        try:
+            config_hash = _digest(_canonical(config))[:16]
+            input_hash = _digest(_canonical(dependencies))
+        except (TypeError, ValueError):
+            logger.debug("[NodeOutputCache] 직렬화할 수 없는 입력으로 캐시 생략: node=%s", node.node_id)
+            return None
+
+        return f"{self.prefix}:{node.__class__.__name__}:{config_hash}:{input_hash}"
+
+    async def get(self, key: str, policy: NodeCachePolicy) -> Optional[CachedNodeOutput]:
+        """캐시 조회 (로컬 → Redis 순)"""
+        local = self._local.get(key)
+        if local is not None:
+            expires_at, raw = local
+            if expires_at > time.monotonic():
+                self._local.move_to_end(key)
+                self.hits += 1
+                return self._decode(json.loads(raw), "local")
+            self._local.pop(key, None)
+
+        if policy.shared and self._redis_available:
+            payload = await self.redis.get(key)
+            if isinstance(payload, dict):
+                # Redis 항목의 남은 수명만큼만 로컬에 보관 (TTL 연장 방지)
+                remaining = float(payload.get("expires_at") or 0) - time.time()
+                if remaining > 0:
+                    self._store_local(key, _canonical(payload), remaining)
+                    self.hits += 1
+                    return self._decode(payload, "redis")
+
+        self.misses += 1
+        return None
+
+    async def set(
+        self,
+        key: str,
+        policy: NodeCachePolicy,
+        outputs: Dict[str, Any],
+        edge_handles: List[str],
+    ) -> bool:
+        """실행 결과 저장 (JSON으로 표현할 수 없는 출력은 저장하지 않음)"""
+        try:
+            raw = _canonical({
+                "outputs": outputs,
+                "edge_handles": list(edge_handles),
+                "expires_at": time.time() + policy.ttl_sec,
+            })
+        except (TypeError, ValueError):
+            logger.debug("[NodeOutputCache] 직렬화할 수 없는 출력으로 캐시 생략: key=%s", key)
+            return False
+
+        self._store_local(key, raw, policy.ttl_sec)
+        if policy.shared and self._redis_available:
+            await self.redis.set(key, raw, expire=policy.ttl_sec)
+        return True
+
+    def _store_local(self, key: str, raw: str, ttl_sec: float) -> None:
+        self._local[key] = (time.monotonic() + ttl_sec, raw)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_max_entries:
+            self._local.popitem(last=False)
+
+    @staticmethod
+    def _decode(payload: Dict[str, Any], tier: str) -> CachedNodeOutput:
+        return CachedNodeOutput(
+            outputs=payload.get("outputs") or {},
+            edge_handles=list(payload.get("edge_handles") or []),
+            tier=tier,
+        )
+
+    def clear_local(self) -> None:
+        self._local.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_node_output_cache: Optional[NodeOutputCache] = None
+
+
+def get_node_output_cache() -> NodeOutputCache:
+    """프로세스 공용 노드 출력 캐시 (실행마다 새 Executor가 만들어져도 로컬 티어 공유)"""
+    global _node_output_cache
+    if _node_output_cache is None:
+        from app.core.retrieval_cache import knowledge_corpus_version
+
+        _node_output_cache = NodeOutputCache(corpus_version_provider=knowledge_corpus_version)
+    return _node_output_cache
@@ -3,13 +3,15 @@ HTTP Node V2
 HTTP 요청을 전송하는 워크플로우 노드
 """
 import asyncio
+import hashlib
 import json
 import logging
-import re
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import httpx
 
+from app.config import settings
+from app.core.http_client import HttpClientProfile, http_client_pool
 from app.core.workflow.base_node_v2 import (
     BaseNodeV2,
     NodeExecutionContext,
@@ -17,9 +19,17 @@ from app.core.workflow.base_node_v2 import (
     PortDefinition,
     PortType,
 )
+from app.core.workflow.node_cache import NodeCachePolicy
+from app.core.workflow.nodes_v2.utils.variable_template_parser import (
+    VariableMatch,
+    compile_template,
+)
 
 logger = logging.getLogger(__name__)
 
+# 사용자 정의 URL 호출용 프로필 (다른 내부 클라이언트와 커넥션을 공유하지 않음)
+WORKFLOW_HTTP_PROFILE = HttpClientProfile.from_settings("workflow_http", follow_redirects=True)
+
 
 class HTTPNodeV2(BaseNodeV2):
     """
@@ -100,6 +110,72 @@ class HTTPNodeV2(BaseNodeV2):
             ]
         )
 
+    def _request_method(self, context: NodeExecutionContext) -> str:
+        return (self.config.get("method") or context.get_input("method") or "GET").upper()
+
+    def get_cache_policy(self) -> Optional[NodeCachePolicy]:
+        """
+        응답 캐시 정책
+
+        노드 설정에 cache_ttl_sec(>0)를 지정한 GET 요청만 캐시합니다.
+        실제 메서드(포트 입력 포함)가 GET이 아니면 get_cache_key_inputs()에서 캐시를 생략합니다.
+        """
+        ttl_sec = self.config.get("cache_ttl_sec")
+        if not isinstance(ttl_sec, int) or ttl_sec <= 0:
+            return None
+        return NodeCachePolicy(ttl_sec=ttl_sec)
+
+    def get_cache_key_inputs(self, context: NodeExecutionContext) -> Optional[Dict[str, Any]]:
+        """포트 입력 + 템플릿이 참조하는 변수 값 + 인증 토큰 해시"""
+        if self._request_method(context) != "GET":
+            return None
+
+        key_inputs = super().get_cache_key_inputs(context)
+
+        templates: List[str] = []
+        for field in ("url", "headers", "query_params"):
+            value = self.config.get(field) or context.get_input(field)
+            if isinstance(value, str):
+                templates.append(value)
+            elif isinstance(value, dict):
+                templates.extend(v for v in value.values() if isinstance(v, str))
+            elif isinstance(value, list):
+                templates.extend(
+                    item["value"] for item in value
+                    if isinstance(item, dict) and isinstance(item.get("value"), str)
+                )
+
+        selectors = sorted({
+            selector
+            for template in templates
+            for selector in compile_template(template).selectors
+        })
+        if selectors:
+            all_vars_dict = context.variable_pool.to_dict()
+            all_vars = {
+                **all_vars_dict.get("node_outputs", {}),
+                **all_vars_dict.get("environment_variables", {}),
+                **all_vars_dict.get("system_variables", {}),
+                **all_vars_dict.get("conversation_variables", {})
+            }
+            referenced: Dict[str, Any] = {}
+            for selector in selectors:
+                value: Any = all_vars
+                for key in selector.split("."):
+                    value = value.get(key) if isinstance(value, dict) else None
+                referenced[selector] = value
+            key_inputs["referenced"] = referenced
+
+        # 자동 주입되는 JWT에 따라 응답이 달라지므로 토큰 해시를 키에 포함
+        jwt_token = context.variable_pool.get_system_variable("jwt_token")
+        if jwt_token:
+            key_inputs["auth"] = hashlib.sha256(str(jwt_token).encode("utf-8")).hexdigest()
+        return key_inputs
+
+    def should_cache_output(self, outputs: Dict[str, Any]) -> bool:
+        # 잘린 응답(error에 표시)은 캐시하지 않음
+        return bool(outputs.get("success")) and not outputs.get("error")
+
     def _substitute_variables(self, text: str, context: NodeExecutionContext) -> str:
         """
         문자열 내의 {{variable}} 형태를 실제 값으로 치환
@@ -114,6 +190,11 @@ class HTTPNodeV2(BaseNodeV2):
         if not text or not isinstance(text, str):
             return text
 
+        # 컴파일된 템플릿 프로그램 (동일 문자열은 캐시 재사용)
+        compiled = compile_template(text)
+        if not compiled.has_variables:
+            return text
+
         # 모든 변수 가져오기
         all_vars = {}
         if hasattr(context, 'variable_pool'):
@@ -128,22 +209,24 @@ class HTTPNodeV2(BaseNodeV2):
             except Exception as e:
                 logger.warning(f"[HTTPNode] Variable pool 접근 실패: {e}")
 
-        # {{variable}} 패턴 찾아서 치환
-        def replace_var(match):
-            var_path = match.group(1).strip()
+        # {{variable}} 위치에 값 치환 (리터럴/변수 교차 프로그램을 순서대로 join)
+        def resolve_var(match: VariableMatch) -> str:
             # 중첩 딕셔너리 경로 처리 (예: nodes.start.bot_id)
-            keys = var_path.split('.')
             value = all_vars
-            for key in keys:
+            for key in match.parts:
                 if isinstance(value, dict) and key in value:
                     value = value[key]
                 else:
-                    logger.warning(f"[HTTPNode] 변수 '{var_path}' 찾을 수 없음")
-                    return match.group(0)  # 원본 유지
+                    logger.warning(f"[HTTPNode] 변수 '{match.selector}' 찾을 수 없음")
+                    return text[match.start:match.end]  # 원본 유지
             return str(value)
 
-        result = re.sub(r'\{\{([^}]+)\}\}', replace_var, text)
-        return result
+        pieces: List[str] = []
+        for literal, match in zip(compiled.literals, compiled.matches):
+            pieces.append(literal)
+            pieces.append(resolve_var(match))
+        pieces.append(compiled.literals[-1])
+        return "".join(pieces)
 
     async def execute_v2(self, context: NodeExecutionContext) -> Dict[str, Any]:
         """
@@ -157,7 +240,7 @@ class HTTPNodeV2(BaseNodeV2):
         """
         # 입력 수집 (config 우선, 없으면 포트 입력 사용)
         url = self.config.get("url") or context.get_input("url") or ""
-        method = (self.config.get("method") or context.get_input("method") or "GET").upper()
+        method = self._request_method(context)
         headers = self.config.get("headers") or context.get_input("headers") or {}
 
         # query_params 처리 (config는 배열 형태, 포트 입력은 딕셔너리)
@@ -235,53 +318,63 @@ class HTTPNodeV2(BaseNodeV2):
                 logger.warning(f"[HTTPNode] Body JSON 파싱 실패, 문자열로 전송: {e}")
                 body_data = body_str
 
-        # HTTP 요청 실행
+        # HTTP 요청 실행 (프로세스 공용 클라이언트 풀 + 응답 캐시)
         try:
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-                # 요청 파라미터 구성
-                request_kwargs = {
-                    "method": method,
-                    "url": url,
-                    "headers": headers,
-                    "params": query_params,
-                }
+            request_kwargs: Dict[str, Any] = {
+                "headers": headers,
+                "params": query_params,
+                "timeout": timeout,
+            }
 
-                # Body가 있는 경우
-                if body_data is not None:
-                    if isinstance(body_data, (dict, list)):
-                        request_kwargs["json"] = body_data
-                    else:
-                        request_kwargs["content"] = str(body_data)
-
-                # 요청 전송
-                response = await client.request(**request_kwargs)
-
-                # 응답 처리
-                response_body = response.text
-                response_headers = dict(response.headers)
-                status_code = response.status_code
-                is_success = 200 <= status_code < 300
-
-                # 에러 응답인 경우 본문 내용도 로그에 기록
-                if not is_success:
-                    logger.error(
-                        f"[HTTPNode] 응답 수신: {status_code} "
-                        f"({len(response_body)}자, success={is_success})\n"
-                        f"응답 본문: {response_body[:500]}"  # 처음 500자만
-                    )
+            # Body가 있는 경우
+            if body_data is not None:
+                if isinstance(body_data, (dict, list)):
+                    request_kwargs["json_body"] = body_data
                 else:
-                    logger.info(
-                        f"[HTTPNode] 응답 수신: {status_code} "
-                        f"({len(response_body)}자, success={is_success})"
-                    )
-
-                return {
-                    "status_code": status_code,
-                    "body": response_body,
-                    "headers": response_headers,
-                    "success": is_success,
-                    "error": "" if is_success else f"HTTP {status_code}",
-                }
+                    request_kwargs["content"] = str(body_data)
+
+            # 요청 전송 (본문은 http_node_max_response_bytes까지만 스트리밍으로 읽음)
+            response = await http_client_pool.request(
+                method,
+                url,
+                profile=WORKFLOW_HTTP_PROFILE,
+                # 응답 캐시는 봇 단위로만 공유
+                cache_scope=f"bot:{context.get_service('bot_id') or ''}",
+                **request_kwargs,
+            )
+
+            # 응답 처리
+            response_body = response.body
+            response_headers = response.headers
+            status_code = response.status_code
+            is_success = 200 <= status_code < 300
+
+            # 에러 응답인 경우 본문 내용도 로그에 기록
+            if not is_success:
+                logger.error(
+                    f"[HTTPNode] 응답 수신: {status_code} "
+                    f"({len(response_body)}자, success={is_success})\n"
+                    f"응답 본문: {response_body[:500]}"  # 처음 500자만
+                )
+            else:
+                logger.info(
+                    f"[HTTPNode] 응답 수신: {status_code} "
+                    f"({len(response_body)}자, success={is_success}, cached={response.from_cache})"
+                )
+
+            error = "" if is_success else f"HTTP {status_code}"
+            if response.truncated:
+                truncated_msg = f"응답 본문이 {settings.http_node_max_response_bytes}바이트를 초과해 잘렸습니다"
+                logger.warning(f"[HTTPNode] {truncated_msg}: {url}")
+                error = f"{error}; {truncated_msg}" if error else truncated_msg
+
+            return {
+                "status_code": status_code,
+                "body": response_body,
+                "headers": response_headers,
+                "success": is_success,
+                "error": error,
+            }
 
         except httpx.TimeoutException:
             error_msg = f"요청 타임아웃 ({timeout}초 초과)"
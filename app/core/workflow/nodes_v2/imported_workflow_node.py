@@ -5,10 +5,15 @@ import re
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
+from app.config import settings
 from app.core.workflow.base_node_v2 import BaseNodeV2, NodeExecutionContext
 from app.schemas.workflow import NodePortSchema, PortDefinition, PortType
-from app.services.library_service import LibraryService
 from app.core.workflow.executor_v2 import WorkflowExecutorV2
+from app.core.workflow.library_agent_plan import (
+    LibraryAgentPlan,
+    extract_selector,
+    library_agent_plans,
+)
 from app.core.workflow.variable_pool import VariablePool
 
 logger = logging.getLogger(__name__)
@@ -165,8 +170,9 @@ class ImportedWorkflowNode(BaseNodeV2):
         logger.info(f"Imported Workflow 실행 시작: {source_version_id}")
 
         try:
-            # 라이브러리 에이전트 로드
-            agent_data = await self._load_library_agent(source_version_id, context)
+            # 라이브러리 에이전트 실행 계획 로드 (source_version_id 단위 캐시)
+            plan = await self._load_library_agent(source_version_id, context)
+            agent_data = plan.to_agent_data()
 
             # 입력 변수 매핑
             internal_inputs = self._map_input_variables(
@@ -203,8 +209,11 @@ class ImportedWorkflowNode(BaseNodeV2):
             # user_message는 sys.user_message에서 가져오거나 기본값
             user_message = context.variable_pool.get_system_variable("user_message") or ""
 
-            # Child executor 생성
+            # Child executor 생성 (검증/실행 순서는 컴파일된 계획을 재사용)
             child_executor = WorkflowExecutorV2()
+            trace_child_run = self.config.get("trace_child_run")
+            if trace_child_run is None:
+                trace_child_run = settings.imported_workflow_trace_child_runs
 
             # ServiceContainer에서 user_uuid, API 메타데이터, 스트리밍 관련 조회
             user_uuid = context.service_container.get("user_uuid") if context.service_container else None
@@ -247,9 +256,17 @@ class ImportedWorkflowNode(BaseNodeV2):
                 # 중첩 워크플로우도 API 파라미터 전달 (부모로부터 상속)
                 api_key_id=api_key_id,
                 user_id=user_id_from_parent,
-                api_request_id=api_request_id
+                api_request_id=api_request_id,
+                execution_order=plan.execution_order,
+                # 부모가 이미 로드한 대화 변수를 그대로 사용하고, 변경분은 부모가 한 번에 저장
+                conversation_variables=context.variable_pool.get_all_conversation_variables(),
+                record_run=bool(trace_child_run),
+                persist_conversation=False
             )
 
+            for key, value in child_executor.variable_pool.get_dirty_conversation_variables().items():
+                context.variable_pool.set_conversation_variable(key, value)
+
             # 출력 값 수집 및 매핑
             output_schema = agent_data.get("output_schema", [])
             output_mappings = agent_data.get("output_mappings", {})
@@ -315,97 +332,30 @@ class ImportedWorkflowNode(BaseNodeV2):
         self,
         source_version_id: str,
         context: NodeExecutionContext
-    ) -> Dict[str, Any]:
-        """라이브러리 에이전트 로드
+    ) -> LibraryAgentPlan:
+        """라이브러리 에이전트 실행 계획 로드
+
+        검증/정규화와 Start 노드·출력 매핑 계산은 버전당 한 번만 수행되며,
+        버전이 바뀌면 다시 컴파일됩니다.
 
         Args:
             source_version_id: 라이브러리 버전 ID (UUID)
             context: 실행 컨텍스트
 
         Returns:
-            Dict[str, Any]: 라이브러리 에이전트 데이터
+            LibraryAgentPlan: 컴파일된 실행 계획
 
         Raises:
             ValueError: 라이브러리 에이전트를 찾을 수 없는 경우
         """
-        # DB에서 라이브러리 에이전트 조회
         db = context.get_service("db_session")
 
         if not db:
             raise RuntimeError("DB 세션을 찾을 수 없습니다")
 
-        # user는 service_container에 없을 수 있으므로 기본값 처리
+        # user가 있으면 권한 검증 포함 조회 (봇 실행 컨텍스트에는 없음)
         user = context.get_service("user")
-
-        # LibraryService를 통해 라이브러리 에이전트 조회
-        library_service = LibraryService(db)
-
-        if user and hasattr(user, 'id'):
-            # 권한 검증 포함 조회
-            source_version = await library_service.get_library_agent_by_id(
-                version_id=source_version_id,
-                user_id=user.id
-            )
-        else:
-            # 권한 검증 없이 조회 (봇 실행 컨텍스트)
-            from sqlalchemy import select
-            from app.models.workflow_version import BotWorkflowVersion
-
-            result = await db.execute(
-                select(BotWorkflowVersion).where(
-                    BotWorkflowVersion.id == source_version_id
-                )
-            )
-            source_version = result.scalar_one_or_none()
-
-        if not source_version:
-            raise ValueError(f"라이브러리 에이전트를 찾을 수 없습니다: {source_version_id}")
-
-        graph = source_version.graph or {}
-        nodes = graph.get("nodes", [])
-
-        start_node_id = None
-        output_mappings: Dict[str, Any] = {}
-
-        for node in nodes:
-            node_id = node.get("id")
-            data = node.get("data", {}) or {}
-            node_type = data.get("type") or node.get("type")
-
-            if node_type == "start" and not start_node_id:
-                start_node_id = node_id
-            elif node_type in ["answer", "end"]:
-                inputs = data.get("inputs")
-                var_mappings = node.get("variable_mappings", {}) or {}
-
-                if isinstance(inputs, dict):
-                    iter_ports = inputs.keys()
-                elif isinstance(inputs, list):
-                    iter_ports = [inp.get("name") for inp in inputs if inp.get("name")]
-                else:
-                    iter_ports = []
-
-                for port_name in iter_ports:
-                    selector = self._extract_selector(var_mappings.get(port_name))
-                    if selector:
-                        output_mappings[port_name] = selector
-
-                # 입력 정보가 없더라도 variable_mappings에 정의되어 있으면 활용
-                if not iter_ports and var_mappings:
-                    for port_name, mapping in var_mappings.items():
-                        selector = self._extract_selector(mapping)
-                        if selector:
-                            output_mappings.setdefault(port_name, selector)
-
-        return {
-            "id": str(source_version.id),
-            "name": source_version.library_name or f"Version {source_version.version}",
-            "graph": graph,
-            "input_schema": source_version.input_schema or [],
-            "output_schema": source_version.output_schema or [],
-            "start_node_id": start_node_id,
-            "output_mappings": output_mappings
-        }
+        return await library_agent_plans.get_plan(db, source_version_id, user=user)
 
     @staticmethod
     def _extract_selector(mapping: Any) -> Optional[str]:
@@ -426,16 +376,7 @@ class ImportedWorkflowNode(BaseNodeV2):
             >>> _extract_selector({"source": {"variable": "start-1.query"}})
             "start-1.query"
         """
-        if isinstance(mapping, str):
-            return mapping
-        elif isinstance(mapping, dict):
-            # {"variable": "..."} 형태
-            if "variable" in mapping:
-                return mapping["variable"]
-            # {"source": {"variable": "..."}} 형태
-            if "source" in mapping and isinstance(mapping["source"], dict):
-                return mapping["source"].get("variable")
-        return None
+        return extract_selector(mapping)
 
     def _map_input_variables(
         self,
@@ -7,7 +7,11 @@
 from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
+from app.config import settings
 from app.core.workflow.base_node_v2 import BaseNodeV2, NodeExecutionContext
+from app.core.workflow.node_cache import NodeCachePolicy
+from app.core.vector_store import SEARCH_MODES
+from app.core.workflow.nodes_v2.utils.mmr_reranker import mmr_select
 from app.schemas.workflow import NodePortSchema, PortDefinition, PortType
 from app.services.vector_service import VectorService
 import logging
@@ -103,12 +107,17 @@ class KnowledgeNodeV2(BaseNodeV2):
         document_ids = self.config.get("document_ids", [])
         # 유사도 임계값: 0.4 미만인 결과는 제외 (낮은 관련성 필터링)
         similarity_threshold = self.config.get("similarity_threshold", 0.4)
+        # 검색 모드: semantic(벡터) | hybrid(어휘 + 벡터 RRF)
+        search_mode = self._get_search_mode()
+        # MMR 다양성 재순위: top_k * mmr_fetch_multiplier개 후보를 임베딩과 함께 가져와 재순위
+        mmr_enabled = bool(self.config.get("mmr_enabled", settings.retrieval_mmr_enabled))
+        fetch_k = top_k * self._get_mmr_fetch_multiplier() if mmr_enabled else top_k
         persist_to_conversation = bool(self.config.get("persist_to_conversation", False))
         conversation_context_key = self.config.get("conversation_context_key", "knowledge_context")
         conversation_documents_key = self.config.get("conversation_documents_key", "knowledge_documents")
         conversation_doc_count_key = self.config.get("conversation_doc_count_key", "knowledge_doc_count")
 
-        logger.info(f"KnowledgeNodeV2: Searching with query='{query[:50]}...', top_k={top_k}, similarity_threshold={similarity_threshold}, user_uuid={user_uuid}, document_ids={document_ids if document_ids else '전체 문서'}")
+        logger.info(f"KnowledgeNodeV2: Searching with query='{query[:50]}...', top_k={top_k}, search_mode={search_mode}, similarity_threshold={similarity_threshold}, user_uuid={user_uuid}, document_ids={document_ids if document_ids else '전체 문서'}")
 
         if not user_uuid:
             raise ValueError("user_uuid를 찾을 수 없습니다")
@@ -119,9 +128,11 @@ class KnowledgeNodeV2(BaseNodeV2):
             results = await vector_service.search_similar_chunks(
                 user_uuid=user_uuid,
                 query=query,
-                top_k=top_k,
+                top_k=fetch_k,
                 db=db_session,
-                document_ids=document_ids if document_ids else None
+                document_ids=document_ids if document_ids else None,
+                search_mode=search_mode,
+                include_embeddings=mmr_enabled
             )
 
             # document_ids 필터로 검색했는데 결과가 없으면, 전체 문서에서 재검색 (Fallback)
@@ -133,11 +144,16 @@ class KnowledgeNodeV2(BaseNodeV2):
                 results = await vector_service.search_similar_chunks(
                     user_uuid=user_uuid,
                     query=query,
-                    top_k=top_k,
+                    top_k=fetch_k,
                     db=db_session,
-                    document_ids=None  # 전체 문서에서 검색
+                    document_ids=None,  # 전체 문서에서 검색
+                    search_mode=search_mode,
+                    include_embeddings=mmr_enabled
                 )
 
+            if mmr_enabled:
+                results = self._rerank_with_mmr(results, top_k)
+
             # 결과 처리
             if not results:
                 logger.warning("No documents found (전체 문서 검색 후에도 결과 없음)")
@@ -154,9 +170,11 @@ class KnowledgeNodeV2(BaseNodeV2):
                 }
 
             # 유사도 임계값으로 필터링 (낮은 관련성 결과 제외)
+            # hybrid 모드에서 어휘 경로로 매칭된 결과(제품 코드, 고유명사 등)는 임계값과 무관하게 유지
             filtered_results = [
                 doc for doc in results
                 if doc.get("similarity", 0.0) >= similarity_threshold
+                or "lexical" in doc.get("match_sources", [])
             ]
 
             low_similarity_warning = False
@@ -229,8 +247,106 @@ class KnowledgeNodeV2(BaseNodeV2):
         if not isinstance(top_k, int) or top_k < 1 or top_k > 20:
             return False, "top_k must be an integer between 1 and 20"
 
+        search_mode = self.config.get("search_mode")
+        if search_mode is not None and search_mode not in SEARCH_MODES:
+            return False, f"search_mode must be one of {', '.join(SEARCH_MODES)}"
+
+        mmr_lambda = self.config.get("mmr_lambda", settings.retrieval_mmr_lambda)
+        if not isinstance(mmr_lambda, (int, float)) or not 0.0 <= mmr_lambda <= 1.0:
+            return False, "mmr_lambda must be a number between 0 and 1"
+
+        dedup_threshold = self.config.get("dedup_threshold", settings.retrieval_dedup_similarity_threshold)
+        if dedup_threshold is not None and (
+            isinstance(dedup_threshold, bool)
+            or not isinstance(dedup_threshold, (int, float))
+            or not 0.0 < dedup_threshold <= 1.0
+        ):
+            return False, "dedup_threshold must be a number greater than 0 and at most 1"
+
+        fetch_multiplier = self.config.get("mmr_fetch_multiplier", settings.retrieval_mmr_fetch_multiplier)
+        if not isinstance(fetch_multiplier, int) or fetch_multiplier < 1 or fetch_multiplier > 10:
+            return False, "mmr_fetch_multiplier must be an integer between 1 and 10"
+
         return True, None
 
+    def _get_search_mode(self) -> str:
+        """노드 설정의 search_mode (없으면 전역 기본값)"""
+        search_mode = self.config.get("search_mode") or settings.retrieval_default_search_mode
+        return search_mode if search_mode in SEARCH_MODES else "semantic"
+
+    def _get_mmr_fetch_multiplier(self) -> int:
+        fetch_multiplier = self.config.get("mmr_fetch_multiplier", settings.retrieval_mmr_fetch_multiplier)
+        try:
+            return max(1, int(fetch_multiplier))
+        except (TypeError, ValueError):
+            return settings.retrieval_mmr_fetch_multiplier
+
+    def _rerank_with_mmr(self, results: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """
+        과다 조회한 후보를 MMR로 재순위해 top_k개 선택
+
+        관련도는 하이브리드 검색이면 최댓값으로 정규화한 RRF 점수, 아니면 코사인 유사도
+        (1 - distance)를 사용하며, 임베딩은 출력에 남기지 않습니다.
+        """
+        embeddings = [doc.pop("embedding", None) for doc in results]
+        if not results or any(embedding is None for embedding in embeddings):
+            return results[:top_k]
+
+        mmr_lambda = float(self.config.get("mmr_lambda", settings.retrieval_mmr_lambda))
+        dedup_threshold = self.config.get("dedup_threshold", settings.retrieval_dedup_similarity_threshold)
+        selected = mmr_select(
+            embeddings,
+            self._mmr_relevance(results),
+            top_k=top_k,
+            lambda_mult=mmr_lambda,
+            dedup_threshold=dedup_threshold,
+        )
+        logger.info(
+            f"KnowledgeNodeV2: MMR 재순위 {len(results)}개 후보 → {len(selected)}개 "
+            f"(lambda={mmr_lambda}, dedup_threshold={dedup_threshold})"
+        )
+        return [results[index] for index in selected]
+
+    @staticmethod
+    def _mmr_relevance(results: List[Dict[str, Any]]) -> List[float]:
+        """MMR 관련도 (RRF 융합 점수가 있으면 [0, 1]로 정규화해 사용, 없으면 1 - distance)"""
+        rrf_scores = [doc.get("rrf_score") for doc in results]
+        if all(score is not None for score in rrf_scores):
+            max_score = max(float(score) for score in rrf_scores)
+            if max_score > 0:
+                return [float(score) / max_score for score in rrf_scores]
+        return [1.0 - float(doc.get("distance", 1.0)) for doc in results]
+
     def get_required_services(self) -> List[str]:
         """필요한 서비스 목록"""
         return ["vector_service", "user_uuid", "db_session"]
+
+    def get_cache_policy(self) -> Optional[NodeCachePolicy]:
+        """
+        검색 결과 캐시 정책
+
+        코퍼스 버전을 확인할 수 있을 때만 캐시하며, 대화 변수에 결과를 기록하는
+        설정(persist_to_conversation)은 부수효과가 있으므로 캐시하지 않습니다.
+        """
+        if self.config.get("persist_to_conversation"):
+            return None
+        return NodeCachePolicy(
+            ttl_sec=settings.node_output_cache_knowledge_ttl_sec,
+            key_fields=(
+                "top_k",
+                "document_ids",
+                "similarity_threshold",
+                "mmr_enabled",
+                "mmr_lambda",
+                "mmr_fetch_multiplier",
+                "dedup_threshold",
+            ),
+            corpus_dependent=True,
+        )
+
+    def get_cache_key_inputs(self, context: NodeExecutionContext) -> Optional[Dict[str, Any]]:
+        """검색 대상 사용자(user_uuid)와 실제 적용되는 검색 모드까지 키에 포함"""
+        key_inputs = super().get_cache_key_inputs(context)
+        key_inputs["user_uuid"] = str(context.get_service("user_uuid"))
+        key_inputs["search_mode"] = self._get_search_mode()
+        return key_inputs
@@ -15,11 +15,22 @@ from app.core.workflow.nodes_v2.utils.template_renderer import (
     TemplateRenderError,
 )
 from app.core.workflow.nodes_v2.utils.variable_template_parser import VariableTemplateParser
+from app.core.prompt_cache import PromptCacheHints, resolve_static_prefix
+from functools import lru_cache
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+# {{ context }} / {{ query }} / {{ system_prompt }} 처럼 노드 ID 없이 쓴 현재 노드 입력 포트
+_SELF_PORT_PATTERN = re.compile(r"\{\{\s*(context|query|system_prompt)\s*\}\}")
+
+
+@lru_cache(maxsize=1024)
+def _prefix_self_ports(template: str) -> str:
+    """단순 포트 이름을 self. prefix selector로 변환 ({{ context }} → {{ self.context }})"""
+    return _SELF_PORT_PATTERN.sub(lambda match: f"{{{{ self.{match.group(1)} }}}}", template)
+
 
 class LLMNodeV2(BaseNodeV2):
     """
@@ -348,6 +359,10 @@ class LLMNodeV2(BaseNodeV2):
                 "검색 결과에 해당 정보가 없다고 명확히 알려주세요."
             )
             
+            # 턴마다 바이트 단위로 동일한 앞부분 (프롬프트 캐시 프리픽스)
+            # 검색 결과 유무에 따른 지시사항은 항상 이 뒤에 덧붙인다
+            stable_system_prompt = default_system_prompt
+
             # 검색 결과가 없는 경우 추가 지시사항
             if is_no_result:
                 default_system_prompt += (
@@ -357,14 +372,23 @@ class LLMNodeV2(BaseNodeV2):
 
             # 사용자가 제공한 system_prompt가 있으면 결합, 없으면 기본 시스템 프롬프트만 사용
             final_system_prompt = system_prompt if system_prompt else default_system_prompt
+            if system_prompt:
+                stable_system_prompt = system_prompt
             if system_prompt and system_prompt != default_system_prompt:
                 # 사용자 시스템 프롬프트 + 한국어 강제
                 final_system_prompt = f"{system_prompt}\n\n**중요: 반드시 한국어로 응답하세요.**"
+                stable_system_prompt = final_system_prompt
                 if is_no_result:
                     final_system_prompt += (
                         "\n\n**검색 결과가 없는 경우, 사용자에게 명확하게 알려주세요.**"
                     )
 
+            # Anthropic/Bedrock 프롬프트 캐시: 시스템 프롬프트 + 템플릿 정적 구간
+            cache_hints = PromptCacheHints(
+                system_prefix=stable_system_prompt,
+                prompt_prefix=resolve_static_prefix(prompt_template, prompt),
+            )
+
             # Provider client 미리 가져오기 (generate 호출 전)
             # 프론트엔드에서 전달받은 모델 이름을 그대로 사용
             provider_key = llm_service._resolve_provider(provider, model)
@@ -387,7 +411,8 @@ class LLMNodeV2(BaseNodeV2):
                     temperature=temperature,
                     max_tokens=max_tokens,
                     on_chunk=stream_handler.emit_content_chunk,
-                    system_prompt=final_system_prompt
+                    system_prompt=final_system_prompt,
+                    cache_hints=cache_hints
                 )
             else:
                 result = await llm_service.generate(
@@ -395,13 +420,23 @@ class LLMNodeV2(BaseNodeV2):
                     model=model,  # 프론트엔드에서 선택한 모델 ID 그대로 사용
                     provider=provider,  # 프론트엔드에서 선택한 provider 그대로 사용
                     temperature=temperature,
-                    max_tokens=max_tokens
+                    max_tokens=max_tokens,
+                    system_prompt=final_system_prompt,
+                    cache_hints=cache_hints
                 )
 
             tokens_used: int = 0
             prompt_tokens: int = 0
             completion_tokens: int = 0
             
+            # 지연시간 라우팅/헤지로 동일 티어의 다른 provider가 응답했을 수 있음
+            routed_provider = getattr(llm_service, "last_used_provider", None)
+            if not isinstance(routed_provider, str):
+                routed_provider = None
+            if routed_provider and routed_provider != provider_key:
+                provider_key = routed_provider
+                client = llm_service._get_client(provider_key)
+
             try:
                 usage = None
                 usage_consumer = getattr(llm_service, "consume_usage_snapshot", None)
@@ -418,6 +453,7 @@ class LLMNodeV2(BaseNodeV2):
                     logger.info(
                         f"[LLMNodeV2] Token usage: prompt={prompt_tokens}, completion={completion_tokens}, total={tokens_used}"
                     )
+                    self._record_prompt_cache_usage(context, usage)
                 else:
                     logger.warning(
                         f"[LLMNodeV2] Provider client에서 토큰 사용량을 찾지 못했습니다. provider={provider_key}, model={model}"
@@ -439,7 +475,14 @@ class LLMNodeV2(BaseNodeV2):
                 response_text = str(result)
 
             model_used = getattr(llm_service, "last_used_model", None) or model
-            if model_used != model:
+            if routed_provider and routed_provider != provider and model_used != model:
+                context.metadata.setdefault("llm_routing", {})[self.node_id] = {
+                    "requested_provider": provider,
+                    "requested_model": model,
+                    "used_provider": routed_provider,
+                    "used_model": model_used,
+                }
+            elif model_used != model:
                 logger.info(
                     "[LLMNodeV2] Streaming-safe model override: requested=%s, used=%s",
                     model,
@@ -517,7 +560,8 @@ class LLMNodeV2(BaseNodeV2):
                             temperature=temperature,
                             max_tokens=max_tokens,
                             on_chunk=stream_handler.emit_content_chunk,
-                            system_prompt=final_system_prompt
+                            system_prompt=final_system_prompt,
+                            cache_hints=cache_hints
                         )
                     else:
                         result = await llm_service.generate(
@@ -525,7 +569,9 @@ class LLMNodeV2(BaseNodeV2):
                             model=fallback_model,
                             provider=provider,
                             temperature=temperature,
-                            max_tokens=max_tokens
+                            max_tokens=max_tokens,
+                            system_prompt=final_system_prompt,
+                            cache_hints=cache_hints
                         )
                     
                     # 폴백 성공 - 결과 처리
@@ -564,6 +610,7 @@ class LLMNodeV2(BaseNodeV2):
                             logger.info(
                                 f"[LLMNodeV2] Token usage: prompt={prompt_tokens}, completion={completion_tokens}, total={tokens_used}"
                             )
+                            self._record_prompt_cache_usage(context, usage)
                     except Exception as token_error:
                         logger.warning(f"[LLMNodeV2] 토큰 사용량 조회 실패: {token_error}")
 
@@ -612,6 +659,23 @@ class LLMNodeV2(BaseNodeV2):
                 logger.error(f"LLM generation failed: {str(e)}")
                 raise
 
+    def _record_prompt_cache_usage(self, context: NodeExecutionContext, usage: Dict[str, Any]) -> None:
+        """프롬프트 캐시 적중 정보를 노드 실행 메타데이터(process_data)에 기록"""
+        cache_read = int(usage.get("cache_read_tokens", 0) or 0)
+        cache_write = int(usage.get("cache_write_tokens", 0) or 0)
+        if not cache_read and not cache_write:
+            return
+        context.metadata.setdefault("prompt_cache", {})[self.node_id] = {
+            "hit": cache_read > 0,
+            "cache_read_tokens": cache_read,
+            "cache_write_tokens": cache_write,
+        }
+        logger.info(
+            "[LLMNodeV2] Prompt cache: read=%d, write=%d tokens",
+            cache_read,
+            cache_write
+        )
+
     def _render_prompt(
         self,
         template: str,
@@ -697,17 +761,10 @@ class LLMNodeV2(BaseNodeV2):
             context.variable_pool.set_node_output("self", "context", context_text)
             context.variable_pool.set_node_output("self", "system_prompt", system_prompt)
 
-            # 단순 포트 이름을 self. prefix로 자동 변환
+            # 단순 포트 이름을 self. prefix로 자동 변환 (템플릿별 결과 캐시)
             # {{ context }} → {{ self.context }}
             # {{ query }} → {{ self.query }}
-            template_processed = template
-            for port_name in ["context", "query", "system_prompt"]:
-                # {{ port_name }} 패턴을 {{ self.port_name }}으로 변환 (공백 고려)
-                template_processed = re.sub(
-                    rf'\{{\{{\s*{port_name}\s*\}}\}}',
-                    f'{{{{ self.{port_name} }}}}',
-                    template_processed
-                )
+            template_processed = _prefix_self_ports(template)
 
             if template_processed != template:
                 logger.debug(f"[LLMNodeV2] 템플릿 자동 변환: 단순 포트 이름 → self.포트")
@@ -715,8 +772,7 @@ class LLMNodeV2(BaseNodeV2):
             # 실행 경로상의 모든 노드의 변수를 허용하도록 셀렉터 목록 계산
             allowed_selectors = self._compute_allowed_selectors_from_execution_path(context)
 
-            parser = VariableTemplateParser(template_processed)
-            selectors = parser.extract_variable_selectors()
+            selectors = VariableTemplateParser(template_processed).extract_variable_selectors()
             rendered_group, metadata = TemplateRenderer.render(
                 template_processed,
                 context.variable_pool,
@@ -7,19 +7,25 @@ Question Classifier 노드 (V2)
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 
 from app.core.workflow.base_node_v2 import BaseNodeV2, NodeExecutionContext
 from app.schemas.workflow import NodePortSchema, PortDefinition, PortType
+from app.core.embeddings import get_embedding_service
 from app.services.llm_service import LLMService
 from app.core.workflow.nodes_v2.utils.template_renderer import (
     TemplateRenderer,
     TemplateRenderError,
 )
+from app.core.workflow.nodes_v2.utils.embedding_classifier import EmbeddingClassifier
 
 logger = logging.getLogger(__name__)
 
+# 임베딩 분류 기본 임계값 (코사인 유사도 기준)
+DEFAULT_EMBEDDING_MARGIN = 0.05
+DEFAULT_EMBEDDING_MIN_SCORE = 0.3
+
 
 class QuestionClassifierNodeV2(BaseNodeV2):
     """
@@ -151,6 +157,54 @@ class QuestionClassifierNodeV2(BaseNodeV2):
             len(query),
         )
 
+        resolved_class: Optional[str] = None
+        tokens_used = 0
+
+        # 임베딩 빠른 경로: 상위 두 클래스 점수 차이가 충분할 때만 LLM 호출 생략
+        if self._classification_engine() == "embedding":
+            resolved_class = await self._classify_with_embeddings(context, query, classes)
+
+        if resolved_class is None:
+            resolved_class, tokens_used = await self._classify_with_llm(context, query, classes)
+
+        outputs: Dict[str, Any] = {
+            "class_name": resolved_class,
+            "query": query,  # 원본 query를 pass-through
+            "usage": {
+                "total_tokens": tokens_used,
+            },
+        }
+
+        # 출력 포트 이름과 핸들을 일치시키기 위해 포트 이름을 직접 사용
+        matched_topic = None
+        matched_port_name = None
+        
+        for topic in classes:
+            # topic['id']가 이미 'class_'로 시작하면 제거하고 다시 추가
+            topic_id = topic['id']
+            if topic_id.startswith('class_'):
+                topic_id = topic_id[6:]  # 'class_' 제거 (6자)
+            port_name = f"class_{topic_id}_branch"
+            
+            is_matched = topic["name"] == resolved_class
+            outputs[port_name] = is_matched
+            
+            if is_matched:
+                matched_topic = topic
+                matched_port_name = port_name
+        
+        if matched_port_name:
+            context.set_next_edge_handle([matched_port_name])
+
+        return outputs
+
+    async def _classify_with_llm(
+        self,
+        context: NodeExecutionContext,
+        query: str,
+        classes: List[Dict[str, Any]],
+    ) -> Tuple[str, int]:
+        """LLM 호출로 클래스 분류 (클래스 이름, 사용 토큰 수)"""
         llm_service: Optional[LLMService] = context.get_service("llm_service")
         if not llm_service:
             raise ValueError("LLM 서비스가 ServiceContainer에 등록되어 있지 않습니다")
@@ -174,7 +228,7 @@ class QuestionClassifierNodeV2(BaseNodeV2):
 
         # LLM을 사용하여 사용자 피드백을 클래스로 분류
         class_names = [topic["name"] for topic in classes]
-        
+
         llm_response = await llm_service.generate(
             prompt=prompt,
             model=model_config["name"],
@@ -198,37 +252,61 @@ class QuestionClassifierNodeV2(BaseNodeV2):
             raw_text,
             query,
         )
+        return resolved_class, tokens_used
 
-        outputs: Dict[str, Any] = {
-            "class_name": resolved_class,
-            "query": query,  # 원본 query를 pass-through
-            "usage": {
-                "total_tokens": tokens_used,
-            },
-        }
+    def _classification_engine(self) -> str:
+        engine = str(self.config.get("classification_engine") or "llm").lower()
+        return engine if engine in ("llm", "embedding") else "llm"
 
-        # 출력 포트 이름과 핸들을 일치시키기 위해 포트 이름을 직접 사용
-        matched_topic = None
-        matched_port_name = None
-        
-        for topic in classes:
-            # topic['id']가 이미 'class_'로 시작하면 제거하고 다시 추가
-            topic_id = topic['id']
-            if topic_id.startswith('class_'):
-                topic_id = topic_id[6:]  # 'class_' 제거 (6자)
-            port_name = f"class_{topic_id}_branch"
-            
-            is_matched = topic["name"] == resolved_class
-            outputs[port_name] = is_matched
-            
-            if is_matched:
-                matched_topic = topic
-                matched_port_name = port_name
-        
-        if matched_port_name:
-            context.set_next_edge_handle([matched_port_name])
+    async def _classify_with_embeddings(
+        self,
+        context: NodeExecutionContext,
+        query: str,
+        classes: List[Dict[str, Any]],
+    ) -> Optional[str]:
+        """
+        임베딩 centroid 코사인 유사도로 분류
 
-        return outputs
+        Returns:
+            확신할 수 있는 경우 클래스 이름, 마진/점수가 임계값 미만이면 None (LLM 폴백)
+        """
+        if len(classes) == 1:
+            return classes[0]["name"]
+
+        margin_threshold = self._float_config("embedding_margin_threshold", DEFAULT_EMBEDDING_MARGIN)
+        min_score = self._float_config("embedding_min_score", DEFAULT_EMBEDDING_MIN_SCORE)
+
+        embedding_service = context.get_service("embedding_service") or get_embedding_service()
+        try:
+            result = await EmbeddingClassifier(embedding_service).classify(query, classes)
+        except Exception as exc:
+            logger.warning("QuestionClassifierNodeV2 embedding path failed, using LLM: %s", exc)
+            return None
+
+        accepted = result.margin >= margin_threshold and result.score >= min_score
+        context.metadata.setdefault("question_classifier_routing", {})[self.node_id] = {
+            "engine": "embedding" if accepted else "llm_fallback",
+            "class_name": result.class_name,
+            "score": round(result.score, 4),
+            "margin": round(result.margin, 4),
+            "margin_threshold": margin_threshold,
+            "scores": result.scores,
+        }
+        logger.info(
+            "QuestionClassifierNodeV2 embedding scores: top='%s' score=%.4f margin=%.4f (threshold=%.4f) → %s",
+            result.class_name,
+            result.score,
+            result.margin,
+            margin_threshold,
+            "accept" if accepted else "LLM fallback",
+        )
+        return result.class_name if accepted else None
+
+    def _float_config(self, key: str, default: float) -> float:
+        try:
+            return float(self.config.get(key, default))
+        except (TypeError, ValueError):
+            return default
 
     def _normalize_model_config(self) -> Dict[str, Any]:
         """
@@ -282,9 +360,9 @@ class QuestionClassifierNodeV2(BaseNodeV2):
             },
         }
 
-    def _get_classes(self) -> List[Dict[str, str]]:
+    def _get_classes(self) -> List[Dict[str, Any]]:
         classes = self.config.get("classes") or []
-        normalized: List[Dict[str, str]] = []
+        normalized: List[Dict[str, Any]] = []
 
         for index, topic in enumerate(classes):
             if not isinstance(topic, dict):
@@ -295,7 +373,14 @@ class QuestionClassifierNodeV2(BaseNodeV2):
                 continue
 
             topic_id = topic.get("id") or self._slugify(name) or f"class_{index}"
-            normalized.append({"id": topic_id, "name": name})
+            item: Dict[str, Any] = {"id": topic_id, "name": name}
+            # 임베딩 분류용 선택 필드
+            if topic.get("description"):
+                item["description"] = str(topic["description"])
+            examples = topic.get("examples")
+            if isinstance(examples, list):
+                item["examples"] = [str(example) for example in examples if example]
+            normalized.append(item)
 
         return normalized
 
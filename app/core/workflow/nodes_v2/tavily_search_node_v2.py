@@ -15,7 +15,7 @@ from app.core.workflow.base_node_v2 import (
 )
 from app.core.workflow.base_node import NodeConfig
 from app.schemas.workflow import NodePortSchema, PortDefinition, PortType
-from app.core.providers.tavily import TavilyClient, TavilySearchRequest
+from app.core.providers.tavily import TavilySearchRequest, tavily_search_cache
 from app.config import settings
 import logging
 
@@ -34,6 +34,7 @@ class TavilySearchNodeConfig(NodeConfig):
     end_date: Optional[str] = Field(default=None, pattern=r"^\d{4}-\d{2}-\d{2}$")
     include_answer: bool = Field(default=False)
     include_raw_content: bool = Field(default=False)
+    cache_ttl_sec: Optional[int] = Field(default=None, ge=0, description="검색 결과 캐시 TTL (미지정 시 tavily_search_cache_ttl_sec, 0이면 캐시하지 않음)")
 
 
 class TavilySearchNodeV2(BaseNodeV2):
@@ -146,17 +147,11 @@ class TavilySearchNodeV2(BaseNodeV2):
             raise ValueError("query input is required")
 
         # 재검색 감지: feedback_stage가 "wait_feedback"이고 last_feedback이 있으면 재검색으로 간주
-        is_re_search = False
-        try:
-            feedback_stage = context.variable_pool.resolve_value_selector("conversation.feedback_stage")
-            last_feedback = context.variable_pool.resolve_value_selector("conversation.last_feedback")
-            if feedback_stage == "wait_feedback" and last_feedback:
-                is_re_search = True
-                # 재검색 시 쿼리에 "최신" 키워드를 추가하여 다른 결과를 가져오도록 함
-                query = f"{query} 최신"
-                logger.info(f"[TavilySearchNodeV2] 재검색 감지: 쿼리 수정됨 (원본: '{context.get_input('query')}', 수정: '{query}')")
-        except Exception as e:
-            logger.debug(f"[TavilySearchNodeV2] 재검색 감지 실패 (정상일 수 있음): {e}")
+        is_re_search = self._is_re_search(context)
+        if is_re_search:
+            # 재검색 시 쿼리에 "최신" 키워드를 추가하여 다른 결과를 가져오도록 함
+            query = f"{query} 최신"
+            logger.info(f"[TavilySearchNodeV2] 재검색 감지: 쿼리 수정됨 (원본: '{context.get_input('query')}', 수정: '{query}')")
 
         cfg = self.typed_config
         api_key = getattr(settings, "tavily_api_key", None)
@@ -165,26 +160,30 @@ class TavilySearchNodeV2(BaseNodeV2):
 
         logger.info(f"[TavilySearchNodeV2] 검색 시작: query='{query}', topic={cfg.topic}, max_results={cfg.max_results}, is_re_search={is_re_search}")
         
-        async with TavilyClient(api_key=api_key) as tavily_client:
-            search_result = await tavily_client.search(
-                TavilySearchRequest(
-                    query=str(query),
-                    search_depth=cfg.search_depth,
-                    topic=cfg.topic,
-                    max_results=cfg.max_results,
-                    include_domains=cfg.include_domains,
-                    exclude_domains=cfg.exclude_domains,
-                    time_range=cfg.time_range,
-                    start_date=cfg.start_date,
-                    end_date=cfg.end_date,
-                    include_answer=cfg.include_answer,
-                    include_raw_content=cfg.include_raw_content,
-                )
-            )
+        # 정규화된 쿼리+검색 옵션 단위 캐시 (만료 직후에는 이전 결과를 반환하며 백그라운드 갱신)
+        # 재검색은 사용자가 새 결과를 요청한 것이므로 캐시를 건너뛰고 결과로 캐시를 갱신
+        search_result, cache_status = await tavily_search_cache.search(
+            api_key,
+            TavilySearchRequest(
+                query=str(query),
+                search_depth=cfg.search_depth,
+                topic=cfg.topic,
+                max_results=cfg.max_results,
+                include_domains=cfg.include_domains,
+                exclude_domains=cfg.exclude_domains,
+                time_range=cfg.time_range,
+                start_date=cfg.start_date,
+                end_date=cfg.end_date,
+                include_answer=cfg.include_answer,
+                include_raw_content=cfg.include_raw_content,
+            ),
+            ttl_sec=cfg.cache_ttl_sec,
+            force_refresh=is_re_search,
+        )
 
         # 검색 결과 로깅
         result_count = len(search_result.results)
-        logger.info(f"[TavilySearchNodeV2] 검색 완료: {result_count}개 결과, response_time={search_result.response_time}s")
+        logger.info(f"[TavilySearchNodeV2] 검색 완료: {result_count}개 결과, response_time={search_result.response_time}s, cache={cache_status}")
         
         if result_count == 0:
             logger.warning(f"[TavilySearchNodeV2] 검색 결과가 없습니다. query='{query}', topic={cfg.topic}")
@@ -239,6 +238,16 @@ class TavilySearchNodeV2(BaseNodeV2):
 
         return output
 
+    @staticmethod
+    def _is_re_search(context: NodeExecutionContext) -> bool:
+        try:
+            feedback_stage = context.variable_pool.resolve_value_selector("conversation.feedback_stage")
+            last_feedback = context.variable_pool.resolve_value_selector("conversation.last_feedback")
+            return bool(feedback_stage == "wait_feedback" and last_feedback)
+        except Exception as e:
+            logger.debug(f"[TavilySearchNodeV2] 재검색 감지 실패 (정상일 수 있음): {e}")
+            return False
+
     def validate(self) -> tuple[bool, Optional[str]]:
         """
         노드 설정 검증
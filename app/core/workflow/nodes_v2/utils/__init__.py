@@ -10,7 +10,12 @@ from .template_renderer import (
     Segment,
     SegmentGroup,
 )
-from .variable_template_parser import VariableTemplateParser, VariableMatch
+from .variable_template_parser import (
+    CompiledTemplate,
+    VariableTemplateParser,
+    VariableMatch,
+    compile_template,
+)
 
 __all__ = [
     "TemplateRenderer",
@@ -19,4 +24,6 @@ __all__ = [
     "SegmentGroup",
     "VariableTemplateParser",
     "VariableMatch",
+    "CompiledTemplate",
+    "compile_template",
 ]
@@ -0,0 +1,166 @@
+"""
+임베딩 기반 질문 분류기
+
+Question Classifier 노드의 빠른 경로(fast path)입니다.
+클래스 이름/설명/예시 발화를 한 번 임베딩해 클래스별 centroid를 만들고,
+실행 시에는 질문 임베딩과의 코사인 유사도로 분류합니다.
+
+centroid는 클래스 정의 + 임베딩 모델을 해시한 키로 캐시되므로
+같은 워크플로우 버전(동일 클래스 정의)에서는 재계산하지 않습니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# centroid 캐시 최대 항목 수 (클래스 정의 조합 단위)
+MAX_CACHED_CENTROIDS = 256
+
+
+@dataclass
+class ClassCentroids:
+    """클래스 이름 목록과 정규화된 centroid 행렬 (shape: [클래스 수, 차원])"""
+
+    class_names: List[str]
+    matrix: np.ndarray
+
+
+@dataclass
+class EmbeddingClassification:
+    """임베딩 분류 결과"""
+
+    class_name: str
+    score: float
+    margin: float
+    scores: Dict[str, float]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def build_class_texts(topic: Dict[str, Any]) -> List[str]:
+    """클래스 하나를 대표하는 임베딩 대상 텍스트 목록 (이름+설명, 예시 발화)"""
+    name = topic["name"]
+    description = (topic.get("description") or "").strip()
+    texts = [f"{name}: {description}" if description else name]
+    texts.extend(
+        example.strip()
+        for example in topic.get("examples") or []
+        if isinstance(example, str) and example.strip()
+    )
+    return texts
+
+
+class EmbeddingClassifier:
+    """클래스 centroid 캐시와 코사인 유사도 분류"""
+
+    _cache: "OrderedDict[str, ClassCentroids]" = OrderedDict()
+    _locks: Dict[str, asyncio.Lock] = {}
+
+    def __init__(self, embedding_service: Any):
+        self.embedding_service = embedding_service
+
+    @staticmethod
+    def cache_key(classes: Sequence[Dict[str, Any]], model_id: Optional[str]) -> str:
+        payload = {
+            "model": model_id or "default",
+            "classes": [
+                {"name": topic["name"], "texts": build_class_texts(topic)}
+                for topic in classes
+            ],
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get_centroids(self, classes: Sequence[Dict[str, Any]]) -> ClassCentroids:
+        """클래스 centroid 조회 (없으면 한 번만 임베딩해서 캐시)"""
+        key = self.cache_key(classes, getattr(self.embedding_service, "model_id", None))
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+
+        lock = EmbeddingClassifier._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._get_cached(key)
+            if cached is not None:
+                return cached
+
+            texts_per_class = [build_class_texts(topic) for topic in classes]
+            flat_texts = [text for texts in texts_per_class for text in texts]
+            vectors = _normalize_rows(
+                np.asarray(await self.embedding_service.embed_documents(flat_texts), dtype=np.float32)
+            )
+
+            # 클래스별 텍스트 벡터 평균 → 정규화 (np.add.reduceat으로 한 번에 집계)
+            offsets = np.cumsum([0] + [len(texts) for texts in texts_per_class[:-1]])
+            counts = np.asarray([len(texts) for texts in texts_per_class], dtype=np.float32)
+            sums = np.add.reduceat(vectors, offsets, axis=0)
+            centroids = ClassCentroids(
+                class_names=[topic["name"] for topic in classes],
+                matrix=_normalize_rows(sums / counts[:, None]),
+            )
+
+            EmbeddingClassifier._cache[key] = centroids
+            while len(EmbeddingClassifier._cache) > MAX_CACHED_CENTROIDS:
+                evicted, _ = EmbeddingClassifier._cache.popitem(last=False)
+                EmbeddingClassifier._locks.pop(evicted, None)
+            logger.info(
+                "[EmbeddingClassifier] centroid 생성: classes=%d texts=%d",
+                len(classes),
+                len(flat_texts),
+            )
+            return centroids
+
+    async def classify(
+        self,
+        query: str,
+        classes: Sequence[Dict[str, Any]],
+    ) -> EmbeddingClassification:
+        centroids = await self.get_centroids(classes)
+        query_vector = np.asarray(await self.embedding_service.embed_query(query), dtype=np.float32)
+        return self.score(centroids, query_vector)
+
+    @staticmethod
+    def score(centroids: ClassCentroids, query_vector: np.ndarray) -> EmbeddingClassification:
+        """정규화된 centroid 행렬과 질문 벡터의 코사인 유사도 (행렬-벡터 곱 1회)"""
+        query_norm = float(np.linalg.norm(query_vector)) or 1.0
+        scores = centroids.matrix @ (query_vector / query_norm)
+
+        order = np.argsort(scores)[::-1]
+        top = int(order[0])
+        margin = float(scores[top] - scores[int(order[1])]) if len(order) > 1 else float("inf")
+
+        return EmbeddingClassification(
+            class_name=centroids.class_names[top],
+            score=float(scores[top]),
+            margin=margin,
+            scores={
+                name: round(float(value), 4)
+                for name, value in zip(centroids.class_names, scores)
+            },
+        )
+
+    @classmethod
+    def _get_cached(cls, key: str) -> Optional[ClassCentroids]:
+        cached = cls._cache.get(key)
+        if cached is not None:
+            cls._cache.move_to_end(key)
+        return cached
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._cache.clear()
+        cls._locks.clear()
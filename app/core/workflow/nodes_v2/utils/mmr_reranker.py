@@ -0,0 +1,76 @@
+"""
+MMR(Maximal Marginal Relevance) 다양성 재순위
+
+지식 검색 노드가 top_k보다 넓게 가져온 후보 청크를 저장된 임베딩으로 재순위합니다.
+chunk_overlap으로 겹치는 청크가 연달아 선택되어 프롬프트 토큰을 낭비하지 않도록,
+질의 관련도와 이미 선택된 청크와의 중복도를 함께 고려해 다양한 top_k를 고릅니다.
+
+후보 간 코사인 유사도 행렬은 NumPy로 한 번에 계산하고, 선택 단계에서는
+"선택된 청크와의 최대 유사도" 벡터만 갱신합니다 (O(k·n)).
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def mmr_select(
+    embeddings: Sequence[Sequence[float]],
+    relevance: Sequence[float],
+    top_k: int,
+    lambda_mult: float = 0.7,
+    dedup_threshold: Optional[float] = None,
+) -> List[int]:
+    """
+    MMR로 후보 인덱스 선택
+
+    score(i) = λ · relevance(i) − (1 − λ) · max_{j∈선택} cos(i, j)
+
+    Args:
+        embeddings: 후보 임베딩 (shape: [n, d])
+        relevance: 후보별 질의 관련도 (코사인 유사도 등, 클수록 관련)
+        top_k: 선택할 개수
+        lambda_mult: 관련도 가중치 (1.0이면 관련도 순, 0.0이면 다양성만)
+        dedup_threshold: 선택된 청크와의 코사인 유사도가 이 값 이상인 후보는 중복으로 제외
+
+    Returns:
+        선택된 후보 인덱스 (선택 순서)
+    """
+    n = len(relevance)
+    if n == 0 or top_k <= 0:
+        return []
+
+    matrix = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+    scores = np.asarray(relevance, dtype=np.float32)
+    similarity = matrix @ matrix.T
+
+    selected: List[int] = []
+    available = np.ones(n, dtype=bool)
+    max_redundancy = np.zeros(n, dtype=np.float32)
+
+    while len(selected) < min(top_k, n):
+        if selected:
+            mmr = lambda_mult * scores - (1.0 - lambda_mult) * max_redundancy
+        else:
+            mmr = scores.copy()
+        mmr[~available] = -np.inf
+
+        best = int(np.argmax(mmr))
+        if not np.isfinite(mmr[best]):
+            break
+
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_redundancy, similarity[best], out=max_redundancy)
+        if dedup_threshold is not None:
+            available &= similarity[best] < dedup_threshold
+
+    return selected
@@ -11,8 +11,10 @@ import logging
 
 from app.core.workflow.variable_pool import VariablePool
 from app.core.workflow.nodes_v2.utils.variable_template_parser import (
+    CompiledTemplate,
     VariableTemplateParser,
     VariableMatch,
+    compile_template,
 )
 
 logger = logging.getLogger(__name__)
@@ -119,14 +121,17 @@ class TemplateRenderer:
         """
         템플릿에서 모든 변수 참조를 추출
         """
+        selectors = TemplateRenderer.compile(template).selectors
+        TemplateRenderer._validate_variable_count(len(selectors))
+        return list(selectors)
+
+    @staticmethod
+    def compile(template: str) -> CompiledTemplate:
+        """
+        길이 제한을 검증한 뒤 컴파일된 템플릿 프로그램을 반환 (LRU 캐시)
+        """
         TemplateRenderer._validate_template_length(template)
-        parser = VariableTemplateParser(template)
-        selectors = parser.extract_variable_selectors()
-        if len(selectors) > TemplateRenderer.MAX_VARIABLES:
-            raise TemplateRenderError(
-                f"템플릿의 변수 수가 최대 {TemplateRenderer.MAX_VARIABLES}개를 초과했습니다"
-            )
-        return selectors
+        return compile_template(template or "")
 
     @staticmethod
     def render(
@@ -151,28 +156,22 @@ class TemplateRenderer:
         if not template or template.strip() == "":
             raise TemplateRenderError("템플릿이 비어있습니다")
 
-        TemplateRenderer._validate_template_length(template)
-        parser = VariableTemplateParser(template)
-        matches = parser.parse()
-        if len(matches) > TemplateRenderer.MAX_VARIABLES:
-            raise TemplateRenderError(
-                f"템플릿의 변수 수가 최대 {TemplateRenderer.MAX_VARIABLES}개를 초과했습니다"
-            )
+        compiled = TemplateRenderer.compile(template)
+        TemplateRenderer._validate_variable_count(len(compiled.matches))
+        allowed = set(allowed_selectors) if allowed_selectors is not None else None
 
         segments: List[Segment] = []
         used_variables: Dict[str, str] = {}
-        last_index = 0
 
-        for match in matches:
-            if match.start > last_index:
-                literal_text = template[last_index:match.start]
-                if literal_text:
-                    segments.append(Segment.literal(literal_text))
+        # 컴파일된 프로그램: 리터럴과 변수가 교차 (값 조회와 join만 수행)
+        for literal_text, match in zip(compiled.literals, compiled.matches):
+            if literal_text:
+                segments.append(Segment.literal(literal_text))
 
             # 변수 연결 검증
-            if allowed_selectors is not None and match.selector not in allowed_selectors:
+            if allowed is not None and match.selector not in allowed:
                 # 더 명확한 에러 메시지 제공
-                parts = match.selector.split(".")
+                parts = match.parts
                 if len(parts) == 2:
                     node_id, port_name = parts
                     # VariablePool에 노드가 있는지 확인
@@ -204,7 +203,7 @@ class TemplateRenderer:
             value = variable_pool.resolve_value_selector(match.selector)
             if value is None:
                 # 더 명확한 에러 메시지
-                parts = match.selector.split(".")
+                parts = match.parts
                 if len(parts) == 2:
                     node_id, port_name = parts
                     has_node = variable_pool.has_node_output(node_id)
@@ -227,12 +226,10 @@ class TemplateRenderer:
             segment = Segment.from_value(value)
             segments.append(segment)
             used_variables[match.selector] = type(value).__name__
-            last_index = match.end
 
-        if last_index < len(template):
-            tail_text = template[last_index:]
-            if tail_text:
-                segments.append(Segment.literal(tail_text))
+        tail_text = compiled.literals[-1]
+        if tail_text:
+            segments.append(Segment.literal(tail_text))
 
         segment_group = SegmentGroup(segments)
 
@@ -260,6 +257,13 @@ class TemplateRenderer:
                 f"템플릿 길이가 최대 {TemplateRenderer.MAX_TEMPLATE_LENGTH}자를 초과했습니다"
             )
 
+    @staticmethod
+    def _validate_variable_count(count: int) -> None:
+        if count > TemplateRenderer.MAX_VARIABLES:
+            raise TemplateRenderError(
+                f"템플릿의 변수 수가 최대 {TemplateRenderer.MAX_VARIABLES}개를 초과했습니다"
+            )
+
     @staticmethod
     def _convert_to_string(value: Any) -> str:
         if value is None:
@@ -2,17 +2,25 @@
 Variable template parser
 
 LLM/Answer/HTTP 노드 등의 템플릿에서 사용된 변수 selector를 추출한다.
+
+템플릿은 한 번만 스캔해 리터럴/변수가 교차하는 불변 프로그램(CompiledTemplate)으로
+컴파일하고, 템플릿 문자열 기준 LRU 캐시에 보관한다. 노드 실행마다 같은 문자열을
+정규식으로 다시 스캔하지 않는다.
 """
 
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from typing import Iterable, List
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable, List, Tuple
 
 
 _VARIABLE_PATTERN = re.compile(r"\{\{\s*(#?)([^{}\n]+?)\s*(#?)\}\}")
 
+# 컴파일된 템플릿 캐시 크기 (템플릿 문자열 단위)
+COMPILED_TEMPLATE_CACHE_SIZE = 2048
+
 
 @dataclass(frozen=True)
 class VariableMatch:
@@ -21,6 +29,64 @@ class VariableMatch:
     selector: str
     start: int
     end: int
+    # selector를 "."으로 미리 분리한 경로 (렌더링 시 재분리 방지)
+    parts: Tuple[str, ...] = field(default=(), compare=False)
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    컴파일된 템플릿 프로그램
+
+    literals[i] 다음에 matches[i]가 오고, 마지막에 literals[-1]이 붙는다.
+    (len(literals) == len(matches) + 1)
+    """
+
+    template: str
+    literals: Tuple[str, ...]
+    matches: Tuple[VariableMatch, ...]
+    selectors: Tuple[str, ...]
+
+    @property
+    def has_variables(self) -> bool:
+        return bool(self.matches)
+
+
+@lru_cache(maxsize=COMPILED_TEMPLATE_CACHE_SIZE)
+def compile_template(template: str) -> CompiledTemplate:
+    """템플릿을 리터럴/변수 프로그램으로 컴파일 (동일 문자열은 캐시 재사용)"""
+    template = template or ""
+    literals: List[str] = []
+    matches: List[VariableMatch] = []
+    selectors: List[str] = []
+    seen = set()
+    last_index = 0
+
+    for match in _VARIABLE_PATTERN.finditer(template):
+        selector = (match.group(2) or "").strip()
+        if not selector:
+            continue
+        literals.append(template[last_index:match.start()])
+        matches.append(
+            VariableMatch(
+                selector=selector,
+                start=match.start(),
+                end=match.end(),
+                parts=tuple(selector.split(".")),
+            )
+        )
+        if selector not in seen:
+            seen.add(selector)
+            selectors.append(selector)
+        last_index = match.end()
+
+    literals.append(template[last_index:])
+    return CompiledTemplate(
+        template=template,
+        literals=tuple(literals),
+        matches=tuple(matches),
+        selectors=tuple(selectors),
+    )
 
 
 class VariableTemplateParser:
@@ -31,38 +97,24 @@ class VariableTemplateParser:
     def __init__(self, template: str) -> None:
         self.template = template or ""
 
+    def compile(self) -> CompiledTemplate:
+        """컴파일된 템플릿 프로그램을 반환한다. (캐시 사용)"""
+        return compile_template(self.template)
+
     def parse(self) -> List[VariableMatch]:
         """
         템플릿을 순회하며 변수 매치를 반환한다.
         """
-        matches: List[VariableMatch] = []
-        for match in _VARIABLE_PATTERN.finditer(self.template):
-            selector = (match.group(2) or "").strip()
-            if not selector:
-                continue
-            matches.append(
-                VariableMatch(
-                    selector=selector,
-                    start=match.start(),
-                    end=match.end(),
-                )
-            )
-        return matches
+        return list(self.compile().matches)
 
     def extract_variable_selectors(self) -> List[str]:
         """
         템플릿에 등장하는 변수 selector 목록을 반환한다. (중복 제거, 순서 유지)
         """
-        selectors: List[str] = []
-        seen = set()
-        for match in self.parse():
-            if match.selector not in seen:
-                seen.add(match.selector)
-                selectors.append(match.selector)
-        return selectors
+        return list(self.compile().selectors)
 
     def iter_matches(self) -> Iterable[VariableMatch]:
         """
         generator 형태로 matcher를 순회하고 싶을 때 사용.
         """
-        yield from self.parse()
+        yield from self.compile().matches
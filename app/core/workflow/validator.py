@@ -8,6 +8,7 @@
 from typing import Dict, List, Set, Tuple, Optional, Any
 from collections import defaultdict, deque
 from app.core.workflow.base_node import BaseNode, NodeType
+from app.core.workflow.graph_index import GraphIndex
 from app.core.workflow.node_registry import node_registry
 from app.core.workflow.node_registry_v2 import node_registry_v2
 from app.core.workflow.nodes_v2.utils.template_renderer import (
@@ -72,6 +73,8 @@ class WorkflowValidator:
 
         # 엣지 맵 생성
         adjacency_list = self._build_adjacency_list(edges, node_map)
+        # 분기/템플릿 검증에서 공유하는 그래프 인덱스 (엣지 리스트 재스캔 방지)
+        graph_index = self.build_graph_index(node_map, edges)
 
         # 검증 수행
         self._validate_required_nodes(nodes)
@@ -88,12 +91,20 @@ class WorkflowValidator:
             self._normalize_v2_graph(nodes, edges, node_map)
             self._validate_v2_connections(nodes, edges)
             self._validate_v2_schema(nodes, edges, node_map)
-            self._validate_branch_convergence(nodes, edges, node_map)
-            self._validate_template_variable_connectivity(nodes, edges, node_map)
+            self._validate_branch_convergence(nodes, edges, node_map, graph_index)
+            self._validate_template_variable_connectivity(nodes, edges, node_map, graph_index)
 
         is_valid = len(self.errors) == 0
         return is_valid, self.errors, self.warnings
 
+    def build_graph_index(
+        self,
+        node_map: Dict[str, Dict],
+        edges: List[Dict[str, Any]]
+    ) -> GraphIndex:
+        """특수 프리픽스(conv/env/sys)를 가상 노드로 취급하는 그래프 인덱스 생성"""
+        return GraphIndex(node_map.keys(), edges, is_virtual=self._resolve_special_prefix)
+
     def _build_adjacency_list(
         self,
         edges: List[Dict[str, Any]],
@@ -193,83 +204,107 @@ class WorkflowValidator:
         node_ids = {node.get("id") for node in nodes}
 
         for node in nodes:
-            node_id = node.get("id")
-            node_type = node.get("type")
-            node_data = node.get("data", {})
+            errors, warnings = self._check_node_configuration(node, node_ids)
+            self.errors.extend(errors)
+            self.warnings.extend(warnings)
 
-            if not node_id:
-                self.errors.append("노드 ID가 없는 노드가 있습니다")
-                continue
+    def _check_node_configuration(
+        self,
+        node: Dict[str, Any],
+        node_ids: Set[Any]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        단일 노드 설정 검증
 
-            if not node_type:
-                self.errors.append(f"노드 {node_id}의 타입이 없습니다")
-                continue
+        Args:
+            node: 노드 정의
+            node_ids: 그래프의 전체 노드 ID 집합 (Answer 변수 참조 확인용)
 
-            # Answer 노드 특별 검증
-            if node_data.get("type") == "answer":
-                template = node_data.get("template", "")
-                if not template or template.strip() == "":
-                    self.errors.append(
-                        f"Answer 노드 '{node_id}'의 템플릿이 비어있습니다. "
-                        "최종 응답 내용을 입력하세요."
-                    )
-                    continue
+        Returns:
+            Tuple: (오류 리스트, 경고 리스트)
+        """
+        errors: List[str] = []
+        warnings: List[str] = []
 
-                try:
-                    variables = TemplateRenderer.parse_template(template)
-                except TemplateRenderError as exc:
-                    self.errors.append(
-                        f"Answer 노드 '{node_id}'의 템플릿 문법 오류: {exc}"
-                    )
-                    continue
+        node_id = node.get("id")
+        node_type = node.get("type")
+        node_data = node.get("data", {})
 
-                for var_ref in variables:
-                    prefix = var_ref.split(".", 1)[0]
-                    if prefix in {"sys", "env", "conv"}:
-                        continue
-                    if prefix not in node_ids:
-                        self.errors.append(
-                            f"Answer 노드의 변수 참조 '{var_ref}'에서 "
-                            f"노드 '{prefix}'를 찾을 수 없습니다."
-                        )
+        if not node_id:
+            errors.append("노드 ID가 없는 노드가 있습니다")
+            return errors, warnings
 
-            # 노드 타입별 설정 검증
-            # V2 노드인 경우 data.type을 우선 확인
-            v2_node_type = node_data.get("type")
-            if v2_node_type:
-                # V2 노드는 node_registry_v2에서 확인
-                v2_node_class = node_registry_v2.get(v2_node_type)
-                if v2_node_class:
-                    # V2 노드는 검증 통과
-                    continue
-                elif node.get("ports") or node.get("variable_mappings"):
-                    # 포트나 변수 매핑이 있으면 V2 노드로 간주
-                    continue
+        if not node_type:
+            errors.append(f"노드 {node_id}의 타입이 없습니다")
+            return errors, warnings
+
+        # Answer 노드 특별 검증
+        if node_data.get("type") == "answer":
+            template = node_data.get("template", "")
+            if not template or template.strip() == "":
+                errors.append(
+                    f"Answer 노드 '{node_id}'의 템플릿이 비어있습니다. "
+                    "최종 응답 내용을 입력하세요."
+                )
+                return errors, warnings
 
-            # V1 노드 검증
             try:
-                node_type_enum = NodeType(node_type)
-                node_class = node_registry.get(node_type_enum)
-
-                if node_class:
-                    # 설정 클래스로 검증
-                    config_class = node_class.get_config_class()
-                    if node_data and config_class != type(None):
-                        try:
-                            config = config_class(**node_data)
-                        except Exception as e:
-                            self.errors.append(f"노드 {node_id}의 설정이 유효하지 않습니다: {str(e)}")
-                else:
-                    # V2 노드는 node_registry에 등록되지 않을 수 있으므로 ports가 있으면 경고 생략
-                    if node.get("ports"):
-                        continue
-                    self.warnings.append(f"알 수 없는 노드 타입: {node_type}")
+                variables = TemplateRenderer.parse_template(template)
+            except TemplateRenderError as exc:
+                errors.append(
+                    f"Answer 노드 '{node_id}'의 템플릿 문법 오류: {exc}"
+                )
+                return errors, warnings
 
-            except ValueError:
-                # V2 노드는 NodeType enum에 존재하지 않을 수 있으므로 포트 정보가 있으면 통과
-                if node.get("ports") or node.get("variable_mappings"):
+            for var_ref in variables:
+                prefix = var_ref.split(".", 1)[0]
+                if prefix in {"sys", "env", "conv"}:
                     continue
-                self.errors.append(f"유효하지 않은 노드 타입: {node_type}")
+                if prefix not in node_ids:
+                    errors.append(
+                        f"Answer 노드의 변수 참조 '{var_ref}'에서 "
+                        f"노드 '{prefix}'를 찾을 수 없습니다."
+                    )
+
+        # 노드 타입별 설정 검증
+        # V2 노드인 경우 data.type을 우선 확인
+        v2_node_type = node_data.get("type")
+        if v2_node_type:
+            # V2 노드는 node_registry_v2에서 확인
+            v2_node_class = node_registry_v2.get(v2_node_type)
+            if v2_node_class:
+                # V2 노드는 검증 통과
+                return errors, warnings
+            elif node.get("ports") or node.get("variable_mappings"):
+                # 포트나 변수 매핑이 있으면 V2 노드로 간주
+                return errors, warnings
+
+        # V1 노드 검증
+        try:
+            node_type_enum = NodeType(node_type)
+            node_class = node_registry.get(node_type_enum)
+
+            if node_class:
+                # 설정 클래스로 검증
+                config_class = node_class.get_config_class()
+                if node_data and config_class != type(None):
+                    try:
+                        config = config_class(**node_data)
+                    except Exception as e:
+                        errors.append(f"노드 {node_id}의 설정이 유효하지 않습니다: {str(e)}")
+            else:
+                # V2 노드는 node_registry에 등록되지 않을 수 있으므로 ports가 있으면 경고 생략
+                if node.get("ports"):
+                    return errors, warnings
+                warnings.append(f"알 수 없는 노드 타입: {node_type}")
+
+        except ValueError:
+            # V2 노드는 NodeType enum에 존재하지 않을 수 있으므로 포트 정보가 있으면 통과
+            if node.get("ports") or node.get("variable_mappings"):
+                return errors, warnings
+            errors.append(f"유효하지 않은 노드 타입: {node_type}")
+
+        return errors, warnings
 
     def _validate_edges(
         self,
@@ -750,29 +785,31 @@ class WorkflowValidator:
         return source_value == any_value or target_value == any_value
 
     def _validate_no_cycles(self, adjacency_list: Dict[str, List[str]]):
-        """순환 참조 검증 (DFS 사용)"""
-        visited = set()
-        rec_stack = set()
-
-        def has_cycle(node: str) -> bool:
-            visited.add(node)
-            rec_stack.add(node)
+        """순환 참조 검증 (반복 DFS, O(V+E))"""
+        # 0: 미방문, 1: 탐색 중(스택), 2: 완료
+        state: Dict[str, int] = {}
 
-            for neighbor in adjacency_list.get(node, []):
-                if neighbor not in visited:
-                    if has_cycle(neighbor):
-                        return True
-                elif neighbor in rec_stack:
-                    return True
-
-            rec_stack.remove(node)
-            return False
-
-        for node in adjacency_list:
-            if node not in visited:
-                if has_cycle(node):
-                    self.errors.append("워크플로우에 순환 참조가 있습니다")
-                    break
+        for root in adjacency_list:
+            if state.get(root):
+                continue
+            state[root] = 1
+            stack = [(root, iter(adjacency_list.get(root, [])))]
+            while stack:
+                node, neighbors = stack[-1]
+                advanced = False
+                for neighbor in neighbors:
+                    neighbor_state = state.get(neighbor, 0)
+                    if neighbor_state == 1:
+                        self.errors.append("워크플로우에 순환 참조가 있습니다")
+                        return
+                    if neighbor_state == 0:
+                        state[neighbor] = 1
+                        stack.append((neighbor, iter(adjacency_list.get(neighbor, []))))
+                        advanced = True
+                        break
+                if not advanced:
+                    state[node] = 2
+                    stack.pop()
 
     def _validate_isolated_nodes(
         self,
@@ -807,14 +844,19 @@ class WorkflowValidator:
         adjacency_list: Dict[str, List[str]]
     ):
         """노드별 제약 조건 검증"""
+        # 역방향 인접 리스트를 한 번만 계산 (노드마다 전체 엣지 재스캔 방지)
+        incoming_map: Dict[str, List[str]] = defaultdict(list)
+        for source, targets in adjacency_list.items():
+            for target in targets:
+                incoming_map[target].append(source)
+
         for node in nodes:
             node_id = node.get("id")
             node_type = node.get("type")
 
             # Start 노드는 입력이 없어야 함
             if node_type == NodeType.START.value:
-                incoming = [source for source, targets in adjacency_list.items()
-                           if node_id in targets]
+                incoming = incoming_map.get(node_id, [])
                 if incoming:
                     self.errors.append(f"Start 노드 {node_id}는 입력을 가질 수 없습니다")
 
@@ -826,8 +868,7 @@ class WorkflowValidator:
             # Knowledge/LLM 노드는 입출력이 있어야 함
             if node_type in [NodeType.KNOWLEDGE_RETRIEVAL.value, NodeType.LLM.value]:
                 # 입력 확인
-                incoming = [source for source, targets in adjacency_list.items()
-                           if node_id in targets]
+                incoming = incoming_map.get(node_id, [])
                 if not incoming:
                     self.errors.append(f"{node_type} 노드 {node_id}는 최소 하나의 입력이 필요합니다")
 
@@ -939,7 +980,8 @@ class WorkflowValidator:
         self,
         nodes: List[Dict[str, Any]],
         edges: List[Dict[str, Any]],
-        node_map: Dict[str, Dict]
+        node_map: Dict[str, Dict],
+        graph_index: Optional[GraphIndex] = None
     ):
         """
         분기 합류 검증 (개선된 버전)
@@ -963,6 +1005,9 @@ class WorkflowValidator:
         if not branch_nodes:
             return
 
+        if graph_index is None:
+            graph_index = self.build_graph_index(node_map, edges)
+
         # 엣지 매핑 생성
         edges_by_source = defaultdict(list)
         for edge in edges:
@@ -992,11 +1037,8 @@ class WorkflowValidator:
             # 각 분기의 다운스트림 노드들 수집
             branch_streams = {}
             for branch_name, targets in branches.items():
-                downstream = self._get_downstream_nodes(
-                    set(targets),
-                    edges_by_source,
-                    node_map
-                )
+                # 도달 가능 노드는 인덱스에 미리 계산된 비트마스크 합집합으로 구함
+                downstream = graph_index.reachable_from(targets)
                 # 핵심: 분기 노드를 필터링한 다운스트림만 비교
                 filtered_downstream = self._filter_branch_nodes(
                     downstream,
@@ -1025,48 +1067,12 @@ class WorkflowValidator:
                             f"Answer → End로 연결되는 것이 더 명확한 설계입니다."
                         )
     
-    def _get_downstream_nodes(
-        self,
-        start_nodes: set,
-        edges_by_source: Dict[str, List[Dict[str, Any]]],
-        node_map: Dict[str, Dict]
-    ) -> set:
-        """
-        시작 노드들로부터 도달 가능한 모든 다운스트림 노드 수집 (BFS)
-
-        Args:
-            start_nodes: 시작 노드 ID 집합
-            edges_by_source: source별 엣지 맵
-            node_map: 노드 맵
-
-        Returns:
-            다운스트림 노드 ID 집합
-        """
-        visited = set()
-        queue = deque(start_nodes)
-
-        while queue:
-            current = queue.popleft()
-
-            if current in visited or current not in node_map:
-                continue
-
-            visited.add(current)
-
-            # 이 노드의 outgoing 엣지들
-            for edge in edges_by_source.get(current, []):
-                target = edge.get("target")
-                if target and target not in visited and not self._resolve_special_prefix(target):
-                    queue.append(target)
-
-        # 시작 노드들은 제외
-        return visited - start_nodes
-
     def _validate_template_variable_connectivity(
         self,
         nodes: List[Dict[str, Any]],
         edges: List[Dict[str, Any]],
-        node_map: Dict[str, Dict]
+        node_map: Dict[str, Dict],
+        graph_index: Optional[GraphIndex] = None
     ) -> None:
         """
         템플릿 변수 참조가 연결된 노드의 출력만 사용하는지 검증
@@ -1074,81 +1080,94 @@ class WorkflowValidator:
         Answer, LLM, Assigner 노드의 템플릿이나 variable_mappings에서
         참조하는 변수가 실제로 엣지로 연결된 노드에서 나오는지 확인합니다.
         """
-        # 노드별 incoming edges 맵 생성
-        incoming_edges: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-        for edge in edges:
-            target = edge.get("target")
-            if target:
-                incoming_edges[target].append(edge)
-
-        # 템플릿을 사용하는 노드 타입
-        template_node_types = {"answer", "llm"}
+        if graph_index is None:
+            graph_index = self.build_graph_index(node_map, edges)
 
         for node in nodes:
-            node_id = node.get("id")
-            node_data = node.get("data", {})
-            node_type = node_data.get("type")
+            self.errors.extend(self._check_node_template_connectivity(node, graph_index))
 
-            if not node_id or not node_type:
-                continue
+    def _check_node_template_connectivity(
+        self,
+        node: Dict[str, Any],
+        graph_index: GraphIndex
+    ) -> List[str]:
+        """
+        단일 노드의 템플릿 변수 연결 검증
 
-            # Answer 및 LLM 노드의 템플릿 변수 검증
-            if node_type in template_node_types:
-                template = node_data.get("template") or node_data.get("prompt_template")
-                if not template:
-                    continue
+        결과는 노드 정의와 이 노드로 들어오는 엣지의 source 집합에만 의존합니다.
 
-                try:
-                    # 템플릿에서 변수 추출
-                    variable_selectors = TemplateRenderer.parse_template(template)
-                except TemplateRenderError:
-                    # 템플릿 파싱 오류는 이미 다른 검증에서 처리됨
-                    continue
+        Returns:
+            오류 리스트
+        """
+        errors: List[str] = []
+        # 템플릿을 사용하는 노드 타입
+        template_node_types = {"answer", "llm"}
 
-                # variable_mappings에서 허용된 셀렉터 계산
-                variable_mappings = node.get("variable_mappings") or {}
-                allowed_selectors = set()
-
-                # variable_mappings의 모든 소스 셀렉터 수집
-                for port_name, mapping in variable_mappings.items():
-                    selector = self._extract_selector(mapping)
-                    if selector:
-                        allowed_selectors.add(selector)
-
-                # 자기 자신의 입력 포트도 허용 (self.port_name 형식)
-                port_map = self._resolve_port_map(node)
-                for input_port in port_map.get("inputs", {}).keys():
-                    allowed_selectors.add(f"self.{input_port}")
-
-                # 템플릿 변수가 허용된 셀렉터에 있는지 확인
-                for var_selector in variable_selectors:
-                    # 특수 프리픽스는 항상 허용
-                    if var_selector.startswith(("env.", "conv.", "conversation.", "sys.")):
-                        continue
+        node_id = node.get("id")
+        node_data = node.get("data", {})
+        node_type = node_data.get("type")
+
+        if not node_id or not node_type:
+            return errors
+
+        # Answer 및 LLM 노드의 템플릿 변수 검증
+        if node_type not in template_node_types:
+            return errors
+
+        template = node_data.get("template") or node_data.get("prompt_template")
+        if not template:
+            return errors
+
+        try:
+            # 템플릿에서 변수 추출
+            variable_selectors = TemplateRenderer.parse_template(template)
+        except TemplateRenderError:
+            # 템플릿 파싱 오류는 이미 다른 검증에서 처리됨
+            return errors
+
+        # variable_mappings에서 허용된 셀렉터 계산
+        variable_mappings = node.get("variable_mappings") or {}
+        allowed_selectors = set()
+
+        # variable_mappings의 모든 소스 셀렉터 수집
+        for port_name, mapping in variable_mappings.items():
+            selector = self._extract_selector(mapping)
+            if selector:
+                allowed_selectors.add(selector)
+
+        # 자기 자신의 입력 포트도 허용 (self.port_name 형식)
+        port_map = self._resolve_port_map(node)
+        for input_port in port_map.get("inputs", {}).keys():
+            allowed_selectors.add(f"self.{input_port}")
+
+        # 템플릿 변수가 허용된 셀렉터에 있는지 확인
+        for var_selector in variable_selectors:
+            # 특수 프리픽스는 항상 허용
+            if var_selector.startswith(("env.", "conv.", "conversation.", "sys.")):
+                continue
 
-                    # self. 프리픽스 정규화
-                    if var_selector in allowed_selectors:
-                        continue
+            # self. 프리픽스 정규화
+            if var_selector in allowed_selectors:
+                continue
 
-                    # 노드.포트 형식 분해
-                    parts = var_selector.split(".", 1)
-                    if len(parts) != 2:
-                        self.errors.append(
-                            f"노드 '{node_id}'의 템플릿 변수 '{var_selector}' 형식이 잘못되었습니다"
-                        )
-                        continue
+            # 노드.포트 형식 분해
+            parts = var_selector.split(".", 1)
+            if len(parts) != 2:
+                errors.append(
+                    f"노드 '{node_id}'의 템플릿 변수 '{var_selector}' 형식이 잘못되었습니다"
+                )
+                continue
 
-                    source_node, source_port = parts
+            source_node, source_port = parts
 
-                    # 소스 노드가 현재 노드와 연결되어 있는지 확인
-                    is_connected = any(
-                        edge.get("source") == source_node and edge.get("target") == node_id
-                        for edge in edges
-                    )
+            # 소스 노드가 현재 노드와 연결되어 있는지 확인
+            is_connected = graph_index.has_edge(source_node, node_id)
 
-                    if not is_connected:
-                        self.errors.append(
-                            f"노드 '{node_id}'의 템플릿 변수 '{var_selector}'는 "
-                            f"연결되지 않은 노드 '{source_node}'를 참조합니다. "
-                            f"워크플로우 에디터에서 노드를 연결해주세요."
-                        )
+            if not is_connected:
+                errors.append(
+                    f"노드 '{node_id}'의 템플릿 변수 '{var_selector}'는 "
+                    f"연결되지 않은 노드 '{source_node}'를 참조합니다. "
+                    f"워크플로우 에디터에서 노드를 연결해주세요."
+                )
+
+        return errors
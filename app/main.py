@@ -202,6 +202,10 @@ async def shutdown_event():
     from app.core.redis_client import redis_client
     await redis_client.close()
 
+    # 공용 HTTP 클라이언트 풀 종료
+    from app.core.http_client import http_client_pool
+    await http_client_pool.aclose()
+
     # 임베딩 서비스 ThreadPoolExecutor 정리
     from app.core.embeddings import get_embedding_service
     embedding_service = get_embedding_service()
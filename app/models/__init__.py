@@ -4,13 +4,14 @@
 from app.models.user import User, RefreshToken, APIKey
 from app.models.bot import Bot, BotKnowledge, BotStatus
 from app.models.deployment import BotDeployment, WidgetSession, WidgetMessage, WidgetEvent
-from app.models.document_embeddings import DocumentEmbedding
+from app.models.document_embeddings import DocumentEmbedding, DocumentChunkLink
 from app.models.document import Document, DocumentStatus
 from app.models.llm_usage import LLMUsageLog, ModelPricing
 from app.models.workflow_version import (
     BotWorkflowVersion,
     WorkflowExecutionRun,
-    WorkflowNodeExecution
+    WorkflowNodeExecution,
+    WorkflowGraphSnapshot
 )
 from app.models.conversation_variable import ConversationVariable
 from app.models.knowledge import Knowledge
@@ -31,6 +32,7 @@ __all__ = [
     "WidgetMessage",
     "WidgetEvent",
     "DocumentEmbedding",
+    "DocumentChunkLink",
     "Document",
     "DocumentStatus",
     "LLMUsageLog",
@@ -38,6 +40,7 @@ __all__ = [
     "BotWorkflowVersion",
     "WorkflowExecutionRun",
     "WorkflowNodeExecution",
+    "WorkflowGraphSnapshot",
     "ConversationVariable",
     "Knowledge",
     "AgentImportHistory",
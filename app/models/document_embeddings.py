@@ -1,14 +1,45 @@
 """
 문서 임베딩 데이터베이스 모델 (pgvector 사용)
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, Computed, Integer, String, Text, DateTime, ForeignKey, JSON, Index, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
 
+from app.config import settings
 from app.core.database import Base
 
 
+def _ann_index(mode: str) -> Index:
+    """
+    ANN 후보 단계 HNSW 인덱스 (settings.vector_search_quantization 모드의 인덱스만 선언)
+
+    양자화 모드에서는 float32 원본 인덱스를 선언하지 않습니다.
+    실제 생성/제거는 app.core.vector_indexes (scripts/apply_vector_search_index.py)가 담당합니다.
+    """
+    if mode == "halfvec":
+        return Index('document_embeddings_embedding_halfvec_idx',
+                     text("(embedding::halfvec(1024)) halfvec_cosine_ops"),
+                     postgresql_using='hnsw',
+                     postgresql_with={'m': 16, 'ef_construction': 64})
+    if mode == "binary":
+        return Index('document_embeddings_embedding_binary_idx',
+                     text("(binary_quantize(embedding)::bit(1024)) bit_hamming_ops"),
+                     postgresql_using='hnsw',
+                     postgresql_with={'m': 16, 'ef_construction': 64})
+    # Matryoshka 축약 벡터 HNSW 인덱스 (원본 대비 1/4 크기)
+    if mode == "matryoshka":
+        return Index('document_embeddings_embedding_short_idx', 'embedding_short',
+                     postgresql_using='hnsw',
+                     postgresql_with={'m': 16, 'ef_construction': 64},
+                     postgresql_ops={'embedding_short': 'vector_cosine_ops'})
+    return Index('document_embeddings_embedding_idx', 'embedding',
+                 postgresql_using='hnsw',
+                 postgresql_with={'m': 16, 'ef_construction': 64},
+                 postgresql_ops={'embedding': 'vector_cosine_ops'})
+
+
 class DocumentEmbedding(Base):
     """문서 임베딩 테이블 (pgvector)"""
     __tablename__ = "document_embeddings"
@@ -24,12 +55,35 @@ class DocumentEmbedding(Base):
     # 문서 청크
     chunk_text = Column(Text, nullable=False, comment="분할된 텍스트 청크")
     chunk_index = Column(Integer, nullable=False, comment="청크 인덱스 (순서)")
+    # 재수집 시 변경 청크만 임베딩하기 위한 청크 본문 해시 (sha256 hex)
+    content_hash = Column(String(64), nullable=True, comment="chunk_text의 sha256 (증분 재수집용)")
+
+    # 유사 중복 탐지용 SimHash 서명 (부호 있는 64비트) 및 LSH 밴드 키 (app.core.near_duplicate)
+    simhash = deferred(Column(BigInteger, nullable=True, comment="청크 SimHash 64비트 서명"))
+    simhash_bands = deferred(Column(ARRAY(Integer), nullable=True, comment="SimHash 밴드 키 (후보 검색용)"))
+
+    # 어휘 검색용 tsvector (chunk_text에서 DB가 생성, 'simple' 설정)
+    # 검색 결과 조회 시 함께 읽지 않도록 지연 로딩
+    chunk_tsv = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('simple'::regconfig, chunk_text)", persisted=True),
+        nullable=True,
+        comment="하이브리드 검색용 전문 검색 벡터"
+    ))
 
     # 벡터 임베딩 (Bedrock Titan: 1024차원)
     embedding = Column(Vector(1024), nullable=False, comment="1024차원 임베딩 벡터")
+    # 2단계 검색 1단계용 Matryoshka 축약 벡터 (앞 256차원, L2 재정규화)
+    embedding_short = deferred(Column(Vector(256), nullable=True, comment="256차원 축약 임베딩 (후보 검색용)"))
+
+    # 메타데이터 (JSONB + GIN: 자주 쓰지 않는 키는 @> 포함 조건으로 필터)
+    doc_metadata = Column(JSONB, nullable=True, comment="소스 파일명, 페이지 번호 등")
 
-    # 메타데이터
-    doc_metadata = Column(JSON, nullable=True, comment="소스 파일명, 페이지 번호 등")
+    # 자주 필터링하는 메타데이터 키를 승격한 컬럼 (VectorStore 저장 시 doc_metadata에서 채움)
+    chunk_id = Column(String(100), nullable=True, index=True, comment="청크 ID (metadata.document_id)")
+    user_uuid = Column(String(36), nullable=True, index=True, comment="업로드 사용자 UUID (metadata.user_uuid)")
+    file_type = Column(String(20), nullable=True, index=True, comment="파일 형식 (metadata.file_type)")
+    page = Column(Integer, nullable=True, comment="시작 페이지 번호 (metadata.page)")
 
     # 타임스탬프
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -40,12 +94,59 @@ class DocumentEmbedding(Base):
 
     # 명시적 인덱스 정의
     __table_args__ = (
-        # HNSW 벡터 인덱스 (pgvector 성능 최적화)
-        Index('document_embeddings_embedding_idx', 'embedding',
-              postgresql_using='hnsw',
-              postgresql_with={'m': 16, 'ef_construction': 64},
-              postgresql_ops={'embedding': 'vector_cosine_ops'}),
+        # HNSW 벡터 인덱스 (pgvector 성능 최적화, 검색 모드별로 하나)
+        _ann_index(settings.vector_search_quantization),
+        # 증분 재수집 시 문서별 청크 해시 조회
+        Index('document_embeddings_document_id_content_hash_idx', 'document_id', 'content_hash'),
+        # 재업로드 시 범위(봇/사용자) 내 본문이 같은 청크의 임베딩 재사용
+        Index('document_embeddings_bot_id_content_hash_idx', 'bot_id', 'content_hash'),
+        Index('document_embeddings_user_uuid_content_hash_idx', 'user_uuid', 'content_hash'),
+        # 메타데이터 필터 (filter_dict의 비승격 키: doc_metadata @> {...})
+        Index('document_embeddings_doc_metadata_idx', 'doc_metadata',
+              postgresql_using='gin',
+              postgresql_ops={'doc_metadata': 'jsonb_path_ops'}),
+        Index('document_embeddings_document_id_page_idx', 'document_id', 'page'),
+        # 유사 중복 후보 검색 (simhash_bands && :bands)
+        Index('document_embeddings_simhash_bands_idx', 'simhash_bands', postgresql_using='gin'),
+        # 전문 검색 / 트라이그램 인덱스 (하이브리드 검색)
+        Index('document_embeddings_chunk_tsv_idx', 'chunk_tsv', postgresql_using='gin'),
+        Index('document_embeddings_chunk_text_trgm_idx', 'chunk_text',
+              postgresql_using='gin',
+              postgresql_ops={'chunk_text': 'gin_trgm_ops'}),
     )
 
     def __repr__(self):
         return f"<DocumentEmbedding(id={self.id}, bot_id={self.bot_id}, chunk_index={self.chunk_index})>"
+
+
+class DocumentChunkLink(Base):
+    """
+    유사 중복 청크 연결 테이블
+
+    수집 시 같은 범위(봇/사용자)의 기존 청크와 거의 같은 청크는 임베딩 행을 새로 만들지 않고
+    대표 청크(canonical_embedding_id)에 연결합니다. document_ids 필터 검색 시 연결된
+    대표 청크도 해당 문서의 청크로 함께 검색됩니다.
+    """
+    __tablename__ = "document_chunk_links"
+
+    id = Column(Integer, primary_key=True)
+    document_id = Column(String(36), nullable=False, index=True, comment="중복 청크가 속한 documents.document_id")
+    canonical_embedding_id = Column(
+        Integer,
+        ForeignKey("document_embeddings.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="대표 청크 (document_embeddings.id)"
+    )
+    chunk_index = Column(Integer, nullable=False, comment="문서 내 청크 인덱스")
+    chunk_id = Column(String(100), nullable=True, index=True, comment="중복 청크 ID (metadata.document_id)")
+    chunk_text = Column(Text, nullable=False, comment="중복 청크 원문 (대표 청크 삭제 시 승격용)")
+    doc_metadata = Column(JSON, nullable=True, comment="중복 청크 메타데이터 (대표 청크 삭제 시 승격용)")
+    hamming_distance = Column(Integer, nullable=False, comment="대표 청크와의 SimHash 해밍 거리")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<DocumentChunkLink(document_id={self.document_id}, chunk_index={self.chunk_index}, "
+            f"canonical_embedding_id={self.canonical_embedding_id})>"
+        )
@@ -3,7 +3,7 @@
 """
 from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Integer, Text, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func, text
 from datetime import datetime
 import uuid
@@ -67,6 +67,19 @@ class BotWorkflowVersion(Base):
     )
 
 
+class WorkflowGraphSnapshot(Base):
+    """
+    실행 시점 그래프 스냅샷 테이블 (content-addressed)
+
+    같은 그래프로 실행된 run들은 그래프 해시(sha256)로 하나의 스냅샷을 공유합니다.
+    """
+    __tablename__ = "workflow_graph_snapshots"
+
+    graph_hash = Column(String(64), primary_key=True)
+    graph = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class WorkflowExecutionRun(Base):
     """워크플로우 실행 기록 테이블"""
     __tablename__ = "workflow_execution_runs"
@@ -78,7 +91,15 @@ class WorkflowExecutionRun(Base):
     user_id = Column(String(36), ForeignKey('users.uuid'))
 
     # 실행 데이터
-    graph_snapshot = Column(JSONB, nullable=False)
+    # 그래프는 workflow_graph_snapshots에 해시로 저장하고 run은 참조만 보관
+    graph_snapshot_hash = Column(
+        String(64),
+        ForeignKey('workflow_graph_snapshots.graph_hash'),
+        nullable=True,
+        index=True
+    )
+    # 레거시 run 전용 (신규 run은 NULL). 목록 조회 시 로드하지 않도록 지연 로딩
+    graph_snapshot = deferred(Column(JSONB, nullable=True))
     inputs = Column(JSONB)
     outputs = Column(JSONB)
 
@@ -408,7 +408,8 @@ class WorkflowRunResponse(BaseModel):
 
 class WorkflowRunDetail(WorkflowRunResponse):
     """워크플로우 실행 기록 상세"""
-    graph_snapshot: Dict[str, Any] = Field(..., description="실행 시점 그래프 스냅샷")
+    graph_snapshot: Optional[Dict[str, Any]] = Field(None, description="실행 시점 그래프 스냅샷")
+    graph_snapshot_hash: Optional[str] = Field(None, description="그래프 스냅샷 해시 (sha256)")
     inputs: Optional[Dict[str, Any]] = Field(None, description="입력 데이터")
     outputs: Optional[Dict[str, Any]] = Field(None, description="출력 데이터")
 
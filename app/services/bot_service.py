@@ -24,6 +24,8 @@ from app.core.exceptions import (
     DatabaseTransactionError
 )
 from app.config import settings
+from app.core.retrieval_cache import retrieval_cache
+from app.core.widget.session_cache import widget_session_cache
 
 logger = logging.getLogger(__name__)
 
@@ -867,6 +869,7 @@ class BotService:
         try:
             await db.commit()
             await db.refresh(bot)
+            await widget_session_cache.invalidate_bot(bot_id)
             logger.info(f"봇 수정 성공: bot_id={bot_id}, 수정 필드={list(update_data.keys())}")
             return bot
         except SQLAlchemyError as e:
@@ -944,6 +947,7 @@ class BotService:
         try:
             await db.commit()
             await db.refresh(bot)
+            await widget_session_cache.invalidate_bot(bot_id)
             logger.info(f"봇 상태 토글 성공: bot_id={bot_id}, is_active={is_active}")
             return bot
         except SQLAlchemyError as e:
@@ -991,6 +995,9 @@ class BotService:
             # bot_knowledge, bot_workflow_versions, workflow_executions 등은 CASCADE로 자동 삭제됨
             await db.delete(bot)
             await db.commit()
+            await widget_session_cache.invalidate_bot(bot_id)
+            # document_embeddings도 CASCADE로 삭제되므로 검색 결과 캐시 무효화
+            await retrieval_cache.bump_corpus_version()
             logger.info(f"봇 삭제 성공: bot_id={bot_id}")
             return True
         except SQLAlchemyError as e:
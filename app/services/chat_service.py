@@ -5,14 +5,15 @@ import asyncio
 import copy
 import logging
 import threading
-import json
 from typing import List, Dict, Optional, AsyncGenerator, Callable, Awaitable, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.embeddings import get_embedding_service
 from app.core.vector_store import get_vector_store
+from app.core.retrieval_cache import retrieval_cache
 from app.core.llm_client import get_llm_client
 from app.core.prompt_templates import PromptTemplate
+from app.core.stream_events import ContentCoalescer, StreamEvent
 from app.models.chat import (
     ChatRequest,
     ChatResponse,
@@ -40,17 +41,30 @@ logger = logging.getLogger(__name__)
 
 
 class WorkflowStreamHandler:
-    """워크플로우 스트리밍 이벤트 헬퍼"""
+    """
+    워크플로우 스트리밍 이벤트 헬퍼
+
+    LLM 토큰은 짧은 시간 창 단위로 병합해 content 이벤트 하나로 내보낸다.
+    노드/출처 이벤트 전에는 대기 중인 토큰을 먼저 내보내 순서를 유지한다.
+    """
 
     def __init__(
         self,
         emit_fn: Callable[[Dict[str, Any]], Awaitable[None]],
         include_sources: bool,
-        text_normalizer: Callable[[str], str]
+        text_normalizer: Callable[[str], str],
+        coalesce_window_ms: Optional[float] = None,
+        coalesce_max_bytes: Optional[int] = None
     ):
         self._emit_fn = emit_fn
         self.include_sources = include_sources
         self._normalize = text_normalizer
+        self._coalescer = ContentCoalescer(
+            window_ms=settings.stream_coalesce_window_ms if coalesce_window_ms is None else coalesce_window_ms,
+            max_bytes=settings.stream_coalesce_max_bytes if coalesce_max_bytes is None else coalesce_max_bytes
+        )
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def emit_node_event(
         self,
@@ -69,20 +83,47 @@ class WorkflowStreamHandler:
             output_preview=output_preview,
             metadata=metadata,
         )
+        await self.flush_content()
         await self._emit_fn(event.model_dump())
 
     async def emit_content_chunk(self, chunk: str) -> Optional[str]:
-        """LLM 토큰 청크를 평문화 후 이벤트 전송"""
+        """LLM 토큰 청크를 평문화 후 병합 버퍼에 추가 (프레임 단위로 이벤트 전송)"""
         normalized = self._normalize(chunk)
         if not normalized:
             return None
 
-        await self._emit_fn(ContentEvent(data=normalized).model_dump())
+        frame = self._coalescer.add(normalized)
+        if frame is not None:
+            self._cancel_scheduled_flush()
+            await self._emit_fn(ContentEvent(data=frame).model_dump())
+        elif self._coalescer.pending and self._flush_handle is None:
+            # 다음 토큰이 늦게 오더라도 시간 창이 끝나면 버퍼를 비운다
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                max(self._coalescer.remaining(), 0.0),
+                self._on_flush_timer
+            )
         return normalized
 
+    async def flush_content(self) -> None:
+        """병합 버퍼에 남은 토큰을 content 이벤트로 즉시 전송"""
+        self._cancel_scheduled_flush()
+        frame = self._coalescer.drain()
+        if frame:
+            await self._emit_fn(ContentEvent(data=frame).model_dump())
+
+    def _on_flush_timer(self) -> None:
+        self._flush_handle = None
+        self._flush_task = asyncio.ensure_future(self.flush_content())
+
+    def _cancel_scheduled_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
     async def emit_sources(self, sources: List[Source]) -> None:
         if not self.include_sources or not sources:
             return
+        await self.flush_content()
         await self._emit_fn(SourcesEvent(data=sources).model_dump())
 
     def _convert_documents_to_sources(self, documents: List[Dict[str, Any]]) -> List[Source]:
@@ -121,9 +162,14 @@ class ChatService:
         request: ChatRequest,
         user_uuid: str,
         db: Optional[AsyncSession] = None,
-        jwt_token: Optional[str] = None
+        jwt_token: Optional[str] = None,
+        bot: Optional[Any] = None
     ) -> ChatResponse:
-        """챗봇 응답 생성 (RAG 파이프라인 또는 Workflow 실행)"""
+        """
+        챗봇 응답 생성 (RAG 파이프라인 또는 Workflow 실행)
+
+        bot: 호출자가 이미 로드한 Bot (위젯 세션 검증 등). 주어지면 재조회하지 않음
+        """
 
         logger.info(f"챗봇 요청: '{request.message[:50]}...'")
 
@@ -136,23 +182,25 @@ class ChatService:
             raise ValueError("데이터베이스 세션이 필요합니다. 봇 정보 및 문서 조회를 위해 db 세션이 필요합니다.")
 
         # Workflow 실행
-        return await self._execute_workflow(request, user_uuid, db, jwt_token=jwt_token)
+        return await self._execute_workflow(request, user_uuid, db, jwt_token=jwt_token, bot=bot)
 
     async def _execute_workflow(
         self,
         request: ChatRequest,
         user_uuid: str,
         db: AsyncSession,
-        jwt_token: Optional[str] = None
+        jwt_token: Optional[str] = None,
+        bot: Optional[Any] = None
     ) -> ChatResponse:
         """Workflow 기반 응답 생성"""
         from app.services.bot_service import get_bot_service
 
         logger.info(f"[ChatService] Workflow 실행: bot_id={request.bot_id}, user_uuid={user_uuid}")
 
-        # Bot 조회
-        bot_service = get_bot_service()
-        bot = await bot_service.get_bot_by_id(request.bot_id, None, db, include_workflow=True)
+        # Bot 조회 (호출자가 로드한 봇이 있으면 재사용)
+        if bot is None or bot.bot_id != request.bot_id:
+            bot_service = get_bot_service()
+            bot = await bot_service.get_bot_by_id(request.bot_id, None, db, include_workflow=True)
 
         if not bot:
             raise ValueError(f"Bot not found: {request.bot_id}")
@@ -228,9 +276,14 @@ class ChatService:
         user_uuid: str,
         db: Optional[AsyncSession] = None,
         cancel_event: Optional[asyncio.Event] = None,
-        jwt_token: Optional[str] = None
+        jwt_token: Optional[str] = None,
+        bot: Optional[Any] = None
     ) -> AsyncGenerator[str, None]:
-        """워크플로우/일반 RAG 공통 스트리밍 응답 생성"""
+        """
+        워크플로우/일반 RAG 공통 스트리밍 응답 생성
+
+        bot: 호출자가 이미 로드한 Bot (위젯 세션 검증 등). 주어지면 재조회하지 않음
+        """
         logger.info(f"[ChatService] 스트리밍 요청: '{request.message[:50]}...' (bot_id={request.bot_id})")
 
         if not request.bot_id:
@@ -242,15 +295,16 @@ class ChatService:
         try:
             from app.services.bot_service import get_bot_service
 
-            bot_service = get_bot_service()
-            bot = await bot_service.get_bot_by_id(request.bot_id, None, db, include_workflow=True)
+            if bot is None or bot.bot_id != request.bot_id:
+                bot_service = get_bot_service()
+                bot = await bot_service.get_bot_by_id(request.bot_id, None, db, include_workflow=True)
 
             if not bot:
                 error_event = ErrorEvent(
                     code=ErrorCode.INVALID_REQUEST,
                     message=f"Bot not found: {request.bot_id}"
                 )
-                yield json.dumps(error_event.model_dump(), ensure_ascii=False)
+                yield StreamEvent.from_model(error_event)
                 return
 
             if bot.workflow or getattr(bot, "use_workflow_v2", False):
@@ -276,15 +330,18 @@ class ChatService:
             vector_store = get_vector_store(user_uuid=user_uuid, db=db)
             sanitized_message = sanitize_chat_query(request.message)
 
-            query_embedding = await self.embedding_service.embed_query(sanitized_message)
             filter_dict = {"user_uuid": user_uuid}
             if request.document_ids:
-                filter_dict["document_id"] = request.document_ids
-
-            search_results = await vector_store.search(
-                query_embedding=query_embedding,
-                top_k=request.top_k,
-                filter_dict=filter_dict
+                filter_dict["source_document_id"] = request.document_ids
+
+            search_results = await retrieval_cache.fetch(
+                scope={"user_uuid": user_uuid},
+                query=sanitized_message,
+                params={"top_k": request.top_k, "filter": filter_dict},
+                document_ids=request.document_ids,
+                loader=lambda: self._embed_and_search(
+                    vector_store, sanitized_message, request.top_k, filter_dict
+                )
             )
 
             retrieved_chunks = self._extract_chunks(search_results)
@@ -293,7 +350,7 @@ class ChatService:
                     code=ErrorCode.INVALID_REQUEST,
                     message="관련 문서를 찾을 수 없습니다"
                 )
-                yield json.dumps(error_event.model_dump(), ensure_ascii=False)
+                yield StreamEvent.from_model(error_event)
                 return
 
             context = self.prompt_template.format_context(retrieved_chunks)
@@ -306,6 +363,10 @@ class ChatService:
             max_tokens = request.max_tokens if request.max_tokens is not None else settings.chat_max_tokens
 
             resolved_model = self._resolve_model_name(request.model)
+            coalescer = ContentCoalescer(
+                window_ms=settings.stream_coalesce_window_ms,
+                max_bytes=settings.stream_coalesce_max_bytes
+            )
 
             async for chunk in self.llm_client.generate_stream(
                 messages=messages,
@@ -319,8 +380,13 @@ class ChatService:
                 normalized_chunk = strip_markdown_preserve_whitespace(chunk)
                 if not normalized_chunk:
                     continue
-                content_event = ContentEvent(data=normalized_chunk)
-                yield json.dumps(content_event.model_dump(), ensure_ascii=False)
+                frame = coalescer.add(normalized_chunk)
+                if frame is not None:
+                    yield StreamEvent.from_model(ContentEvent(data=frame))
+
+            remaining_frame = coalescer.drain()
+            if remaining_frame and not (cancel_event and cancel_event.is_set()):
+                yield StreamEvent.from_model(ContentEvent(data=remaining_frame))
 
             if cancel_event and cancel_event.is_set():
                 logger.info("[ChatService] Cancellation requested before sending sources")
@@ -330,7 +396,7 @@ class ChatService:
                 sources = self._build_sources(retrieved_chunks, search_results)
                 if sources:
                     sources_event = SourcesEvent(data=sources)
-                    yield json.dumps(sources_event.model_dump(), ensure_ascii=False)
+                    yield StreamEvent.from_model(sources_event)
 
             if cancel_event and cancel_event.is_set():
                 logger.info("[ChatService] Cancellation requested before tracking usage")
@@ -349,7 +415,7 @@ class ChatService:
                 code=ErrorCode.INVALID_REQUEST,
                 message=str(e)
             )
-            yield json.dumps(error_event.model_dump(), ensure_ascii=False)
+            yield StreamEvent.from_model(error_event)
             return
 
         except VectorStoreError as e:
@@ -358,7 +424,7 @@ class ChatService:
                 code=ErrorCode.STREAM_ERROR,
                 message="문서 검색 중 오류가 발생했습니다"
             )
-            yield json.dumps(error_event.model_dump(), ensure_ascii=False)
+            yield StreamEvent.from_model(error_event)
             return
 
         except LLMRateLimitError as e:
@@ -367,7 +433,7 @@ class ChatService:
                 code=ErrorCode.RATE_LIMIT_EXCEEDED,
                 message="API 사용량 제한을 초과했습니다. 잠시 후 다시 시도해주세요."
             )
-            yield json.dumps(error_event.model_dump(), ensure_ascii=False)
+            yield StreamEvent.from_model(error_event)
             return
 
         except Exception as e:
@@ -376,7 +442,7 @@ class ChatService:
                 code=ErrorCode.UNKNOWN_ERROR,
                 message="응답 생성 중 오류가 발생했습니다"
             )
-            yield json.dumps(error_event.model_dump(), ensure_ascii=False)
+            yield StreamEvent.from_model(error_event)
             return
 
     async def _stream_workflow_response(
@@ -412,10 +478,11 @@ class ChatService:
         from app.core.workflow.executor_v2 import WorkflowExecutorV2
         executor = WorkflowExecutorV2()
 
-        queue: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        queue: asyncio.Queue[Optional[StreamEvent]] = asyncio.Queue()
 
         async def emit(event_payload: Dict[str, Any]) -> None:
-            await queue.put(json.dumps(event_payload, ensure_ascii=False))
+            # 이벤트당 한 번만 직렬화하고, 소비자는 StreamEvent.payload를 재사용
+            await queue.put(StreamEvent(event_payload))
 
         stream_handler = WorkflowStreamHandler(
             emit_fn=emit,
@@ -450,12 +517,15 @@ class ChatService:
 
             except Exception as exc:
                 logger.error(f"[ChatService] 워크플로우 스트리밍 실패: {exc}")
+                await stream_handler.flush_content()
                 friendly_message = str(exc) or "워크플로우 실행 중 오류가 발생했습니다"
                 error_event = ErrorEvent(
                     code=ErrorCode.STREAM_ERROR,
                     message=friendly_message
                 )
                 await emit(error_event.model_dump())
+            else:
+                await stream_handler.flush_content()
             finally:
                 await queue.put(None)
 
@@ -481,6 +551,23 @@ class ChatService:
             except asyncio.CancelledError:
                 logger.info("[ChatService] 워크플로우 태스크가 취소되었습니다.")
 
+    async def _embed_and_search(
+        self,
+        vector_store,
+        query: str,
+        top_k: int,
+        filter_dict: Optional[Dict] = None
+    ) -> Dict:
+        """쿼리 임베딩 생성 후 벡터 검색 (검색 결과 캐시 miss 시 실행)"""
+        # 정제된 사용자 질문을 임베딩 벡터(List[float])로 변환
+        # 비동기 메서드 호출 (이벤트 루프 블로킹 방지)
+        query_embedding = await self.embedding_service.embed_query(query)
+        return await vector_store.search(
+            query_embedding=query_embedding,
+            top_k=top_k,
+            filter_dict=filter_dict
+        )
+
     async def _execute_rag_pipeline(
         self,
         request: ChatRequest,
@@ -510,17 +597,14 @@ class ChatService:
                     retrieved_chunks=0
                 )
 
-            # 1. 쿼리 임베딩 생성
-            logger.debug("쿼리 임베딩 생성 중...")
-            # 정제된 사용자 질문을 임베딩 벡터(List[float])로 변환
-            # 비동기 메서드 호출 (이벤트 루프 블로킹 방지)
-            query_embedding = await self.embedding_service.embed_query(sanitized_message)
-
-            # 2. 벡터 검색
+            # 1~2. 쿼리 임베딩 생성 + 벡터 검색 (같은 질문이면 검색 결과 캐시 사용)
             logger.debug(f"벡터 검색 중 (bot_id={bot_id}, top_k={request.top_k})...")
-            search_results = await vector_store.search(
-                query_embedding=query_embedding,
-                top_k=request.top_k
+            search_results = await retrieval_cache.fetch(
+                scope={"bot_id": bot_id, "user_uuid": user_uuid},
+                query=sanitized_message,
+                params={"top_k": request.top_k},
+                document_ids=None,
+                loader=lambda: self._embed_and_search(vector_store, sanitized_message, request.top_k)
             )
 
             # 3. 검색 결과 추출
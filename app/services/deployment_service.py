@@ -8,6 +8,7 @@ from app.models.bot import Bot
 from app.schemas.deployment import DeploymentCreate, DeploymentUpdate
 from app.models.workflow_version import BotWorkflowVersion
 from app.core.widget.security import widget_security
+from app.core.widget.session_cache import widget_session_cache
 from app.core.exceptions import NotFoundException, ForbiddenException
 from app.config import settings
 
@@ -76,6 +77,7 @@ class DeploymentService:
             existing_deployment.workflow_version_id = workflow_version_uuid
             await db.commit()
             await db.refresh(existing_deployment)
+            await widget_session_cache.invalidate_bot(bot_id)
             return existing_deployment
         else:
             # 생성
@@ -174,6 +176,7 @@ class DeploymentService:
         deployment.status = status
         await db.commit()
         await db.refresh(deployment)
+        await widget_session_cache.invalidate_bot(bot_id)
         return deployment
 
     @staticmethod
@@ -196,3 +199,4 @@ class DeploymentService:
 
         await db.delete(deployment)
         await db.commit()
+        await widget_session_cache.invalidate_bot(bot_id)
@@ -70,24 +70,25 @@ class DocumentService:
             # 2. 파일 크기 확인
             file_size = os.path.getsize(file_path)
             
-            # 3. 문서 파싱
-            logger.info(f"문서 파싱 시작: {file.filename}")
-            text = self.document_processor.process_file(file_path)
+            # 3~4. 문서 파싱 + 텍스트 청킹 (페이지 스트림 단위)
+            logger.info(f"문서 파싱/청킹 시작: {file.filename}")
+            pages = self.document_processor.iter_pages(file_path)
+            text_chunks = list(self.text_chunker.iter_chunks(pages))
             
-            if not text or not text.strip():
+            if not text_chunks:
                 raise ValueError("문서에서 텍스트를 추출할 수 없습니다")
-            
-            # 4. 텍스트 청킹
-            logger.info(f"텍스트 청킹 시작")
-            chunks = self.text_chunker.split_text(text)
-            
-            if not chunks:
-                raise ValueError("텍스트 청킹에 실패했습니다")
-            
-            # 5. 임베딩 생성
-            logger.info(f"임베딩 생성 시작: {len(chunks)}개 청크")
-            # 비동기로 임베딩 생성 (블로킹 방지)
-            embeddings = await self.embedding_service.embed_documents(chunks)
+            chunks = [chunk.text for chunk in text_chunks]
+
+            # 5. 기존 청크/유사 중복 비교 (임베딩 워커와 같은 수집 경로)
+            sync_plan = await vector_store.plan_document_sync(document_id, chunks)
+            if settings.ingest_dedup_enabled:
+                # 같은 봇/사용자 범위의 중복 청크(기본: 본문 동일, 설정 시 SimHash 유사)는 임베딩하지 않고 대표 청크에 연결
+                await vector_store.find_near_duplicates(sync_plan, chunks)
+
+            # 신규/변경 청크만 임베딩 생성 (비동기, 블로킹 방지)
+            new_chunks = [chunks[i] for i in sync_plan.embed_indices]
+            logger.info(f"임베딩 생성 시작: {len(new_chunks)}/{len(chunks)}개 청크")
+            embeddings = await self.embedding_service.embed_documents(new_chunks) if new_chunks else []
             
             # 6. 메타데이터 생성
             metadata = self.document_processor.extract_metadata(file_path, file_size)
@@ -98,26 +99,27 @@ class DocumentService:
             metadata["bot_id"] = bot_id
             metadata["user_uuid"] = user_uuid
             
-            # 7. 벡터 스토어에 저장
+            # 7. 벡터 스토어 반영 (삭제/갱신/추가/중복 연결을 한 트랜잭션으로)
             logger.info(f"벡터 스토어에 저장 시작 (bot_id={bot_id})")
             chunk_ids = [f"{document_id}_chunk_{i}" for i in range(len(chunks))]
             chunk_metadatas = [
                 {
                     **metadata,
+                    **text_chunks[i].to_metadata(),
                     "chunk_index": i,
                     "chunk_id": chunk_ids[i]
                 }
                 for i in range(len(chunks))
             ]
 
-            await vector_store.add_documents(
+            # sync_plan의 source_document_id(documents 테이블의 document_id)로 저장되어
+            # Knowledge 노드의 document_ids 필터가 정상 동작
+            await vector_store.apply_document_sync(
+                plan=sync_plan,
                 ids=chunk_ids,
-                embeddings=embeddings,
                 documents=chunks,
                 metadatas=chunk_metadatas,
-                # documents 테이블의 document_id를 명시적으로 전달하여
-                # Knowledge 노드의 document_ids 필터가 정상 동작하도록 보장
-                source_document_id=document_id
+                embeddings=embeddings
             )
             
             # 8. 임시 파일 삭제
@@ -7,6 +7,7 @@ from typing import Optional, Callable, Awaitable, List, Dict, Deque, Any
 from functools import wraps
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.prompt_cache import PromptCacheHints
 from app.services.llm_service import LLMService
 from app.services.cost_tracking_service import CostTrackingService
 
@@ -37,7 +38,9 @@ class LLMServiceWithCostTracking(LLMService):
         model: Optional[str] = None,
         provider: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: int = 4000
+        max_tokens: int = 4000,
+        system_prompt: Optional[str] = None,
+        cache_hints: Optional[PromptCacheHints] = None
     ) -> str:
         """비용 추적이 포함된 응답 생성"""
         # 원본 generate 호출
@@ -46,7 +49,9 @@ class LLMServiceWithCostTracking(LLMService):
             model=model,
             provider=provider,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            system_prompt=system_prompt,
+            cache_hints=cache_hints
         )
 
         # 비용 추적 (bot_id와 user_id가 설정된 경우에만)
@@ -63,7 +68,8 @@ class LLMServiceWithCostTracking(LLMService):
         temperature: float = 0.7,
         max_tokens: int = 4000,
         on_chunk: Optional[Callable[[str], Awaitable[Optional[str]]]] = None,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        cache_hints: Optional[PromptCacheHints] = None
     ) -> str:
         """비용 추적이 포함된 스트리밍 응답 생성"""
         # 원본 generate_stream 호출
@@ -74,7 +80,8 @@ class LLMServiceWithCostTracking(LLMService):
             temperature=temperature,
             max_tokens=max_tokens,
             on_chunk=on_chunk,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            cache_hints=cache_hints
         )
 
         # 비용 추적
@@ -116,8 +123,8 @@ class LLMServiceWithCostTracking(LLMService):
     ) -> None:
         """토큰 사용량 및 비용 추적"""
         try:
-            # Provider 확인
-            provider_key = self._resolve_provider(provider, model)
+            # Provider 확인 (지연시간 라우팅으로 다른 provider가 응답했을 수 있음)
+            provider_key = self.last_used_provider or self._resolve_provider(provider, model)
             client = self._get_client(provider_key)
             resolved_model = self.last_used_model or model or getattr(client, "model", None) or "unknown"
 
@@ -169,6 +176,31 @@ class LLMServiceWithCostTracking(LLMService):
             # 비용 추적 실패는 서비스 전체를 막지 않음
             logger.error(f"비용 추적 중 오류 발생: {e}", exc_info=True)
 
+        await self._track_hedge_usages()
+
+    async def _track_hedge_usages(self) -> None:
+        """헤지 경쟁에서 진 요청이 이미 소비한 토큰 비용 기록"""
+        for provider_key, usage in self.consume_hedge_usages():
+            if not isinstance(usage, dict):
+                continue
+            try:
+                await self.cost_service.log_usage(
+                    bot_id=self.bot_id,
+                    user_id=self.user_id,
+                    provider=provider_key,
+                    model_name=usage.get('model') or "unknown",
+                    input_tokens=usage.get('input_tokens', 0),
+                    output_tokens=usage.get('output_tokens', 0),
+                    cache_read_tokens=usage.get('cache_read_tokens', 0),
+                    cache_write_tokens=usage.get('cache_write_tokens', 0)
+                )
+                logger.info(
+                    f"헤지 패자 비용 추적 완료 - bot_id: {self.bot_id}, provider: {provider_key}, "
+                    f"tokens: {usage.get('total_tokens', 0)}"
+                )
+            except Exception as e:
+                logger.error(f"헤지 패자 비용 추적 중 오류 발생: {e}", exc_info=True)
+
     def consume_usage_snapshot(self, provider_key: Optional[str]) -> Optional[Any]:
         """워크플로우 노드가 사용할 수 있도록 토큰 사용량 스냅샷을 반환"""
         if not provider_key:
@@ -15,6 +15,8 @@ from dataclasses import dataclass
 from typing import Optional, Dict, List
 from datetime import datetime
 
+from app.core.llm_router import llm_latency_router
+
 
 class BedrockModel(Enum):
     """사용 가능한 Bedrock 모델"""
@@ -212,6 +214,8 @@ class LLMFacade:
             )
 
             latency_ms = int((time.time() - start_time) * 1000)
+            # 지연시간 라우터 통계 공유 (LLMService의 Bedrock/Anthropic 라우팅에 반영)
+            llm_latency_router.record("bedrock", model.value, latency_ms, True)
 
             # 비용 계산
             input_tokens = response['usage']['input_tokens']
@@ -243,6 +247,9 @@ class LLMFacade:
             }
 
         except Exception as e:
+            llm_latency_router.record(
+                "bedrock", model.value, int((time.time() - start_time) * 1000), False
+            )
             # 폴백: Sonnet 실패 시 Haiku로 재시도
             if model == BedrockModel.SONNET_35:
                 print(f"⚠️ Sonnet failed, falling back to Haiku 3.5: {e}")
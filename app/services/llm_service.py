@@ -4,7 +4,7 @@ LLM 서비스
 import hashlib
 import json
 import logging
-from typing import Optional, Callable, Awaitable, List, Dict, Tuple, Any
+from typing import Optional, Callable, Awaitable, AsyncIterator, List, Dict, Tuple, Any
 
 from app.config import settings
 from app.core.llm_registry import LLMProviderRegistry
@@ -17,6 +17,8 @@ from app.core.providers.config import (
     ProviderConfig,
 )
 from app.core.exceptions import LLMServiceError
+from app.core.llm_router import KIND_STREAM, RouteTarget, llm_latency_router
+from app.core.prompt_cache import PromptCacheHints, mark_cache_prefix, supports_prompt_cache
 from app.core.redis_client import redis_client
 from app.services.semantic_cache_service import SemanticCacheService
 
@@ -30,6 +32,10 @@ class LLMService:
         self.registry = LLMProviderRegistry
         self.config = config or self._build_config_from_settings()
         self._last_used_model: Optional[str] = None
+        self._last_used_provider: Optional[str] = None
+        # 헤지 경쟁에서 졌지만 응답까지 완료되어 비용이 발생한 요청 (provider, usage)
+        self._hedge_usages: List[Tuple[str, Any]] = []
+        self.router = llm_latency_router
         self._initialize_providers()
         self.semantic_cache = SemanticCacheService()
 
@@ -38,18 +44,31 @@ class LLMService:
         """가장 최근 호출에 사용된 모델명 (스트리밍 강제 교체 포함)"""
         return self._last_used_model
 
+    @property
+    def last_used_provider(self) -> Optional[str]:
+        """가장 최근 호출에 실제로 응답한 provider (지연시간 라우팅/헤지 결과 포함)"""
+        return self._last_used_provider
+
+    def consume_hedge_usages(self) -> List[Tuple[str, Any]]:
+        """헤지 패자 요청의 토큰 사용량 목록을 반환하고 비움 (비용 기록용)"""
+        usages, self._hedge_usages = self._hedge_usages, []
+        return usages
+
     async def generate(
         self,
         prompt: str,
         model: Optional[str] = None,
         provider: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: int = 4000
+        max_tokens: int = 4000,
+        system_prompt: Optional[str] = None,
+        cache_hints: Optional[PromptCacheHints] = None
     ) -> str:
         """단일 응답 생성"""
         provider_key = self._resolve_provider(provider, model)
         client = self._get_client(provider_key)
         resolved_model = model or getattr(client, "model", None)
+        self._last_used_provider = provider_key
 
         logger.info(
             "[LLMService] generate 호출: provider=%s model=%s temp=%.2f",
@@ -58,25 +77,26 @@ class LLMService:
             temperature,
         )
 
-        messages = [{"role": "user", "content": prompt}]
+        messages = self._build_messages(provider_key, prompt, system_prompt, cache_hints)
         semantic_meta = self._build_semantic_meta(
             provider_key=provider_key,
             model=resolved_model or "default",
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            system_prompt=system_prompt
         )
         semantic_embedding = None
 
-        cache_key = await self._build_cache_key(
-            tag="prompt",
-            payload={
-                "provider": provider_key,
-                "model": resolved_model or "default",
-                "prompt": prompt,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-            },
-        )
+        cache_payload = {
+            "provider": provider_key,
+            "model": resolved_model or "default",
+            "prompt": prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        if system_prompt:
+            cache_payload["system_prompt"] = system_prompt
+        cache_key = await self._build_cache_key(tag="prompt", payload=cache_payload)
         cached = await self._try_get_cached(cache_key)
         if cached is not None:
             self._record_last_used_model(resolved_model)
@@ -96,15 +116,15 @@ class LLMService:
                 client.last_usage = None
             return semantic_response
 
-        response = await client.generate(
-            messages=messages,
+        response = await self._generate_routed(
+            provider_key,
+            resolved_model,
+            messages,
             temperature=temperature,
-            max_tokens=max_tokens,
-            model=resolved_model
+            max_tokens=max_tokens
         )
 
         logger.info("[LLMService] LLM 응답 생성 완료 (%d chars)", len(response))
-        self._record_last_used_model(resolved_model)
         await self._store_cache(
             cache_key,
             response,
@@ -130,11 +150,13 @@ class LLMService:
         temperature: float = 0.7,
         max_tokens: int = 4000,
         on_chunk: Optional[Callable[[str], Awaitable[Optional[str]]]] = None,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        cache_hints: Optional[PromptCacheHints] = None
     ) -> str:
         """스트리밍 응답 생성"""
         provider_key = self._resolve_provider(provider, model)
         client = self._get_client(provider_key)
+        self._last_used_provider = provider_key
 
         requested_model = model or getattr(client, "model", None)
         model_to_use = requested_model
@@ -156,11 +178,8 @@ class LLMService:
         # 다른 provider들(bedrock, anthropic, google)은 모두 SSE 스트리밍을 지원하므로
         # 요청한 모델을 그대로 사용
 
-        # 시스템 프롬프트 추가 (제공된 경우)
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+        # 시스템 프롬프트 추가 (제공된 경우) + 프롬프트 캐시 프리픽스 표시
+        messages = self._build_messages(provider_key, prompt, system_prompt, cache_hints)
         semantic_meta = self._build_semantic_meta(
             provider_key=provider_key,
             model=model_to_use or "default",
@@ -212,11 +231,12 @@ class LLMService:
 
         buffer: List[str] = []
 
-        async for chunk in client.generate_stream(
-            messages=messages,
+        async for chunk in self._stream_routed(
+            provider_key,
+            model_to_use,
+            messages,
             temperature=temperature,
-            max_tokens=max_tokens,
-            model=model_to_use
+            max_tokens=max_tokens
         ):
             processed = chunk
             if on_chunk:
@@ -224,7 +244,6 @@ class LLMService:
             if processed:
                 buffer.append(processed)
 
-        self._record_last_used_model(model_to_use)
         full_response = "".join(buffer)
 
         # 스트리밍 완료 후 캐시 저장 (스트리밍 시에도 동일 키 재사용)
@@ -261,6 +280,7 @@ class LLMService:
         provider_key = self._resolve_provider(provider, model)
         client = self._get_client(provider_key)
         resolved_model = model or getattr(client, "model", None)
+        self._last_used_provider = provider_key
 
         logger.info(
             "[LLMService] RAG 응답 생성: provider=%s model=%s",
@@ -282,10 +302,7 @@ class LLMService:
 
 위 컨텍스트를 기반으로 질문에 답변해주세요."""
 
-        messages = [
-            {"role": "system", "content": system_message},
-            {"role": "user", "content": user_message}
-        ]
+        messages = self._build_messages(provider_key, user_message, system_message)
         semantic_meta = self._build_semantic_meta(
             provider_key=provider_key,
             model=resolved_model or "default",
@@ -326,15 +343,15 @@ class LLMService:
                 client.last_usage = None
             return semantic_response
 
-        response = await client.generate(
-            messages=messages,
+        response = await self._generate_routed(
+            provider_key,
+            resolved_model,
+            messages,
             temperature=temperature,
-            max_tokens=max_tokens,
-            model=model
+            max_tokens=max_tokens
         )
 
         logger.info("[LLMService] RAG 응답 생성 완료 (%d chars)", len(response))
-        self._record_last_used_model(resolved_model)
         await self._store_cache(
             cache_key,
             response,
@@ -352,6 +369,132 @@ class LLMService:
         )
         return response
 
+    async def _generate_routed(
+        self,
+        provider_key: str,
+        model: Optional[str],
+        messages: List[Dict[str, Any]],
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """지연시간 라우터를 거쳐 단일 응답 생성 (동일 티어 provider 헤지 포함)"""
+        targets = self.router.plan(provider_key, model, self._provider_available)
+
+        usages: Dict[RouteTarget, Any] = {}
+
+        async def _call(target: RouteTarget) -> str:
+            client = self._get_client(target.provider)
+            response = await client.generate(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                model=target.model
+            )
+            usage = getattr(client, "last_usage", None)
+            usages[target] = usage.copy() if isinstance(usage, dict) else usage
+            return response
+
+        def _spent(target: RouteTarget) -> None:
+            if usages.get(target):
+                self._hedge_usages.append((target.provider, usages[target]))
+
+        response, target = await self.router.execute(targets, _call, on_spent=_spent)
+        self._record_route(provider_key, target)
+        return response
+
+    async def _stream_routed(
+        self,
+        provider_key: str,
+        model: Optional[str],
+        messages: List[Dict[str, Any]],
+        temperature: float,
+        max_tokens: int
+    ) -> AsyncIterator[str]:
+        """
+        지연시간 라우터를 거쳐 스트리밍 (첫 청크 도착 기준으로 헤지)
+
+        첫 청크를 먼저 받은 스트림만 끝까지 소비하고 나머지 스트림은 닫는다.
+        """
+        targets = self.router.plan(provider_key, model, self._provider_available, kind=KIND_STREAM)
+
+        async def _open(target: RouteTarget) -> Tuple[AsyncIterator[str], Optional[str]]:
+            client = self._get_client(target.provider)
+            stream = client.generate_stream(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                model=target.model
+            )
+            try:
+                first_chunk = await stream.__anext__()
+            except StopAsyncIteration:
+                first_chunk = None
+            return stream, first_chunk
+
+        async def _discard(opened: Tuple[AsyncIterator[str], Optional[str]]) -> None:
+            await opened[0].aclose()
+
+        (stream, first_chunk), target = await self.router.execute(
+            targets,
+            _open,
+            kind=KIND_STREAM,
+            discard=_discard
+        )
+        self._record_route(provider_key, target)
+
+        if first_chunk is not None:
+            yield first_chunk
+        async for chunk in stream:
+            yield chunk
+
+    def _provider_available(self, provider: str) -> bool:
+        """라우팅 대상으로 사용할 수 있는 (설정·활성화된) provider인지 여부"""
+        config = self.config.get_provider_config(provider)
+        return bool(config and config.enabled)
+
+    def _record_route(self, requested_provider: str, target: RouteTarget) -> None:
+        """실제로 응답한 provider/모델 기록"""
+        if target.provider != requested_provider:
+            logger.info(
+                "[LLMService] 지연시간 라우팅: %s → %s (model=%s)",
+                requested_provider,
+                target.provider,
+                target.model,
+            )
+        self._last_used_provider = target.provider
+        self._record_last_used_model(target.model)
+
+    @staticmethod
+    def _build_messages(
+        provider_key: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        cache_hints: Optional[PromptCacheHints] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        OpenAI 형식 메시지 구성
+
+        Anthropic/Bedrock 호출이면 턴마다 동일한 프리픽스(시스템 프롬프트,
+        정적 템플릿 구간)에 캐시 표시를 추가합니다. 표시는 provider가
+        cache_control block으로 변환하며, 다른 provider에는 붙지 않습니다.
+        """
+        messages: List[Dict[str, Any]] = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        if not supports_prompt_cache(provider_key):
+            return messages
+
+        hints = cache_hints or PromptCacheHints()
+        marked: List[Dict[str, Any]] = []
+        for message in messages:
+            if message["role"] == "system":
+                marked.append(mark_cache_prefix(message, hints.system_prefix or system_prompt))
+            else:
+                marked.append(mark_cache_prefix(message, hints.prompt_prefix))
+        return marked
+
     async def _build_cache_key(self, tag: str, payload: Dict) -> str:
         """프롬프트/컨텍스트를 해시하여 캐시 키 생성"""
         try:
@@ -472,7 +615,7 @@ class LLMService:
         """캐시 조회 + 로깅 (히트/미스)"""
         if not self._cache_enabled():
             return None
-        cached = await redis_client.get(cache_key)
+        cached = await redis_client.get(cache_key, near_cache=True)
         if not cached:
             logger.info("[LLMService] cache_miss key=%s", cache_key)
             return None
@@ -3,6 +3,7 @@
 """
 import logging
 import math
+import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -19,6 +20,8 @@ class SemanticCacheService:
     def __init__(self) -> None:
         self.enabled = settings.semantic_cache_enabled
         self.cache_key = f"{settings.semantic_cache_prefix}:entries"
+        # 임베딩은 JSON 텍스트 대신 packed float32 행렬로 세대(generation)별 키에 저장 (entries와 같은 순서)
+        self.vectors_prefix = f"{settings.semantic_cache_prefix}:vectors"
         self.threshold = settings.semantic_cache_similarity_threshold
         self.ttl = settings.semantic_cache_ttl_sec
         self.max_entries = max(1, settings.semantic_cache_max_entries)
@@ -102,7 +105,17 @@ class SemanticCacheService:
             entries = entries[-self.max_entries:]
 
         expire = self.ttl if self.ttl and self.ttl > 0 else None
+        previous_generation = entries[0].get("vectors_gen")
+        generation = uuid.uuid4().hex
+        vectors = []
+        for entry in entries:
+            vectors.append(entry.pop("embedding"))
+            entry["vectors_gen"] = generation
+        # 벡터를 먼저 기록한 뒤 entries가 새 세대를 가리키도록 교체
+        await redis_client.set_vectors(f"{self.vectors_prefix}:{generation}", vectors, expire=expire)
         await redis_client.set(self.cache_key, entries, expire=expire)
+        if previous_generation and previous_generation != generation:
+            await redis_client.delete(f"{self.vectors_prefix}:{previous_generation}")
         logger.info(
             "[SemanticCache] store provider=%s model=%s size=%d",
             meta.get("provider"),
@@ -112,9 +125,19 @@ class SemanticCacheService:
 
     async def _load_entries(self) -> List[Dict[str, Any]]:
         data = await redis_client.get(self.cache_key)
-        if isinstance(data, list):
+        if not isinstance(data, list) or not data:
+            return []
+        # 이전 포맷(항목에 embedding 포함)은 그대로 사용
+        if all("embedding" in entry for entry in data):
             return data
-        return []
+        generation = data[0].get("vectors_gen")
+        vectors = await redis_client.get_vectors(f"{self.vectors_prefix}:{generation}") if generation else []
+        if len(vectors) != len(data):
+            logger.debug("[SemanticCache] 벡터 세대 불일치로 캐시 무시")
+            return []
+        for entry, vector in zip(data, vectors):
+            entry["embedding"] = vector
+        return data
 
     def _select_best_match(
         self,
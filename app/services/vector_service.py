@@ -5,8 +5,10 @@ import logging
 from typing import List, Dict, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.core.embeddings import get_embedding_service
-from app.core.vector_store import get_vector_store
+from app.core.retrieval_cache import retrieval_cache
+from app.core.vector_store import SEARCH_MODE_HYBRID, SEARCH_MODES, get_vector_store
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +26,9 @@ class VectorService:
         top_k: int,
         db: Optional[AsyncSession] = None,
         document_ids: Optional[List[str]] = None,
-        bot_id: Optional[str] = None  # 레거시 호환용, 사용하지 않음
+        bot_id: Optional[str] = None,  # 레거시 호환용, 사용하지 않음
+        search_mode: str = "semantic",
+        include_embeddings: bool = False
     ) -> List[Dict[str, Any]]:
         """
         유사 문서 검색 (user_uuid 기반, 같은 유저의 모든 문서 검색)
@@ -36,12 +40,16 @@ class VectorService:
             db: 데이터베이스 세션
             document_ids: 특정 문서만 검색 (document_id 리스트)
             bot_id: 레거시 호환용 (더 이상 사용하지 않음)
+            search_mode: semantic(벡터) | hybrid(어휘 + 벡터, RRF 병합)
+            include_embeddings: 결과에 저장된 임베딩(embedding) 포함 여부 (MMR 재순위용)
 
         Returns:
-            검색 결과 리스트
+            검색 결과 리스트 (hybrid는 rrf_score, match_sources 포함)
         """
         if not user_uuid:
             raise ValueError("user_uuid는 필수입니다")
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"지원하지 않는 search_mode입니다: {search_mode}")
 
         if document_ids:
             logger.info(
@@ -59,16 +67,45 @@ class VectorService:
                 top_k
             )
 
-        # 1. 쿼리 임베딩 생성
-        query_embedding = await self.embedding_service.embed_query(query)
+        async def run_search() -> Dict[str, Any]:
+            # 1. 쿼리 임베딩 생성
+            query_embedding = await self.embedding_service.embed_query(query)
+
+            # 2. 벡터 스토어에서 검색 (user_uuid 기반)
+            vector_store = get_vector_store(user_uuid=user_uuid, db=db)
+            if search_mode == SEARCH_MODE_HYBRID:
+                return await vector_store.hybrid_search(
+                    query_embedding=query_embedding,
+                    query_text=query,
+                    top_k=top_k,
+                    document_ids=document_ids,
+                    candidate_k=top_k * settings.retrieval_hybrid_candidate_multiplier,
+                    rrf_k=settings.retrieval_rrf_k,
+                    include_embeddings=include_embeddings
+                )
+            return await vector_store.search(
+                query_embedding=query_embedding,
+                top_k=top_k,
+                document_ids=document_ids,
+                include_embeddings=include_embeddings
+            )
 
-        # 2. 벡터 스토어에서 검색 (user_uuid 기반)
-        vector_store = get_vector_store(user_uuid=user_uuid, db=db)
-        search_results = await vector_store.search(
-            query_embedding=query_embedding,
-            top_k=top_k,
-            document_ids=document_ids
-        )
+        if include_embeddings:
+            # 임베딩 포함 결과(MMR 재순위용)는 크기가 커서 캐시하지 않음
+            search_results = await run_search()
+        else:
+            # 같은 질문 반복 시 임베딩 + 검색 생략 (코퍼스 버전 기반 무효화)
+            search_results = await retrieval_cache.fetch(
+                scope={"user_uuid": user_uuid},
+                query=query,
+                params={
+                    "top_k": top_k,
+                    "search_mode": search_mode,
+                    "document_ids": sorted(document_ids or []),
+                },
+                document_ids=document_ids,
+                loader=run_search
+            )
 
         # 3. 결과 변환
         results = []
@@ -76,17 +113,26 @@ class VectorService:
             documents = search_results["documents"][0]
             metadatas = search_results.get("metadatas", [[]])[0]
             distances = search_results.get("distances", [[]])[0]
+            rrf_scores = search_results.get("rrf_scores", [[]])[0]
+            match_sources = search_results.get("match_sources", [[]])[0]
+            embeddings = search_results.get("embeddings", [[]])[0]
 
             for i, (doc, meta) in enumerate(zip(documents, metadatas)):
                 distance = distances[i] if i < len(distances) else 2.0
                 similarity = 1.0 / (1.0 + distance)
 
-                results.append({
+                result = {
                     "content": doc,
                     "metadata": meta,
                     "similarity": round(similarity, 3),
                     "distance": round(distance, 4)  # 거리 값도 포함
-                })
+                }
+                if i < len(rrf_scores):
+                    result["rrf_score"] = round(rrf_scores[i], 6)
+                    result["match_sources"] = match_sources[i] if i < len(match_sources) else []
+                if i < len(embeddings):
+                    result["embedding"] = embeddings[i]
+                results.append(result)
 
             # 유사도 점수 상세 로깅
             if len(results) > 0:
@@ -122,7 +168,7 @@ class VectorService:
             query: 검색 쿼리
             user_uuid: 사용자 UUID
             top_k: 검색할 문서 개수
-            search_mode: 검색 모드 (semantic, keyword) - 현재는 semantic만 지원
+            search_mode: 검색 모드 (semantic, hybrid)
             db: 데이터베이스 세션
             bot_id: 레거시 호환용 (더 이상 사용하지 않음)
 
@@ -135,11 +181,16 @@ class VectorService:
             search_mode
         )
 
+        if search_mode not in SEARCH_MODES:
+            # keyword 등 미지원 모드는 기존과 동일하게 semantic으로 처리
+            search_mode = "semantic"
+
         return await self.search_similar_chunks(
             user_uuid=user_uuid,
             query=query,
             top_k=top_k,
-            db=db
+            db=db,
+            search_mode=search_mode
         )
 
 
@@ -1,6 +1,5 @@
-import json
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 from typing import Optional, Dict, Any, List, AsyncGenerator
 from datetime import datetime, timedelta, timezone
@@ -11,6 +10,8 @@ from app.models.deployment import BotDeployment, WidgetSession, WidgetMessage
 from app.models.bot import Bot
 from app.schemas.widget import SessionCreateRequest, ChatMessageRequest
 from app.core.widget.security import widget_security
+from app.core.widget.session_cache import WidgetSessionPrincipal, widget_session_cache
+from app.core.stream_events import event_payload
 from app.core.exceptions import NotFoundException, ForbiddenException, UnauthorizedException
 from app.config import settings
 
@@ -54,10 +55,18 @@ class WidgetService:
         db: AsyncSession,
         message_data: ChatMessageRequest,
         session_token: str
-    ) -> tuple[WidgetSession, Bot]:
-        """세션 검증 및 봇 로드"""
+    ) -> tuple[WidgetSessionPrincipal, Bot]:
+        """세션 검증 및 봇 로드 (principal 캐시 hit이면 봇 PK 조회 1회)"""
         session_token_hash = widget_security.hash_token(session_token)
 
+        principal = await widget_session_cache.get(session_token_hash, message_data.session_id)
+        if principal is not None:
+            bot = await db.get(Bot, principal.bot_pk)
+            if bot:
+                return principal, bot
+            # 봇이 삭제된 경우 캐시를 버리고 전체 검증 경로로 재확인
+            await widget_session_cache.invalidate_token(session_token_hash)
+
         stmt = select(WidgetSession).options(
             selectinload(WidgetSession.deployment)
         ).where(
@@ -83,7 +92,25 @@ class WidgetService:
         if not bot:
             raise NotFoundException("Bot not found for widget deployment")
 
-        return session, bot
+        principal = WidgetSessionPrincipal(
+            session_id=str(session.session_id),
+            deployment_id=str(deployment.deployment_id),
+            bot_pk=bot.id,
+            bot_id=bot.bot_id,
+            owner_uuid=str(bot.user.uuid) if bot.user else None,
+            expires_at=session.expires_at,
+        )
+        await widget_session_cache.set(session_token_hash, principal)
+        return principal, bot
+
+    @staticmethod
+    async def _touch_session(db: AsyncSession, session_id: str) -> None:
+        """마지막 활동 시간 갱신 (세션 행을 로드하지 않고 UPDATE)"""
+        await db.execute(
+            update(WidgetSession)
+            .where(WidgetSession.session_id == UUID(session_id))
+            .values(last_activity=datetime.now(timezone.utc))
+        )
 
     @staticmethod
     async def get_widget_config(
@@ -366,11 +393,12 @@ class WidgetService:
         Returns:
             봇 응답
         """
-        session, bot = await WidgetService._load_session_and_bot(db, message_data, session_token)
+        principal, bot = await WidgetService._load_session_and_bot(db, message_data, session_token)
+        session_id = UUID(principal.session_id)
 
         # 사용자 메시지 저장 (속성명 수정: metadata → message_metadata)
         user_message = WidgetMessage(
-            session_id=session.session_id,
+            session_id=session_id,
             role="user",
             content=message_data.message["content"],
             message_type=message_data.message.get("type", "text"),
@@ -392,19 +420,20 @@ class WidgetService:
             top_k=settings.chat_default_top_k
         )
 
-        # User UUID 가져오기
-        user_uuid = str(bot.user.uuid) if bot and bot.user else None
+        # User UUID (principal에 캐시된 봇 소유자)
+        user_uuid = principal.owner_uuid
 
-        # 응답 생성
+        # 응답 생성 (검증 단계에서 로드한 봇 재사용)
         chat_response = await chat_service.generate_response(
             request=chat_request,
             user_uuid=user_uuid,
-            db=db
+            db=db,
+            bot=bot
         )
 
         # 봇 응답 저장 (속성명 수정: metadata → message_metadata)
         bot_message = WidgetMessage(
-            session_id=session.session_id,
+            session_id=session_id,
             role="assistant",
             content=chat_response.response,
             sources=[source.dict() for source in chat_response.sources] if chat_response.sources else None,
@@ -413,7 +442,7 @@ class WidgetService:
         db.add(bot_message)
 
         # 마지막 활동 시간 업데이트 (timezone-aware)
-        session.last_activity = datetime.now(timezone.utc)
+        await WidgetService._touch_session(db, principal.session_id)
 
         await db.commit()
         await db.refresh(bot_message)
@@ -440,10 +469,11 @@ class WidgetService:
         from app.services.chat_service import ChatService
         from app.models.chat import ChatRequest
 
-        session, bot = await WidgetService._load_session_and_bot(db, message_data, session_token)
+        principal, bot = await WidgetService._load_session_and_bot(db, message_data, session_token)
+        session_id = UUID(principal.session_id)
 
         user_message = WidgetMessage(
-            session_id=session.session_id,
+            session_id=session_id,
             role="user",
             content=message_data.message["content"],
             message_type=message_data.message.get("type", "text"),
@@ -458,7 +488,7 @@ class WidgetService:
             bot_id=bot.bot_id if bot else None,
             top_k=settings.chat_default_top_k
         )
-        user_uuid = str(bot.user.uuid) if bot and bot.user else None
+        user_uuid = principal.owner_uuid
 
         assistant_chunks: List[str] = []
         sources_payload: List[Dict[str, Any]] = []
@@ -468,19 +498,18 @@ class WidgetService:
             async for event_json in chat_service.generate_response_stream(
                 request=chat_request,
                 user_uuid=user_uuid,
-                db=db
+                db=db,
+                bot=bot
             ):
-                try:
-                    payload = json.loads(event_json)
-                    event_type = payload.get("type")
-                    if event_type == "content":
-                        assistant_chunks.append(payload.get("data", ""))
-                    elif event_type == "sources":
-                        sources_payload = payload.get("data") or []
-                    elif event_type == "error":
-                        error_event_emitted = True
-                except json.JSONDecodeError:
-                    pass
+                # ChatService가 넘겨준 StreamEvent의 payload를 재사용 (재파싱 없음)
+                payload = event_payload(event_json) or {}
+                event_type = payload.get("type")
+                if event_type == "content":
+                    assistant_chunks.append(payload.get("data", ""))
+                elif event_type == "sources":
+                    sources_payload = payload.get("data") or []
+                elif event_type == "error":
+                    error_event_emitted = True
 
                 yield event_json
 
@@ -492,7 +521,7 @@ class WidgetService:
                 assistant_text = "".join(assistant_chunks)
                 if assistant_text:
                     bot_message = WidgetMessage(
-                        session_id=session.session_id,
+                        session_id=session_id,
                         role="assistant",
                         content=assistant_text,
                         sources=sources_payload or None,
@@ -500,7 +529,7 @@ class WidgetService:
                     )
                     db.add(bot_message)
 
-                session.last_activity = datetime.now(timezone.utc)
+                await WidgetService._touch_session(db, principal.session_id)
                 await db.commit()
             else:
                 await db.rollback()
@@ -10,6 +10,7 @@ from datetime import datetime
 import logging
 
 from app.models.workflow_version import BotWorkflowVersion
+from app.core.workflow.library_agent_plan import library_agent_plans
 from app.models.bot import Bot
 from app.models.user import User
 from app.schemas.workflow import WorkflowVersionStatus, WorkflowGraph, PortDefinition
@@ -70,6 +71,7 @@ class WorkflowVersionService:
 
             await self.db.commit()
             await self.db.refresh(existing_draft)
+            library_agent_plans.invalidate(existing_draft.id)
 
             logger.info(f"Updated draft workflow for bot {bot_id}")
             return existing_draft
@@ -203,6 +205,7 @@ class WorkflowVersionService:
         await self._touch_bot_updated_at(bot_id)
         await self.db.commit()
         await self.db.refresh(draft)
+        library_agent_plans.invalidate(draft.id)
 
         # user_id 검증 및 fallback 처리
         creator_uuid = await self._get_valid_creator_uuid(bot_id, user_id)
@@ -343,6 +346,7 @@ class WorkflowVersionService:
 
         await self.db.commit()
         await self.db.refresh(version)
+        library_agent_plans.invalidate(version.id)
 
         logger.info(f"Archived workflow version {version.version} (id: {version_id})")
         return version
@@ -562,6 +566,7 @@ class WorkflowVersionService:
 
         if not dry_run:
             await self.db.commit()
+            library_agent_plans.clear()
             logger.info(f"Schema migration completed: {stats['migrated']} migrated, {stats['errors']} errors")
         else:
             logger.info(f"Schema migration dry-run completed: {stats['migrated']} would be migrated")
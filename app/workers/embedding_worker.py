@@ -21,10 +21,10 @@ from app.core.aws_clients import get_s3_client, get_sqs_client
 from app.models.document import Document, DocumentStatus
 from app.core.embeddings import get_embedding_service, CircuitBreakerOpenError
 from app.core.vector_store import get_vector_store
+from app.core.redis_client import redis_client
 from app.core.document_processor import DocumentProcessor
 from app.core.chunking import get_text_chunker
 from app.core.exceptions import (
-    DocumentProcessingError,
     DocumentParsingError,
     VectorStoreError
 )
@@ -73,6 +73,14 @@ class EmbeddingWorker:
         logger.info(f"S3 버킷: {settings.s3_bucket_name}")
         logger.info(f"Long Polling: 5초")
 
+        # 임베딩 저장 시 코퍼스 버전을 올려 API 서버의 검색 결과 캐시를 무효화하기 위해 Redis 연결
+        try:
+            await redis_client.connect()
+        except Exception as e:
+            logger.error(
+                f"Redis 연결 실패 - 검색 결과 캐시가 TTL 만료 전까지 갱신되지 않을 수 있습니다: {e}"
+            )
+
         while True:
             try:
                 # SQS에서 메시지 수신 (Long Polling)
@@ -161,6 +169,7 @@ class EmbeddingWorker:
         1. 상태를 PROCESSING으로 변경
         2. S3에서 파일 다운로드
         3. 파싱 → 청킹 → 임베딩 → pgvector 저장
+           (기존 청크와 본문 해시를 비교해 신규/변경 청크만 임베딩, 사라진 청크는 삭제)
         4. 상태를 DONE으로 변경
         """
         async with self.async_session() as db:
@@ -187,24 +196,29 @@ class EmbeddingWorker:
                     f.write(file_content)
 
                 try:
-                    # 4. 문서 파싱
-                    logger.info(f"문서 파싱 시작: {original_filename}")
-                    text = self.document_processor.process_file(temp_file_path)
+                    # 4~5. 문서 파싱 + 텍스트 청킹 (페이지 스트림 단위)
+                    logger.info(f"문서 파싱/청킹 시작: {original_filename}")
+                    pages = self.document_processor.iter_pages(temp_file_path)
+                    text_chunks = list(self.text_chunker.iter_chunks(pages))
 
-                    if not text or not text.strip():
+                    if not text_chunks:
                         raise DocumentParsingError("문서에서 텍스트를 추출할 수 없습니다")
+                    chunks = [chunk.text for chunk in text_chunks]
 
-                    # 5. 텍스트 청킹
-                    logger.info(f"텍스트 청킹 시작")
-                    chunks = self.text_chunker.split_text(text)
-
-                    if not chunks:
-                        raise DocumentProcessingError("텍스트 청킹에 실패했습니다")
-
-                    # 6. 임베딩 생성
-                    logger.info(f"임베딩 생성 시작: {len(chunks)}개 청크")
+                    # 6. 기존 청크와 비교 (재업로드/재처리 시 본문이 같은 청크는 임베딩 재사용)
+                    vector_store = get_vector_store(bot_id=bot_id, user_uuid=user_uuid, db=db)
+                    sync_plan = await vector_store.plan_document_sync(document_id, chunks)
+                    if settings.ingest_dedup_enabled:
+                        # 같은 봇/사용자 범위의 중복 청크(기본: 본문 동일, 설정 시 SimHash 유사)는 임베딩하지 않고 대표 청크에 연결
+                        await vector_store.find_near_duplicates(sync_plan, chunks)
+
+                    # 7. 신규/변경 청크만 임베딩 생성
+                    new_chunks = [chunks[i] for i in sync_plan.embed_indices]
+                    logger.info(f"임베딩 생성 시작: {len(new_chunks)}/{len(chunks)}개 청크")
                     try:
-                        embeddings = await self.embedding_service.embed_documents(chunks)
+                        embeddings = (
+                            await self.embedding_service.embed_documents(new_chunks) if new_chunks else []
+                        )
                     except CircuitBreakerOpenError as e:
                         # Circuit Breaker가 열린 경우: 메시지를 다시 큐로 반환 (재시도)
                         logger.warning(f"Circuit Breaker 열림: {e}")
@@ -217,7 +231,7 @@ class EmbeddingWorker:
                         # 메시지를 삭제하지 않으면 자동으로 재시도됨
                         raise
 
-                    # 7. 메타데이터 생성
+                    # 8. 메타데이터 생성
                     file_size = os.path.getsize(temp_file_path)
                     metadata = self.document_processor.extract_metadata(temp_file_path, file_size)
                     metadata.update({
@@ -233,29 +247,28 @@ class EmbeddingWorker:
                         f"user_uuid={user_uuid}, metadata_keys={list(metadata.keys())}"
                     )
 
-                    # 8. 벡터 스토어에 저장
+                    # 9. 벡터 스토어 반영 (삭제/갱신/추가를 한 트랜잭션으로)
                     logger.info(f"벡터 스토어에 저장 시작 (bot_id={bot_id})")
-                    vector_store = get_vector_store(bot_id=bot_id, user_uuid=user_uuid, db=db)
-
                     chunk_ids = [f"{document_id}_chunk_{i}" for i in range(len(chunks))]
                     chunk_metadatas = [
                         {
                             **metadata,
+                            **text_chunks[i].to_metadata(),
                             "chunk_index": i,
                             "chunk_id": chunk_ids[i]
                         }
                         for i in range(len(chunks))
                     ]
 
-                    await vector_store.add_documents(
+                    await vector_store.apply_document_sync(
+                        plan=sync_plan,
                         ids=chunk_ids,
-                        embeddings=embeddings,
                         documents=chunks,
                         metadatas=chunk_metadatas,
-                        source_document_id=document_id  # ← documents 테이블 연결
+                        embeddings=embeddings
                     )
 
-                    # 9. 상태를 DONE으로 변경
+                    # 10. 상태를 DONE으로 변경
                     await self._update_document_status(
                         db=db,
                         document_id=document_id,
@@ -267,7 +280,7 @@ class EmbeddingWorker:
                     logger.info(f"✅ 문서 처리 성공: {document_id} ({len(chunks)} 청크)")
 
                 finally:
-                    # 10. 임시 파일 삭제
+                    # 11. 임시 파일 삭제
                     self._cleanup_temp_file(temp_file_path)
 
             except DocumentParsingError as e:
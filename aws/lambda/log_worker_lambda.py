@@ -85,7 +85,7 @@ def upsert_execution_run(conn, run: Dict[str, Any]) -> None:
                 user_id,
                 api_key_id,
                 api_request_id,
-                graph_snapshot,
+                graph_snapshot_hash,
                 inputs,
                 outputs,
                 status,
@@ -105,7 +105,7 @@ def upsert_execution_run(conn, run: Dict[str, Any]) -> None:
                 %(user_id)s,
                 %(api_key_id)s,
                 %(api_request_id)s,
-                %(graph_snapshot)s,
+                %(graph_snapshot_hash)s,
                 %(inputs)s,
                 %(outputs)s,
                 %(status)s,
@@ -133,7 +133,7 @@ def upsert_execution_run(conn, run: Dict[str, Any]) -> None:
                 "user_id": run.get("user_id"),
                 "api_key_id": run.get("api_key_id"),
                 "api_request_id": run.get("api_request_id"),
-                "graph_snapshot": Json(run.get("graph_snapshot")),
+                "graph_snapshot_hash": run.get("graph_snapshot_hash"),
                 "inputs": Json(run.get("inputs") or {}),
                 "outputs": Json(run.get("outputs") or {}),
                 "status": run.get("status"),
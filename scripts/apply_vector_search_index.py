@@ -0,0 +1,55 @@
+"""
+벡터 검색 모드(ANN 인덱스) 전환 스크립트
+
+사용법:
+    python scripts/apply_vector_search_index.py [--mode none|halfvec|binary|matryoshka] [--drop-others]
+
+목적:
+    - settings.vector_search_quantization(또는 --mode) 모드의 HNSW 인덱스 생성
+      (matryoshka는 비어 있는 embedding_short를 먼저 채움)
+    - --drop-others: 새 인덱스가 준비된 뒤 다른 모드의 인덱스 제거
+      (양자화 모드로 전환하면서 float32 원본 인덱스 document_embeddings_embedding_idx를 제거해 메모리 절감,
+       none으로 되돌릴 때는 원본 인덱스를 다시 만들고 양자화 인덱스 제거)
+
+전제:
+    - scripts/benchmark_vector_quantization.py로 recall/지연시간 확인
+    - 양자화 모드는 pgvector 0.7.0 이상 (미만이면 아무것도 바꾸지 않고 종료 코드 1)
+    - 애플리케이션의 VECTOR_SEARCH_QUANTIZATION도 같은 모드로 설정
+"""
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.core.vector_indexes import ANN_INDEXES, create_ann_index, drop_ann_index  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="벡터 검색 모드(ANN 인덱스) 전환")
+    parser.add_argument("--mode", choices=sorted(ANN_INDEXES), default=settings.vector_search_quantization)
+    parser.add_argument("--drop-others", action="store_true", help="다른 모드의 인덱스 제거 (float32 원본 포함)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    engine = create_engine(settings.get_database_url_sync())
+    with engine.begin() as conn:
+        if not create_ann_index(conn, args.mode):
+            print(f"❌ {args.mode} 인덱스를 만들 수 없습니다 (pgvector 0.7.0 이상 필요)")
+            return 1
+        print(f"✅ {ANN_INDEXES[args.mode][0]} 준비 완료")
+
+        if args.drop_others:
+            for mode, (name, _) in ANN_INDEXES.items():
+                if mode != args.mode:
+                    drop_ann_index(conn, mode)
+                    print(f"🗑️  {name} 제거")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+워크플로우 그래프 검증/인덱스 벤치마크 스크립트
+
+사용법:
+    python scripts/benchmark_graph_index.py [--sizes 50,100,200,500] [--repeat 5]
+
+목적:
+    - 합성 그래프(분기 노드 포함, 50~500 노드)에서 WorkflowValidator.validate와
+      GraphIndex 생성/도달 가능성 계산 시간을 측정
+    - 노드 수를 늘렸을 때 시간이 선형에 가깝게 증가하는지 확인
+"""
+import argparse
+import copy
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# validator ↔ executor 순환 import를 피하기 위해 노드 레지스트리를 먼저 로드
+import app.core.workflow.node_registry_v2  # noqa: E402,F401
+from app.core.workflow.graph_index import GraphIndex  # noqa: E402
+from app.core.workflow.validator import WorkflowValidator  # noqa: E402
+
+
+def build_synthetic_graph(node_count: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Start → (if-else → 두 갈래 LLM 체인) 반복 → Answer → End 형태의 합성 그래프
+
+    10개 노드마다 분기 노드를 두고 두 갈래가 다음 구간에서 합류하도록 구성합니다.
+    """
+    nodes: List[Dict[str, Any]] = [{"id": "start", "type": "start", "data": {"type": "start"}}]
+    edges: List[Dict[str, Any]] = []
+    previous = "start"
+    index = 0
+
+    def add_edge(source: str, target: str, source_port: str = "") -> None:
+        edges.append({
+            "id": f"e{len(edges)}",
+            "source": source,
+            "target": target,
+            "source_port": source_port,
+            "target_port": "",
+        })
+
+    while len(nodes) < node_count - 2:
+        if index % 10 == 0:
+            branch_id = f"branch_{index}"
+            left_id = f"llm_{index}_a"
+            right_id = f"llm_{index}_b"
+            nodes.append({"id": branch_id, "type": "if-else", "data": {"type": "if-else"}})
+            nodes.append({"id": left_id, "type": "llm", "data": {"type": "llm"}})
+            nodes.append({"id": right_id, "type": "llm", "data": {"type": "llm"}})
+            add_edge(previous, branch_id)
+            add_edge(branch_id, left_id, "if")
+            add_edge(branch_id, right_id, "else")
+            join_id = f"join_{index}"
+            nodes.append({"id": join_id, "type": "llm", "data": {"type": "llm"}})
+            add_edge(left_id, join_id)
+            add_edge(right_id, join_id)
+            previous = join_id
+            index += 4
+        else:
+            node_id = f"llm_{index}"
+            nodes.append({"id": node_id, "type": "llm", "data": {"type": "llm"}})
+            add_edge(previous, node_id)
+            previous = node_id
+            index += 1
+
+    nodes.append({"id": "answer", "type": "answer", "data": {"type": "answer", "template": "{{start.query}}"}})
+    nodes.append({"id": "end", "type": "end", "data": {"type": "end"}})
+    add_edge(previous, "answer")
+    add_edge("answer", "end")
+    return nodes, edges
+
+
+def measure(func, repeat: int) -> float:
+    """repeat회 실행 중 최솟값 (ms)"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="워크플로우 그래프 검증 벤치마크")
+    parser.add_argument("--sizes", default="50,100,200,500", help="노드 수 목록 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    # 검증 경고 로그가 측정을 방해하지 않도록 비활성화
+    logging.disable(logging.CRITICAL)
+    validator = WorkflowValidator()
+
+    print(f"{'nodes':>6} {'edges':>6} {'validate(ms)':>13} {'index(ms)':>10} {'reach(ms)':>10} {'ms/node':>8}")
+    for size in [int(value) for value in args.sizes.split(",") if value.strip()]:
+        nodes, edges = build_synthetic_graph(size)
+
+        def run_validate():
+            validator.validate(copy.deepcopy(nodes), copy.deepcopy(edges))
+
+        def run_index():
+            GraphIndex([node["id"] for node in nodes], edges)
+
+        def run_reachability():
+            index = GraphIndex([node["id"] for node in nodes], edges)
+            for node in nodes:
+                index.descendants(node["id"])
+
+        validate_ms = measure(run_validate, args.repeat)
+        index_ms = measure(run_index, args.repeat)
+        reach_ms = measure(run_reachability, args.repeat)
+        print(
+            f"{len(nodes):>6} {len(edges):>6} {validate_ms:>13.2f} {index_ms:>10.2f} "
+            f"{reach_ms:>10.2f} {validate_ms / len(nodes):>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+벡터 양자화 검색 recall/지연시간 비교 스크립트
+
+사용법:
+    python scripts/benchmark_vector_quantization.py [--queries 50] [--top-k 5] [--bot-id bot_123]
+        [--modes none,halfvec,binary,matryoshka] [--rescore-multipliers 4,10]
+
+목적:
+    - 저장된 임베딩을 질의로 샘플링해 정확 검색(인덱스 미사용 순차 스캔) 결과를 기준으로
+      각 ANN 모드(float32 / halfvec / binary / matryoshka 256차원 + 원본 벡터 재점수)의 recall@k를 측정
+    - 모드별 검색 지연시간 p50/p95 비교
+    - settings.vector_search_quantization / vector_search_rescore_multiplier 값을 정하고
+      원본 HNSW 인덱스 제거 여부를 판단하는 데 사용
+
+전제:
+    - 비교할 모드의 인덱스 생성 완료 (scripts/apply_vector_search_index.py --mode <모드>)
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import func, select, text  # noqa: E402
+
+import app.core.workflow.node_registry_v2  # noqa: E402,F401  (순환 import 방지용 선 로드)
+from app.config import settings  # noqa: E402
+from app.core.database import AsyncSessionLocal  # noqa: E402
+from app.core.vector_store import VectorStore  # noqa: E402
+from app.models.document_embeddings import DocumentEmbedding  # noqa: E402
+
+
+async def sample_queries(count: int, bot_id: Optional[str]) -> List[List[float]]:
+    """저장된 임베딩 중 무작위 count개를 질의 벡터로 사용"""
+    async with AsyncSessionLocal() as db:
+        query = select(DocumentEmbedding.embedding).order_by(func.random()).limit(count)
+        if bot_id:
+            query = query.where(DocumentEmbedding.bot_id == bot_id)
+        rows = (await db.execute(query)).scalars().all()
+    return [list(map(float, row)) for row in rows]
+
+
+async def run_search(
+    query_embedding: Sequence[float],
+    top_k: int,
+    quantization: str,
+    exact: bool = False,
+) -> Dict[str, object]:
+    """한 트랜잭션에서 검색 1회 실행 (exact=True면 인덱스 스캔을 꺼서 정확 검색)"""
+    async with AsyncSessionLocal() as db:
+        async with db.begin():
+            if exact:
+                await db.execute(text("SET LOCAL enable_indexscan = off"))
+            store = VectorStore(bot_id="benchmark", db=db)
+            started = time.perf_counter()
+            result = await store.search(
+                query_embedding=list(query_embedding),
+                top_k=top_k,
+                quantization=quantization,
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000
+    return {"ids": result["ids"][0], "ms": elapsed_ms}
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(ratio * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="벡터 양자화 검색 recall/지연시간 비교")
+    parser.add_argument("--queries", type=int, default=50, help="샘플 질의 수")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--bot-id", default=None, help="특정 봇의 임베딩만 질의로 샘플링")
+    parser.add_argument("--modes", default="none,halfvec,binary,matryoshka", help="비교할 모드 (쉼표 구분)")
+    parser.add_argument("--rescore-multipliers", default="4,10", help="양자화 모드 후보 배수 목록 (쉼표 구분)")
+    args = parser.parse_args()
+
+    # 검색 로그가 측정 출력을 가리지 않도록 비활성화
+    logging.disable(logging.CRITICAL)
+
+    queries = await sample_queries(args.queries, args.bot_id)
+    if not queries:
+        print("샘플링할 임베딩이 없습니다.")
+        return
+
+    ground_truth = [await run_search(q, args.top_k, "none", exact=True) for q in queries]
+    exact_ms = [result["ms"] for result in ground_truth]
+    print(f"queries={len(queries)} top_k={args.top_k}")
+    print(f"{'mode':>8} {'mult':>5} {'recall@k':>9} {'p50(ms)':>8} {'p95(ms)':>8}")
+    print(f"{'exact':>8} {'-':>5} {1.0:>9.3f} {statistics.median(exact_ms):>8.2f} {percentile(exact_ms, 0.95):>8.2f}")
+
+    multipliers = [int(value) for value in args.rescore_multipliers.split(",") if value.strip()]
+    for mode in [value.strip() for value in args.modes.split(",") if value.strip()]:
+        for multiplier in (multipliers if mode != "none" else [1]):
+            settings.vector_search_rescore_multiplier = multiplier
+            recalls: List[float] = []
+            latencies: List[float] = []
+            for query_embedding, truth in zip(queries, ground_truth):
+                result = await run_search(query_embedding, args.top_k, mode)
+                expected = set(truth["ids"])
+                recalls.append(len(expected & set(result["ids"])) / max(1, len(expected)))
+                latencies.append(result["ms"])
+            print(
+                f"{mode:>8} {multiplier if mode != 'none' else '-':>5} {statistics.mean(recalls):>9.3f} "
+                f"{statistics.median(latencies):>8.2f} {percentile(latencies, 0.95):>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
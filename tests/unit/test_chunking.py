@@ -0,0 +1,66 @@
+import random
+
+import pytest
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from app.core.chunking import DEFAULT_SEPARATORS, PAGE_SEPARATOR, TextChunker
+
+
+def make_text(seed: int, words: int = 300) -> str:
+    rng = random.Random(seed)
+    vocabulary = ["문서", "검색은", "hello", "world.", "foo\n", "bar. ", "\n\n", "x" * 120, "  "]
+    return "".join(rng.choice(vocabulary) + " " for _ in range(words))
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(40, 0), (100, 20), (512, 128)])
+def test_char_mode_matches_recursive_character_splitter(seed, chunk_size, chunk_overlap):
+    text = make_text(seed)
+    expected = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        separators=DEFAULT_SEPARATORS,
+    ).split_text(text)
+
+    chunker = TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_unit="char")
+
+    assert chunker.split_text(text) == expected
+
+
+def test_page_stream_reports_offsets_and_page_numbers():
+    pages = [make_text(seed, words=60) for seed in range(4)]
+    joined = PAGE_SEPARATOR.join(pages)
+    page_starts = [0]
+    for page in pages[:-1]:
+        page_starts.append(page_starts[-1] + len(page) + len(PAGE_SEPARATOR))
+
+    chunker = TextChunker(chunk_size=80, chunk_overlap=10, length_unit="char")
+    streamed = list(chunker.iter_chunks(iter(pages)))
+
+    assert [chunk.text for chunk in streamed] == chunker.split_text(joined)
+    assert [chunk.index for chunk in streamed] == list(range(len(streamed)))
+    for chunk in streamed:
+        assert joined[chunk.start:chunk.end] == chunk.text
+        assert chunk.page_start == max(i for i, start in enumerate(page_starts) if start <= chunk.start) + 1
+        assert chunk.page_end >= chunk.page_start
+    assert streamed[-1].page_end == len(pages)
+
+
+def test_custom_length_function_bounds_chunk_length():
+    chunker = TextChunker(
+        chunk_size=10, chunk_overlap=2, length_function=lambda text: len(text.split())
+    )
+    text = " ".join(f"w{i}" for i in range(100))
+
+    chunks = list(chunker.iter_chunks([text]))
+
+    assert all(len(chunk.text.split()) <= 10 for chunk in chunks)
+    assert chunks[0].to_metadata()["page"] == 1
+
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size=10, chunk_overlap=20, length_unit="char")
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size=10, chunk_overlap=2, length_unit="bytes")
@@ -0,0 +1,120 @@
+import json
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.core.workflow.conversation_state import LOADED_MARKER_FIELD, ConversationStateStore
+
+
+class FakeRedis:
+    """RedisClient의 hash API만 흉내내는 인메모리 구현"""
+
+    def __init__(self):
+        self.redis = object()  # 연결된 상태로 간주
+        self.hashes = {}
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hset_many(self, key, mapping, expire=None):
+        self.hashes.setdefault(key, {}).update(mapping)
+        return True
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.hashes.pop(key, None) is not None)
+
+
+class Row:
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """AsyncSession 흉내 (트랜잭션 이벤트는 연결 없는 동기 Session으로 발생)"""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+        self.flushes = 0
+        self.sync_session = Session()
+
+    async def execute(self, stmt):
+        if not self.sync_session.in_transaction():
+            self.sync_session.begin()
+        self.statements.append(stmt)
+        return FakeResult(self.rows)
+
+    async def flush(self):
+        self.flushes += 1
+
+    async def commit(self):
+        self.sync_session.commit()
+
+    async def rollback(self):
+        self.sync_session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_load_populates_hash_and_skips_db_on_next_turn():
+    redis = FakeRedis()
+    store = ConversationStateStore(redis=redis, enabled=True, ttl_sec=60, prefix="test:conv")
+    db = FakeSession([Row("name", "민수"), Row("cart", {"items": [1, 2]})])
+
+    first = await store.load(db, "bot_1", "session_1")
+    second = await store.load(db, "bot_1", "session_1")
+
+    assert first == second == {"name": "민수", "cart": {"items": [1, 2]}}
+    assert len(db.statements) == 1
+    assert LOADED_MARKER_FIELD in redis.hashes["test:conv:bot_1:session_1"]
+
+
+@pytest.mark.asyncio
+async def test_persist_upserts_in_one_statement_and_writes_cache_after_commit():
+    redis = FakeRedis()
+    store = ConversationStateStore(redis=redis, enabled=True, ttl_sec=60, prefix="test:conv")
+    db = FakeSession()
+
+    await store.persist(db, "bot_1", "session_1", {"a": 1, "b": "둘"})
+    await store.drain()
+
+    assert len(db.statements) == 1 and db.flushes == 1
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT ON CONSTRAINT uq_conversation_variable_key DO UPDATE" in sql
+    # 커밋 전에는 캐시에 쓰지 않음
+    assert "test:conv:bot_1:session_1" not in redis.hashes
+
+    await db.commit()
+    await store.drain()
+
+    cached = redis.hashes["test:conv:bot_1:session_1"]
+    assert {key: json.loads(value) for key, value in cached.items()} == {"a": 1, "b": "둘"}
+
+    # 마커가 없는 부분 캐시는 신뢰하지 않고 DB에서 다시 로드
+    reload_db = FakeSession([Row("a", 1), Row("b", "둘"), Row("c", True)])
+    assert await store.load(reload_db, "bot_1", "session_1") == {"a": 1, "b": "둘", "c": True}
+    assert len(reload_db.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_persist_without_commit_invalidates_cached_state():
+    redis = FakeRedis()
+    store = ConversationStateStore(redis=redis, enabled=True, ttl_sec=60, prefix="test:conv")
+    await store.load(FakeSession([Row("a", 0)]), "bot_1", "session_1")
+    db = FakeSession()
+
+    await store.persist(db, "bot_1", "session_1", {"a": 1})
+    await db.rollback()
+    await store.drain()
+
+    # 롤백된 값은 캐시에 남지 않고, 이전 캐시도 지워져 다음 로드는 DB를 조회
+    assert "test:conv:bot_1:session_1" not in redis.hashes
@@ -0,0 +1,44 @@
+from app.core.workflow.graph_index import GraphIndex
+
+
+def _edge(source, target, port=""):
+    return {"source": source, "target": target, "source_port": port, "target_port": ""}
+
+
+EDGES = [
+    _edge("start", "branch"),
+    _edge("branch", "a", "if"),
+    _edge("branch", "b", "else"),
+    _edge("a", "join"),
+    _edge("b", "join"),
+    _edge("join", "end"),
+    _edge("conv", "a", "name"),
+    _edge("join", "missing"),
+]
+NODES = ["start", "branch", "a", "b", "join", "end"]
+
+
+def test_graph_index_adjacency_and_reachability():
+    index = GraphIndex(NODES, EDGES, is_virtual=lambda node_id: node_id == "conv")
+
+    assert index.successors("branch") == ["a", "b"]
+    assert [edge["target"] for edge in index.out_edges_by_port["branch"]["else"]] == ["b"]
+    assert sorted(index.predecessors("join")) == ["a", "b"]
+    # 가상 노드/미존재 노드 엣지는 구조에서 제외되지만 원본 엣지 조회는 가능
+    assert index.in_degree("a") == 1
+    assert index.has_edge("conv", "a")
+    assert index.out_degree("join") == 1
+
+    assert index.topological_order() == ["start", "branch", "a", "b", "join", "end"]
+    assert index.descendants("a") == {"join", "end"}
+    assert index.reachable_from(["a", "b"]) == {"join", "end"}
+    assert index.reachable_from(["branch", "a"]) == {"b", "join", "end"}
+
+
+def test_graph_index_detects_cycles_and_falls_back_to_bfs():
+    index = GraphIndex(["x", "y", "z"], [_edge("x", "y"), _edge("y", "z"), _edge("z", "y")])
+
+    assert index.has_cycle()
+    assert index.topological_order() is None
+    assert index.descendants("x") == {"y", "z"}
+    assert index.descendants("y") == {"z"}
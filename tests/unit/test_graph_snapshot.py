@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.workflow import graph_snapshot
+from app.core.workflow.graph_snapshot import (
+    compute_graph_hash,
+    mark_graph_snapshot_persisted,
+    store_graph_snapshot,
+)
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+
+
+@pytest.fixture(autouse=True)
+def _clear_known_hashes():
+    graph_snapshot.clear_known_hashes()
+    yield
+    graph_snapshot.clear_known_hashes()
+
+
+def test_graph_hash_ignores_key_order():
+    graph_a = {"nodes": [{"id": "start", "data": {"title": "시작", "type": "start"}}], "edges": []}
+    graph_b = {"edges": [], "nodes": [{"data": {"type": "start", "title": "시작"}, "id": "start"}]}
+
+    assert compute_graph_hash(graph_a) == compute_graph_hash(graph_b)
+    assert len(compute_graph_hash(graph_a)) == 64
+    assert compute_graph_hash(graph_a) != compute_graph_hash({**graph_a, "edges": [{"id": "e1"}]})
+
+
+@pytest.mark.asyncio
+async def test_store_graph_snapshot_skips_insert_after_commit():
+    session = RecordingSession()
+    graph = {"nodes": [], "edges": []}
+
+    graph_hash = await store_graph_snapshot(session, graph)
+    assert len(session.statements) == 1
+    assert "ON CONFLICT" in str(session.statements[0].compile(dialect=postgresql.dialect()))
+
+    # 커밋 전에는 다시 INSERT (롤백 대비), 커밋 후에는 생략
+    await store_graph_snapshot(session, graph)
+    assert len(session.statements) == 2
+
+    mark_graph_snapshot_persisted(graph_hash)
+    assert await store_graph_snapshot(session, graph) == graph_hash
+    assert len(session.statements) == 2
+
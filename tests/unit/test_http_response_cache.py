@@ -0,0 +1,209 @@
+import json
+
+import httpx
+import pytest
+
+from app.core.http_client import (
+    HttpClientPool,
+    HttpResponseCache,
+    build_cached_response,
+    freshness_lifetime,
+    parse_cache_control,
+)
+
+
+class FakeRedis:
+    """RedisClient의 get/set만 흉내내는 인메모리 구현 (JSON 자동 디코딩)"""
+
+    def __init__(self):
+        self.redis = object()  # 연결된 상태로 간주
+        self.values = {}
+        self.expires = {}
+
+    async def get(self, key):
+        raw = self.values.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key, value, expire=None, nx=False, xx=False):
+        self.values[key] = value
+        self.expires[key] = expire
+        return True
+
+
+def make_pool(handler, redis=None, **cache_kwargs):
+    cache = HttpResponseCache(redis=redis or FakeRedis(), enabled=True, local_max_entries=16, **cache_kwargs)
+    return HttpClientPool(response_cache=cache, transport=httpx.MockTransport(handler))
+
+
+def test_parse_cache_control_and_freshness():
+    assert parse_cache_control('public, max-age=60, no-cache="set-cookie"') == {
+        "public": None,
+        "max-age": "60",
+        "no-cache": "set-cookie",
+    }
+    assert freshness_lifetime({"cache-control": "max-age=60, s-maxage=10"}) == 10.0
+    assert freshness_lifetime({
+        "date": "Mon, 01 Jun 2026 00:00:00 GMT",
+        "expires": "Mon, 01 Jun 2026 00:02:00 GMT",
+    }) == 120.0
+    assert freshness_lifetime({"expires": "invalid"}) == 0.0
+    assert freshness_lifetime({}) is None
+
+
+def test_shared_cache_storage_rules():
+    def build(request_headers, response_headers, method="GET", status=200):
+        return build_cached_response(method, request_headers, status, response_headers, "ok", 0.0, 0.0)
+
+    assert build({}, {"cache-control": "max-age=60"}) is not None
+    assert build({}, {"cache-control": "private, max-age=60"}) is None
+    assert build({}, {"cache-control": "no-store"}) is None
+    assert build({}, {"cache-control": "max-age=60", "vary": "*"}) is None
+    assert build({}, {"cache-control": "max-age=60"}, method="POST") is None
+    # 명시적 freshness/검증자가 없으면 저장하지 않음
+    assert build({}, {}) is None
+    # 인증 요청은 public/s-maxage가 있어야 공유 캐시에 저장
+    assert build({"authorization": "Bearer t"}, {"cache-control": "max-age=60"}) is None
+    assert build({"authorization": "Bearer t"}, {"cache-control": "public, max-age=60"}) is not None
+    # 사용자 정의 자격 증명 헤더도 동일하게 취급
+    assert build({"x-api-key": "k"}, {"cache-control": "max-age=60"}) is None
+    assert build({"cookie": "sid=1"}, {"cache-control": "max-age=60, must-revalidate"}) is None
+    assert build({"x-custom-token": "t"}, {"cache-control": "s-maxage=60"}) is not None
+    assert build({"accept": "application/json"}, {"cache-control": "max-age=60"}) is not None
+
+
+def test_cache_key_separates_scopes_and_all_request_headers():
+    cache = HttpResponseCache(redis=FakeRedis(), enabled=True)
+    url = "https://api.example.com/items"
+    base = cache.cache_key("GET", url, {"x-api-key": "a"}, "bot:1")
+
+    assert base == cache.cache_key("GET", url, {"x-api-key": "a"}, "bot:1")
+    assert base != cache.cache_key("GET", url, {"x-api-key": "b"}, "bot:1")
+    assert base != cache.cache_key("GET", url, {"x-api-key": "a"}, "bot:2")
+
+
+@pytest.mark.asyncio
+async def test_fresh_response_is_served_from_cache_per_credentials():
+    calls = []
+
+    def handler(request):
+        calls.append(request.headers.get("authorization"))
+        return httpx.Response(200, headers={"cache-control": "public, max-age=60"}, text="hello")
+
+    pool = make_pool(handler)
+    first = await pool.request("GET", "https://api.example.com/items", params={"page": 1})
+    second = await pool.request("GET", "https://api.example.com/items", params={"page": 1})
+    other_user = await pool.request(
+        "GET", "https://api.example.com/items", params={"page": 1}, headers={"Authorization": "Bearer x"}
+    )
+    other_bot = await pool.request(
+        "GET", "https://api.example.com/items", params={"page": 1}, cache_scope="bot:2"
+    )
+    await pool.aclose()
+
+    assert first.from_cache is False and second.from_cache is True
+    assert second.body == "hello"
+    assert other_user.from_cache is False
+    assert other_bot.from_cache is False
+    assert calls == [None, "Bearer x", None]
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_revalidates_with_etag():
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"', "cache-control": "no-cache"})
+        return httpx.Response(200, headers={"etag": '"v1"', "cache-control": "no-cache"}, text="body")
+
+    redis = FakeRedis()
+    pool = make_pool(handler, redis=redis)
+    first = await pool.request("GET", "https://api.example.com/doc")
+    second = await pool.request("GET", "https://api.example.com/doc")
+    await pool.aclose()
+
+    assert seen == [None, '"v1"']
+    assert second.status_code == 200 and second.body == "body" and second.from_cache is True
+    # 검증자가 있으면 만료 후에도 재검증용으로 Redis에 보관
+    assert 3599 <= list(redis.expires.values())[0] <= 3600
+    assert first.from_cache is False
+
+
+@pytest.mark.asyncio
+async def test_vary_header_separates_representations():
+    def handler(request):
+        return httpx.Response(
+            200,
+            headers={"cache-control": "max-age=60", "vary": "Accept-Language"},
+            text=request.headers.get("accept-language", ""),
+        )
+
+    pool = make_pool(handler)
+    await pool.request("GET", "https://api.example.com/greet", headers={"Accept-Language": "ko"})
+    english = await pool.request("GET", "https://api.example.com/greet", headers={"Accept-Language": "en"})
+    await pool.aclose()
+
+    assert english.from_cache is False and english.body == "en"
+
+
+@pytest.mark.asyncio
+async def test_large_body_is_truncated_and_not_cached():
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        return httpx.Response(200, headers={"cache-control": "max-age=60"}, content=b"a" * 100)
+
+    pool = make_pool(handler)
+    first = await pool.request("GET", "https://api.example.com/big", max_body_bytes=10)
+    second = await pool.request("GET", "https://api.example.com/big", max_body_bytes=10)
+    await pool.aclose()
+
+    assert first.truncated is True and first.body == "a" * 10
+    assert second.from_cache is False and len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_unsafe_methods_bypass_cache():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(200, headers={"cache-control": "max-age=60"}, json={"ok": True})
+
+    pool = make_pool(handler)
+    await pool.request("POST", "https://api.example.com/hook", json_body={"a": 1})
+    result = await pool.request("POST", "https://api.example.com/hook", json_body={"a": 1})
+    await pool.aclose()
+
+    assert result.from_cache is False and calls == ["POST", "POST"]
+
+
+@pytest.mark.asyncio
+async def test_response_header_names_match_for_cached_and_uncached_results():
+    def handler(request):
+        return httpx.Response(
+            200, headers={"Cache-Control": "public, max-age=60", "X-Request-Id": "abc"}, text="ok"
+        )
+
+    pool = make_pool(handler)
+    first = await pool.request("GET", "https://api.example.com/headers")
+    second = await pool.request("GET", "https://api.example.com/headers")
+    await pool.aclose()
+
+    assert second.from_cache is True
+    assert first.headers == second.headers
+    assert first.headers["x-request-id"] == "abc"
+
+
+@pytest.mark.asyncio
+async def test_host_limits_evict_least_recently_used_idle_hosts(monkeypatch):
+    monkeypatch.setattr("app.core.http_client.MAX_TRACKED_HOSTS", 2)
+    pool = make_pool(lambda request: httpx.Response(200, text="ok"))
+
+    for host in ("a.example.com", "b.example.com", "a.example.com", "c.example.com"):
+        await pool.request("POST", f"https://{host}/items")
+
+    assert [host for _, host in pool._host_limits] == ["a.example.com", "c.example.com"]
+    await pool.aclose()
@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import app.core.workflow.node_registry_v2  # noqa: F401  (노드 모듈 순환 import 방지용 선 로드)
+from app.core.vector_store import VectorStore, reciprocal_rank_fusion
+from app.core.workflow.base_node_v2 import NodeExecutionContext
+from app.core.workflow.nodes_v2.knowledge_node_v2 import KnowledgeNodeV2
+from app.core.workflow.service_container import ServiceContainer
+from app.core.workflow.variable_pool import VariablePool
+
+
+class FakeVectorService:
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    async def search_similar_chunks(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.results
+
+
+def make_context(vector_service):
+    container = ServiceContainer()
+    container.register("vector_service", vector_service)
+    container.register("user_uuid", "user-1")
+    container.register("db_session", None)
+    return NodeExecutionContext(
+        node_id="knowledge_1",
+        variable_pool=VariablePool(),
+        service_container=container,
+        metadata={"prepared_inputs": {"query": "SKU-1234 환불"}},
+    )
+
+
+def test_rrf_rewards_items_ranked_by_both_legs():
+    fused = reciprocal_rank_fusion(
+        {"semantic": ["a", "b", "c"], "lexical": ["c", "d"]},
+        k=60,
+    )
+
+    assert [entry["id"] for entry in fused] == ["c", "a", "b", "d"]
+    assert fused[0]["ranks"] == {"semantic": 3, "lexical": 1}
+    assert fused[0]["score"] == pytest.approx(1 / 63 + 1 / 61)
+
+
+def test_rrf_ignores_duplicate_ids_within_a_leg():
+    fused = reciprocal_rank_fusion({"semantic": ["a", "a", "b"]}, k=1)
+
+    assert fused[0] == {"id": "a", "score": pytest.approx(0.5), "ranks": {"semantic": 1}}
+    assert fused[1]["ranks"] == {"semantic": 3}
+
+
+def test_hybrid_query_runs_both_legs_in_one_statement():
+    store = VectorStore(bot_id="bot-1")
+    query = store._build_hybrid_query(
+        query_embedding=[0.1] * 1024,
+        query_text="환불 규정",
+        candidate_k=20,
+        document_ids=["doc-1"],
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "UNION ALL" in sql
+    assert "websearch_to_tsquery" in sql
+    assert "%>" in sql
+    assert sql.count("document_embeddings.document_id IN") == 2
+
+
+@pytest.mark.asyncio
+async def test_hybrid_mode_keeps_lexical_matches_below_threshold():
+    service = FakeVectorService([
+        {"content": "벡터 결과", "similarity": 0.62, "match_sources": ["semantic"]},
+        {"content": "SKU-1234 환불 절차", "similarity": 0.41, "match_sources": ["lexical"]},
+        {"content": "무관한 결과", "similarity": 0.41, "match_sources": ["semantic"]},
+    ])
+    node = KnowledgeNodeV2(
+        node_id="knowledge_1",
+        config={"search_mode": "hybrid", "similarity_threshold": 0.5},
+    )
+
+    outputs = await node.execute_v2(make_context(service))
+
+    assert service.calls[0]["search_mode"] == "hybrid"
+    assert [doc["content"] for doc in outputs["documents"]] == ["벡터 결과", "SKU-1234 환불 절차"]
+
+
+def test_validate_rejects_unknown_search_mode():
+    node = KnowledgeNodeV2(
+        node_id="knowledge_1",
+        config={"search_mode": "keyword"},
+        variable_mappings={"query": "start.query"},
+    )
+
+    assert node.validate() == (False, "search_mode must be one of semantic, hybrid")
@@ -0,0 +1,152 @@
+import pytest
+
+import app.core.workflow.node_registry_v2  # noqa: F401  (노드 모듈 순환 import 방지용 선 로드)
+from app.core.vector_store import VectorStore, chunk_content_hash, copy_scope_embeddings, diff_chunk_hashes
+
+
+def test_chunk_content_hash_is_stable_sha256():
+    assert chunk_content_hash("문서") == chunk_content_hash("문서")
+    assert chunk_content_hash("a") == "ca978112ca1bbdcafac231b39a23dc4da786eff8147c4e72b9807785afee48bb"
+
+
+def test_unchanged_chunks_are_kept_and_only_edits_are_embedded():
+    existing = [(10, chunk_content_hash("p1")), (11, chunk_content_hash("p2")), (12, chunk_content_hash("p3"))]
+
+    plan = diff_chunk_hashes("doc-1", existing, ["p1", "p2 edited", "p3", "p4"])
+
+    assert plan.keep == {0: 10, 2: 12}
+    assert plan.embed_indices == [1, 3]
+    assert plan.delete_ids == [11]
+
+
+def test_duplicate_chunks_reuse_rows_one_to_one():
+    existing = [(2, chunk_content_hash("same")), (1, chunk_content_hash("same"))]
+
+    plan = diff_chunk_hashes("doc-1", existing, ["same", "same", "same"])
+
+    assert plan.keep == {0: 1, 1: 2}
+    assert plan.embed_indices == [2]
+    assert plan.delete_ids == []
+
+
+def test_rows_without_hash_are_replaced():
+    plan = diff_chunk_hashes("doc-1", [(5, None)], ["p1"])
+
+    assert plan.keep == {}
+    assert plan.embed_indices == [0]
+    assert plan.delete_ids == [5]
+
+
+class FakeUpload:
+    filename = "policy.txt"
+
+    async def read(self):
+        return "첫 문단\n\n둘째 문단".encode("utf-8")
+
+
+class FakeEmbeddingService:
+    def __init__(self):
+        self.calls = []
+
+    async def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[0.0] * 4 for _ in texts]
+
+
+class FakeSyncStore:
+    """DocumentService가 워커와 같은 plan → 중복 연결 → apply 경로를 타는지 기록"""
+
+    def __init__(self):
+        self.applied = None
+
+    async def plan_document_sync(self, document_id, documents):
+        return diff_chunk_hashes(document_id, [], documents)
+
+    async def find_near_duplicates(self, plan, documents):
+        # 두 번째 청크는 다른 문서의 대표 청크와 유사 중복
+        plan.links[1] = (42, 1)
+        plan.embed_indices.remove(1)
+
+    async def apply_document_sync(self, plan, ids, documents, metadatas, embeddings):
+        self.applied = (plan, ids, embeddings)
+
+
+@pytest.mark.asyncio
+async def test_upload_ingest_uses_sync_plan_and_embeds_only_new_chunks(tmp_path, monkeypatch):
+    from app.core.chunking import TextChunker
+    from app.core.document_processor import DocumentProcessor
+    from app.services import document_service
+
+    store = FakeSyncStore()
+    monkeypatch.setattr(document_service, "get_vector_store", lambda **kwargs: store)
+    monkeypatch.setattr(document_service.settings, "upload_temp_dir", str(tmp_path))
+    monkeypatch.setattr(document_service.settings, "ingest_dedup_enabled", True)
+
+    service = document_service.DocumentService.__new__(document_service.DocumentService)
+    service.embedding_service = FakeEmbeddingService()
+    service.document_processor = DocumentProcessor()
+    service.text_chunker = TextChunker(chunk_size=8, chunk_overlap=0, length_unit="char")
+
+    response = await service.process_and_store_document(FakeUpload(), "bot-1", "user-1")
+
+    plan, ids, embeddings = store.applied
+    assert response.chunk_count == 2
+    assert plan.source_document_id == response.document_id
+    assert ids == [f"{response.document_id}_chunk_0", f"{response.document_id}_chunk_1"]
+    assert service.embedding_service.calls == [["첫 문단"]]
+    assert len(embeddings) == 1
+
+
+def test_reupload_copies_embeddings_of_identical_chunks_in_scope():
+    documents = ["같은 문단", "바뀐 문단"]
+    plan = diff_chunk_hashes("doc-new", [], documents)
+
+    copy_scope_embeddings(plan, documents, {chunk_content_hash("같은 문단"): [0.1, 0.2]})
+
+    assert plan.copies == {0: [0.1, 0.2]}
+    assert plan.embed_indices == [1]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+def compile_sql(query) -> str:
+    from sqlalchemy.dialects import postgresql
+
+    return str(query.compile(dialect=postgresql.asyncpg.dialect()))
+
+
+class FakeScopeSession:
+    """문서 단위 조회는 빈 결과, 범위 내 해시 조회는 이전 업로드의 행을 돌려주는 세션"""
+
+    def __init__(self, scope_rows):
+        self.scope_rows = scope_rows
+        self.queries = []
+
+    async def execute(self, query):
+        self.queries.append(query)
+        if "DISTINCT ON" in compile_sql(query):
+            return FakeResult(self.scope_rows)
+        return FakeResult([])
+
+
+@pytest.mark.asyncio
+async def test_plan_document_sync_reuses_previous_upload_embeddings():
+    from types import SimpleNamespace
+
+    documents = ["연차 규정", "새 조항"]
+    session = FakeScopeSession([SimpleNamespace(content_hash=chunk_content_hash("연차 규정"), embedding=[0.5, 0.5])])
+    store = VectorStore(bot_id="bot-1", db=session)
+
+    plan = await store.plan_document_sync("doc_new", documents)
+
+    assert plan.copies == {0: [0.5, 0.5]}
+    assert plan.embed_indices == [1]
+    scope_sql = compile_sql(session.queries[-1])
+    assert "document_embeddings.bot_id = " in scope_sql
+    assert "DISTINCT ON (document_embeddings.content_hash)" in scope_sql
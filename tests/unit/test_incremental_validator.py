@@ -0,0 +1,45 @@
+"""IncrementalWorkflowValidator 단위 테스트"""
+
+import copy
+
+from app.core.workflow.incremental_validator import IncrementalWorkflowValidator
+from app.core.workflow.validator import WorkflowValidator
+from tests.data.workflow_v2_feedback_graph import FEEDBACK_WORKFLOW_GRAPH
+
+
+def _validate(validator, graph):
+    nodes = copy.deepcopy(graph["nodes"])
+    edges = copy.deepcopy(graph["edges"])
+    result = validator.validate(nodes, edges)
+    return result, nodes, edges
+
+
+def _find(graph, node_id):
+    return next(node for node in graph["nodes"] if node["id"] == node_id)
+
+
+def test_incremental_validator_matches_full_validation_across_edits():
+    incremental = IncrementalWorkflowValidator()
+    graph = copy.deepcopy(FEEDBACK_WORKFLOW_GRAPH)
+
+    first = _validate(incremental, graph)
+    assert first == _validate(WorkflowValidator(), graph)
+    assert incremental.last_mode == "incremental"
+
+    # 위치만 바뀐 autosave는 이전 결과와 정규화 결과를 그대로 재사용
+    _find(graph, "llm-summary")["position"] = {"x": 999, "y": 999}
+    moved = _validate(incremental, graph)
+    assert incremental.last_mode == "reused"
+    assert moved == _validate(WorkflowValidator(), graph)
+
+    # 템플릿이 연결되지 않은 노드를 참조하도록 바뀌면 해당 노드만 재검증
+    answer = _find(graph, "answer-1")
+    answer["data"]["template"] = answer["data"]["template"] + " {{tavily-initial.context}}"
+    edited = _validate(incremental, graph)
+    assert incremental.last_changed_nodes == {"answer-1"}
+    assert edited == _validate(WorkflowValidator(), graph)
+    assert any("tavily-initial" in error for error in edited[0][1])
+
+    # 엣지만 제거해도 (노드 정의 불변) 전역 검증 결과가 전체 검증과 같아야 함
+    graph["edges"] = graph["edges"][:-1]
+    assert _validate(incremental, graph) == _validate(WorkflowValidator(), graph)
@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import app.core.workflow.node_registry_v2  # noqa: F401  (노드 모듈 순환 import 방지용 선 로드)
+from app.core.workflow.library_agent_plan import LibraryAgentPlanCache, compile_library_agent
+
+
+def make_graph():
+    return {
+        "nodes": [
+            {
+                "id": "start-1",
+                "type": "start",
+                "data": {"type": "start"},
+                "ports": {
+                    "inputs": [],
+                    "outputs": [{"name": "query", "type": "string", "required": True}],
+                },
+                "variable_mappings": {},
+            },
+            {
+                "id": "llm-1",
+                "type": "llm",
+                "data": {"type": "llm"},
+                "ports": {
+                    "inputs": [{"name": "query", "type": "string", "required": True}],
+                    "outputs": [{"name": "response", "type": "string", "required": True}],
+                },
+                "variable_mappings": {},
+            },
+            {
+                "id": "answer-1",
+                "type": "answer",
+                "data": {"type": "answer", "template": "{{llm-1.response}}"},
+                "variable_mappings": {},
+            },
+            {
+                "id": "end-1",
+                "type": "end",
+                "data": {"type": "end", "inputs": {"response": {}}},
+                "ports": {
+                    "inputs": [{"name": "response", "type": "string", "required": True}],
+                    "outputs": [],
+                },
+                "variable_mappings": {"response": "answer-1.final_output"},
+            },
+        ],
+        "edges": [
+            {"id": "e1", "source": "start-1", "target": "llm-1", "source_port": "source", "target_port": "target"},
+            {"id": "e2", "source": "answer-1", "target": "end-1", "source_port": "source", "target_port": "target"},
+            {"id": "e3", "source": "llm-1", "target": "answer-1", "source_port": "source", "target_port": "target"},
+        ],
+    }
+
+
+def make_version(updated_at):
+    return SimpleNamespace(
+        id="11111111-1111-1111-1111-111111111111",
+        graph=make_graph(),
+        library_name="요약 에이전트",
+        version="v1.0",
+        input_schema=[{"name": "query", "type": "string"}],
+        output_schema=[{"name": "response", "type": "string"}],
+        updated_at=updated_at,
+    )
+
+
+class FakeResult:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one_or_none(self):
+        return self._value
+
+
+class FakeDB:
+    """버전 행 전체 조회와 updated_at 단독 조회를 구분해 응답"""
+
+    def __init__(self, version):
+        self.version = version
+        self.full_loads = 0
+        self.stamp_checks = 0
+
+    async def execute(self, stmt):
+        columns = [column.name for column in stmt.selected_columns]
+        if columns == ["updated_at"]:
+            self.stamp_checks += 1
+            return FakeResult(self.version.updated_at)
+        self.full_loads += 1
+        return FakeResult(self.version)
+
+
+def test_compile_library_agent_resolves_start_outputs_and_order():
+    version = make_version(datetime(2026, 1, 1))
+    plan = compile_library_agent(version)
+
+    assert plan.start_node_id == "start-1"
+    assert plan.output_mappings == {"response": "answer-1.final_output"}
+    assert plan.execution_order == ["start-1", "llm-1", "answer-1", "end-1"]
+    assert plan.to_agent_data()["name"] == "요약 에이전트"
+    # 원본 그래프는 검증 정규화로 변경되지 않음
+    assert version.graph == make_graph()
+
+
+def test_agent_data_is_isolated_per_execution():
+    plan = compile_library_agent(make_version(datetime(2026, 1, 1)))
+
+    # 자식 Executor가 config_data에 ports를 병합하는 것처럼 제자리 수정
+    first = plan.to_agent_data()
+    first["graph"]["nodes"][0]["data"]["ports"] = {"outputs": []}
+
+    assert "ports" not in plan.graph["nodes"][0]["data"]
+    assert "ports" not in plan.to_agent_data()["graph"]["nodes"][0]["data"]
+
+
+@pytest.mark.asyncio
+async def test_plan_cache_reuses_plan_until_version_changes():
+    version = make_version(datetime(2026, 1, 1))
+    db = FakeDB(version)
+    cache = LibraryAgentPlanCache(max_size=8, revalidate_sec=0)
+
+    first = await cache.get_plan(db, version.id)
+    second = await cache.get_plan(db, version.id)
+    assert second is first
+    assert db.full_loads == 1 and db.stamp_checks == 1
+
+    version.updated_at = version.updated_at + timedelta(minutes=1)
+    third = await cache.get_plan(db, version.id)
+    assert third is not first
+    assert db.full_loads == 2
+
+
+@pytest.mark.asyncio
+async def test_plan_cache_skips_stamp_check_within_revalidate_window():
+    version = make_version(datetime(2026, 1, 1))
+    db = FakeDB(version)
+    cache = LibraryAgentPlanCache(max_size=8, revalidate_sec=60)
+
+    await cache.get_plan(db, version.id)
+    await cache.get_plan(db, version.id)
+    assert db.full_loads == 1 and db.stamp_checks == 0
+
+    cache.invalidate(version.id)
+    await cache.get_plan(db, version.id)
+    assert db.full_loads == 2
+
+
+@pytest.mark.asyncio
+async def test_plan_cache_raises_for_missing_version():
+    db = FakeDB(None)
+    db.version = None
+    cache = LibraryAgentPlanCache(max_size=8, revalidate_sec=0)
+
+    with pytest.raises(ValueError):
+        await cache.get_plan(db, "missing")
@@ -0,0 +1,129 @@
+"""LLM 지연시간 라우터 단위 테스트"""
+
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.core.llm_router import (
+    KIND_STREAM,
+    LLMLatencyRouter,
+    RouteTarget,
+    bedrock_inference_profile_id,
+)
+
+
+ANTHROPIC = RouteTarget("anthropic", "claude-3-5-sonnet-20240620")
+BEDROCK = RouteTarget("bedrock", "anthropic.claude-3-5-sonnet-20240620-v1:0")
+
+
+@pytest.fixture(autouse=True)
+def enable_routing(monkeypatch):
+    # 라우팅/헤지는 기본 비활성(opt-in)
+    monkeypatch.setattr(settings, "llm_routing_enabled", True)
+    monkeypatch.setattr(settings, "llm_hedging_enabled", True)
+
+
+def _warm_up(router: LLMLatencyRouter, target: RouteTarget, latency_ms: float, count: int = 10, kind="generate"):
+    for _ in range(count):
+        router.record(target.provider, target.model, latency_ms, True, kind)
+
+
+def test_equivalent_targets_map_claude_tiers():
+    assert LLMLatencyRouter.equivalent_targets("anthropic", ANTHROPIC.model) == [
+        RouteTarget("bedrock", bedrock_inference_profile_id(BEDROCK.model, settings.bedrock_region))
+    ]
+    assert LLMLatencyRouter.equivalent_targets(
+        "bedrock", "apac.anthropic.claude-3-5-sonnet-20240620-v1:0"
+    ) == [ANTHROPIC]
+    assert LLMLatencyRouter.equivalent_targets("openai", "gpt-4o-mini") == []
+
+
+def test_bedrock_inference_profile_id_uses_region_geo():
+    assert bedrock_inference_profile_id(BEDROCK.model, "ap-northeast-2") == "apac." + BEDROCK.model
+    assert bedrock_inference_profile_id(BEDROCK.model, "us-east-1") == "us." + BEDROCK.model
+    assert bedrock_inference_profile_id("eu." + BEDROCK.model, "us-east-1") == "eu." + BEDROCK.model
+
+
+def test_plan_prefers_provider_with_lower_p95():
+    router = LLMLatencyRouter(window_size=50, min_samples=5)
+    available = lambda provider: True
+
+    # 통계가 없으면 요청한 provider 우선
+    assert router.plan("bedrock", BEDROCK.model, available) == [BEDROCK, ANTHROPIC]
+
+    _warm_up(router, BEDROCK, 4000)
+    _warm_up(router, ANTHROPIC, 800)
+    assert router.plan("bedrock", BEDROCK.model, available) == [ANTHROPIC, BEDROCK]
+
+    # 스트리밍 통계는 별도로 집계
+    assert router.plan("bedrock", BEDROCK.model, available, kind=KIND_STREAM) == [BEDROCK, ANTHROPIC]
+
+    # 사용할 수 없는 provider는 제외
+    assert router.plan("bedrock", BEDROCK.model, lambda p: p == "bedrock") == [BEDROCK]
+
+
+@pytest.mark.asyncio
+async def test_execute_hedges_slow_primary_and_cancels_loser():
+    router = LLMLatencyRouter(window_size=50, min_samples=5)
+    _warm_up(router, BEDROCK, 10)
+    cancelled = []
+
+    async def call(target: RouteTarget) -> str:
+        if target == BEDROCK:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(target)
+                raise
+            return "bedrock"
+        return "anthropic"
+
+    result, target = await router.execute([BEDROCK, ANTHROPIC], call)
+    await asyncio.sleep(0)
+
+    assert (result, target) == ("anthropic", ANTHROPIC)
+    assert cancelled == [BEDROCK]
+
+
+@pytest.mark.asyncio
+async def test_execute_falls_back_when_primary_fails():
+    router = LLMLatencyRouter(window_size=50, min_samples=5)
+
+    async def call(target: RouteTarget) -> str:
+        if target == BEDROCK:
+            raise RuntimeError("throttled")
+        return "anthropic"
+
+    result, target = await router.execute([BEDROCK, ANTHROPIC], call)
+
+    assert target == ANTHROPIC
+    assert router.get_window(BEDROCK).error_rate == 1.0
+
+
+@pytest.mark.asyncio
+async def test_hedge_losers_that_finished_are_settled_not_cancelled():
+    spent, discarded = [], []
+
+    async def finished() -> str:
+        return "bedrock"
+
+    async def failed() -> str:
+        raise RuntimeError("throttled")
+
+    async def discard(result: str) -> None:
+        discarded.append(result)
+
+    done_task = asyncio.ensure_future(finished())
+    failed_task = asyncio.ensure_future(failed())
+    in_flight = asyncio.ensure_future(asyncio.sleep(5))
+    await asyncio.sleep(0)
+    tasks = {done_task: BEDROCK, failed_task: ANTHROPIC, in_flight: ANTHROPIC}
+
+    await LLMLatencyRouter._settle_losers(list(tasks), tasks, discard, spent.append)
+
+    # 진행 중인 요청만 취소, 이미 응답한 패자는 비용 기록 + 결과 정리
+    assert in_flight.cancelled()
+    assert not done_task.cancelled()
+    assert spent == [BEDROCK]
+    assert discarded == ["bedrock"]
@@ -0,0 +1,156 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import app.core.workflow.node_registry_v2  # noqa: F401  (노드 모듈 순환 import 방지용 선 로드)
+from app.core.local_vector_index import IndexSegment, LocalVectorIndex, exact_top_k, quantize_int8
+
+
+class FakeVersions:
+    def __init__(self):
+        self.versions = {}
+
+    async def get_corpus_versions(self, scopes):
+        return {scope: self.versions.get(scope, 1) for scope in scopes}
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeDB:
+    def __init__(self, rows_by_document):
+        self.rows_by_document = rows_by_document
+        self.queries = 0
+
+    async def execute(self, query):
+        self.queries += 1
+        document_id = next(
+            value for value in query.compile().params.values() if value in self.rows_by_document
+        )
+        return FakeResult(self.rows_by_document[document_id])
+
+
+def make_row(row_id, document_id, embedding):
+    return SimpleNamespace(
+        id=row_id,
+        chunk_text=f"chunk-{row_id}",
+        doc_metadata={"document_id": f"{document_id}_chunk_{row_id}"},
+        embedding=embedding,
+    )
+
+
+def basis(index, dimensions=1024):
+    vector = np.zeros(dimensions, dtype=np.float32)
+    vector[index] = 1.0
+    return vector
+
+
+@pytest.fixture
+def rows_by_document():
+    return {
+        "doc-a": [make_row(1, "doc-a", basis(0)), make_row(2, "doc-a", basis(1))],
+        "doc-b": [make_row(3, "doc-b", basis(0) + basis(2))],
+    }
+
+
+def test_exact_top_k_returns_descending_indices():
+    scores = np.array([0.1, 0.9, 0.5, 0.7])
+
+    assert exact_top_k(scores, 2).tolist() == [1, 3]
+    assert exact_top_k(scores, 10).tolist() == [1, 3, 2, 0]
+    assert exact_top_k(np.empty(0), 3).tolist() == []
+
+
+def test_int8_quantization_keeps_row_direction():
+    matrix = np.array([[0.6, -0.8], [0.0, 0.0]], dtype=np.float32)
+    quantized, scales = quantize_int8(matrix)
+
+    assert quantized.dtype == np.int8
+    assert quantized[0].tolist() == [95, -127]
+    assert quantized[0] * scales[0] == pytest.approx([0.6, -0.8], abs=0.01)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dtype", ["float32", "int8"])
+async def test_search_materializes_segments_after_min_hits(tmp_path, rows_by_document, dtype):
+    index = LocalVectorIndex(
+        root_dir=str(tmp_path), enabled=True, dtype=dtype, min_hits=2, versions=FakeVersions()
+    )
+    db = FakeDB(rows_by_document)
+    query = basis(0).tolist()
+
+    assert await index.search(db, ["doc-a", "doc-b"], query, top_k=2) is None
+    results = await index.search(db, ["doc-a", "doc-b"], query, top_k=2)
+
+    assert results["ids"][0] == ["doc-a_chunk_1", "doc-b_chunk_3"]
+    assert results["distances"][0] == pytest.approx([0.0, 1 - 1 / np.sqrt(2)], abs=0.01)
+    assert db.queries == 2
+    assert isinstance(index._segments[("doc-a", 1)].vectors, np.memmap)
+
+
+@pytest.mark.asyncio
+async def test_segments_refresh_only_for_changed_documents(tmp_path, rows_by_document):
+    versions = FakeVersions()
+    index = LocalVectorIndex(root_dir=str(tmp_path), enabled=True, min_hits=1, versions=versions)
+    db = FakeDB(rows_by_document)
+    await index.search(db, ["doc-a", "doc-b"], basis(1).tolist(), top_k=1)
+
+    rows_by_document["doc-a"].append(make_row(4, "doc-a", basis(3)))
+    versions.versions["doc:doc-a"] = 2
+    results = await index.search(db, ["doc-a", "doc-b"], basis(3).tolist(), top_k=1)
+
+    assert results["ids"][0] == ["doc-a_chunk_4"]
+    assert db.queries == 3
+    assert sorted(p.name for p in (tmp_path / "doc-a").iterdir()) == [
+        "2.float32.rows.json", "2.float32.vectors.npy"
+    ]
+
+    # 다른 워커(새 프로세스)는 DB 조회 없이 파일을 mmap으로 연다
+    other_worker = LocalVectorIndex(root_dir=str(tmp_path), enabled=True, min_hits=1, versions=versions)
+    other_db = FakeDB(rows_by_document)
+    results = await other_worker.search(other_db, ["doc-a"], basis(3).tolist(), top_k=1)
+
+    assert results["ids"][0] == ["doc-a_chunk_4"]
+    assert other_db.queries == 0
+
+
+def test_late_writer_keeps_newer_segment(tmp_path, rows_by_document):
+    index = LocalVectorIndex(root_dir=str(tmp_path), enabled=True)
+    index._write_segment("doc-a", 3, rows_by_document["doc-a"])
+    index._write_segment("doc-a", 1, rows_by_document["doc-a"])
+    index._write_segment("doc-a", 2, rows_by_document["doc-a"])
+
+    # 버전 1은 정리되고, 늦게 끝난 버전 2 작성이 최신 버전 3을 지우지 않음
+    assert sorted(p.name for p in (tmp_path / "doc-a").iterdir()) == [
+        "2.float32.rows.json", "2.float32.vectors.npy",
+        "3.float32.rows.json", "3.float32.vectors.npy",
+    ]
+
+
+def test_exact_search_dedupes_canonical_rows_shared_by_documents():
+    def segment(document_id, row_ids, vectors):
+        return IndexSegment(
+            document_id=document_id,
+            version=1,
+            vectors=np.asarray(vectors, dtype=np.float32),
+            scales=None,
+            ids=[f"chunk-{row_id}" for row_id in row_ids],
+            texts=["" for _ in row_ids],
+            metadatas=[{} for _ in row_ids],
+            row_ids=row_ids,
+        )
+
+    # doc-b의 청크가 doc-a의 대표 청크(행 1)에 연결되어 두 세그먼트에 같은 행이 있음
+    segments = [
+        segment("doc-a", [1, 2], [basis(0), basis(1)]),
+        segment("doc-b", [1, 3], [basis(0), 0.5 * basis(0) + basis(2)]),
+    ]
+    candidates = LocalVectorIndex._exact_search(segments, basis(0), top_k=2)
+
+    assert [seg.row_ids[row] for seg, row, _ in candidates] == [1, 3]
@@ -0,0 +1,59 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+import app.core.workflow.node_registry_v2  # noqa: F401  (노드 모듈 순환 import 방지용 선 로드)
+from app.core.vector_store import VectorStore, compile_metadata_filters, hot_metadata_columns
+from app.models.document_embeddings import DocumentEmbedding
+
+
+def compile_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.asyncpg.dialect()))
+
+
+def filtered(filter_dict) -> str:
+    query = select(DocumentEmbedding.id)
+    for condition in compile_metadata_filters(filter_dict):
+        query = query.where(condition)
+    return compile_sql(query)
+
+
+def test_hot_keys_use_typed_columns():
+    sql = filtered({"user_uuid": "u-1", "source_document_id": ["d-1", "d-2"], "page": "3", "document_id": "d-1_chunk_0"})
+
+    assert "document_embeddings.user_uuid = " in sql
+    assert "document_embeddings.document_id IN" in sql
+    # 유사 중복으로 다른 문서의 대표 청크에 연결된 청크도 포함
+    assert "FROM document_chunk_links" in sql
+    assert "document_embeddings.page = " in sql
+    assert "document_embeddings.chunk_id = " in sql
+    assert "doc_metadata" not in sql
+
+
+def test_other_keys_use_jsonb_containment():
+    sql = filtered({"original_filename": "policy.pdf", "lang": ["ko", "en"]})
+
+    assert sql.count("document_embeddings.doc_metadata @>") == 3
+    assert " OR " in sql
+    assert "CAST" not in sql
+
+
+def test_search_filters_compose_with_ann_query():
+    store = VectorStore(bot_id="bot-1")
+    sql = compile_sql(store._build_ann_query(
+        query_embedding=[0.1] * 1024,
+        top_k=5,
+        filter_dict={"file_type": "pdf"},
+        quantization="none",
+    ))
+
+    assert "document_embeddings.file_type = " in sql
+    assert "ORDER BY document_embeddings.embedding <=>" in sql
+
+
+def test_hot_metadata_columns_are_extracted_from_row_metadata():
+    columns = hot_metadata_columns(
+        {"document_id": "d-1_chunk_2", "user_uuid": "u-1", "file_type": "pdf", "page": 4}
+    )
+
+    assert columns == {"chunk_id": "d-1_chunk_2", "user_uuid": "u-1", "file_type": "pdf", "page": 4}
+    assert hot_metadata_columns({"page": "x"})["page"] is None
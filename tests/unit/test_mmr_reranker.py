@@ -0,0 +1,93 @@
+import pytest
+
+import app.core.workflow.node_registry_v2  # noqa: F401  (노드 모듈 순환 import 방지용 선 로드)
+from app.core.workflow.base_node_v2 import NodeExecutionContext
+from app.core.workflow.nodes_v2.knowledge_node_v2 import KnowledgeNodeV2
+from app.core.workflow.nodes_v2.utils.mmr_reranker import mmr_select
+from app.core.workflow.service_container import ServiceContainer
+from app.core.workflow.variable_pool import VariablePool
+
+
+class FakeVectorService:
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    async def search_similar_chunks(self, **kwargs):
+        self.calls.append(kwargs)
+        return [dict(doc) for doc in self.results[: kwargs["top_k"]]]
+
+
+def make_context(vector_service):
+    container = ServiceContainer()
+    container.register("vector_service", vector_service)
+    container.register("user_uuid", "user-1")
+    container.register("db_session", None)
+    return NodeExecutionContext(
+        node_id="knowledge_1",
+        variable_pool=VariablePool(),
+        service_container=container,
+        metadata={"prepared_inputs": {"query": "환불 규정"}},
+    )
+
+
+# a와 a'는 거의 같은 청크(overlap), b는 관련도가 조금 낮지만 다른 내용
+EMBEDDINGS = [[1.0, 0.0, 0.0], [0.99, 0.14, 0.0], [0.6, 0.0, 0.8]]
+RELEVANCE = [0.9, 0.88, 0.7]
+
+
+def test_lambda_one_keeps_relevance_order():
+    assert mmr_select(EMBEDDINGS, RELEVANCE, top_k=2, lambda_mult=1.0) == [0, 1]
+
+
+def test_mmr_prefers_diverse_chunk_over_near_duplicate():
+    assert mmr_select(EMBEDDINGS, RELEVANCE, top_k=2, lambda_mult=0.5) == [0, 2]
+
+
+def test_dedup_threshold_drops_near_duplicates_even_with_spare_slots():
+    selected = mmr_select(EMBEDDINGS, RELEVANCE, top_k=3, lambda_mult=1.0, dedup_threshold=0.95)
+
+    assert selected == [0, 2]
+    assert mmr_select([], [], top_k=3) == []
+
+
+@pytest.mark.asyncio
+async def test_knowledge_node_over_fetches_and_strips_embeddings():
+    candidates = [
+        {"content": content, "similarity": 0.7, "distance": 1.0 - relevance, "embedding": embedding}
+        for content, relevance, embedding in zip(["a", "a'", "b"], RELEVANCE, EMBEDDINGS)
+    ]
+    service = FakeVectorService(candidates)
+    node = KnowledgeNodeV2(
+        node_id="knowledge_1",
+        config={"top_k": 2, "mmr_enabled": True, "mmr_lambda": 0.5, "mmr_fetch_multiplier": 2},
+    )
+
+    outputs = await node.execute_v2(make_context(service))
+
+    assert service.calls[0]["top_k"] == 4
+    assert service.calls[0]["include_embeddings"] is True
+    assert [doc["content"] for doc in outputs["documents"]] == ["a", "b"]
+    assert all("embedding" not in doc for doc in outputs["documents"])
+
+
+def test_hybrid_results_use_normalized_rrf_relevance():
+    # 어휘 검색으로만 매칭된 청크는 distance가 커도 RRF 점수로 관련도를 평가
+    results = [
+        {"content": "vector", "distance": 0.2, "rrf_score": 0.016},
+        {"content": "lexical", "distance": 0.9, "rrf_score": 0.032},
+    ]
+
+    assert KnowledgeNodeV2._mmr_relevance(results) == [0.5, 1.0]
+    assert KnowledgeNodeV2._mmr_relevance([{"distance": 0.25}]) == [0.75]
+
+
+def test_validate_rejects_out_of_range_dedup_threshold():
+    def validate(**config):
+        node = KnowledgeNodeV2(node_id="knowledge_1", config=config, variable_mappings={"query": "start.query"})
+        return node.validate()[0]
+
+    assert validate(dedup_threshold=0.9)
+    assert not validate(dedup_threshold=0)
+    assert not validate(dedup_threshold=1.5)
+    assert not validate(dedup_threshold="0.9")
@@ -0,0 +1,135 @@
+import pytest
+
+import app.core.workflow.node_registry_v2  # noqa: F401  (노드 모듈 순환 import 방지용 선 로드)
+from app.core.near_duplicate import (
+    SimHashIndex,
+    from_signed64,
+    hamming_distance,
+    simhash,
+    simhash_bands,
+    to_signed64,
+)
+from app.core.vector_store import (
+    chunk_content_hash,
+    diff_chunk_hashes,
+    link_identical_chunks,
+    link_near_duplicates,
+)
+
+POLICY = (
+    "제3조(개인정보의 이용) 회사는 수집한 개인정보를 서비스 제공 목적 외로 이용하지 않으며, "
+    "이용 목적이 변경되는 경우 이용자에게 사전에 동의를 받습니다. "
+)
+OTHER = "벡터 검색은 질의와 문서 청크의 임베딩 유사도를 계산해 상위 결과를 반환합니다. " * 2
+
+
+def test_simhash_is_stable_and_whitespace_insensitive():
+    assert simhash(POLICY) == simhash(POLICY)
+    assert simhash(POLICY) == simhash("  " + POLICY.replace(" ", "\n  ", 3).upper())
+    assert hamming_distance(simhash(POLICY * 3), simhash((POLICY * 3).replace(".", ",", 1))) <= 3
+    assert hamming_distance(simhash(POLICY), simhash(OTHER)) > 10
+
+
+def test_signed_storage_round_trip_and_band_keys():
+    signature = (1 << 63) | 0xABCD
+
+    assert from_signed64(to_signed64(signature)) == signature
+    assert -(1 << 63) <= to_signed64(signature) < 0
+    assert simhash_bands(signature) == [0xABCD, 1 << 16, 2 << 16, (3 << 16) | 0x8000]
+
+
+def test_index_finds_neighbours_within_distance_only():
+    index = SimHashIndex()
+    index.add("a", 0b1111)
+    index.add("b", 1 << 40)
+
+    assert index.nearest(0b0111, max_distance=1) == ("a", 1)
+    assert index.nearest(0b0001, max_distance=1) is None
+
+
+def test_link_near_duplicates_against_scope_rows_and_same_document():
+    documents = [POLICY * 2, OTHER, "머리말: 사내 기밀 문서", "머리말: 사내 기밀 문서 ", "새로운 문단입니다. " * 5]
+    plan = diff_chunk_hashes("doc-2", [(7, chunk_content_hash(OTHER))], documents)
+    scope_rows = [(100, to_signed64(simhash(POLICY * 2)))]
+
+    link_near_duplicates(plan, documents, scope_rows, max_distance=3)
+
+    assert plan.keep == {1: 7}
+    assert plan.links == {0: (100, 0)}
+    assert plan.new_links == {3: (2, 0)}
+    assert plan.embed_indices == [2, 4]
+
+
+def test_default_linking_keeps_chunks_that_differ_by_one_number():
+    base = (
+        "제5조(연차휴가) 1년간 80퍼센트 이상 출근한 근로자에게 연간 15일의 유급휴가를 준다. "
+        + "사용하지 않은 휴가는 다음 해로 이월하지 않으며 휴가 사용 촉진 절차에 따라 소멸한다. " * 4
+    )
+    edited = base.replace("연간 15일", "연간 20일")
+    documents = [edited, "머리말: 사내 기밀 문서", "머리말: 사내 기밀 문서"]
+    plan = diff_chunk_hashes("doc-2", [], documents)
+    scope_rows = [(100, chunk_content_hash(base))]
+
+    # SimHash로는 같은 청크로 보일 만큼 가깝지만 기본 모드는 본문 해시가 같을 때만 연결
+    assert hamming_distance(simhash(base), simhash(edited)) <= 3
+    link_identical_chunks(plan, documents, scope_rows)
+
+    assert plan.links == {}
+    assert plan.new_links == {2: (1, 0)}
+    assert plan.embed_indices == [0, 1]
+
+
+def test_identical_chunks_link_to_scope_rows_by_content_hash():
+    documents = [POLICY, OTHER]
+    plan = diff_chunk_hashes("doc-2", [], documents)
+
+    link_identical_chunks(plan, documents, [(100, chunk_content_hash(POLICY)), (101, None)])
+
+    assert plan.links == {0: (100, 0)}
+    assert plan.embed_indices == [1]
+
+
+class FakeSearchResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return self
+
+
+class FakeSearchSession:
+    """첫 쿼리(벡터 검색)는 대표 행, 두 번째 쿼리(링크 조회)는 연결 청크를 돌려주는 세션"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+
+    async def execute(self, query):
+        return FakeSearchResult(self.results.pop(0))
+
+
+@pytest.mark.asyncio
+async def test_search_through_link_returns_linked_chunk_text_and_metadata(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.core import vector_store
+    from app.core.vector_store import VectorStore
+
+    monkeypatch.setattr(vector_store.local_vector_index, "enabled", False)
+    canonical = SimpleNamespace(
+        id=100, chunk_text="대표 청크 본문", doc_metadata={"document_id": "doc-1_chunk_0", "page": 1}
+    )
+    link = SimpleNamespace(
+        canonical_embedding_id=100,
+        chunk_text="연결 청크 본문",
+        doc_metadata={"document_id": "doc-2_chunk_3", "page": 7},
+    )
+    store = VectorStore(bot_id="bot-1", db=FakeSearchSession([(canonical, 0.1)], [link]))
+
+    results = await store.search([0.1] * 1024, top_k=1, document_ids=["doc-2"], quantization="none")
+
+    assert results["ids"] == [["doc-2_chunk_3"]]
+    assert results["documents"] == [["연결 청크 본문"]]
+    assert results["metadatas"] == [[{"document_id": "doc-2_chunk_3", "page": 7}]]
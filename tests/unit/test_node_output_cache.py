@@ -0,0 +1,176 @@
+import json
+
+import pytest
+
+import app.core.workflow.node_registry_v2  # noqa: F401  (노드 모듈 순환 import 방지용 선 로드)
+from app.core.workflow.base_node_v2 import NodeExecutionContext
+from app.core.workflow.node_cache import NodeCachePolicy, NodeOutputCache
+from app.core.workflow.nodes_v2.if_else_node_v2 import IfElseNodeV2
+from app.core.workflow.nodes_v2.knowledge_node_v2 import KnowledgeNodeV2
+from app.core.workflow.nodes_v2.template_transform_node_v2 import TemplateTransformNodeV2
+from app.core.workflow.service_container import ServiceContainer
+from app.core.workflow.variable_pool import VariablePool
+
+
+class FakeRedis:
+    """RedisClient의 get/set만 흉내내는 인메모리 구현 (JSON 자동 디코딩)"""
+
+    def __init__(self):
+        self.redis = object()  # 연결된 상태로 간주
+        self.values = {}
+
+    async def get(self, key):
+        raw = self.values.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key, value, expire=None, nx=False, xx=False):
+        self.values[key] = value
+        return True
+
+
+def make_context(node_id, variable_pool, cache, prepared_inputs=None, bot_id="bot-1"):
+    container = ServiceContainer()
+    container.register("node_output_cache", cache)
+    container.register("bot_id", bot_id)
+    container.register("user_uuid", "user-1")
+    return NodeExecutionContext(
+        node_id=node_id,
+        variable_pool=variable_pool,
+        service_container=container,
+        metadata={"prepared_inputs": prepared_inputs or {}},
+    )
+
+
+class CachedIfElseNode(IfElseNodeV2):
+    """엣지 핸들 재생 검증용 (실제 IfElse 노드는 캐시하지 않음)"""
+
+    def get_cache_policy(self):
+        return NodeCachePolicy(ttl_sec=300, shared=False)
+
+    def get_cache_key_inputs(self, context):
+        return {"tier": context.variable_pool.resolve_value_selector("start.tier")}
+
+
+def make_if_else():
+    return CachedIfElseNode(
+        node_id="if_1",
+        config={
+            "cases": [
+                {
+                    "case_id": "vip",
+                    "conditions": [
+                        {
+                            "variable_selector": "start.tier",
+                            "comparison_operator": "is",
+                            "value": "vip",
+                        }
+                    ],
+                }
+            ]
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_hit_replays_outputs_and_edge_handles():
+    cache = NodeOutputCache(redis=FakeRedis(), enabled=True, local_max_entries=16)
+    pool = VariablePool()
+    pool.set_node_output("start", "tier", "vip")
+
+    first = await make_if_else().execute(make_context("if_1", pool, cache))
+    second_context = make_context("if_1", pool, cache)
+    second = await make_if_else().execute(second_context)
+
+    assert cache.hits == 1 and cache.misses == 1
+    assert second.output == first.output
+    assert second.metadata["edge_handles"] == ["if"]
+    assert second.metadata["cache_hit"] is True
+    assert second_context.metadata["node_cache"]["if_1"] == {"hit": True, "tier": "local"}
+    assert pool.get_node_output("if_1", "if") is True
+
+
+@pytest.mark.asyncio
+async def test_key_tracks_declared_key_inputs():
+    cache = NodeOutputCache(redis=FakeRedis(), enabled=True, local_max_entries=16)
+    pool = VariablePool()
+    pool.set_node_output("start", "tier", "vip")
+    await make_if_else().execute(make_context("if_1", pool, cache))
+
+    pool.set_node_output("start", "tier", "free")
+    result = await make_if_else().execute(make_context("if_1", pool, cache))
+
+    assert cache.hits == 0
+    assert result.metadata["edge_handles"] == ["else"]
+
+
+def test_pure_in_process_nodes_are_not_cached():
+    # 키 계산 비용이 실행 비용보다 커서 캐시 정책을 두지 않음
+    assert IfElseNodeV2(node_id="if_1", config={"cases": []}).get_cache_policy() is None
+    assert TemplateTransformNodeV2(
+        node_id="tpl_1", config={"template": "{{ llm_1.response }}!"}
+    ).get_cache_policy() is None
+
+
+@pytest.mark.asyncio
+async def test_shared_policy_uses_redis_tier_across_processes():
+    redis = FakeRedis()
+    writer = NodeOutputCache(redis=redis, enabled=True, local_max_entries=16)
+    reader = NodeOutputCache(redis=redis, enabled=True, local_max_entries=16)
+    policy = NodeCachePolicy(ttl_sec=60)
+
+    await writer.set("node:out:key", policy, {"context": "문서"}, ["source"])
+    cached = await reader.get("node:out:key", policy)
+
+    assert cached.tier == "redis"
+    assert cached.outputs == {"context": "문서"}
+    assert cached.edge_handles == ["source"]
+    assert (await reader.get("node:out:key", policy)).tier == "local"
+
+    # 로컬 전용 정책은 Redis에 기록하지 않음
+    await writer.set("node:out:local", NodeCachePolicy(ttl_sec=60, shared=False), {"a": 1}, [])
+    assert "node:out:local" not in redis.values
+
+
+@pytest.mark.asyncio
+async def test_hit_returns_fresh_objects():
+    cache = NodeOutputCache(redis=FakeRedis(), enabled=True, local_max_entries=16)
+    policy = NodeCachePolicy(ttl_sec=60, shared=False)
+    await cache.set("k", policy, {"documents": [{"content": "a"}]}, [])
+
+    (await cache.get("k", policy)).outputs["documents"].append({"content": "b"})
+    assert (await cache.get("k", policy)).outputs["documents"] == [{"content": "a"}]
+
+
+@pytest.mark.asyncio
+async def test_corpus_dependent_policy_requires_corpus_version():
+    pool = VariablePool()
+    node = KnowledgeNodeV2(node_id="knowledge_1", config={"top_k": 3})
+    context = make_context("knowledge_1", pool, None, prepared_inputs={"query": "환불 규정"})
+    policy = node.get_cache_policy()
+
+    without_version = NodeOutputCache(redis=FakeRedis(), enabled=True)
+    assert await without_version.build_key(node, policy, context) is None
+
+    versions = {"value": "1"}
+
+    async def provider(_node, _context):
+        return versions["value"]
+
+    cache = NodeOutputCache(redis=FakeRedis(), enabled=True, corpus_version_provider=provider)
+    first = await cache.build_key(node, policy, context)
+    versions["value"] = "2"
+    second = await cache.build_key(node, policy, context)
+
+    assert first and second and first != second
+    assert KnowledgeNodeV2(
+        node_id="knowledge_2", config={"persist_to_conversation": True}
+    ).get_cache_policy() is None
+
+
+@pytest.mark.asyncio
+async def test_unserializable_outputs_are_not_cached():
+    cache = NodeOutputCache(redis=FakeRedis(), enabled=True, local_max_entries=16)
+    policy = NodeCachePolicy(ttl_sec=60)
+
+    assert await cache.set("k", policy, {"value": object()}, []) is False
+    assert await cache.get("k", policy) is None
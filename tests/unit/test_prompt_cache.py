@@ -0,0 +1,68 @@
+"""프롬프트 캐시(cache_control) 유틸리티 단위 테스트"""
+
+from app.core.prompt_cache import (
+    CACHE_PREFIX_KEY,
+    PromptCacheHints,
+    convert_to_anthropic_messages,
+    extract_static_prefix,
+    resolve_static_prefix,
+)
+from app.services.llm_service import LLMService
+
+
+LONG_SYSTEM_PROMPT = "당신은 고객 지원 상담원입니다. " * 300
+
+
+def test_extract_static_prefix_stops_at_first_variable():
+    template = "규칙 설명\n\n{{start.query}} 이후 {context}"
+    assert extract_static_prefix(template) == "규칙 설명\n\n"
+    assert extract_static_prefix("변수 없음") == "변수 없음"
+
+
+def test_resolve_static_prefix_requires_minimum_length():
+    assert resolve_static_prefix("짧은 안내 {{start.query}}", "짧은 안내 질문") is None
+
+    template = LONG_SYSTEM_PROMPT + "{{start.query}}"
+    rendered = LONG_SYSTEM_PROMPT + "배송은 언제 오나요?"
+    assert resolve_static_prefix(template, rendered) == LONG_SYSTEM_PROMPT
+
+
+def test_build_messages_marks_only_cache_capable_providers():
+    hints = PromptCacheHints(system_prefix=LONG_SYSTEM_PROMPT)
+
+    bedrock_messages = LLMService._build_messages("bedrock", "질문", LONG_SYSTEM_PROMPT, hints)
+    assert bedrock_messages[0][CACHE_PREFIX_KEY] == LONG_SYSTEM_PROMPT
+    assert CACHE_PREFIX_KEY not in bedrock_messages[1]
+
+    openai_messages = LLMService._build_messages("openai", "질문", LONG_SYSTEM_PROMPT, hints)
+    assert all(CACHE_PREFIX_KEY not in message for message in openai_messages)
+
+
+def test_convert_to_anthropic_messages_splits_cache_blocks():
+    dynamic_suffix = "\n\n검색 결과가 없는 경우 명확히 알려주세요."
+    messages = [
+        {"role": "system", "content": LONG_SYSTEM_PROMPT + dynamic_suffix, CACHE_PREFIX_KEY: LONG_SYSTEM_PROMPT},
+        {"role": "user", "content": "안녕하세요"},
+    ]
+
+    system, converted = convert_to_anthropic_messages(messages, default_system="기본")
+
+    assert system[0] == {
+        "type": "text",
+        "text": LONG_SYSTEM_PROMPT,
+        "cache_control": {"type": "ephemeral"},
+    }
+    assert system[1] == {"type": "text", "text": dynamic_suffix}
+    assert converted == [{"role": "user", "content": "안녕하세요"}]
+
+
+def test_convert_to_anthropic_messages_without_cache_keeps_strings():
+    messages = [
+        {"role": "system", "content": "시스템", CACHE_PREFIX_KEY: "시스템"},
+        {"role": "user", "content": "질문"},
+    ]
+
+    system, converted = convert_to_anthropic_messages(messages, default_system="기본", enable_cache=False)
+
+    assert system == "시스템"
+    assert converted == [{"role": "user", "content": "질문"}]
@@ -0,0 +1,110 @@
+import pytest
+
+from app.core.workflow.base_node_v2 import NodeExecutionContext
+from app.core.workflow.nodes_v2.question_classifier_node_v2 import QuestionClassifierNodeV2
+from app.core.workflow.nodes_v2.utils.embedding_classifier import EmbeddingClassifier
+from app.core.workflow.service_container import ServiceContainer
+from app.core.workflow.variable_pool import VariablePool
+
+
+KEYWORD_AXES = ["배송", "환불", "날씨"]
+
+
+class KeywordEmbeddingService:
+    """키워드 포함 여부로 축을 만드는 테스트용 임베딩"""
+
+    model_id = "keyword-test"
+
+    def __init__(self):
+        self.document_calls = 0
+
+    @staticmethod
+    def _embed(text: str):
+        return [1.0 if keyword in text else 0.0 for keyword in KEYWORD_AXES] + [0.1]
+
+    async def embed_documents(self, texts):
+        self.document_calls += 1
+        return [self._embed(text) for text in texts]
+
+    async def embed_query(self, text):
+        return self._embed(text)
+
+
+class FailingLLMService:
+    async def generate(self, **kwargs):
+        raise AssertionError("임베딩으로 분류 가능한 질문은 LLM을 호출하지 않아야 합니다")
+
+
+class RecordingLLMService:
+    def __init__(self, response: str):
+        self.response = response
+        self.calls = 0
+
+    async def generate(self, **kwargs):
+        self.calls += 1
+        return self.response
+
+
+CLASSES = [
+    {"id": "shipping", "name": "배송 문의", "examples": ["배송 언제 와요?"]},
+    {"id": "refund", "name": "환불 문의", "description": "환불 및 반품 요청"},
+]
+
+
+def _build(llm_service, embedding_service, **config):
+    node = QuestionClassifierNodeV2(
+        node_id="qc_1",
+        config={"classes": CLASSES, "classification_engine": "embedding", **config},
+        variable_mappings={"query": "start.query"},
+    )
+    container = ServiceContainer()
+    container.register("llm_service", llm_service)
+    container.register("embedding_service", embedding_service)
+    return node, container
+
+
+@pytest.fixture(autouse=True)
+def _clear_centroid_cache():
+    EmbeddingClassifier.clear_cache()
+    yield
+    EmbeddingClassifier.clear_cache()
+
+
+@pytest.mark.asyncio
+async def test_embedding_engine_classifies_without_llm_and_caches_centroids():
+    embeddings = KeywordEmbeddingService()
+    node, container = _build(FailingLLMService(), embeddings)
+
+    for _ in range(2):
+        context = NodeExecutionContext(
+            node_id="qc_1",
+            variable_pool=VariablePool(),
+            service_container=container,
+            metadata={"prepared_inputs": {"query": "환불 받고 싶어요"}},
+        )
+        outputs = await node.execute_v2(context)
+
+        assert outputs["class_name"] == "환불 문의"
+        assert outputs["class_refund_branch"] is True
+        assert outputs["class_shipping_branch"] is False
+        assert context.metadata["question_classifier_routing"]["qc_1"]["engine"] == "embedding"
+
+    assert embeddings.document_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_embedding_engine_falls_back_to_llm_when_margin_is_small():
+    llm_service = RecordingLLMService("배송 문의")
+    node, container = _build(llm_service, KeywordEmbeddingService())
+    context = NodeExecutionContext(
+        node_id="qc_1",
+        variable_pool=VariablePool(),
+        service_container=container,
+        metadata={"prepared_inputs": {"query": "오늘 날씨 어때요?"}},
+    )
+
+    outputs = await node.execute_v2(context)
+
+    assert llm_service.calls == 1
+    assert outputs["class_name"] == "배송 문의"
+    assert context.metadata["question_classifier_routing"]["qc_1"]["engine"] == "llm_fallback"
@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from app.core import redis_client as redis_module
+from app.core.redis_client import (
+    NearCache,
+    RedisClient,
+    decode_packed,
+    encode_packed,
+    pack_vectors,
+    unpack_vectors,
+)
+
+
+class FakeRawRedis:
+    """decode_responses=True 연결의 get/set/mget만 흉내내는 구현"""
+
+    def __init__(self):
+        self.values = {}
+        self.get_calls = 0
+
+    async def get(self, key):
+        self.get_calls += 1
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False, xx=False):
+        self.values[key] = value
+        return True
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+
+def make_client(near_cache=None):
+    client = RedisClient()
+    client.redis = FakeRawRedis()
+    client.set_near_cache(near_cache)
+    return client
+
+
+def test_vectors_roundtrip_as_float32():
+    vectors = [[0.5, -1.25, 3.0], [0.0, 2.0, -0.75]]
+    data = pack_vectors(vectors)
+
+    assert len(data) == 8 + 6 * 4
+    assert unpack_vectors(data) == vectors
+    assert unpack_vectors(b"") == []
+    with pytest.raises(ValueError):
+        pack_vectors([[1.0], [1.0, 2.0]])
+
+
+def test_packed_codec_roundtrip_with_and_without_msgpack(monkeypatch):
+    value = {"response": "안녕하세요", "scores": [0.1, 0.2]}
+    assert decode_packed(encode_packed(value)) == value
+
+    monkeypatch.setattr(redis_module, "msgpack", None)
+    encoded = encode_packed(value)
+    assert encoded[:1] == b"\x00"
+    assert decode_packed(encoded) == value
+
+
+def test_near_cache_expires_and_evicts(monkeypatch):
+    cache = NearCache(max_entries=2, ttl_sec=1.0)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")  # 가장 오래 사용하지 않은 b 제거
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, "1")
+
+    now = time.monotonic()
+    monkeypatch.setattr(redis_module.time, "monotonic", lambda: now + 5)
+    assert cache.get("a") == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_get_with_near_cache_skips_round_trip_until_write():
+    client = make_client(NearCache(max_entries=16, ttl_sec=60))
+    client.redis.values["api_key:cache:x"] = '{"id": "k1"}'
+
+    assert await client.get("api_key:cache:x", near_cache=True) == {"id": "k1"}
+    assert await client.get("api_key:cache:x", near_cache=True) == {"id": "k1"}
+    assert client.redis.get_calls == 1
+
+    # 같은 프로세스의 쓰기는 near-cache를 무효화
+    await client.set("api_key:cache:x", {"id": "k2"})
+    assert await client.get("api_key:cache:x", near_cache=True) == {"id": "k2"}
+    assert client.redis.get_calls == 2
+
+    # near_cache를 요청하지 않으면 항상 Redis 조회
+    await client.get("api_key:cache:x")
+    assert client.redis.get_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_mget_decodes_json_and_missing_keys():
+    client = make_client()
+    client.redis.values.update({"a": '{"v": 1}', "b": "plain"})
+
+    assert await client.mget(["a", "b", "missing"]) == [{"v": 1}, "plain", None]
+    assert await client.mget([]) == []
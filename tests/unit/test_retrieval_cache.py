@@ -0,0 +1,133 @@
+import json
+
+import pytest
+
+from app.core.retrieval_cache import RetrievalCache, corpus_scopes, normalize_query
+
+
+class FakeRawRedis:
+    """redis.asyncio 클라이언트의 set(nx)/get/incr만 흉내내는 인메모리 구현"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return False
+        self.values[key] = str(value)
+        return True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+
+class FakePipeline:
+    def __init__(self, raw):
+        self.raw = raw
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, *args, **kwargs):
+        self.commands.append(self.raw.set(*args, **kwargs))
+
+    def incr(self, key):
+        self.commands.append(self.raw.incr(key))
+
+    async def execute(self):
+        return [await command for command in self.commands]
+
+
+class FakeRedis:
+    """RedisClient의 get/set/mget/pipeline 인메모리 구현 (JSON 자동 인코딩/디코딩)"""
+
+    def __init__(self):
+        self.redis = FakeRawRedis()
+
+    async def get(self, key):
+        raw = self.redis.values.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key, value, expire=None, nx=False, xx=False):
+        self.redis.values[key] = json.dumps(value)
+        return True
+
+    async def mget(self, keys):
+        return [await self.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.redis)
+
+
+def make_loader(counter, value):
+    async def loader():
+        counter["calls"] += 1
+        return value
+
+    return loader
+
+
+def test_normalized_queries_share_a_key_and_scopes_follow_document_ids():
+    assert normalize_query("  환불   규정ＡＢ ") == normalize_query("환불 규정ab")
+    assert corpus_scopes(None) == ["all"]
+    assert corpus_scopes(["d2", "d1", "d2"]) == ["doc:d1", "doc:d2"]
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_is_served_from_cache_until_corpus_changes():
+    redis = FakeRedis()
+    cache = RetrievalCache(redis=redis, enabled=True, local_max_entries=16, ttl_sec=60)
+    counter = {"calls": 0}
+    fetch_kwargs = dict(scope={"user_uuid": "u1"}, params={"top_k": 3}, document_ids=None)
+
+    first = await cache.fetch(query="환불 규정", loader=make_loader(counter, {"ids": [["a"]]}), **fetch_kwargs)
+    second = await cache.fetch(query="환불  규정", loader=make_loader(counter, {"ids": [["x"]]}), **fetch_kwargs)
+    assert first == second == {"ids": [["a"]]}
+    assert counter["calls"] == 1
+
+    # 다른 레플리카(빈 로컬 티어)도 Redis 티어로 hit
+    replica = RetrievalCache(redis=redis, enabled=True, local_max_entries=16, ttl_sec=60)
+    assert await replica.fetch(query="환불 규정", loader=make_loader(counter, None), **fetch_kwargs) == first
+
+    await cache.bump_corpus_version(["doc-1"])
+    third = await cache.fetch(query="환불 규정", loader=make_loader(counter, {"ids": [["b"]]}), **fetch_kwargs)
+    assert third == {"ids": [["b"]]}
+    assert counter["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_document_scoped_search_ignores_other_document_changes():
+    cache = RetrievalCache(redis=FakeRedis(), enabled=True, local_max_entries=16, ttl_sec=60)
+    counter = {"calls": 0}
+    fetch_kwargs = dict(scope={"user_uuid": "u1"}, params={"top_k": 3}, document_ids=["doc-1"])
+
+    await cache.fetch(query="q", loader=make_loader(counter, ["r1"]), **fetch_kwargs)
+    await cache.bump_corpus_version(["doc-2"])
+    await cache.fetch(query="q", loader=make_loader(counter, ["r2"]), **fetch_kwargs)
+    assert counter["calls"] == 1
+
+    await cache.bump_corpus_version(["doc-1"])
+    assert await cache.fetch(query="q", loader=make_loader(counter, ["r3"]), **fetch_kwargs) == ["r3"]
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bypassed_without_redis():
+    class Disconnected:
+        redis = None
+
+    cache = RetrievalCache(redis=Disconnected(), enabled=True, ttl_sec=60)
+    counter = {"calls": 0}
+    for _ in range(2):
+        await cache.fetch(
+            scope={}, query="q", params={}, document_ids=None, loader=make_loader(counter, ["r"])
+        )
+
+    assert counter["calls"] == 2
@@ -0,0 +1,92 @@
+"""SSE 이벤트 인코딩 및 토큰 병합 단위 테스트"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.core.stream_events import ContentCoalescer, StreamEvent, event_payload
+from app.models.chat import ErrorCode, ErrorEvent
+from app.services.chat_service import WorkflowStreamHandler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_stream_event_serializes_once_and_keeps_payload():
+    event = StreamEvent.from_model(ErrorEvent(code=ErrorCode.STREAM_ERROR, message="오류 발생"))
+
+    assert json.loads(event) == {"type": "error", "code": "STREAM_ERROR", "message": "오류 발생"}
+    assert "오류 발생" in event  # 비ASCII 문자를 이스케이프하지 않음
+    assert event_payload(event) is event.payload
+    assert event_payload('{"type": "content", "data": "x"}') == {"type": "content", "data": "x"}
+    assert event_payload("[DONE]") is None
+
+
+def test_coalescer_flushes_by_window_and_bytes():
+    clock = FakeClock()
+    coalescer = ContentCoalescer(window_ms=20, max_bytes=16, clock=clock)
+
+    assert coalescer.add("안녕") is None
+    clock.now = 0.01
+    assert coalescer.add("하세") is None
+    clock.now = 0.025
+    assert coalescer.add("요") == "안녕하세요"
+
+    assert coalescer.add("abcdefghijklmnop") == "abcdefghijklmnop"
+    assert coalescer.add("끝") is None
+    assert coalescer.drain() == "끝"
+    assert coalescer.drain() is None
+
+    passthrough = ContentCoalescer(window_ms=0, max_bytes=12)
+    assert passthrough.add("토큰") == "토큰"
+
+
+@pytest.mark.asyncio
+async def test_workflow_stream_handler_coalesces_and_keeps_order():
+    events = []
+
+    async def emit(payload):
+        events.append(payload)
+
+    handler = WorkflowStreamHandler(
+        emit_fn=emit,
+        include_sources=False,
+        text_normalizer=lambda text: text,
+        coalesce_window_ms=10_000,
+        coalesce_max_bytes=1024,
+    )
+
+    for token in ["Fast", "API", "는 "]:
+        assert await handler.emit_content_chunk(token) == token
+    assert events == []
+
+    await handler.emit_node_event("llm-1", "llm", "completed")
+    assert events[0] == {"type": "content", "data": "FastAPI는 "}
+    assert events[1]["type"] == "node"
+
+
+@pytest.mark.asyncio
+async def test_workflow_stream_handler_flushes_after_window():
+    events = []
+
+    async def emit(payload):
+        events.append(payload)
+
+    handler = WorkflowStreamHandler(
+        emit_fn=emit,
+        include_sources=False,
+        text_normalizer=lambda text: text,
+        coalesce_window_ms=5,
+        coalesce_max_bytes=1024,
+    )
+
+    await handler.emit_content_chunk("토큰")
+    await asyncio.sleep(0.05)
+
+    assert events == [{"type": "content", "data": "토큰"}]
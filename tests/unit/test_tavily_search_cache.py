@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.providers.tavily import (
+    TavilySearchCache,
+    TavilySearchRequest,
+    TavilySearchResponse,
+    normalize_query,
+)
+
+
+class FakeRedis:
+    """RedisClient의 get/set만 흉내내는 인메모리 구현 (JSON 자동 인코딩/디코딩)"""
+
+    def __init__(self):
+        self.redis = object()  # 연결된 상태로 간주
+        self.values = {}
+
+    async def get(self, key):
+        raw = self.values.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key, value, expire=None, nx=False, xx=False):
+        if nx and key in self.values:
+            return False
+        self.values[key] = json.dumps(value) if isinstance(value, (dict, list)) else value
+        return True
+
+
+class CountingCache(TavilySearchCache):
+    """API 호출 대신 호출 횟수를 세는 캐시"""
+
+    def __init__(self, **kwargs):
+        super().__init__(enabled=True, local_max_entries=16, **kwargs)
+        self.calls = 0
+        self.delay = 0.0
+
+    async def _fetch(self, api_key, request):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return TavilySearchResponse(query=request.query, answer=f"v{self.calls}", response_time=0.1)
+
+
+def test_cache_key_normalizes_query_and_domains():
+    cache = CountingCache(redis=FakeRedis())
+    a = TavilySearchRequest(query="  Ｏｐｅｎ  AI 뉴스 ", include_domains=["B.com", "a.com"])
+    b = TavilySearchRequest(query="open ai 뉴스", include_domains=["a.com", "b.com"])
+    c = TavilySearchRequest(query="open ai 뉴스", include_domains=["a.com", "b.com"], topic="news")
+
+    assert normalize_query("  Ｏｐｅｎ  AI ") == "open ai"
+    assert cache.cache_key(a) == cache.cache_key(b)
+    assert cache.cache_key(a) != cache.cache_key(c)
+
+
+@pytest.mark.asyncio
+async def test_fresh_hit_and_redis_tier_shared_across_replicas():
+    redis = FakeRedis()
+    writer = CountingCache(redis=redis)
+    reader = CountingCache(redis=redis)
+    request = TavilySearchRequest(query="환율")
+
+    _, first = await writer.search("key", request, ttl_sec=60)
+    result, second = await reader.search("key", request, ttl_sec=60)
+
+    assert (first, second) == ("miss", "hit")
+    assert result.answer == "v1"
+    assert writer.calls == 1 and reader.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshing():
+    cache = CountingCache(redis=FakeRedis(), stale_sec=60)
+    request = TavilySearchRequest(query="날씨")
+    await cache.search("key", request, ttl_sec=60)
+
+    # 만료된 상태로 만든 뒤 조회 → 이전 결과 반환 + 백그라운드 갱신
+    key = cache.cache_key(request)
+    fetched_at, payload = cache._local[key]
+    cache._local[key] = (fetched_at - 90, payload)
+
+    result, status = await cache.search("key", request, ttl_sec=60)
+    assert status == "stale" and result.answer == "v1"
+    assert len(cache._refresh_tasks) == 1
+
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    result, status = await cache.search("key", request, ttl_sec=60)
+    assert status == "hit" and result.answer == "v2"
+    assert cache.calls == 2
+    assert not cache._refresh_tasks
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call():
+    cache = CountingCache(redis=FakeRedis())
+    cache.delay = 0.01
+    request = TavilySearchRequest(query="주가")
+
+    results = await asyncio.gather(*(cache.search("key", request, ttl_sec=60) for _ in range(5)))
+
+    assert cache.calls == 1
+    assert {response.answer for response, _ in results} == {"v1"}
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_bypasses_cache():
+    cache = CountingCache(redis=FakeRedis())
+    request = TavilySearchRequest(query="속보")
+
+    await cache.search("key", request, ttl_sec=0)
+    _, status = await cache.search("key", request, ttl_sec=0)
+
+    assert status == "bypass" and cache.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_force_refresh_skips_cached_entry_and_updates_it():
+    cache = CountingCache(redis=FakeRedis())
+    request = TavilySearchRequest(query="환율 최신")
+    await cache.search("key", request, ttl_sec=60)
+
+    result, status = await cache.search("key", request, ttl_sec=60, force_refresh=True)
+    assert status == "refresh" and result.answer == "v2"
+
+    result, status = await cache.search("key", request, ttl_sec=60)
+    assert status == "hit" and result.answer == "v2"
+    assert cache.calls == 2
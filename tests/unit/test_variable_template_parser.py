@@ -1,5 +1,6 @@
 from app.core.workflow.nodes_v2.utils.variable_template_parser import (
     VariableTemplateParser,
+    compile_template,
 )
 
 
@@ -9,3 +10,17 @@ def test_variable_template_parser_extracts_ordered_unique_selectors():
     )
     selectors = parser.extract_variable_selectors()
     assert selectors == ["start.query", "conversation.summary"]
+
+
+def test_compile_template_builds_cached_literal_program():
+    template = "안녕 {{ start.query }}! {{#llm_1.response#}} 끝"
+    compiled = compile_template(template)
+
+    assert compiled is compile_template(template)
+    assert compiled.literals == ("안녕 ", "! ", " 끝")
+    assert [match.parts for match in compiled.matches] == [("start", "query"), ("llm_1", "response")]
+    assert compiled.selectors == ("start.query", "llm_1.response")
+
+    plain = compile_template("변수 없음")
+    assert not plain.has_variables
+    assert plain.literals == ("변수 없음",)
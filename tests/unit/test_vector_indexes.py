@@ -0,0 +1,94 @@
+import pytest
+
+from app.core.vector_indexes import create_ann_index, drop_ann_index, pgvector_version
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+    def one(self):
+        return self.value
+
+
+class FakeConnection:
+    """실행한 SQL을 기록하는 동기 Connection 대역"""
+
+    def __init__(self, extversion, id_bounds=(None, None)):
+        self.extversion = extversion
+        self.id_bounds = id_bounds
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "pg_extension" in sql:
+            return FakeResult(self.extversion)
+        if "MIN(id)" in sql:
+            return FakeResult(self.id_bounds)
+        return FakeResult(None)
+
+    def ddl(self):
+        return [sql for sql in self.statements if sql.startswith(("CREATE", "DROP", "UPDATE"))]
+
+
+def test_pgvector_version_parses_extension_version():
+    assert pgvector_version(FakeConnection("0.7.4")) == (0, 7)
+    assert pgvector_version(FakeConnection(None)) is None
+
+
+def test_quantized_index_is_skipped_on_old_pgvector():
+    conn = FakeConnection("0.6.2")
+
+    assert create_ann_index(conn, "halfvec") is False
+    assert conn.ddl() == []
+
+
+def test_only_configured_mode_index_is_created():
+    conn = FakeConnection("0.8.0")
+
+    assert create_ann_index(conn, "binary") is True
+    assert len(conn.ddl()) == 1
+    assert "document_embeddings_embedding_binary_idx" in conn.ddl()[0]
+
+
+def test_matryoshka_backfills_short_embeddings_before_indexing():
+    conn = FakeConnection("0.7.0", id_bounds=(1, 12000))
+
+    assert create_ann_index(conn, "matryoshka") is True
+    statements = conn.ddl()
+    assert [sql.split()[0] for sql in statements] == ["UPDATE", "UPDATE", "UPDATE", "CREATE"]
+    assert "document_embeddings_embedding_short_idx" in statements[-1]
+
+
+def test_matryoshka_is_skipped_on_old_pgvector():
+    conn = FakeConnection("0.5.1", id_bounds=(1, 10))
+
+    assert create_ann_index(conn, "matryoshka") is False
+    assert conn.ddl() == []
+
+
+def test_drop_ann_index_uses_if_exists():
+    conn = FakeConnection("0.8.0")
+
+    drop_ann_index(conn, "none")
+
+    assert conn.ddl() == ["DROP INDEX IF EXISTS document_embeddings_embedding_idx"]
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        create_ann_index(FakeConnection("0.8.0"), "int8")
+
+
+def test_model_declares_float32_index_only_without_quantization():
+    import app.core.workflow.node_registry_v2  # noqa: F401  (순환 import 방지용 선 로드)
+    from app.models.document_embeddings import _ann_index
+
+    assert _ann_index("none").name == "document_embeddings_embedding_idx"
+    assert _ann_index("halfvec").name == "document_embeddings_embedding_halfvec_idx"
+    assert _ann_index("binary").name == "document_embeddings_embedding_binary_idx"
+    assert _ann_index("matryoshka").name == "document_embeddings_embedding_short_idx"
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import app.core.workflow.node_registry_v2  # noqa: F401  (노드 모듈 순환 import 방지용 선 로드)
+from app.core.vector_store import VectorStore, matryoshka_prefix
+
+
+def compile_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.asyncpg.dialect()))
+
+
+def build(quantization: str) -> str:
+    store = VectorStore(bot_id="bot-1")
+    return compile_sql(store._build_ann_query(
+        query_embedding=[0.1] * 1024,
+        top_k=5,
+        document_ids=["doc-1"],
+        quantization=quantization,
+        candidate_k=40,
+    ))
+
+
+def test_full_precision_mode_keeps_single_hnsw_query():
+    sql = build("none")
+
+    assert "ann_candidates" not in sql
+    assert "halfvec" not in sql.lower()
+
+
+@pytest.mark.parametrize(
+    "quantization, index_expression",
+    [
+        ("halfvec", "CAST(document_embeddings.embedding AS HALFVEC(1024)) <=>"),
+        ("binary", "CAST(binary_quantize(document_embeddings.embedding) AS BIT(1024)) <~>"),
+    ],
+)
+def test_quantized_modes_rescore_candidates_with_full_vectors(quantization, index_expression):
+    sql = build(quantization)
+    candidates, outer = sql.split(") AS ann_candidates")
+
+    # 후보 단계는 표현식 인덱스와 같은 식으로 정렬, 필터도 후보 단계에 적용
+    assert index_expression in candidates
+    assert "document_embeddings.document_id IN" in candidates
+    # 최종 순위는 원본 float32 벡터의 코사인 거리
+    assert "ORDER BY document_embeddings.embedding <=> $1" in outer
+
+
+def test_unknown_quantization_mode_is_rejected():
+    with pytest.raises(ValueError):
+        build("int4")
+
+
+def test_matryoshka_prefix_truncates_and_renormalizes():
+    short = matryoshka_prefix([3.0, 4.0] + [1.0] * 1022, dimensions=2)
+
+    assert short == pytest.approx([0.6, 0.8])
+    assert matryoshka_prefix([0.0] * 4, dimensions=2) == [0.0, 0.0]
+
+
+def test_matryoshka_mode_searches_short_column_then_reranks_full_vectors():
+    sql = build("matryoshka")
+    candidates, outer = sql.split(") AS ann_candidates")
+
+    assert "ORDER BY document_embeddings.embedding_short <=>" in candidates
+    assert "ORDER BY document_embeddings.embedding <=> $1" in outer
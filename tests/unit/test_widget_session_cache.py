@@ -0,0 +1,123 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.widget.session_cache import WidgetSessionCache, WidgetSessionPrincipal
+
+
+class FakePipeline:
+    def __init__(self, store):
+        self.store = store
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.commands.append(("set", key, value))
+
+    def sadd(self, key, member):
+        self.commands.append(("sadd", key, member))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    async def execute(self):
+        for command, key, value in self.commands:
+            if command == "set":
+                self.store.values[key] = value
+            elif command == "sadd":
+                self.store.sets.setdefault(key, set()).add(value)
+        return [True] * len(self.commands)
+
+
+class FakeRedis:
+    """RedisClient의 get/delete/pipeline과 raw smembers만 흉내내는 구현"""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.redis = self
+
+    async def get(self, key):
+        raw = self.values.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.sets.pop(key, None)
+        return len(keys)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+
+def make_principal(bot_id="bot-1", session_id="s-1", minutes=30):
+    return WidgetSessionPrincipal(
+        session_id=session_id,
+        deployment_id="d-1",
+        bot_pk=7,
+        bot_id=bot_id,
+        owner_uuid="owner-uuid",
+        expires_at=datetime.now(timezone.utc) + timedelta(minutes=minutes),
+    )
+
+
+def make_cache(redis):
+    return WidgetSessionCache(redis=redis, enabled=True, local_max_entries=16, local_ttl_sec=60)
+
+
+@pytest.mark.asyncio
+async def test_principal_shared_across_replicas_and_bound_to_session_id():
+    redis = FakeRedis()
+    await make_cache(redis).set("hash-1", make_principal())
+
+    reader = make_cache(redis)
+    principal = await reader.get("hash-1", "s-1")
+    assert principal.bot_pk == 7 and principal.owner_uuid == "owner-uuid"
+    # 토큰과 다른 session_id로는 사용할 수 없음
+    assert await reader.get("hash-1", "other-session") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_principal_is_not_returned():
+    cache = make_cache(FakeRedis())
+    expired = make_principal(minutes=-1)
+    cache._store_local("hash-1", expired)
+
+    assert await cache.get("hash-1", "s-1") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_bot_drops_local_and_redis_entries():
+    redis = FakeRedis()
+    cache = make_cache(redis)
+    await cache.set("hash-1", make_principal())
+    await cache.set("hash-2", make_principal(session_id="s-2"))
+    await cache.set("hash-3", make_principal(bot_id="bot-2", session_id="s-3"))
+
+    await cache.invalidate_bot("bot-1")
+
+    assert await cache.get("hash-1", "s-1") is None
+    assert await cache.get("hash-2", "s-2") is None
+    assert (await cache.get("hash-3", "s-3")).bot_id == "bot-2"
+    assert await make_cache(redis).get("hash-1", "s-1") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_token_removes_single_session():
+    redis = FakeRedis()
+    cache = make_cache(redis)
+    await cache.set("hash-1", make_principal())
+
+    await cache.invalidate_token("hash-1")
+
+    assert await cache.get("hash-1", "s-1") is None